@@ -6,8 +6,8 @@ Set-Location $root
 
 python scripts/prepare_long_table.py
 python scripts/validate_schema.py --input data/multiscale_long.parquet --out results/schema_validation.json
-python scripts/saturation_gate.py --input data/multiscale_long.parquet --out_csv results/saturation_matrix.csv --out_json results/saturation_summary.json
-python scripts/fit_scale_invariants.py --input data/multiscale_long.parquet --saturation_csv results/saturation_matrix.csv --results_dir results --bootstrap_resamples 200
+python scripts/saturation_gate.py --input data/multiscale_long.parquet --out_csv results/saturation_matrix.csv --out_json results/saturation_summary.json --wide_cache data/multiscale_long.wide.npz
+python scripts/fit_scale_invariants.py --input data/multiscale_long.parquet --saturation_csv results/saturation_matrix.csv --results_dir results --bootstrap_resamples 200 --wide_cache data/multiscale_long.wide.npz
 
 Write-Host "Full Path-4 run complete."
 
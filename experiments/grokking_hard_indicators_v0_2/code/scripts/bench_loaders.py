@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import torch
+
+from grokking.datasets.modular_addition import make_loaders, make_tensor_loaders
+from grokking.models.tiny_transformer import TinyTransformer
+from grokking.utils.config import load_yaml
+from grokking.utils.seed import set_seed
+
+
+def run_steps(spec: dict, seed: int, steps: int, tensor_path: bool, device: torch.device) -> tuple[float, torch.Tensor]:
+    # The train_one_run step loop without checkpoints, timed from the first batch.
+    boundary = spec["boundary"]
+    p = int(boundary["modulus_p"])
+    dataset = boundary["dataset"]
+    model_cfg = boundary["model"]
+    train_cfg = boundary["training"]
+    set_seed(seed)
+    kwargs = dict(
+        p=p,
+        train_size=int(dataset["train_size"]),
+        test_size=int(dataset["test_size"]),
+        batch_size=int(train_cfg["batch_size"]),
+        seed=seed,
+        corruption=dataset.get("corruption", {}),
+    )
+    if tensor_path:
+        train_loader, _ = make_tensor_loaders(device=device, **kwargs)
+    else:
+        train_loader, _ = make_loaders(**kwargs)
+    model = TinyTransformer(
+        vocab_size=p,
+        d_model=int(model_cfg["width"]),
+        n_heads=int(model_cfg["heads"]),
+        n_layers=int(model_cfg["layers"]),
+        dropout=float(model_cfg.get("dropout", 0.0)),
+        n_classes=p,
+    ).to(device)
+    optimizer = torch.optim.AdamW(
+        model.parameters(), lr=float(train_cfg["lr"]), weight_decay=float(train_cfg["weight_decay"])
+    )
+    loss_fn = torch.nn.CrossEntropyLoss()
+
+    data_iter = iter(train_loader)
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        try:
+            batch = next(data_iter)
+        except StopIteration:
+            data_iter = iter(train_loader)
+            batch = next(data_iter)
+        model.train()
+        loss = loss_fn(model(batch["x"].to(device)), batch["y"].to(device))
+        optimizer.zero_grad(set_to_none=True)
+        loss.backward()
+        optimizer.step()
+    if device.type == "cuda":
+        torch.cuda.synchronize()
+    elapsed = time.perf_counter() - t0
+    return elapsed, torch.cat([q.detach().reshape(-1).cpu() for q in model.parameters()])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Training steps/sec: DataLoader + collate vs tensor-resident batches.")
+    ap.add_argument("--spec", default="protocol/estimator_spec.dev.yaml")
+    ap.add_argument("--steps", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--device", default="cpu")
+    args = ap.parse_args()
+
+    spec = load_yaml(args.spec)
+    device = torch.device(args.device)
+    t_loader, w_loader = run_steps(spec, args.seed, args.steps, tensor_path=False, device=device)
+    t_tensor, w_tensor = run_steps(spec, args.seed, args.steps, tensor_path=True, device=device)
+    print(
+        json.dumps(
+            {
+                "spec": args.spec,
+                "steps": args.steps,
+                "device": str(device),
+                "identical_weights": bool(torch.equal(w_loader, w_tensor)),
+                "dataloader_steps_per_sec": round(args.steps / t_loader, 2),
+                "tensor_steps_per_sec": round(args.steps / t_tensor, 2),
+                "speedup": round(t_loader / t_tensor, 2) if t_tensor > 0 else None,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
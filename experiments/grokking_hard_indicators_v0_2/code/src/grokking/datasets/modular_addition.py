@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Iterator
 
 import numpy as np
 import torch
@@ -50,6 +50,15 @@ class ModularAdditionDataset(Dataset[ModularAdditionBatch]):
     def __len__(self) -> int:
         return int(self._x.shape[0])
 
+    def as_tensors(self) -> dict[str, torch.Tensor]:
+        """The whole split as the same dict of tensors `collate` builds for a batch."""
+        return {
+            "x": torch.as_tensor(self._x, dtype=torch.long),
+            "y": torch.as_tensor(self._y, dtype=torch.long),
+            "y_true": torch.as_tensor(self._y_true, dtype=torch.long),
+            "is_corrupted": torch.as_tensor(self._is_corrupted, dtype=torch.bool),
+        }
+
     def __getitem__(self, idx: int) -> ModularAdditionBatch:
         x = torch.tensor(self._x[idx], dtype=torch.long)
         y = torch.tensor(self._y[idx], dtype=torch.long)
@@ -111,3 +120,86 @@ def make_loaders(
     )
     return train_loader, test_loader
 
+
+class TensorBatchIterator:
+    """Tensor-resident replacement for `DataLoader(ds, collate_fn=collate)` on this dataset.
+
+    The split lives as four whole tensors (on `device`); a batch is an index slice, so there is no
+    per-item tensor construction or re-stacking. Iteration consumes the global torch RNG exactly
+    like a single-process DataLoader (one draw per `iter()`, plus one per shuffled epoch to seed
+    that epoch's `randperm`), so batch order and every later random draw match the DataLoader path
+    for the same seed.
+    """
+
+    def __init__(
+        self,
+        dataset: ModularAdditionDataset,
+        *,
+        batch_size: int,
+        shuffle: bool,
+        drop_last: bool,
+        device: torch.device | str = "cpu",
+    ) -> None:
+        self.device = torch.device(device)
+        self.tensors = {k: v.to(self.device) for k, v in dataset.as_tensors().items()}
+        self.n = len(dataset)
+        self.batch_size = int(batch_size)
+        self.shuffle = bool(shuffle)
+        self.drop_last = bool(drop_last)
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return self.n // self.batch_size
+        return (self.n + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self) -> Iterator[dict[str, torch.Tensor]]:
+        # DataLoader draws its worker base seed when the iterator is created.
+        torch.empty((), dtype=torch.int64).random_()
+        return self._batches()
+
+    def _batches(self) -> Iterator[dict[str, torch.Tensor]]:
+        stop = (self.n // self.batch_size) * self.batch_size if self.drop_last else self.n
+        if self.shuffle:
+            # RandomSampler: seed a private generator from the global RNG on the first batch.
+            seed = int(torch.empty((), dtype=torch.int64).random_().item())
+            generator = torch.Generator()
+            generator.manual_seed(seed)
+            perm = torch.randperm(self.n, generator=generator).to(self.device)
+            for start in range(0, stop, self.batch_size):
+                idx = perm[start : start + self.batch_size]
+                yield {k: v[idx] for k, v in self.tensors.items()}
+        else:
+            for start in range(0, stop, self.batch_size):
+                yield {k: v[start : start + self.batch_size] for k, v in self.tensors.items()}
+
+
+def make_tensor_loaders(
+    *,
+    p: int,
+    train_size: int,
+    test_size: int,
+    batch_size: int,
+    seed: int,
+    corruption: dict[str, Any],
+    device: torch.device | str = "cpu",
+) -> tuple[TensorBatchIterator, TensorBatchIterator]:
+    """`make_loaders` with tensor-resident iterators (same splits, batches and RNG use)."""
+    train_ds = ModularAdditionDataset(
+        p=p,
+        size=train_size,
+        seed=seed,
+        corruption_enabled=bool(corruption.get("enabled", False)),
+        corruption_rate=float(corruption.get("corruption_rate", 0.0)),
+        corruption_seed=int(corruption.get("corruption_seed", 0)),
+    )
+    test_ds = ModularAdditionDataset(
+        p=p,
+        size=test_size,
+        seed=seed + 10_000,
+        corruption_enabled=False,
+        corruption_rate=0.0,
+        corruption_seed=0,
+    )
+    train_loader = TensorBatchIterator(train_ds, batch_size=batch_size, shuffle=True, drop_last=True, device=device)
+    test_loader = TensorBatchIterator(test_ds, batch_size=batch_size, shuffle=False, drop_last=False, device=device)
+    return train_loader, test_loader
@@ -6,22 +6,65 @@ from typing import Any
 import torch
 
 
-def save_checkpoint(
+def save_checkpoint_state(
     *,
     path: str | Path,
     step: int,
-    model: torch.nn.Module,
-    optimizer: torch.optim.Optimizer,
+    model_state: dict[str, torch.Tensor],
+    optimizer_state: dict[str, Any],
     extra: dict[str, Any] | None = None,
 ) -> None:
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
     payload: dict[str, Any] = {
         "step": step,
-        "model": model.state_dict(),
-        "optimizer": optimizer.state_dict(),
+        "model": model_state,
+        "optimizer": optimizer_state,
     }
     if extra:
         payload["extra"] = extra
     torch.save(payload, path)
 
+
+def save_checkpoint(
+    *,
+    path: str | Path,
+    step: int,
+    model: torch.nn.Module,
+    optimizer: torch.optim.Optimizer | dict[str, Any],
+    extra: dict[str, Any] | None = None,
+) -> None:
+    save_checkpoint_state(
+        path=path,
+        step=step,
+        model_state=model.state_dict(),
+        # A plain dict is an already-built optimizer state_dict (e.g. one population replica).
+        optimizer_state=optimizer if isinstance(optimizer, dict) else optimizer.state_dict(),
+        extra=extra,
+    )
+
+
+class CheckpointRetention:
+    """Keep every k-th checkpoint (by save order, the first included), the final one and the last N.
+
+    keep_every=1 keeps all. A checkpoint that would drop out of retention as soon as it is written
+    (keep_last=0, off the keep_every grid, not final) is not saved at all.
+    """
+
+    def __init__(self, *, keep_every: int = 1, keep_last: int = 0) -> None:
+        self.keep_every = max(1, int(keep_every))
+        self.keep_last = max(0, int(keep_last))
+        self._count = 0
+        self._recent: list[tuple[bool, Path]] = []
+
+    def add(self, path: str | Path, *, final: bool = False) -> tuple[bool, list[Path]]:
+        """Register the next checkpoint; returns (whether to save it, saved checkpoints that fell out of retention)."""
+        kept = final or self._count % self.keep_every == 0
+        self._count += 1
+        if self.keep_last == 0:
+            return kept, []
+        self._recent.append((kept, Path(path)))
+        if len(self._recent) <= self.keep_last:
+            return True, []
+        old_kept, old = self._recent.pop(0)
+        return True, ([] if old_kept else [old])
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import argparse
+import copy
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+import torch
+from torch.func import functional_call, stack_module_state, vmap
+from tqdm import tqdm
+
+from grokking.datasets.modular_addition import make_tensor_loaders
+from grokking.models.tiny_transformer import TinyTransformer
+from grokking.runner.device import pick_device
+from grokking.runner.train import eval_metrics
+from grokking.runner.writer import CheckpointWriter, take_snapshot
+from grokking.utils.config import dump_yaml, load_yaml, make_run_paths
+from grokking.utils.seed import set_seed
+
+# Population mode: K `train_one_run` seeds trained as one batched model. Parameters of the K
+# TinyTransformers are stacked along a leading replica axis, the forward/backward is one
+# `vmap(functional_call(...))`, and one AdamW steps the stacked tensors (AdamW is elementwise, so
+# this is K independent optimizers). Each replica keeps the init, data order and RNG draws of its
+# solo run; only the batched kernels' float summation order differs, so metrics agree with
+# `train_one_run(seed)` to within rounding. Logs and checkpoints are written per seed in the
+# usual `seed_<s>/` layout.
+
+
+class ReplicaRng:
+    """One saved global-CPU-RNG stream per replica (loader shuffles and draws, as in a solo run)."""
+
+    def __init__(self) -> None:
+        self.states: list[torch.Tensor] = []
+
+    def capture(self) -> None:
+        self.states.append(torch.get_rng_state())
+
+    @contextmanager
+    def use(self, k: int) -> Iterator[None]:
+        outer = torch.get_rng_state()
+        torch.set_rng_state(self.states[k])
+        try:
+            yield
+        finally:
+            self.states[k] = torch.get_rng_state()
+            torch.set_rng_state(outer)
+
+
+def replica_optimizer_state(optimizer: torch.optim.Optimizer, k: int) -> dict[str, Any]:
+    """Replica k's slice of a stacked optimizer, as a solo model's `optimizer.state_dict()`."""
+    sd = optimizer.state_dict()
+    state = {
+        i: {key: (v[k].clone() if torch.is_tensor(v) and v.ndim > 0 else v) for key, v in st.items()}
+        for i, st in sd["state"].items()
+    }
+    return {"state": state, "param_groups": sd["param_groups"]}
+
+
+def _load_replica(
+    model: torch.nn.Module, params: dict[str, torch.Tensor], buffers: dict[str, torch.Tensor], k: int
+) -> None:
+    # Copy replica k's weights (and current grads, for grad norms) into a plain module.
+    with torch.no_grad():
+        for name, p in model.named_parameters():
+            p.copy_(params[name][k])
+            g = params[name].grad
+            p.grad = None if g is None else g[k].clone()
+        for name, b in model.named_buffers():
+            b.copy_(buffers[name][k])
+
+
+def train_population(*, spec: dict[str, Any], out_dir: str | Path, seeds: list[int]) -> list[Path]:
+    device = pick_device()
+
+    boundary = spec["boundary"]
+    p = int(boundary["modulus_p"])
+    dataset = boundary["dataset"]
+    model_cfg = boundary["model"]
+    train_cfg = boundary["training"]
+    time_cfg = spec["time"]
+    batch_size = int(train_cfg["batch_size"])
+    max_steps = int(train_cfg["max_steps"])
+    checkpoint_every = int(time_cfg["checkpoint_every_steps"])
+
+    rngs = ReplicaRng()
+    models: list[TinyTransformer] = []
+    loaders = []
+    for seed in seeds:
+        # Same order of seeded draws as train_one_run: seed, data, model init.
+        set_seed(seed)
+        loaders.append(
+            make_tensor_loaders(
+                p=p,
+                train_size=int(dataset["train_size"]),
+                test_size=int(dataset["test_size"]),
+                batch_size=batch_size,
+                seed=seed,
+                corruption=dataset.get("corruption", {}),
+                device=device,
+            )
+        )
+        models.append(
+            TinyTransformer(
+                vocab_size=p,
+                d_model=int(model_cfg["width"]),
+                n_heads=int(model_cfg["heads"]),
+                n_layers=int(model_cfg["layers"]),
+                dropout=float(model_cfg.get("dropout", 0.0)),
+                n_classes=p,
+            ).to(device)
+        )
+        rngs.capture()
+
+    params, buffers = stack_module_state(models)
+    base = copy.deepcopy(models[0]).to("meta")
+    loss_fn = torch.nn.CrossEntropyLoss()
+
+    def replica_loss(p_k, b_k, x, y):
+        return loss_fn(functional_call(base, (p_k, b_k), (x,)), y)
+
+    # randomness="different": with dropout > 0 each replica draws its own masks (not its solo masks).
+    batched_loss = vmap(replica_loss, randomness="different")
+    optimizer = torch.optim.AdamW(
+        list(params.values()),
+        lr=float(train_cfg["lr"]),
+        weight_decay=float(train_cfg["weight_decay"]),
+    )
+
+    all_paths = []
+    for seed in seeds:
+        paths = make_run_paths(out_dir, seed)
+        paths.run_dir.mkdir(parents=True, exist_ok=True)
+        paths.checkpoints_dir.mkdir(parents=True, exist_ok=True)
+        resolved = copy.deepcopy(spec)
+        resolved.setdefault("run", {})
+        resolved["run"]["seed"] = seed
+        resolved["run"]["device"] = str(device)
+        resolved["run"]["population_seeds"] = [int(s) for s in seeds]
+        dump_yaml(resolved, paths.resolved_config_path)
+        all_paths.append(paths)
+
+    with ExitStack() as stack:
+        writers = [
+            stack.enter_context(
+                CheckpointWriter.from_spec(spec=spec, logs_path=paths.logs_path, checkpoints_dir=paths.checkpoints_dir)
+            )
+            for paths in all_paths
+        ]
+
+        iters = []
+        for k in range(len(seeds)):
+            with rngs.use(k):
+                iters.append(iter(loaders[k][0]))
+
+        pbar = tqdm(range(1, max_steps + 1), desc=f"population={list(seeds)} ({device})", ncols=100)
+        for step in pbar:
+            xs, ys = [], []
+            for k in range(len(seeds)):
+                with rngs.use(k):
+                    try:
+                        batch = next(iters[k])
+                    except StopIteration:
+                        iters[k] = iter(loaders[k][0])
+                        batch = next(iters[k])
+                xs.append(batch["x"])
+                ys.append(batch["y"])
+
+            base.train()
+            losses = batched_loss(params, buffers, torch.stack(xs).to(device), torch.stack(ys).to(device))
+
+            optimizer.zero_grad(set_to_none=True)
+            losses.sum().backward()
+            optimizer.step()
+
+            if step % checkpoint_every != 0 and step != 1 and step != max_steps:
+                continue
+
+            train_losses = losses.detach().cpu().tolist()
+            for k, seed in enumerate(seeds):
+                model = models[k]
+                _load_replica(model, params, buffers, k)
+                train_loader, test_loader = loaders[k]
+                with rngs.use(k):
+                    metrics = eval_metrics(
+                        model=model,
+                        train_loader=train_loader,
+                        test_loader=test_loader,
+                        device=device,
+                        spec=spec,
+                        batch_size=batch_size,
+                    )
+                writers[k].submit(
+                    take_snapshot(
+                        step=step,
+                        train_loss=float(train_losses[k]),
+                        eval_metrics=metrics,
+                        model=model,
+                        optimizer=replica_optimizer_state(optimizer, k),
+                        final=step == max_steps,
+                    )
+                )
+            pbar.set_postfix({"loss": f"{sum(train_losses) / len(train_losses):.4f}"})
+
+    return [paths.run_dir for paths in all_paths]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--spec", required=True, help="Path to estimator_spec.yaml")
+    parser.add_argument("--out", required=True, help="Output directory for runs/")
+    parser.add_argument("--seeds", type=int, nargs="+", required=True)
+    args = parser.parse_args()
+
+    spec = load_yaml(args.spec)
+    train_population(spec=spec, out_dir=args.out, seeds=[int(s) for s in args.seeds])
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+from grokking.runner.population import train_population
 from grokking.runner.train import train_one_run
 from grokking.utils.config import load_yaml
 
@@ -13,6 +14,9 @@ def main() -> None:
     parser.add_argument("--out", required=True)
     parser.add_argument("--phase", choices=["explore", "eval"], default="explore")
     parser.add_argument("--limit", type=int, default=0, help="If >0, run only first N seeds")
+    parser.add_argument(
+        "--population", type=int, default=1, help="If >1, train seeds in batched groups of this size"
+    )
     args = parser.parse_args()
 
     spec = load_yaml(args.spec)
@@ -23,6 +27,10 @@ def main() -> None:
         raise SystemExit(f"No seeds found for phase={args.phase} in spec")
 
     out_dir = Path(args.out) / args.phase
+    if args.population > 1:
+        for i in range(0, len(seeds), args.population):
+            train_population(spec=spec, out_dir=out_dir, seeds=[int(s) for s in seeds[i : i + args.population]])
+        return
     for seed in seeds:
         train_one_run(spec=spec, out_dir=out_dir, seed=int(seed))
 
@@ -1,21 +1,18 @@
 from __future__ import annotations
 
 import argparse
-import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import torch
 from tqdm import tqdm
 
-from grokking.datasets.modular_addition import make_loaders
+from grokking.datasets.modular_addition import make_tensor_loaders
 from grokking.estimators.cleanup_correction import correction_rate_on_corrupted
-from grokking.estimators.spectral import spectral_metrics_from_weight
 from grokking.models.tiny_transformer import TinyTransformer
-from grokking.runner.checkpoint import save_checkpoint
 from grokking.runner.device import pick_device
+from grokking.runner.writer import CheckpointWriter, take_snapshot
 from grokking.utils.config import dump_yaml, load_yaml, make_run_paths
-from grokking.utils.jsonl import append_jsonl
 from grokking.utils.seed import set_seed
 
 
@@ -23,7 +20,7 @@ from grokking.utils.seed import set_seed
 def evaluate(
     *,
     model: torch.nn.Module,
-    loader: torch.utils.data.DataLoader,
+    loader: Iterable[dict[str, torch.Tensor]],
     device: torch.device,
 ) -> tuple[float, float]:
     model.eval()
@@ -43,11 +40,26 @@ def evaluate(
     return total_loss / max(total, 1), correct / max(total, 1)
 
 
-def _get_weight_by_name(model: torch.nn.Module, name: str) -> torch.Tensor:
-    for n, p in model.named_parameters():
-        if n == name:
-            return p
-    raise KeyError(f"Parameter not found: {name}")
+def eval_metrics(
+    *,
+    model: torch.nn.Module,
+    train_loader: Iterable[dict[str, torch.Tensor]],
+    test_loader: Iterable[dict[str, torch.Tensor]],
+    device: torch.device,
+    spec: dict[str, Any],
+    batch_size: int,
+) -> dict[str, float]:
+    """Checkpoint metrics that need the live model (and draw from the loaders' RNG stream)."""
+    test_loss, test_acc = evaluate(model=model, loader=test_loader, device=device)
+    corr_cfg = spec.get("estimators", {}).get("Correction_Rate", {})
+    correction_rate = correction_rate_on_corrupted(
+        model=model,
+        train_loader=train_loader,
+        device=device,
+        samples=int(corr_cfg.get("samples", 2048)),
+        batch_size=int(corr_cfg.get("batch_size", batch_size)),
+    )
+    return {"test_loss": float(test_loss), "test_acc": float(test_acc), "correction_rate": float(correction_rate)}
 
 
 def train_one_run(*, spec: dict[str, Any], out_dir: str | Path, seed: int) -> Path:
@@ -62,13 +74,15 @@ def train_one_run(*, spec: dict[str, Any], out_dir: str | Path, seed: int) -> Pa
     time_cfg = spec["time"]
 
     batch_size = int(train_cfg["batch_size"])
-    train_loader, test_loader = make_loaders(
+    # Tensor-resident batches: same splits, batch order and RNG draws as the DataLoader path.
+    train_loader, test_loader = make_tensor_loaders(
         p=p,
         train_size=int(dataset["train_size"]),
         test_size=int(dataset["test_size"]),
         batch_size=batch_size,
         seed=seed,
         corruption=dataset.get("corruption", {}),
+        device=device,
     )
 
     model = TinyTransformer(
@@ -100,79 +114,56 @@ def train_one_run(*, spec: dict[str, Any], out_dir: str | Path, seed: int) -> Pa
     resolved["run"]["device"] = str(device)
     dump_yaml(resolved, paths.resolved_config_path)
 
-    spectral_cfg = spec.get("estimators", {}).get("H_spec", {})
-    normalize_entropy = bool(spectral_cfg.get("normalize", True))
-    matrices = spec.get("state", {}).get("spectral_matrices", ["unembed.weight"])
-    corr_cfg = spec.get("estimators", {}).get("Correction_Rate", {})
-
-    data_iter = iter(train_loader)
-    pbar = tqdm(range(1, max_steps + 1), desc=f"seed={seed} ({device})", ncols=100)
-    for step in pbar:
-        try:
-            batch = next(data_iter)
-        except StopIteration:
-            data_iter = iter(train_loader)
-            batch = next(data_iter)
-
-        model.train()
-        x = batch["x"].to(device)
-        y = batch["y"].to(device)
-        logits = model(x)
-        loss = loss_fn(logits, y)
-
-        optimizer.zero_grad(set_to_none=True)
-        loss.backward()
-        optimizer.step()
-
-        if step % checkpoint_every != 0 and step != 1 and step != max_steps:
-            continue
-
-        train_loss = float(loss.item())
-        test_loss, test_acc = evaluate(model=model, loader=test_loader, device=device)
-
-        h_spec_by_layer: dict[str, float] = {}
-        r_eff_by_layer: dict[str, float] = {}
-        for name in matrices:
-            w = _get_weight_by_name(model, name)
-            sm = spectral_metrics_from_weight(w, normalize_entropy=normalize_entropy)
-            h_spec_by_layer[name] = sm.h_spec
-            r_eff_by_layer[name] = sm.r_eff
-
-        correction_rate = correction_rate_on_corrupted(
-            model=model,
-            train_loader=train_loader,
-            device=device,
-            samples=int(corr_cfg.get("samples", 2048)),
-            batch_size=int(corr_cfg.get("batch_size", batch_size)),
-        )
-
-        weight_norm_by_layer = {n: float(p.detach().float().norm().item()) for n, p in model.named_parameters()}
-        grad_norm_by_layer = {
-            n: float((p.grad.detach().float().norm().item()) if p.grad is not None else 0.0)
-            for n, p in model.named_parameters()
-        }
-
-        record = {
-            "step": step,
-            "train_loss": train_loss,
-            "test_loss": float(test_loss),
-            "test_acc": float(test_acc),
-            "H_spec_by_layer": h_spec_by_layer,
-            "r_eff_by_layer": r_eff_by_layer,
-            "correction_rate": float(correction_rate),
-            "weight_norm_by_layer": weight_norm_by_layer,
-            "grad_norm_by_layer": grad_norm_by_layer,
-            "ts": time.time(),
-        }
-        append_jsonl(paths.logs_path, record)
-        save_checkpoint(
-            path=paths.checkpoints_dir / f"step_{step}.pt",
-            step=step,
-            model=model,
-            optimizer=optimizer,
-            extra={"test_acc": test_acc, "test_loss": test_loss},
-        )
-        pbar.set_postfix({"loss": f"{train_loss:.4f}", "test_acc": f"{test_acc:.3f}", "corr": f"{correction_rate:.3f}"})
+    writer = CheckpointWriter.from_spec(spec=spec, logs_path=paths.logs_path, checkpoints_dir=paths.checkpoints_dir)
+    with writer:
+        data_iter = iter(train_loader)
+        pbar = tqdm(range(1, max_steps + 1), desc=f"seed={seed} ({device})", ncols=100)
+        for step in pbar:
+            try:
+                batch = next(data_iter)
+            except StopIteration:
+                data_iter = iter(train_loader)
+                batch = next(data_iter)
+
+            model.train()
+            x = batch["x"].to(device)
+            y = batch["y"].to(device)
+            logits = model(x)
+            loss = loss_fn(logits, y)
+
+            optimizer.zero_grad(set_to_none=True)
+            loss.backward()
+            optimizer.step()
+
+            if step % checkpoint_every != 0 and step != 1 and step != max_steps:
+                continue
+
+            metrics = eval_metrics(
+                model=model,
+                train_loader=train_loader,
+                test_loader=test_loader,
+                device=device,
+                spec=spec,
+                batch_size=batch_size,
+            )
+            train_loss = float(loss.item())
+            writer.submit(
+                take_snapshot(
+                    step=step,
+                    train_loss=train_loss,
+                    eval_metrics=metrics,
+                    model=model,
+                    optimizer=optimizer,
+                    final=step == max_steps,
+                )
+            )
+            pbar.set_postfix(
+                {
+                    "loss": f"{train_loss:.4f}",
+                    "test_acc": f"{metrics['test_acc']:.3f}",
+                    "corr": f"{metrics['correction_rate']:.3f}",
+                }
+            )
 
     return paths.run_dir
 
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import torch
+
+from grokking.estimators.spectral import spectral_metrics_from_weight
+from grokking.runner.checkpoint import CheckpointRetention, save_checkpoint_state
+from grokking.utils.jsonl import append_jsonl
+
+# Checkpoint steps split in two. The training thread runs what needs the live model and the
+# global RNG stream (test evaluation, correction rate over train_loader) and takes a CPU
+# snapshot of parameters, grads and optimizer state. A CheckpointWriter computes the spectral
+# and norm metrics from the snapshot, appends the logs.jsonl record and saves the checkpoint,
+# in a background thread unless `checkpointing.async` is false. Records keep the key order of the
+# synchronous path and `ts` is the snapshot time. Spectral metrics and norms are computed on the CPU
+# copies: identical to the synchronous path for CPU runs, while on CUDA/MPS they can differ from
+# the device computation in the last float digits.
+
+
+@dataclass
+class CheckpointSnapshot:
+    step: int
+    train_loss: float
+    eval_metrics: dict[str, float]
+    params: dict[str, torch.Tensor]
+    grads: dict[str, torch.Tensor | None]
+    model_state: dict[str, torch.Tensor]
+    optimizer_state: dict[str, Any]
+    ts: float
+    final: bool = False
+
+
+def _cpu_copy(obj: Any) -> Any:
+    if torch.is_tensor(obj):
+        return obj.detach().to("cpu", copy=True)
+    if isinstance(obj, dict):
+        return {k: _cpu_copy(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_cpu_copy(v) for v in obj)
+    return obj
+
+
+def take_snapshot(
+    *,
+    step: int,
+    train_loss: float,
+    eval_metrics: dict[str, float],
+    model: torch.nn.Module,
+    optimizer: torch.optim.Optimizer | dict[str, Any],
+    final: bool = False,
+) -> CheckpointSnapshot:
+    params = {n: p.detach().to("cpu", copy=True) for n, p in model.named_parameters()}
+    grads = {
+        n: (p.grad.detach().to("cpu", copy=True) if p.grad is not None else None)
+        for n, p in model.named_parameters()
+    }
+    # Parameters are shared with `params`; only buffers are copied again.
+    model_state = {k: params[k] if k in params else _cpu_copy(v) for k, v in model.state_dict().items()}
+    optimizer_state = _cpu_copy(optimizer if isinstance(optimizer, dict) else optimizer.state_dict())
+    return CheckpointSnapshot(
+        step=step,
+        train_loss=train_loss,
+        eval_metrics=eval_metrics,
+        params=params,
+        grads=grads,
+        model_state=model_state,
+        optimizer_state=optimizer_state,
+        ts=time.time(),
+        final=final,
+    )
+
+
+def state_metrics(
+    *, params: dict[str, torch.Tensor], grads: dict[str, torch.Tensor | None], spec: dict[str, Any]
+) -> dict[str, dict[str, float]]:
+    """Spectral metrics of the configured matrices plus per-parameter weight and grad norms."""
+    spectral_cfg = spec.get("estimators", {}).get("H_spec", {})
+    normalize_entropy = bool(spectral_cfg.get("normalize", True))
+    matrices = spec.get("state", {}).get("spectral_matrices", ["unembed.weight"])
+
+    h_spec_by_layer: dict[str, float] = {}
+    r_eff_by_layer: dict[str, float] = {}
+    for name in matrices:
+        if name not in params:
+            raise KeyError(f"Parameter not found: {name}")
+        sm = spectral_metrics_from_weight(params[name], normalize_entropy=normalize_entropy)
+        h_spec_by_layer[name] = sm.h_spec
+        r_eff_by_layer[name] = sm.r_eff
+
+    return {
+        "H_spec_by_layer": h_spec_by_layer,
+        "r_eff_by_layer": r_eff_by_layer,
+        "weight_norm_by_layer": {n: float(p.float().norm().item()) for n, p in params.items()},
+        "grad_norm_by_layer": {
+            n: float(g.float().norm().item()) if g is not None else 0.0 for n, g in grads.items()
+        },
+    }
+
+
+class CheckpointWriter:
+    """Turns snapshots into logs.jsonl records and checkpoint files, with retention."""
+
+    def __init__(
+        self,
+        *,
+        logs_path: str | Path,
+        checkpoints_dir: str | Path,
+        spec: dict[str, Any],
+        background: bool = True,
+        max_pending: int = 2,
+        keep_every: int = 1,
+        keep_last: int = 0,
+    ) -> None:
+        self.logs_path = Path(logs_path)
+        self.checkpoints_dir = Path(checkpoints_dir)
+        self.spec = spec
+        self.retention = CheckpointRetention(keep_every=keep_every, keep_last=keep_last)
+        self._error: BaseException | None = None
+        self._queue: queue.Queue[CheckpointSnapshot | None] | None = None
+        self._thread: threading.Thread | None = None
+        if background:
+            # Bounded: training blocks instead of piling up snapshots if the writer falls behind.
+            self._queue = queue.Queue(maxsize=max(1, int(max_pending)))
+            self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+            self._thread.start()
+
+    @classmethod
+    def from_spec(cls, *, spec: dict[str, Any], logs_path: str | Path, checkpoints_dir: str | Path) -> CheckpointWriter:
+        cfg = spec.get("checkpointing", {})
+        return cls(
+            logs_path=logs_path,
+            checkpoints_dir=checkpoints_dir,
+            spec=spec,
+            background=bool(cfg.get("async", True)),
+            max_pending=int(cfg.get("max_pending", 2)),
+            keep_every=int(cfg.get("keep_every", 1)),
+            keep_last=int(cfg.get("keep_last", 0)),
+        )
+
+    def write(self, snap: CheckpointSnapshot) -> None:
+        sm = state_metrics(params=snap.params, grads=snap.grads, spec=self.spec)
+        record = {
+            "step": snap.step,
+            "train_loss": snap.train_loss,
+            "test_loss": float(snap.eval_metrics["test_loss"]),
+            "test_acc": float(snap.eval_metrics["test_acc"]),
+            "H_spec_by_layer": sm["H_spec_by_layer"],
+            "r_eff_by_layer": sm["r_eff_by_layer"],
+            "correction_rate": float(snap.eval_metrics["correction_rate"]),
+            "weight_norm_by_layer": sm["weight_norm_by_layer"],
+            "grad_norm_by_layer": sm["grad_norm_by_layer"],
+            "ts": snap.ts,
+        }
+        append_jsonl(self.logs_path, record)
+        path = self.checkpoints_dir / f"step_{snap.step}.pt"
+        save, dropped = self.retention.add(path, final=snap.final)
+        if save:
+            save_checkpoint_state(
+                path=path,
+                step=snap.step,
+                model_state=snap.model_state,
+                optimizer_state=snap.optimizer_state,
+                extra={"test_acc": record["test_acc"], "test_loss": record["test_loss"]},
+            )
+        for old in dropped:
+            old.unlink(missing_ok=True)
+
+    def _run(self) -> None:
+        assert self._queue is not None
+        while True:
+            snap = self._queue.get()
+            if snap is None:
+                return
+            if self._error is not None:
+                continue  # keep draining so submit() never blocks on a dead writer
+            try:
+                self.write(snap)
+            except BaseException as e:  # re-raised on the training thread
+                self._error = e
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("checkpoint writer failed") from self._error
+
+    def submit(self, snap: CheckpointSnapshot) -> None:
+        self._raise_if_failed()
+        if self._queue is None:
+            self.write(snap)
+        else:
+            self._queue.put(snap)
+
+    def close(self) -> None:
+        """Flush pending snapshots and stop the thread; raises if any write failed."""
+        if self._thread is not None and self._thread.is_alive():
+            assert self._queue is not None
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_if_failed()
+
+    def __enter__(self) -> CheckpointWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._thread is not None and self._thread.is_alive():
+            # Training already failed: flush what was queued, keep the original exception.
+            assert self._queue is not None
+            self._queue.put(None)
+            self._thread.join()
@@ -0,0 +1,99 @@
+from pathlib import Path
+import copy
+import json
+import sys
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from grokking.runner.checkpoint import CheckpointRetention
+from grokking.runner.train import train_one_run
+from grokking.utils.config import load_yaml
+
+SPEC_PATH = Path(__file__).resolve().parents[1] / "protocol" / "estimator_spec.dev.yaml"
+
+
+def _simulate(n, *, keep_every, keep_last, final=True):
+    # Returns the checkpoint indices on disk after n saves, and the indices that were never written.
+    retention = CheckpointRetention(keep_every=keep_every, keep_last=keep_last)
+    on_disk, skipped = set(), []
+    for i in range(n):
+        save, dropped = retention.add(Path(f"step_{i}.pt"), final=final and i == n - 1)
+        if save:
+            on_disk.add(i)
+        else:
+            skipped.append(i)
+        for old in dropped:
+            assert int(old.stem.split("_")[1]) in on_disk
+            on_disk.remove(int(old.stem.split("_")[1]))
+    return sorted(on_disk), skipped
+
+
+def test_retention_keep_all_by_default():
+    assert _simulate(6, keep_every=1, keep_last=0) == ([0, 1, 2, 3, 4, 5], [])
+
+
+def test_retention_every_k_plus_last_n():
+    assert _simulate(12, keep_every=4, keep_last=3) == ([0, 4, 8, 9, 10, 11], [])
+
+
+def test_retention_keep_last_zero_keeps_final_and_skips_dead_saves():
+    on_disk, skipped = _simulate(10, keep_every=4, keep_last=0)
+    assert on_disk == [0, 4, 8, 9]
+    assert skipped == [1, 2, 3, 5, 6, 7]
+
+
+def test_retention_final_is_never_dropped():
+    on_disk, _ = _simulate(7, keep_every=3, keep_last=1)
+    assert on_disk == [0, 3, 6]
+    on_disk, _ = _simulate(8, keep_every=3, keep_last=1, final=False)
+    assert on_disk == [0, 3, 6, 7]
+
+
+def _small_spec(**checkpointing):
+    spec = load_yaml(SPEC_PATH)
+    boundary = spec["boundary"]
+    boundary["dataset"].update(train_size=256, test_size=128)
+    boundary["model"].update(width=32, layers=1, heads=4, dropout=0.0)
+    boundary["training"].update(batch_size=32, max_steps=22)
+    spec["time"]["checkpoint_every_steps"] = 5
+    spec["estimators"]["Correction_Rate"].update(samples=64, batch_size=32)
+    spec["checkpointing"] = checkpointing
+    return spec
+
+
+def _read_logs(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_async_writer_matches_synchronous_records(tmp_path):
+    sync_dir = train_one_run(spec=_small_spec(**{"async": False}), out_dir=tmp_path / "sync", seed=0)
+    async_dir = train_one_run(spec=_small_spec(**{"async": True, "max_pending": 1}), out_dir=tmp_path / "async", seed=0)
+
+    sync_logs = _read_logs(sync_dir / "logs.jsonl")
+    async_logs = _read_logs(async_dir / "logs.jsonl")
+    assert [r["step"] for r in async_logs] == [1, 5, 10, 15, 20, 22]
+    for a, b in zip(sync_logs, async_logs):
+        a.pop("ts")
+        b.pop("ts")
+        assert list(a) == list(b)
+        assert a == b  # CPU run: same values, not just close
+
+    for name in ("step_1.pt", "step_22.pt"):
+        a = torch.load(sync_dir / "checkpoints" / name)
+        b = torch.load(async_dir / "checkpoints" / name)
+        assert all(torch.equal(a["model"][k], b["model"][k]) for k in a["model"])
+
+
+def test_train_one_run_retention_keeps_final(tmp_path):
+    spec = _small_spec(keep_every=2, keep_last=0)
+    run_dir = train_one_run(spec=copy.deepcopy(spec), out_dir=tmp_path, seed=0)
+    # Checkpoint steps 1, 5, 10, 15, 20, 22: every 2nd by save order plus the final one.
+    assert sorted(p.name for p in (run_dir / "checkpoints").iterdir()) == sorted(
+        ["step_1.pt", "step_10.pt", "step_20.pt", "step_22.pt"]
+    )
+    assert [r["step"] for r in _read_logs(run_dir / "logs.jsonl")] == [1, 5, 10, 15, 20, 22]
@@ -0,0 +1,121 @@
+from pathlib import Path
+import copy
+import json
+import sys
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("torch.func")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from grokking.runner.population import train_population
+from grokking.runner.train import train_one_run
+from grokking.utils.config import load_yaml
+
+SPEC_PATH = Path(__file__).resolve().parents[1] / "protocol" / "estimator_spec.dev.yaml"
+SEEDS = [0, 1]
+
+# Population runs differ from solo runs only in float summation order of the batched kernels.
+LOG_ATOL = 1e-5
+PARAM_ATOL = 1e-5
+
+
+def _small_spec():
+    spec = load_yaml(SPEC_PATH)
+    boundary = spec["boundary"]
+    boundary["dataset"].update(train_size=256, test_size=128)
+    boundary["model"].update(width=32, layers=2, heads=4, dropout=0.0)
+    boundary["training"].update(batch_size=32, max_steps=20)
+    spec["time"]["checkpoint_every_steps"] = 5
+    spec["estimators"]["Correction_Rate"].update(samples=64, batch_size=32)
+    return spec
+
+
+def _read_logs(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _assert_close(a, b, atol, where):
+    if isinstance(a, dict):
+        assert a.keys() == b.keys(), where
+        for k in a:
+            _assert_close(a[k], b[k], atol, f"{where}.{k}")
+    elif torch.is_tensor(a):
+        assert a.shape == b.shape, where
+        assert torch.allclose(a.float(), b.float(), rtol=0.0, atol=atol), where
+    elif isinstance(a, float):
+        assert a == pytest.approx(b, abs=atol), where
+    else:
+        assert a == b, where
+
+
+def _without_key_bias(model_state, d_model):
+    # The key block of in_proj_bias has an exactly zero gradient (softmax is invariant to a
+    # constant shift of the keys), so AdamW turns round-off noise into ~lr-sized steps in both
+    # runs; it does not change any output.
+    out = {}
+    for name, value in model_state.items():
+        if name.endswith("self_attn.in_proj_bias"):
+            value = torch.cat([value[:d_model], value[2 * d_model :]])
+        out[name] = value
+    return out
+
+
+def test_population_matches_train_one_run(tmp_path):
+    spec = _small_spec()
+    d_model = int(spec["boundary"]["model"]["width"])
+    for seed in SEEDS:
+        train_one_run(spec=copy.deepcopy(spec), out_dir=tmp_path / "solo", seed=seed)
+    train_population(spec=copy.deepcopy(spec), out_dir=tmp_path / "pop", seeds=SEEDS)
+
+    for seed in SEEDS:
+        solo_dir = tmp_path / "solo" / f"seed_{seed}"
+        pop_dir = tmp_path / "pop" / f"seed_{seed}"
+
+        solo_logs = _read_logs(solo_dir / "logs.jsonl")
+        pop_logs = _read_logs(pop_dir / "logs.jsonl")
+        assert [r["step"] for r in solo_logs] == [r["step"] for r in pop_logs] == [1, 5, 10, 15, 20]
+        for a, b in zip(solo_logs, pop_logs):
+            a.pop("ts")
+            b.pop("ts")
+            _assert_close(a, b, LOG_ATOL, f"seed {seed} step {a['step']}")
+
+        solo_ckpts = sorted(p.name for p in (solo_dir / "checkpoints").iterdir())
+        assert solo_ckpts == sorted(p.name for p in (pop_dir / "checkpoints").iterdir())
+        for name in solo_ckpts:
+            a = torch.load(solo_dir / "checkpoints" / name)
+            b = torch.load(pop_dir / "checkpoints" / name)
+            assert a["step"] == b["step"]
+            _assert_close(a["extra"], b["extra"], LOG_ATOL, f"{name} extra")
+            _assert_close(
+                _without_key_bias(a["model"], d_model), _without_key_bias(b["model"], d_model), PARAM_ATOL, name
+            )
+            sa, sb = a["optimizer"]["state"], b["optimizer"]["state"]
+            assert sa.keys() == sb.keys()
+            for i in sa:
+                assert torch.equal(sa[i]["step"], sb[i]["step"])
+                _assert_close(sa[i]["exp_avg"], sb[i]["exp_avg"], PARAM_ATOL, f"{name} exp_avg[{i}]")
+
+
+def test_population_flushes_writers_on_error(tmp_path, monkeypatch):
+    import grokking.runner.population as population
+
+    spec = _small_spec()
+    calls = {"n": 0}
+    real = population.eval_metrics
+
+    def failing_eval_metrics(**kwargs):
+        calls["n"] += 1
+        if calls["n"] > len(SEEDS):  # second checkpoint step
+            raise RuntimeError("boom")
+        return real(**kwargs)
+
+    monkeypatch.setattr(population, "eval_metrics", failing_eval_metrics)
+    with pytest.raises(RuntimeError, match="boom"):
+        train_population(spec=spec, out_dir=tmp_path, seeds=SEEDS)
+    for seed in SEEDS:
+        assert [r["step"] for r in _read_logs(tmp_path / f"seed_{seed}" / "logs.jsonl")] == [1]
+        assert (tmp_path / f"seed_{seed}" / "checkpoints" / "step_1.pt").exists()
@@ -0,0 +1,57 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from grokking.datasets.modular_addition import make_loaders, make_tensor_loaders
+from grokking.utils.seed import set_seed
+
+LOADER_KWARGS = dict(
+    p=31,
+    train_size=300,
+    test_size=100,
+    batch_size=32,
+    seed=7,
+    corruption={"enabled": True, "corruption_rate": 0.1, "corruption_seed": 5},
+)
+
+
+def _drain(loaders, epochs=3):
+    # Batches of several epochs, interleaved with test passes and unrelated draws from the
+    # global RNG (as train_one_run does), so a drifted RNG stream shows up in later batches.
+    train_loader, test_loader = loaders
+    out = []
+    for _ in range(epochs):
+        for batch in train_loader:
+            out.append({k: v.clone() for k, v in batch.items()})
+        out.append({"draw": torch.rand(4)})
+        for batch in test_loader:
+            out.append({k: v.clone() for k, v in batch.items()})
+    return out
+
+
+def test_tensor_loaders_match_dataloader_batches_and_rng():
+    set_seed(7)
+    ref = _drain(make_loaders(**LOADER_KWARGS))
+    ref_state = torch.get_rng_state()
+
+    set_seed(7)
+    fast = _drain(make_tensor_loaders(**LOADER_KWARGS))
+
+    assert len(ref) == len(fast)
+    for a, b in zip(ref, fast):
+        assert a.keys() == b.keys()
+        for k in a:
+            assert a[k].dtype == b[k].dtype and torch.equal(a[k], b[k]), k
+    assert torch.equal(ref_state, torch.get_rng_state())
+
+
+def test_tensor_loader_lengths():
+    train_loader, test_loader = make_tensor_loaders(**LOADER_KWARGS)
+    assert len(train_loader) == 300 // 32 == len(list(train_loader))
+    assert len(test_loader) == 4 == len(list(test_loader))
+    assert [len(b["x"]) for b in test_loader][-1] == 100 - 3 * 32
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 import argparse
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 from sklearn.isotonic import IsotonicRegression
 
+EXPERIMENTS = Path(__file__).resolve().parents[2]
+if str(EXPERIMENTS) not in sys.path:
+    sys.path.insert(0, str(EXPERIMENTS))
+
+from multiscale_common.permutation_audit import permutation_null
+from multiscale_common.wide_cache import WideCache
+
 
 def rmse(y_true: np.ndarray, y_pred: np.ndarray) -> float:
     return float(np.sqrt(np.mean((y_true - y_pred) ** 2)))
@@ -23,15 +33,6 @@ def seed_split(seeds: list[int], train_ratio: float, random_seed: int) -> tuple[
     return train, test
 
 
-def build_pair_data(df: pd.DataFrame, scheme: str, estimator: str, b1: int, b2: int) -> pd.DataFrame:
-    sub = df[(df["scheme"] == scheme) & (df["estimator"] == estimator)].copy()
-    piv = sub.pivot_table(index=["seed", "t"], columns="b", values="value", aggfunc="mean").reset_index()
-    if b1 not in piv.columns or b2 not in piv.columns:
-        return pd.DataFrame(columns=["seed", "t", "x", "y"])
-    out = piv[["seed", "t", b1, b2]].dropna().rename(columns={b1: "x", b2: "y"})
-    return out
-
-
 def fit_iso(x: np.ndarray, y: np.ndarray) -> IsotonicRegression:
     iso = IsotonicRegression(increasing=True, out_of_bounds="clip")
     iso.fit(x, y)
@@ -39,7 +40,7 @@ def fit_iso(x: np.ndarray, y: np.ndarray) -> IsotonicRegression:
 
 
 def evaluate_one(
-    df: pd.DataFrame,
+    cache: WideCache,
     sat_df: pd.DataFrame,
     scheme: str,
     estimator: str,
@@ -47,6 +48,12 @@ def evaluate_one(
     split_seed: int,
     n_perm: int,
     perm_seed: int,
+    alpha: float = 0.05,
+    early_stop: bool = False,
+    chunk_size: int = 256,
+    executor: Executor | None = None,
+    max_in_flight: int = 4,
+    perm_csv: Path | None = None,
 ) -> dict | None:
     # Required triple only: 1->2->4
     sat_flags = sat_df[
@@ -64,9 +71,9 @@ def evaluate_one(
             "reason": "saturated_required_scales",
         }
 
-    p12 = build_pair_data(df, scheme, estimator, 1, 2)
-    p24 = build_pair_data(df, scheme, estimator, 2, 4)
-    p14 = build_pair_data(df, scheme, estimator, 1, 4)
+    p12 = cache.pair_frame(scheme, estimator, 1, 2)
+    p24 = cache.pair_frame(scheme, estimator, 2, 4)
+    p14 = cache.pair_frame(scheme, estimator, 1, 4)
     if len(p12) == 0 or len(p24) == 0 or len(p14) == 0:
         return {
             "scheme": scheme,
@@ -110,22 +117,30 @@ def evaluate_one(
     y_dir = iso14.predict(x_eval)
     rmse_real = rmse(y_dir, y_comp)
 
-    rng = np.random.default_rng(perm_seed)
-    x_train = t14["x"].to_numpy(float)
-    y_train = t14["y"].to_numpy(float)
-    perm_rmses: list[float] = []
-    for _ in range(n_perm):
-        y_perm = y_train[rng.permutation(len(y_train))]
-        iso_perm = fit_iso(x_train, y_perm)
-        y_perm_pred = iso_perm.predict(x_eval)
-        perm_rmses.append(rmse(y_perm_pred, y_comp))
+    null = permutation_null(
+        x_train=t14["x"].to_numpy(float),
+        y_train=t14["y"].to_numpy(float),
+        x_eval=x_eval,
+        y_ref=y_comp,
+        rmse_real=rmse_real,
+        n_perm=n_perm,
+        perm_seed=perm_seed,
+        chunk_size=chunk_size,
+        executor=executor,
+        max_in_flight=max_in_flight,
+        early_stop=early_stop,
+        alpha=alpha,
+        out_csv=perm_csv,
+    )
 
-    arr = np.array(perm_rmses, dtype=float)
+    # After an early stop these use the permutations run so far; the p_emp <= alpha verdict is
+    # the one the full run would give.
+    arr = null["rmses"]
     mean_perm = float(np.mean(arr))
     std_perm = float(np.std(arr))
     p_emp = float((1 + np.sum(arr <= rmse_real)) / (len(arr) + 1))
     effect_sigma = float((mean_perm - rmse_real) / std_perm) if std_perm > 0 else float("nan")
-    neg_ctrl_pass = bool((rmse_real < mean_perm) and (p_emp <= 0.05))
+    neg_ctrl_pass = bool((rmse_real < mean_perm) and (p_emp <= alpha))
 
     return {
         "scheme": scheme,
@@ -142,6 +157,8 @@ def evaluate_one(
         "effect_sigma": effect_sigma,
         "negative_control_pass": neg_ctrl_pass,
         "independent_estimator": estimator in {"C_frozen", "H_2x2"},
+        "n_perm_done": int(null["n_done"]),
+        "stopped_early": bool(null["stopped_early"]),
     }
 
 
@@ -158,41 +175,64 @@ def main() -> None:
     ap.add_argument("--perm_seed", type=int, default=20260223)
     ap.add_argument("--out_csv", default="results/temp_compare_blocks/permutation_negative_control.csv")
     ap.add_argument("--out_md", default="results/temp_compare_blocks/permutation_negative_control.md")
+    ap.add_argument("--alpha", type=float, default=0.05, help="Preregistered level for p_emp (lower tail)")
+    ap.add_argument(
+        "--early_stop",
+        action="store_true",
+        help="Stop a cell's permutations once p_emp <= alpha can no longer change",
+    )
+    ap.add_argument("--workers", type=int, default=0, help="Processes for permutation chunks (0/1 = serial)")
+    ap.add_argument("--chunk_size", type=int, default=256, help="Permutations per fitted chunk")
+    ap.add_argument(
+        "--perm_rmse_dir",
+        default="",
+        help="Directory for per-cell CSVs of permutation RMSEs, streamed as chunks finish (default: not written)",
+    )
     args = ap.parse_args()
 
     rows: list[dict] = []
-    blocks = [
-        ("A", Path(args.data_block_a_root), Path(args.results_block_a_root)),
-        ("B", Path(args.data_block_b_root), Path(args.results_block_b_root)),
-    ]
-    for block_name, data_root, res_root in blocks:
-        for temp in args.temps:
-            data_path = data_root / temp / "multiscale_long.parquet"
-            sat_path = res_root / temp / "saturation_matrix.csv"
-            if not data_path.exists() or not sat_path.exists():
-                continue
-            df = pd.read_parquet(data_path)
-            sat_df = pd.read_csv(sat_path)
-            schemes = sorted(df["scheme"].dropna().astype(str).unique().tolist())
-            estimators = sorted(df["estimator"].dropna().astype(str).unique().tolist())
-            for scheme in schemes:
-                for estimator in estimators:
-                    rec = evaluate_one(
-                        df=df,
-                        sat_df=sat_df,
-                        scheme=scheme,
-                        estimator=estimator,
-                        train_ratio=args.train_ratio,
-                        split_seed=args.split_seed,
-                        n_perm=args.n_perm,
-                        perm_seed=args.perm_seed,
-                    )
-                    if rec is None:
-                        continue
-                    rec["block"] = block_name
-                    rec["temp_tag"] = temp
-                    rec["temperature"] = 2.10 if temp == "T2p10" else 2.269 if temp == "T2p269" else None
-                    rows.append(rec)
+    perm_dir = Path(args.perm_rmse_dir) if args.perm_rmse_dir else None
+    with ExitStack() as stack:
+        # The pool is shut down on the way out, also when a cell raises.
+        executor = stack.enter_context(ProcessPoolExecutor(max_workers=args.workers)) if args.workers > 1 else None
+        blocks = [
+            ("A", Path(args.data_block_a_root), Path(args.results_block_a_root)),
+            ("B", Path(args.data_block_b_root), Path(args.results_block_b_root)),
+        ]
+        for block_name, data_root, res_root in blocks:
+            for temp in args.temps:
+                data_path = data_root / temp / "multiscale_long.parquet"
+                sat_path = res_root / temp / "saturation_matrix.csv"
+                if not data_path.exists() or not sat_path.exists():
+                    continue
+                cache = WideCache.from_long(pd.read_parquet(data_path))
+                sat_df = pd.read_csv(sat_path)
+                schemes = cache.schemes
+                estimators = cache.estimators
+                for scheme in schemes:
+                    for estimator in estimators:
+                        rec = evaluate_one(
+                            cache=cache,
+                            sat_df=sat_df,
+                            scheme=scheme,
+                            estimator=estimator,
+                            train_ratio=args.train_ratio,
+                            split_seed=args.split_seed,
+                            n_perm=args.n_perm,
+                            perm_seed=args.perm_seed,
+                            alpha=args.alpha,
+                            early_stop=args.early_stop,
+                            chunk_size=args.chunk_size,
+                            executor=executor,
+                            max_in_flight=2 * args.workers,
+                            perm_csv=None if perm_dir is None else perm_dir / f"{block_name}_{temp}_{scheme}_{estimator}.csv",
+                        )
+                        if rec is None:
+                            continue
+                        rec["block"] = block_name
+                        rec["temp_tag"] = temp
+                        rec["temperature"] = 2.10 if temp == "T2p10" else 2.269 if temp == "T2p269" else None
+                        rows.append(rec)
 
     out_csv = Path(args.out_csv)
     out_md = Path(args.out_md)
@@ -247,6 +287,11 @@ def main() -> None:
             "- `C_activity` is derived (`1 - C_frozen`), so independent-evidence emphasis should remain on `C_frozen` and `H_2x2`.",
         ]
     )
+    if args.early_stop:
+        lines.append(
+            f"- Early stopping at alpha={args.alpha:g}: a cell stops once its pass/fail verdict on p_emp is decided "
+            "(`n_perm_done` in the CSV); RMSE(perm) statistics use the permutations run."
+        )
     out_md.write_text("\n".join(lines) + "\n", encoding="utf-8")
     print(f"Wrote {out_csv}")
     print(f"Wrote {out_md}")
@@ -2,16 +2,27 @@ from __future__ import annotations
 
 import argparse
 import json
-import warnings
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
 
 import numpy as np
 import pandas as pd
-from scipy.optimize import brentq
 from sklearn.isotonic import IsotonicRegression
 
+EXPERIMENTS = Path(__file__).resolve().parents[2]
+if str(EXPERIMENTS) not in sys.path:
+    sys.path.insert(0, str(EXPERIMENTS))
+
+from multiscale_common.seed_bootstrap import (
+    bootstrap_fixed_point_and_slope,
+    root_find_on_unit_interval,
+    slope_iso,
+    slope_poly,
+    stable_polyfit,
+)
+from multiscale_common.wide_cache import WideCache
+
 
 @dataclass
 class PairFit:
@@ -67,15 +78,6 @@ def seed_split(seeds: list[int], train_ratio: float, random_seed: int) -> tuple[
     return train, test
 
 
-def build_pair_data(df: pd.DataFrame, scheme: str, estimator: str, b1: int, b2: int) -> pd.DataFrame:
-    sub = df[(df["scheme"] == scheme) & (df["estimator"] == estimator)].copy()
-    piv = sub.pivot_table(index=["seed", "t"], columns="b", values="value", aggfunc="mean").reset_index()
-    if b1 not in piv.columns or b2 not in piv.columns:
-        return pd.DataFrame(columns=["seed", "t", "x", "y"])
-    out = piv[["seed", "t", b1, b2]].dropna().rename(columns={b1: "x", b2: "y"})
-    return out
-
-
 def fit_poly_select(
     x_train: np.ndarray,
     y_train: np.ndarray,
@@ -113,146 +115,6 @@ def monotonic_violations_poly(coefs: np.ndarray, xs: np.ndarray) -> int:
     return int(np.sum(diffs < 0))
 
 
-def stable_polyfit(x: np.ndarray, y: np.ndarray, degree: int) -> np.ndarray:
-    if degree < 0:
-        raise ValueError("degree must be >= 0")
-    # Degenerate case: no x variation => constant predictor.
-    if len(np.unique(x)) < 2:
-        coefs = np.zeros(degree + 1, dtype=float)
-        coefs[-1] = float(np.mean(y))
-        return coefs
-
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        try:
-            coefs = np.polyfit(x, y, degree)
-            if np.all(np.isfinite(coefs)):
-                return coefs
-        except Exception:
-            pass
-
-    coefs = np.zeros(degree + 1, dtype=float)
-    coefs[-1] = float(np.mean(y))
-    return coefs
-
-
-def root_find_on_unit_interval(f: Callable[[np.ndarray], np.ndarray], grid_points: int) -> tuple[float | None, bool]:
-    xs = np.linspace(0.0, 1.0, grid_points)
-    gx = f(xs) - xs
-
-    close_idx = np.where(np.isclose(gx, 0.0, atol=1e-6))[0]
-    if len(close_idx) > 0:
-        x0 = float(xs[close_idx[0]])
-        return x0, True
-
-    sign = np.sign(gx)
-    for i in range(len(xs) - 1):
-        if sign[i] == 0:
-            return float(xs[i]), True
-        if sign[i] * sign[i + 1] < 0:
-            a, b = float(xs[i]), float(xs[i + 1])
-            try:
-                r = float(brentq(lambda z: float(f(np.array([z]))[0] - z), a, b))
-                return r, True
-            except Exception:
-                continue
-
-    # fallback: nearest approach, not strict root
-    idx = int(np.argmin(np.abs(gx)))
-    return float(xs[idx]), False
-
-
-def slope_iso(iso: IsotonicRegression, x_star: float, delta: float) -> float:
-    a = max(0.0, x_star - delta)
-    b = min(1.0, x_star + delta)
-    if np.isclose(a, b):
-        return 0.0
-    ya = float(iso.predict([a])[0])
-    yb = float(iso.predict([b])[0])
-    return float((yb - ya) / (b - a))
-
-
-def slope_poly(coefs: np.ndarray, x_star: float) -> float:
-    dcoefs = np.polyder(coefs)
-    return float(np.polyval(dcoefs, x_star))
-
-
-def slope_stability(slope_samples: list[float]) -> dict:
-    if len(slope_samples) == 0:
-        return {"label": "unknown", "abs_mean": None, "abs_ci_low": None, "abs_ci_high": None}
-    arr = np.abs(np.array(slope_samples, dtype=float))
-    m = float(np.mean(arr))
-    lo = float(np.quantile(arr, 0.025))
-    hi = float(np.quantile(arr, 0.975))
-    if m < 1.0 and hi < 1.0:
-        label = "stable"
-    elif m > 1.0 and lo > 1.0:
-        label = "unstable"
-    else:
-        label = "unknown"
-    return {"label": label, "abs_mean": m, "abs_ci_low": lo, "abs_ci_high": hi}
-
-
-def bootstrap_fixed_point_and_slope(
-    pair_df: pd.DataFrame,
-    train_seeds: list[int],
-    degree: int,
-    grid_points: int,
-    n_bootstrap: int,
-    random_seed: int,
-    delta: float,
-) -> dict:
-    rng = np.random.default_rng(random_seed)
-    xstars_iso: list[float] = []
-    xstars_poly: list[float] = []
-    slope_iso_samples: list[float] = []
-    slope_poly_samples: list[float] = []
-
-    train_seed_arr = np.array(train_seeds, dtype=int)
-    for _ in range(n_bootstrap):
-        sample_seeds = rng.choice(train_seed_arr, size=len(train_seed_arr), replace=True)
-        sampled_parts = [pair_df[pair_df["seed"] == s] for s in sample_seeds]
-        boot = pd.concat(sampled_parts, ignore_index=True)
-        if len(boot) < 30:
-            continue
-
-        x = boot["x"].to_numpy(dtype=float)
-        y = boot["y"].to_numpy(dtype=float)
-        iso = IsotonicRegression(increasing=True, out_of_bounds="clip")
-        iso.fit(x, y)
-        x_star_iso, _ = root_find_on_unit_interval(lambda z: iso.predict(z), grid_points=grid_points)
-        if x_star_iso is not None:
-            xstars_iso.append(float(x_star_iso))
-            slope_iso_samples.append(float(slope_iso(iso, x_star_iso, delta=delta)))
-
-        coefs = stable_polyfit(x, y, degree)
-        f_poly = lambda z: np.polyval(coefs, z)
-        x_star_poly, _ = root_find_on_unit_interval(f_poly, grid_points=grid_points)
-        if x_star_poly is not None:
-            xstars_poly.append(float(x_star_poly))
-            slope_poly_samples.append(float(slope_poly(coefs, x_star_poly)))
-
-    def summarize(vals: list[float]) -> dict:
-        if len(vals) == 0:
-            return {"mean": None, "ci_low": None, "ci_high": None, "n": 0}
-        arr = np.array(vals, dtype=float)
-        return {
-            "mean": float(np.mean(arr)),
-            "ci_low": float(np.quantile(arr, 0.025)),
-            "ci_high": float(np.quantile(arr, 0.975)),
-            "n": int(len(arr)),
-        }
-
-    return {
-        "x_star_iso": summarize(xstars_iso),
-        "x_star_poly": summarize(xstars_poly),
-        "slope_iso": summarize(slope_iso_samples),
-        "slope_poly": summarize(slope_poly_samples),
-        "slope_iso_stability": slope_stability(slope_iso_samples),
-        "slope_poly_stability": slope_stability(slope_poly_samples),
-    }
-
-
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", default="data/multiscale_long.parquet")
@@ -262,10 +124,21 @@ def main() -> None:
     ap.add_argument("--train_ratio", type=float, default=0.7)
     ap.add_argument("--random_seed", type=int, default=20260216)
     ap.add_argument("--bootstrap_resamples", type=int, default=200)
+    ap.add_argument(
+        "--bootstrap_workers",
+        type=int,
+        default=0,
+        help="Processes for bootstrap resamples (0/1 = serial); results do not depend on this",
+    )
     ap.add_argument("--grid_points", type=int, default=2001)
     ap.add_argument("--boundary_eps", type=float, default=0.10)
     ap.add_argument("--slope_delta", type=float, default=0.01)
     ap.add_argument("--closure_rmse_tau", type=float, default=0.05)
+    ap.add_argument(
+        "--wide_cache",
+        default="",
+        help="Optional .npz pivot cache (reused if built from the same input, else rebuilt and saved)",
+    )
     args = ap.parse_args()
 
     input_path = Path(args.input)
@@ -273,11 +146,12 @@ def main() -> None:
     results_dir = Path(args.results_dir)
     results_dir.mkdir(parents=True, exist_ok=True)
 
-    df = load_table(input_path)
+    # Pivot the long table once; every scale pair below is a column slice of this cache.
+    cache, _ = WideCache.for_input(input_path, Path(args.wide_cache) if args.wide_cache else None, load_table)
     sat_df = pd.read_csv(sat_path)
 
-    schemes = sorted(df["scheme"].dropna().astype(str).unique().tolist())
-    estimators = sorted(df["estimator"].dropna().astype(str).unique().tolist())
+    schemes = cache.schemes
+    estimators = cache.estimators
     scales = args.scales
 
     sat_lookup = {}
@@ -297,8 +171,8 @@ def main() -> None:
             closure_tests[scheme][estimator] = {}
 
             # seed split shared per scheme+estimator
-            sub_se = df[(df["scheme"] == scheme) & (df["estimator"] == estimator)]
-            all_seeds = sorted(sub_se["seed"].dropna().astype(int).unique().tolist())
+            table = cache.table(scheme, estimator)
+            all_seeds = [] if table is None else sorted(int(s) for s in table.seeds)
             if len(all_seeds) < 2:
                 continue
             train_seeds, test_seeds = seed_split(
@@ -312,7 +186,7 @@ def main() -> None:
 
             for i in range(len(scales) - 1):
                 b1, b2 = int(scales[i]), int(scales[i + 1])
-                pair_df = build_pair_data(df, scheme, estimator, b1, b2)
+                pair_df = cache.pair_frame(scheme, estimator, b1, b2)
                 if len(pair_df) == 0:
                     continue
                 train_df = pair_df[pair_df["seed"].isin(train_seeds)].copy()
@@ -383,6 +257,7 @@ def main() -> None:
                     n_bootstrap=args.bootstrap_resamples,
                     random_seed=args.random_seed + b1 * 101 + b2,
                     delta=args.slope_delta,
+                    workers=args.bootstrap_workers,
                 )
 
                 boundary_flag_iso = (
@@ -439,7 +314,7 @@ def main() -> None:
                     }
                     continue
 
-                direct_df = build_pair_data(df, scheme, estimator, a, c)
+                direct_df = cache.pair_frame(scheme, estimator, a, c)
                 if len(direct_df) == 0:
                     closure_tests[scheme][estimator][key] = {
                         "label": "ESTIMATOR_UNSTABLE",
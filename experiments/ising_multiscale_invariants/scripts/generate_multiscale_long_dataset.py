@@ -4,14 +4,35 @@ import argparse
 import csv
 import hashlib
 import json
+import math
 import subprocess
+import sys
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+EXPERIMENTS = Path(__file__).resolve().parents[2]
+if str(EXPERIMENTS) not in sys.path:
+    sys.path.insert(0, str(EXPERIMENTS))
+
+from multiscale_common.block_entropy import block_entropy
+from multiscale_common.frozen_tracker import FrozenTracker
+from multiscale_common.ising_checkerboard import CheckerboardIsing
+from multiscale_common.seed_parts import (
+    combine_csv,
+    combine_parquet,
+    iter_parts,
+    part_path,
+    run_parts,
+    write_part,
+)
+
+LONG_COLUMNS = ["seed", "t", "scheme", "b", "estimator", "value"]
+
 
 @dataclass
 class SimConfig:
@@ -25,44 +46,42 @@ class SimConfig:
     schemes: tuple[str, ...] = ("majority", "threshold_low", "threshold_high", "average")
 
 
+def check_grid_size(parser: argparse.ArgumentParser, grid_size: int, scales: tuple[int, ...] = SimConfig.scales) -> None:
+    """Reject lattice sizes the checkerboard kernel (even L) or the coarse-graining cannot take."""
+    step = math.lcm(2, *scales)
+    if grid_size <= 0 or grid_size % step:
+        parser.error(
+            f"--grid_size must be a positive multiple of {step} (even for the checkerboard kernel, "
+            f"divisible by the scales {list(scales)}), got {grid_size}"
+        )
+
+
+def initial_spins(seed: int, size: int) -> tuple[np.ndarray, np.random.Generator]:
+    """Initial +/-1 spins and the Generator left positioned for the dynamics, as in Ising2DGlauber."""
+    rng = np.random.default_rng(seed)
+    spins = rng.choice(np.array([-1, 1], dtype=np.int8), size=(size, size)).astype(np.int8)
+    return spins, rng
+
+
 class Ising2DGlauber:
+    """Single-replica view of the checkerboard kernel (same seed -> same trajectory as before)."""
+
     def __init__(self, seed: int, size: int = 128, temperature: float = 2.269):
-        self.rng = np.random.default_rng(seed)
+        spins, self.rng = initial_spins(seed, size)
         self.size = size
         self.temperature = temperature
-        # +/-1 spins
-        self.spins = self.rng.choice(np.array([-1, 1], dtype=np.int8), size=(size, size)).astype(np.int8)
-        ii, jj = np.indices((size, size))
-        self.mask_even = ((ii + jj) % 2 == 0)
-        self.mask_odd = ~self.mask_even
-
-    def _neighbor_sum(self) -> np.ndarray:
-        s = self.spins
-        return np.roll(s, 1, axis=0) + np.roll(s, -1, axis=0) + np.roll(s, 1, axis=1) + np.roll(s, -1, axis=1)
-
-    def _update_mask(self, mask: np.ndarray) -> None:
-        neigh = self._neighbor_sum()
-        s = self.spins
-        dE = 2.0 * s * neigh  # J=1
-        acc = np.zeros_like(dE, dtype=bool)
-        accept_downhill = (dE <= 0) & mask
-        acc |= accept_downhill
-
-        uphill = (dE > 0) & mask
-        if np.any(uphill):
-            p = np.exp(-dE[uphill] / self.temperature)
-            u = self.rng.random(size=p.shape[0])
-            acc[uphill] = (u < p)
-
-        s[acc] *= -1
+        self.kernel = CheckerboardIsing(spins, [temperature], rngs=[self.rng])
+
+    @property
+    def spins(self) -> np.ndarray:
+        return self.kernel.spins()[0]
 
     def sweep(self) -> None:
-        # Checkerboard update: avoids immediate conflicts and is fast vectorized.
-        self._update_mask(self.mask_even)
-        self._update_mask(self.mask_odd)
+        # Checkerboard update: even sublattice, then odd.
+        self.kernel.sweep()
 
     def binary_snapshot(self) -> np.ndarray:
-        return (self.spins > 0).astype(np.int8)
+        return self.kernel.binary_snapshots()[0]
 
 
 def coarsen_grid(grid: np.ndarray, b: int, scheme: str) -> np.ndarray:
@@ -89,24 +108,7 @@ def coarsen_grid(grid: np.ndarray, b: int, scheme: str) -> np.ndarray:
 
 
 def entropy_2x2(grid: np.ndarray) -> float:
-    h, w = grid.shape
-    blocks: list[tuple[int, int, int, int]] = []
-    for i in range(0, h - 1, 2):
-        for j in range(0, w - 1, 2):
-            blocks.append(tuple(list(grid[i : i + 2, j : j + 2].flat)))  # type: ignore[arg-type]
-    if not blocks:
-        return 0.0
-    _, counts = np.unique(blocks, axis=0, return_counts=True)
-    p = counts.astype(float) / counts.sum()
-    return float(-(p * np.log2(p + 1e-15)).sum())
-
-
-def frozen_fraction(history: list[np.ndarray], window: int) -> float:
-    if len(history) < window:
-        return 0.0
-    rec = np.stack(history[-window:])
-    var_cell = np.var(rec, axis=0)
-    return float(np.mean(var_cell == 0.0))
+    return block_entropy(grid, 2)
 
 
 def sha256_file(path: Path) -> str:
@@ -129,85 +131,71 @@ def git_commit(repo_root: Path) -> str:
         return "unknown"
 
 
+def measure_snapshot(
+    seed: int,
+    t: int,
+    base_grid: np.ndarray,
+    cfg: SimConfig,
+    trackers: dict[tuple[str, int], FrozenTracker],
+    rows: list[dict],
+) -> None:
+    """Append the long-format rows for one measured snapshot of one replica."""
+    for scheme in cfg.schemes:
+        for b in cfg.scales:
+            cg = coarsen_grid(base_grid, b=b, scheme=scheme)
+            key = (scheme, b)
+            if key not in trackers:
+                trackers[key] = FrozenTracker(cg.shape, cfg.window)
+            trackers[key].update(cg)
+
+            c_frozen = trackers[key].frozen_fraction()
+            c_activity = 1.0 - c_frozen
+            h_norm = float(np.clip(entropy_2x2(cg) / 4.0, 0.0, 1.0))
+
+            rows.append({"seed": seed, "t": t, "scheme": scheme, "b": b, "estimator": "C_frozen", "value": c_frozen})
+            rows.append(
+                {"seed": seed, "t": t, "scheme": scheme, "b": b, "estimator": "C_activity", "value": c_activity}
+            )
+            rows.append({"seed": seed, "t": t, "scheme": scheme, "b": b, "estimator": "H_2x2", "value": h_norm})
+
+
+def is_measured(t: int, cfg: SimConfig) -> bool:
+    return t >= cfg.burn_in and t % cfg.measure_interval == 0
+
+
 def run_sim(seed: int, cfg: SimConfig) -> list[dict]:
     sim = Ising2DGlauber(seed=seed, size=cfg.grid_size, temperature=cfg.temperature)
     rows: list[dict] = []
-    histories: dict[tuple[str, int], list[np.ndarray]] = {
-        (scheme, b): [] for scheme in cfg.schemes for b in cfg.scales
-    }
+    trackers: dict[tuple[str, int], FrozenTracker] = {}
 
     for t in range(1, cfg.steps + 1):
         sim.sweep()
-        if t < cfg.burn_in or (t % cfg.measure_interval != 0):
-            continue
-
-        base_grid = sim.binary_snapshot()
-        for scheme in cfg.schemes:
-            for b in cfg.scales:
-                cg = coarsen_grid(base_grid, b=b, scheme=scheme)
-                key = (scheme, b)
-                histories[key].append(cg)
-                if len(histories[key]) > (cfg.window + 5):
-                    histories[key] = histories[key][-cfg.window - 5 :]
-
-                c_frozen = frozen_fraction(histories[key], cfg.window)
-                c_activity = 1.0 - c_frozen
-                h_norm = float(np.clip(entropy_2x2(cg) / 4.0, 0.0, 1.0))
-
-                rows.append(
-                    {"seed": seed, "t": t, "scheme": scheme, "b": b, "estimator": "C_frozen", "value": c_frozen}
-                )
-                rows.append(
-                    {"seed": seed, "t": t, "scheme": scheme, "b": b, "estimator": "C_activity", "value": c_activity}
-                )
-                rows.append(
-                    {"seed": seed, "t": t, "scheme": scheme, "b": b, "estimator": "H_2x2", "value": h_norm}
-                )
+        if is_measured(t, cfg):
+            measure_snapshot(seed, t, sim.binary_snapshot(), cfg, trackers, rows)
     return rows
 
 
-def main() -> None:
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--seeds", type=int, default=6)
-    ap.add_argument("--seed_start", type=int, default=10000)
-    ap.add_argument("--steps", type=int, default=4000)
-    ap.add_argument("--burn_in", type=int, default=500)
-    ap.add_argument("--measure_interval", type=int, default=20)
-    ap.add_argument("--window", type=int, default=40)
-    ap.add_argument("--grid_size", type=int, default=128)
-    ap.add_argument("--temperature", type=float, default=2.269)
-    ap.add_argument("--out_parquet", default="data/multiscale_long.parquet")
-    ap.add_argument("--out_csv", default="data/multiscale_long.csv")
-    ap.add_argument("--summary_json", default="data/run_summary.json")
-    ap.add_argument("--manifest_json", default="data/MANIFEST.json")
-    args = ap.parse_args()
-
-    cfg = SimConfig(
-        steps=args.steps,
-        burn_in=args.burn_in,
-        measure_interval=args.measure_interval,
-        window=args.window,
-        grid_size=args.grid_size,
-        temperature=args.temperature,
-    )
-
-    rows: list[dict] = []
-    for i in range(args.seeds):
-        rows.extend(run_sim(seed=args.seed_start + i, cfg=cfg))
-
-    df = pd.DataFrame(rows)
+def long_frame(rows: list[dict]) -> pd.DataFrame:
+    """Rows -> the long table, with the column dtypes written on both the serial and --workers paths."""
+    df = pd.DataFrame(rows, columns=LONG_COLUMNS)
     df["seed"] = df["seed"].astype(int)
     df["t"] = df["t"].astype(int)
     df["scheme"] = df["scheme"].astype(str)
     df["b"] = df["b"].astype(int)
     df["estimator"] = df["estimator"].astype(str)
     df["value"] = df["value"].astype(float).clip(0.0, 1.0)
+    return df
 
-    out_parquet = Path(args.out_parquet)
-    out_csv = Path(args.out_csv)
-    summary_json = Path(args.summary_json)
-    manifest_json = Path(args.manifest_json)
-    out_parquet.parent.mkdir(parents=True, exist_ok=True)
+
+def seed_part(seed: int, cfg: SimConfig, part_dir: Path) -> dict:
+    # One seed -> one Parquet part, in the same schema as the serial path's output.
+    df = long_frame(run_sim(seed=seed, cfg=cfg))
+    return dict(write_part(df, part_path(part_dir, seed)), seed=int(seed))
+
+
+def write_rows(rows: list[dict], out_parquet: Path, out_csv: Path) -> tuple[int, bool, str | None]:
+    """Serial path: rows -> Parquet (best effort) + CSV. Returns (n_rows, wrote_parquet, parquet_error)."""
+    df = long_frame(rows)
 
     wrote_parquet = True
     parquet_error = None
@@ -218,22 +206,38 @@ def main() -> None:
         parquet_error = str(e)
 
     df.to_csv(out_csv, index=False, quoting=csv.QUOTE_MINIMAL)
-    summary = {
-        "rows": int(len(df)),
-        "seeds": args.seeds,
-        "seed_start": args.seed_start,
-        "steps": args.steps,
-        "burn_in": args.burn_in,
-        "measure_interval": args.measure_interval,
-        "window": args.window,
-        "grid_size": args.grid_size,
-        "temperature": args.temperature,
+    return int(len(df)), wrote_parquet, parquet_error
+
+
+def run_summary(cfg: SimConfig, n_rows: int, seeds: int, seed_start: int, out_parquet: Path, out_csv: Path) -> dict:
+    return {
+        "rows": n_rows,
+        "seeds": seeds,
+        "seed_start": seed_start,
+        "steps": cfg.steps,
+        "burn_in": cfg.burn_in,
+        "measure_interval": cfg.measure_interval,
+        "window": cfg.window,
+        "grid_size": cfg.grid_size,
+        "temperature": cfg.temperature,
         "scales": list(cfg.scales),
         "schemes": list(cfg.schemes),
         "estimators": ["C_frozen", "C_activity", "H_2x2"],
         "out_parquet": str(out_parquet.as_posix()),
         "out_csv": str(out_csv.as_posix()),
     }
+
+
+def write_summary_and_manifest(
+    summary: dict,
+    out_parquet: Path,
+    out_csv: Path,
+    summary_json: Path,
+    manifest_json: Path,
+    wrote_parquet: bool,
+    parquet_error: str | None,
+    parts: list[dict] | None = None,
+) -> None:
     summary_json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
 
     repo_root = Path(__file__).resolve().parents[3]
@@ -248,20 +252,90 @@ def main() -> None:
         ],
         "parquet_written": wrote_parquet,
         "parquet_error": parquet_error,
-        "rows_long": int(len(df)),
+        "rows_long": summary["rows"],
     }
     if wrote_parquet and out_parquet.exists():
         manifest["artifacts"].append(
             {"path": str(out_parquet), "sha256": sha256_file(out_parquet), "kind": "derived_long_parquet"}
         )
+    if parts is not None:
+        for part in parts:
+            manifest["artifacts"].append(
+                {"path": part["path"], "sha256": part["sha256"], "kind": "seed_part_parquet", "rows": part["rows"]}
+            )
     manifest_json.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
 
-    print(f"Wrote rows: {len(df)}")
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seeds", type=int, default=6)
+    ap.add_argument("--seed_start", type=int, default=10000)
+    ap.add_argument("--steps", type=int, default=4000)
+    ap.add_argument("--burn_in", type=int, default=500)
+    ap.add_argument("--measure_interval", type=int, default=20)
+    ap.add_argument("--window", type=int, default=40)
+    ap.add_argument("--grid_size", type=int, default=128)
+    ap.add_argument("--temperature", type=float, default=2.269)
+    ap.add_argument("--out_parquet", default="data/multiscale_long.parquet")
+    ap.add_argument("--out_csv", default="data/multiscale_long.csv")
+    ap.add_argument("--summary_json", default="data/run_summary.json")
+    ap.add_argument("--manifest_json", default="data/MANIFEST.json")
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="0 = serial in-memory path; N >= 1 = one Parquet part per seed on N processes (needs pyarrow)",
+    )
+    ap.add_argument("--parts_dir", default=None, help="Part-file directory (default: <out_parquet stem>_parts)")
+    args = ap.parse_args()
+    check_grid_size(ap, args.grid_size)
+
+    cfg = SimConfig(
+        steps=args.steps,
+        burn_in=args.burn_in,
+        measure_interval=args.measure_interval,
+        window=args.window,
+        grid_size=args.grid_size,
+        temperature=args.temperature,
+    )
+
+    out_parquet = Path(args.out_parquet)
+    out_csv = Path(args.out_csv)
+    summary_json = Path(args.summary_json)
+    manifest_json = Path(args.manifest_json)
+    out_parquet.parent.mkdir(parents=True, exist_ok=True)
+    seeds = [args.seed_start + i for i in range(args.seeds)]
+
+    parts: list[dict] | None = None
+    wrote_parquet = True
+    parquet_error = None
+    if args.workers > 0:
+        part_dir = Path(args.parts_dir) if args.parts_dir else out_parquet.with_name(f"{out_parquet.stem}_parts")
+        for stale in part_dir.glob("part-seed*.parquet"):
+            stale.unlink()
+        parts = run_parts(partial(seed_part, cfg=cfg, part_dir=part_dir), seeds, workers=args.workers)
+        n_rows = combine_csv(iter_parts(parts), out_csv, quoting=csv.QUOTE_MINIMAL)
+        combine_parquet(parts, out_parquet)
+    else:
+        rows: list[dict] = []
+        for seed in seeds:
+            rows.extend(run_sim(seed=seed, cfg=cfg))
+        n_rows, wrote_parquet, parquet_error = write_rows(rows, out_parquet, out_csv)
+
+    summary = run_summary(cfg, n_rows, args.seeds, args.seed_start, out_parquet, out_csv)
+    if parts is not None:
+        summary["workers"] = args.workers
+        summary["parts_dir"] = str(part_dir.as_posix())
+        summary["parts"] = len(parts)
+    write_summary_and_manifest(
+        summary, out_parquet, out_csv, summary_json, manifest_json, wrote_parquet, parquet_error, parts
+    )
+
+    print(f"Wrote rows: {n_rows}")
     print(f"CSV: {out_csv}")
     print(f"PARQUET: {out_parquet if wrote_parquet else 'SKIPPED'}")
     print(f"summary: {summary_json}")
     print(f"manifest: {manifest_json}")
 
-
 if __name__ == "__main__":
     main()
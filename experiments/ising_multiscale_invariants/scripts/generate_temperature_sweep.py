@@ -0,0 +1,131 @@
+"""Generate the long datasets for a whole temperature sweep in one batched simulation.
+
+Every (temperature, seed) replica is advanced together by the checkerboard kernel, then each
+temperature gets the same data directory `generate_multiscale_long_dataset.py` would write
+(`<data_root>/T<tag>/multiscale_long.{parquet,csv}`, `run_summary.json`, `MANIFEST.json`).
+
+Seeds follow `run_temperature_sweep.ps1`: temperature k uses seeds
+`seed_start + k * seed_stride + i`. With `--rng per_replica` (default) each replica keeps its
+own Generator and the outputs are identical to separate per-temperature runs; `--rng shared`
+draws all uniforms from one Generator per half-sweep (faster, different random stream).
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from generate_multiscale_long_dataset import (
+    SimConfig,
+    check_grid_size,
+    initial_spins,
+    is_measured,
+    measure_snapshot,
+    run_summary,
+    write_rows,
+    write_summary_and_manifest,
+)
+from multiscale_common.frozen_tracker import FrozenTracker
+from multiscale_common.ising_checkerboard import RNG_MODES, CheckerboardIsing
+
+
+def temperature_tag(temp: str) -> str:
+    return "T" + temp.replace(".", "p")
+
+
+def run_sweep(
+    temperatures: list[float],
+    seeds_by_temp: list[list[int]],
+    cfg: SimConfig,
+    rng_mode: str = "per_replica",
+    rng_seed: int = 0,
+) -> list[list[dict]]:
+    """Simulate every (temperature, seed) replica in one batch; returns rows per temperature."""
+    replicas = [(k, seed) for k, seeds in enumerate(seeds_by_temp) for seed in seeds]
+    spins = np.empty((len(replicas), cfg.grid_size, cfg.grid_size), dtype=np.int8)
+    rngs = []
+    for r, (_, seed) in enumerate(replicas):
+        spins[r], rng = initial_spins(seed, cfg.grid_size)
+        rngs.append(rng)
+    kernel = CheckerboardIsing(
+        spins,
+        [temperatures[k] for k, _ in replicas],
+        rng_mode=rng_mode,
+        rngs=rngs if rng_mode == "per_replica" else None,
+        rng=np.random.default_rng(rng_seed) if rng_mode == "shared" else None,
+    )
+
+    rows: list[list[list[dict]]] = [[[] for _ in seeds] for seeds in seeds_by_temp]
+    trackers: list[dict[tuple[str, int], FrozenTracker]] = [{} for _ in replicas]
+    index_in_temp = [i for seeds in seeds_by_temp for i in range(len(seeds))]
+    for t in range(1, cfg.steps + 1):
+        kernel.sweep()
+        if not is_measured(t, cfg):
+            continue
+        snapshots = kernel.binary_snapshots()
+        for r, (k, seed) in enumerate(replicas):
+            measure_snapshot(seed, t, snapshots[r], cfg, trackers[r], rows[k][index_in_temp[r]])
+
+    # Seed-major within a temperature, as the per-temperature generator writes them.
+    return [[row for seed_rows in per_temp for row in seed_rows] for per_temp in rows]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Batched multi-temperature Ising long-dataset generation.")
+    ap.add_argument("--temperatures", nargs="+", default=["2.10", "2.269", "2.40"])
+    ap.add_argument("--seeds", type=int, default=3)
+    ap.add_argument("--seed_start", type=int, default=14000)
+    ap.add_argument("--seed_stride", type=int, default=100, help="Seed offset between consecutive temperatures")
+    ap.add_argument("--steps", type=int, default=2500)
+    ap.add_argument("--burn_in", type=int, default=400)
+    ap.add_argument("--measure_interval", type=int, default=20)
+    ap.add_argument("--window", type=int, default=30)
+    ap.add_argument("--grid_size", type=int, default=128)
+    ap.add_argument("--data_root", default="data/temp_sweep")
+    ap.add_argument("--rng", choices=RNG_MODES, default="per_replica")
+    ap.add_argument("--rng_seed", type=int, default=None, help="Seed of the shared Generator (default: seed_start)")
+    args = ap.parse_args()
+    check_grid_size(ap, args.grid_size)
+
+    temps = [float(v) for v in args.temperatures]
+    seeds_by_temp = [
+        [args.seed_start + k * args.seed_stride + i for i in range(args.seeds)] for k in range(len(temps))
+    ]
+    base = SimConfig(
+        steps=args.steps,
+        burn_in=args.burn_in,
+        measure_interval=args.measure_interval,
+        window=args.window,
+        grid_size=args.grid_size,
+    )
+    rng_seed = args.seed_start if args.rng_seed is None else args.rng_seed
+    rows_by_temp = run_sweep(temps, seeds_by_temp, base, rng_mode=args.rng, rng_seed=rng_seed)
+
+    for label, temp, seeds, rows in zip(args.temperatures, temps, seeds_by_temp, rows_by_temp):
+        data_dir = Path(args.data_root) / temperature_tag(label)
+        data_dir.mkdir(parents=True, exist_ok=True)
+        out_parquet = data_dir / "multiscale_long.parquet"
+        out_csv = data_dir / "multiscale_long.csv"
+        cfg = SimConfig(**{**base.__dict__, "temperature": temp})
+
+        n_rows, wrote_parquet, parquet_error = write_rows(rows, out_parquet, out_csv)
+        summary = run_summary(cfg, n_rows, args.seeds, seeds[0], out_parquet, out_csv)
+        if args.rng == "shared":
+            summary["rng"] = "shared"
+            summary["rng_seed"] = rng_seed
+        write_summary_and_manifest(
+            summary,
+            out_parquet,
+            out_csv,
+            data_dir / "run_summary.json",
+            data_dir / "MANIFEST.json",
+            wrote_parquet,
+            parquet_error,
+        )
+        print(f"T={label}: {n_rows} rows -> {data_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,8 +32,8 @@ foreach ($temp in $temps) {
 
   Invoke-Py "python scripts/generate_multiscale_long_dataset.py --seeds $seeds --seed_start $seedStart --steps $steps --burn_in $burnIn --measure_interval $measureInterval --window $window --grid_size $gridSize --temperature $temp --out_parquet $dataDir/multiscale_long.parquet --out_csv $dataDir/multiscale_long.csv --summary_json $dataDir/run_summary.json --manifest_json $dataDir/MANIFEST.json"
   Invoke-Py "python scripts/validate_schema.py --input $dataDir/multiscale_long.parquet --out $resDir/schema_validation.json"
-  Invoke-Py "python scripts/saturation_gate.py --input $dataDir/multiscale_long.parquet --out_csv $resDir/saturation_matrix.csv --out_json $resDir/saturation_summary.json"
-  Invoke-Py "python scripts/fit_scale_invariants.py --input $dataDir/multiscale_long.parquet --saturation_csv $resDir/saturation_matrix.csv --results_dir $resDir --bootstrap_resamples $bootstrap"
+  Invoke-Py "python scripts/saturation_gate.py --input $dataDir/multiscale_long.parquet --out_csv $resDir/saturation_matrix.csv --out_json $resDir/saturation_summary.json --wide_cache $dataDir/multiscale_long.wide.npz"
+  Invoke-Py "python scripts/fit_scale_invariants.py --input $dataDir/multiscale_long.parquet --saturation_csv $resDir/saturation_matrix.csv --results_dir $resDir --bootstrap_resamples $bootstrap --wide_cache $dataDir/multiscale_long.wide.npz"
   Invoke-Py "python scripts/render_invariant_matrix_md.py --input_csv $resDir/invariant_matrix.csv --output_md $resDir/invariant_matrix.md"
 }
 
@@ -2,11 +2,20 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+EXPERIMENTS = Path(__file__).resolve().parents[2]
+if str(EXPERIMENTS) not in sys.path:
+    sys.path.insert(0, str(EXPERIMENTS))
+
+from multiscale_common.wide_cache import WideCache
+
+REQUIRED_COLS = {"scheme", "estimator", "b", "value"}
+
 
 def load_table(path: Path) -> pd.DataFrame:
     if path.suffix.lower() == ".parquet":
@@ -14,8 +23,15 @@ def load_table(path: Path) -> pd.DataFrame:
     return pd.read_csv(path)
 
 
-def saturation_row(sub: pd.DataFrame, eps: float, ratio: float) -> dict:
-    values = sub["value"].astype(float).to_numpy()
+def load_checked(path: Path) -> pd.DataFrame:
+    df = load_table(path)
+    missing = sorted(REQUIRED_COLS - set(df.columns))
+    if missing:
+        raise ValueError(f"Missing columns in input: {missing}")
+    return df
+
+
+def saturation_row(values: np.ndarray, eps: float, ratio: float) -> dict:
     n = len(values)
     near0 = int(np.sum(values <= eps))
     near1 = int(np.sum(values >= (1.0 - eps)))
@@ -33,6 +49,31 @@ def saturation_row(sub: pd.DataFrame, eps: float, ratio: float) -> dict:
     }
 
 
+def rows_from_long(df: pd.DataFrame, eps: float, ratio: float) -> list[dict]:
+    rows = []
+    for (scheme, estimator, b), sub in df.groupby(["scheme", "estimator", "b"], dropna=False):
+        r = saturation_row(sub["value"].astype(float).to_numpy(), eps=eps, ratio=ratio)
+        r["scheme"] = str(scheme)
+        r["estimator"] = str(estimator)
+        r["b"] = int(b)
+        rows.append(r)
+    return rows
+
+
+def rows_from_cache(cache: WideCache, eps: float, ratio: float) -> list[dict]:
+    # Only valid when cache.exact_long: each scale column then holds exactly that group's values.
+    rows = []
+    for (scheme, estimator), table in sorted(cache.tables.items()):
+        for b in table.scales:
+            col = table.column(b)
+            r = saturation_row(col[~np.isnan(col)], eps=eps, ratio=ratio)
+            r["scheme"] = scheme
+            r["estimator"] = estimator
+            r["b"] = int(b)
+            rows.append(r)
+    return rows
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", required=True)
@@ -40,21 +81,23 @@ def main() -> None:
     ap.add_argument("--out_json", default="results/saturation_summary.json")
     ap.add_argument("--eps", type=float, default=0.10)
     ap.add_argument("--ratio", type=float, default=0.90)
+    ap.add_argument(
+        "--wide_cache",
+        default="",
+        help="Optional .npz pivot cache to build (or reuse) for fit_scale_invariants.py --wide_cache",
+    )
     args = ap.parse_args()
 
-    df = load_table(Path(args.input))
-    required_cols = {"scheme", "estimator", "b", "value"}
-    missing = sorted(required_cols - set(df.columns))
-    if missing:
-        raise ValueError(f"Missing columns in input: {missing}")
-
-    rows = []
-    for (scheme, estimator, b), sub in df.groupby(["scheme", "estimator", "b"], dropna=False):
-        r = saturation_row(sub, eps=args.eps, ratio=args.ratio)
-        r["scheme"] = str(scheme)
-        r["estimator"] = str(estimator)
-        r["b"] = int(b)
-        rows.append(r)
+    input_path = Path(args.input)
+    if args.wide_cache:
+        cache, df = WideCache.for_input(input_path, Path(args.wide_cache), load_checked)
+        if cache.exact_long:
+            rows = rows_from_cache(cache, eps=args.eps, ratio=args.ratio)
+        else:
+            # Duplicate cells or missing values: the wide means are not the raw groups.
+            rows = rows_from_long(df if df is not None else load_checked(input_path), eps=args.eps, ratio=args.ratio)
+    else:
+        rows = rows_from_long(load_checked(input_path), eps=args.eps, ratio=args.ratio)
 
     out_df = pd.DataFrame(rows).sort_values(by=["scheme", "estimator", "b"]).reset_index(drop=True)
     out_csv = Path(args.out_csv)
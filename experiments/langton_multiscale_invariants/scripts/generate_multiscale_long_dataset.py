@@ -5,13 +5,33 @@ import csv
 import hashlib
 import json
 import subprocess
+import sys
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+EXPERIMENTS = Path(__file__).resolve().parents[2]
+if str(EXPERIMENTS) not in sys.path:
+    sys.path.insert(0, str(EXPERIMENTS))
+
+from multiscale_common.block_entropy import block_entropy
+from multiscale_common.frozen_tracker import FrozenTracker
+from multiscale_common.langton_dense import DIRECTIONS, LangtonDense
+from multiscale_common.seed_parts import (
+    combine_csv,
+    combine_parquet,
+    iter_parts,
+    part_path,
+    run_parts,
+    write_part,
+)
+
+LONG_COLUMNS = ["seed", "t", "scheme", "b", "estimator", "value"]
+
 
 @dataclass
 class SimConfig:
@@ -24,50 +44,46 @@ class SimConfig:
     schemes: tuple[str, ...] = ("majority", "threshold_low", "threshold_high", "average")
 
 
-class LangtonAntSparse:
+class LangtonAntDense:
+    """Seeded ant on the unbounded plane, backed by the dense engine in multiscale_common."""
+
     # N,E,S,W
-    DIRECTIONS = np.array([[0, -1], [1, 0], [0, 1], [-1, 0]], dtype=int)
+    DIRECTIONS = DIRECTIONS
 
     def __init__(self, seed: int, init_radius: int = 8, init_black_prob: float = 0.03):
         self.rng = np.random.default_rng(seed)
-        self.pos = np.array([0, 0], dtype=int)
-        self.dir_idx = int(self.rng.integers(0, 4))
-        self.black_cells: set[tuple[int, int]] = set()
-        self.step_count = 0
+        dir_idx = int(self.rng.integers(0, 4))
 
         # Seed-specific initial perturbation to avoid identical deterministic traces.
+        black_cells = []
         for x in range(-init_radius, init_radius + 1):
             for y in range(-init_radius, init_radius + 1):
                 if self.rng.random() < init_black_prob:
-                    self.black_cells.add((x, y))
+                    black_cells.append((x, y))
+        self.engine = LangtonDense(pos=(0, 0), dir_idx=dir_idx, black_cells=black_cells, size=4 * init_radius + 4)
 
-    def step(self) -> None:
-        key = (int(self.pos[0]), int(self.pos[1]))
-        is_black = key in self.black_cells
+    @property
+    def pos(self) -> np.ndarray:
+        return self.engine.pos
+
+    @property
+    def dir_idx(self) -> int:
+        return self.engine.dir_idx
 
-        if not is_black:
-            # white -> turn right, paint black
-            self.dir_idx = (self.dir_idx + 1) % 4
-            self.black_cells.add(key)
-        else:
-            # black -> turn left, paint white
-            self.dir_idx = (self.dir_idx - 1) % 4
-            self.black_cells.discard(key)
+    @property
+    def step_count(self) -> int:
+        return self.engine.step_count
+
+    def step(self) -> None:
+        self.engine.step()
 
-        self.pos += self.DIRECTIONS[self.dir_idx]
-        self.step_count += 1
+    def run(self, n: int) -> None:
+        self.engine.run(n)
 
     def snapshot_window(self, view_size: int) -> np.ndarray:
         half = view_size // 2
         cx, cy = int(self.pos[0]), int(self.pos[1])
-        x_min, x_max = cx - half, cx + half
-        y_min, y_max = cy - half, cy + half
-
-        arr = np.zeros((view_size, view_size), dtype=np.int8)
-        for x, y in self.black_cells:
-            if x_min <= x < x_max and y_min <= y < y_max:
-                arr[x - x_min, y - y_min] = 1
-        return arr
+        return self.engine.window(cx - half, cy - half, view_size, view_size)
 
 
 def coarsen_grid(grid: np.ndarray, b: int, scheme: str) -> np.ndarray:
@@ -94,24 +110,7 @@ def coarsen_grid(grid: np.ndarray, b: int, scheme: str) -> np.ndarray:
 
 
 def entropy_2x2(grid: np.ndarray) -> float:
-    h, w = grid.shape
-    blocks: list[tuple[int, int, int, int]] = []
-    for i in range(0, h - 1, 2):
-        for j in range(0, w - 1, 2):
-            blocks.append(tuple(list(grid[i : i + 2, j : j + 2].flat)))  # type: ignore[arg-type]
-    if not blocks:
-        return 0.0
-    _, counts = np.unique(blocks, axis=0, return_counts=True)
-    p = counts.astype(float) / counts.sum()
-    return float(-(p * np.log2(p + 1e-15)).sum())
-
-
-def frozen_fraction(history: list[np.ndarray], window: int) -> float:
-    if len(history) < window:
-        return 0.0
-    rec = np.stack(history[-window:])
-    var_cell = np.var(rec, axis=0)
-    return float(np.mean(var_cell == 0.0))
+    return block_entropy(grid, 2)
 
 
 def sha256_file(path: Path) -> str:
@@ -135,27 +134,25 @@ def git_commit(repo_root: Path) -> str:
 
 
 def run_sim(seed: int, cfg: SimConfig) -> list[dict]:
-    ant = LangtonAntSparse(seed=seed)
+    ant = LangtonAntDense(seed=seed)
     rows: list[dict] = []
-    histories: dict[tuple[str, int], list[np.ndarray]] = {
-        (scheme, b): [] for scheme in cfg.schemes for b in cfg.scales
-    }
+    trackers: dict[tuple[str, int], FrozenTracker] = {}
 
-    for t in range(1, cfg.steps + 1):
-        ant.step()
-        if t < cfg.burn_in or (t % cfg.measure_interval != 0):
-            continue
+    # Steps between measurement points run as one batch.
+    first = max(cfg.measure_interval, -(-cfg.burn_in // cfg.measure_interval) * cfg.measure_interval)
+    for t in range(first, cfg.steps + 1, cfg.measure_interval):
+        ant.run(t - ant.step_count)
 
         base_grid = ant.snapshot_window(view_size=cfg.view_size)
         for scheme in cfg.schemes:
             for b in cfg.scales:
                 cg = coarsen_grid(base_grid, b=b, scheme=scheme)
                 key = (scheme, b)
-                histories[key].append(cg)
-                if len(histories[key]) > (cfg.window + 5):
-                    histories[key] = histories[key][-cfg.window - 5 :]
+                if key not in trackers:
+                    trackers[key] = FrozenTracker(cg.shape, cfg.window)
+                trackers[key].update(cg)
 
-                c_frozen = frozen_fraction(histories[key], cfg.window)
+                c_frozen = trackers[key].frozen_fraction()
                 c_activity = 1.0 - c_frozen
                 h_norm = float(np.clip(entropy_2x2(cg) / 4.0, 0.0, 1.0))
 
@@ -171,6 +168,24 @@ def run_sim(seed: int, cfg: SimConfig) -> list[dict]:
     return rows
 
 
+def long_frame(rows: list[dict]) -> pd.DataFrame:
+    """Rows -> the long table, with the column dtypes written on both the serial and --workers paths."""
+    df = pd.DataFrame(rows, columns=LONG_COLUMNS)
+    df["seed"] = df["seed"].astype(int)
+    df["t"] = df["t"].astype(int)
+    df["scheme"] = df["scheme"].astype(str)
+    df["b"] = df["b"].astype(int)
+    df["estimator"] = df["estimator"].astype(str)
+    df["value"] = df["value"].astype(float).clip(0.0, 1.0)
+    return df
+
+
+def seed_part(seed: int, cfg: SimConfig, part_dir: Path) -> dict:
+    # One seed -> one Parquet part, in the same schema as the serial path's output.
+    df = long_frame(run_sim(seed=seed, cfg=cfg))
+    return dict(write_part(df, part_path(part_dir, seed)), seed=int(seed))
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--seeds", type=int, default=6)
@@ -184,6 +199,13 @@ def main() -> None:
     ap.add_argument("--out_csv", default="data/multiscale_long.csv")
     ap.add_argument("--summary_json", default="data/run_summary.json")
     ap.add_argument("--manifest_json", default="data/MANIFEST.json")
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="0 = serial in-memory path; N >= 1 = one Parquet part per seed on N processes (needs pyarrow)",
+    )
+    ap.add_argument("--parts_dir", default=None, help="Part-file directory (default: <out_parquet stem>_parts)")
     args = ap.parse_args()
 
     cfg = SimConfig(
@@ -194,35 +216,41 @@ def main() -> None:
         view_size=args.view_size,
     )
 
-    rows: list[dict] = []
-    for i in range(args.seeds):
-        rows.extend(run_sim(seed=args.seed_start + i, cfg=cfg))
-
-    df = pd.DataFrame(rows)
-    df["seed"] = df["seed"].astype(int)
-    df["t"] = df["t"].astype(int)
-    df["scheme"] = df["scheme"].astype(str)
-    df["b"] = df["b"].astype(int)
-    df["estimator"] = df["estimator"].astype(str)
-    df["value"] = df["value"].astype(float).clip(0.0, 1.0)
-
     out_parquet = Path(args.out_parquet)
     out_csv = Path(args.out_csv)
     summary_json = Path(args.summary_json)
     manifest_json = Path(args.manifest_json)
     out_parquet.parent.mkdir(parents=True, exist_ok=True)
+    seeds = [args.seed_start + i for i in range(args.seeds)]
 
+    parts: list[dict] | None = None
     wrote_parquet = True
     parquet_error = None
-    try:
-        df.to_parquet(out_parquet, index=False)
-    except Exception as e:
-        wrote_parquet = False
-        parquet_error = str(e)
+    if args.workers > 0:
+        part_dir = Path(args.parts_dir) if args.parts_dir else out_parquet.with_name(f"{out_parquet.stem}_parts")
+        for stale in part_dir.glob("part-seed*.parquet"):
+            stale.unlink()
+        parts = run_parts(partial(seed_part, cfg=cfg, part_dir=part_dir), seeds, workers=args.workers)
+        n_rows = combine_csv(iter_parts(parts), out_csv, quoting=csv.QUOTE_MINIMAL)
+        combine_parquet(parts, out_parquet)
+    else:
+        rows: list[dict] = []
+        for seed in seeds:
+            rows.extend(run_sim(seed=seed, cfg=cfg))
+
+        df = long_frame(rows)
+        n_rows = int(len(df))
+
+        try:
+            df.to_parquet(out_parquet, index=False)
+        except Exception as e:
+            wrote_parquet = False
+            parquet_error = str(e)
+
+        df.to_csv(out_csv, index=False, quoting=csv.QUOTE_MINIMAL)
 
-    df.to_csv(out_csv, index=False, quoting=csv.QUOTE_MINIMAL)
     summary = {
-        "rows": int(len(df)),
+        "rows": n_rows,
         "seeds": args.seeds,
         "seed_start": args.seed_start,
         "steps": args.steps,
@@ -236,6 +264,10 @@ def main() -> None:
         "out_parquet": str(out_parquet.as_posix()),
         "out_csv": str(out_csv.as_posix()),
     }
+    if parts is not None:
+        summary["workers"] = args.workers
+        summary["parts_dir"] = str(part_dir.as_posix())
+        summary["parts"] = len(parts)
     summary_json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
 
     repo_root = Path(__file__).resolve().parents[3]
@@ -250,15 +282,20 @@ def main() -> None:
         ],
         "parquet_written": wrote_parquet,
         "parquet_error": parquet_error,
-        "rows_long": int(len(df)),
+        "rows_long": n_rows,
     }
     if wrote_parquet and out_parquet.exists():
         manifest["artifacts"].append(
             {"path": str(out_parquet), "sha256": sha256_file(out_parquet), "kind": "derived_long_parquet"}
         )
+    if parts is not None:
+        for part in parts:
+            manifest["artifacts"].append(
+                {"path": part["path"], "sha256": part["sha256"], "kind": "seed_part_parquet", "rows": part["rows"]}
+            )
     manifest_json.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
 
-    print(f"Wrote rows: {len(df)}")
+    print(f"Wrote rows: {n_rows}")
     print(f"CSV: {out_csv}")
     print(f"PARQUET: {out_parquet if wrote_parquet else 'SKIPPED'}")
     print(f"summary: {summary_json}")
@@ -14,8 +14,8 @@ function Invoke-Py([string]$cmd) {
 
 Invoke-Py "python scripts/generate_multiscale_long_dataset.py --seeds 6 --seed_start 7000 --steps 12000 --burn_in 800 --measure_interval 20 --window 40 --view_size 128"
 Invoke-Py "python scripts/validate_schema.py --input data/multiscale_long.parquet --out results/schema_validation.json"
-Invoke-Py "python scripts/saturation_gate.py --input data/multiscale_long.parquet --out_csv results/saturation_matrix.csv --out_json results/saturation_summary.json"
-Invoke-Py "python scripts/fit_scale_invariants.py --input data/multiscale_long.parquet --saturation_csv results/saturation_matrix.csv --results_dir results --bootstrap_resamples 200"
+Invoke-Py "python scripts/saturation_gate.py --input data/multiscale_long.parquet --out_csv results/saturation_matrix.csv --out_json results/saturation_summary.json --wide_cache data/multiscale_long.wide.npz"
+Invoke-Py "python scripts/fit_scale_invariants.py --input data/multiscale_long.parquet --saturation_csv results/saturation_matrix.csv --results_dir results --bootstrap_resamples 200 --wide_cache data/multiscale_long.wide.npz"
 Invoke-Py "python scripts/render_invariant_matrix_md.py --input_csv results/invariant_matrix.csv --output_md results/invariant_matrix.md"
 Invoke-Py "python scripts/plot_path4_figures.py --input data/multiscale_long.parquet --fixed_points_json results/fixed_points.json --saturation_csv results/saturation_matrix.csv --invariant_csv results/invariant_matrix.csv --out_dir results/figures"
 
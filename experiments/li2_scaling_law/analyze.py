@@ -42,8 +42,20 @@ def aggregate_by_config(results):
     return aggregated
 
 
-def compute_grok_probability(results_list):
-    """Compute grokking probability from list of results"""
+def is_aborted(result):
+    """Run stopped early by train.py's preregistered memorization-abort rule"""
+    return result.get('stop_reason') == 'abort_memorization'
+
+
+def compute_grok_probability(results_list, aborted_as='no_grok'):
+    """
+    Compute grokking probability from list of results
+    
+    Aborted runs never grokked before their abort epoch (right-censored there). aborted_as='no_grok'
+    counts them as no-grok, as the preregistered rule asserts; 'exclude' drops them from the cell.
+    """
+    if aborted_as == 'exclude':
+        results_list = [r for r in results_list if not is_aborted(r)]
     n_grok = sum(1 for r in results_list if r['grok_happened'])
     return n_grok / len(results_list) if results_list else 0
 
@@ -54,7 +66,7 @@ def compute_mean_grok_epoch(results_list):
     return np.mean(grok_epochs) if grok_epochs else np.nan
 
 
-def build_phase_matrix(aggregated):
+def build_phase_matrix(aggregated, aborted_as='no_grok'):
     """
     Build phase diagram matrix
     
@@ -74,7 +86,7 @@ def build_phase_matrix(aggregated):
         for j, ratio in enumerate(ratios):
             key = (M, ratio)
             if key in aggregated:
-                grok_probs[i, j] = compute_grok_probability(aggregated[key])
+                grok_probs[i, j] = compute_grok_probability(aggregated[key], aborted_as)
                 grok_epochs[i, j] = compute_mean_grok_epoch(aggregated[key])
     
     return M_values, ratios, grok_probs, grok_epochs
@@ -296,7 +308,16 @@ def plot_scaling_law_n(M_values, critical_ratios, fit_result, output_path=None,
     plt.close()
 
 
-def generate_report(M_values, ratios, grok_probs, critical_ratios, fit_result, output_path):
+def stop_reason_counts(results):
+    """Runs per stop_reason ('unrecorded' for results written before it was logged)"""
+    counts = defaultdict(int)
+    for r in results:
+        counts[r.get('stop_reason') or 'unrecorded'] += 1
+    return dict(sorted(counts.items()))
+
+
+def generate_report(M_values, ratios, grok_probs, critical_ratios, fit_result, output_path,
+                    stop_counts=None, aborted_as='no_grok'):
     """Generate analysis report"""
     report = []
     report.append("# Li² Scaling Law Verification Report")
@@ -304,6 +325,11 @@ def generate_report(M_values, ratios, grok_probs, critical_ratios, fit_result, o
     report.append("\n## Summary")
     report.append(f"- M values tested: {M_values}")
     report.append(f"- Ratio range: {min(ratios):.2f} to {max(ratios):.2f}")
+    if stop_counts:
+        report.append(f"- Runs by stop reason: {stop_counts}")
+        if stop_counts.get('abort_memorization'):
+            how = "counted as no-grok" if aborted_as == 'no_grok' else "excluded from grok probabilities"
+            report.append(f"- Memorization-aborted runs (censored at their abort epoch): {how}")
     
     report.append("\n## Critical Ratios (50% Grokking Probability)")
     report.append("| M | Critical Ratio | Critical n (≈ ratio·M²) | M·log(M) | c_implied (= n / (M log M)) |")
@@ -349,6 +375,8 @@ def main():
                         help='Directory for analysis outputs')
     parser.add_argument('--show', action='store_true',
                         help='Show plots (default: save only; useful on headful setups)')
+    parser.add_argument('--aborted_as', choices=['no_grok', 'exclude'], default='no_grok',
+                        help='How memorization-aborted runs enter grok probabilities')
     
     args = parser.parse_args()
     
@@ -361,7 +389,9 @@ def main():
     aggregated = aggregate_by_config(results)
     
     # Build phase matrix
-    M_values, ratios, grok_probs, grok_epochs = build_phase_matrix(aggregated)
+    M_values, ratios, grok_probs, grok_epochs = build_phase_matrix(aggregated, args.aborted_as)
+    stop_counts = stop_reason_counts(results)
+    print(f"Runs by stop reason: {stop_counts}")
     
     print(f"\nM values: {M_values}")
     print(f"Ratios: {ratios}")
@@ -395,7 +425,7 @@ def main():
     
     # Generate report
     generate_report(M_values, ratios, grok_probs, critical_ratios, fit_result,
-                    output_dir / 'report.md')
+                    output_dir / 'report.md', stop_counts, args.aborted_as)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,83 @@
+"""
+Training throughput: DataLoader + per-item one-hot rows vs tensor-resident index batches
+
+Both paths start from the same weights and see the same batch order; the index path's first
+layer is an embedding lookup, so weights agree up to float summation order in the backward pass.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import torch
+import torch.nn as nn
+import torch.optim as optim
+
+sys.path.append(str(Path(__file__).parent))
+
+from data.generate_data import generate_modular_addition_data, get_dataloader, get_tensor_batches
+from models.grok_net import create_model
+
+
+def run(loader, model, epochs):
+    optimizer = optim.AdamW(model.parameters(), lr=1e-3, weight_decay=2e-4)
+    criterion = nn.CrossEntropyLoss()
+    steps = 0
+    t0 = time.perf_counter()
+    for _ in range(epochs):
+        model.train()
+        for x, y in loader:
+            optimizer.zero_grad()
+            loss = criterion(model(x), y)
+            loss.backward()
+            optimizer.step()
+            steps += 1
+    return steps, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Li2 train-step throughput by input path')
+    parser.add_argument('--M', type=int, default=71)
+    parser.add_argument('--ratio', type=float, default=0.4)
+    parser.add_argument('--hidden_dim', type=int, default=2048)
+    parser.add_argument('--batch_size', type=int, default=512)
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    data = generate_modular_addition_data(args.M, args.ratio, seed=args.seed)
+    torch.manual_seed(args.seed)
+    init = create_model(args.M, args.hidden_dim).state_dict()
+
+    results = {}
+    weights = {}
+    for name in ['dataloader_onehot', 'tensor_onehot', 'tensor_index']:
+        model = create_model(args.M, args.hidden_dim)
+        model.load_state_dict(init)
+        torch.manual_seed(args.seed)
+        if name == 'dataloader_onehot':
+            loader = get_dataloader(data['train'], args.batch_size, shuffle=True)
+        else:
+            loader = get_tensor_batches(data['train'], args.batch_size, shuffle=True,
+                                        encoding=name.split('_')[1])
+        steps, elapsed = run(loader, model, args.epochs)
+        results[f'{name}_steps_per_sec'] = round(steps / elapsed, 2)
+        weights[name] = torch.cat([p.detach().reshape(-1) for p in model.parameters()])
+
+    base = weights['dataloader_onehot']
+    print(json.dumps({
+        'M': args.M,
+        'train_size': data['train_size'],
+        'hidden_dim': args.hidden_dim,
+        'epochs': args.epochs,
+        **results,
+        'speedup_tensor_index': round(results['tensor_index_steps_per_sec'] / results['dataloader_onehot_steps_per_sec'], 2),
+        'tensor_onehot_identical': bool(torch.equal(weights['tensor_onehot'], base)),
+        'tensor_index_max_abs_diff': float((weights['tensor_index'] - base).abs().max()),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
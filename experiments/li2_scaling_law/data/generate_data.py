@@ -33,6 +33,66 @@ class ModularAdditionDataset(Dataset):
         
         return x, label
 
+    def tensors(self, encoding='index'):
+        """
+        Whole split as tensors: (x, y)
+
+        encoding='index': x is [N, 2] long (a, b) pairs for the models' index path
+        encoding='onehot': x is [N, 2*M] float, the same rows __getitem__ builds
+        """
+        pairs = torch.as_tensor(np.asarray(self.pairs, dtype=np.int64).reshape(-1, 2))
+        y = torch.as_tensor(np.asarray(self.labels, dtype=np.int64))
+        if encoding == 'index':
+            return pairs, y
+        if encoding == 'onehot':
+            rows = torch.arange(len(pairs))
+            x = torch.zeros(len(pairs), 2 * self.M)
+            x[rows, pairs[:, 0]] = 1.0
+            x[rows, self.M + pairs[:, 1]] = 1.0
+            return x, y
+        raise ValueError(f"Unknown encoding: {encoding}")
+
+
+class TensorBatches:
+    """
+    Tensor-resident stand-in for get_dataloader(): the split is materialized once (on `device`)
+    and batches are slices of one permutation per epoch.
+
+    Iteration draws from the global torch RNG exactly like a single-process DataLoader (one draw
+    per iter(), one more to seed each shuffled epoch's randperm), so batch order and later random
+    draws match the DataLoader path.
+    """
+
+    def __init__(self, dataset, batch_size, shuffle=True, device='cpu', encoding='index'):
+        self.device = torch.device(device)
+        x, y = dataset.tensors(encoding)
+        self.x = x.to(self.device)
+        self.y = y.to(self.device)
+        self.n = len(self.y)
+        self.batch_size = int(batch_size)
+        self.shuffle = bool(shuffle)
+
+    def __len__(self):
+        return (self.n + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self):
+        # DataLoader draws its worker base seed when the iterator is created.
+        torch.empty((), dtype=torch.int64).random_()
+        return self._batches()
+
+    def _batches(self):
+        if self.shuffle:
+            seed = int(torch.empty((), dtype=torch.int64).random_().item())
+            generator = torch.Generator()
+            generator.manual_seed(seed)
+            perm = torch.randperm(self.n, generator=generator).to(self.device)
+            for start in range(0, self.n, self.batch_size):
+                idx = perm[start:start + self.batch_size]
+                yield self.x[idx], self.y[idx]
+        else:
+            for start in range(0, self.n, self.batch_size):
+                yield self.x[start:start + self.batch_size], self.y[start:start + self.batch_size]
+
 
 def generate_modular_addition_data(M, train_ratio, seed=42):
     """
@@ -114,6 +174,11 @@ def get_dataloader(dataset, batch_size, shuffle=True):
     return DataLoader(dataset, batch_size=batch_size, shuffle=shuffle)
 
 
+def get_tensor_batches(dataset, batch_size, shuffle=True, device='cpu', encoding='index'):
+    """Create TensorBatches from dataset (no per-item one-hot tensors)"""
+    return TensorBatches(dataset, batch_size, shuffle=shuffle, device=device, encoding=encoding)
+
+
 if __name__ == "__main__":
     # Test data generation
     M = 71
@@ -5,12 +5,13 @@ Tests M ∈ {15, 18, 20, 23, 25, 28, 30, 32, 35, 38, 40, 45, 50}
 For each M, uses 3 ratios around estimated r_crit to capture the transition precisely.
 """
 
+import argparse
 import json
-import subprocess
 from pathlib import Path
 from collections import defaultdict
 import numpy as np
-import sys
+
+from scheduler import Job, add_scheduler_args, run_jobs, train_flags
 
 # Configuration
 CONFIG_BASE = {
@@ -25,10 +26,10 @@ CONFIG_BASE = {
 # M values to test (denser sweep)
 M_VALUES = [15, 18, 20, 23, 25, 28, 30, 32, 35, 38, 40, 45, 50]
 SEEDS = [42]  # Single seed per config to save time (fewer total runs)
+DELTAS = [-0.04, -0.02, 0.0, 0.02, 0.04]  # Ratio offsets around r_crit_est
 
 # Result directory
 RESULTS_DIR = Path("results/dense_m_sweep")
-RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
 def estimate_critical_ratio(M):
     """
@@ -54,59 +55,63 @@ def estimate_critical_ratio(M):
     
     return r_crit
 
-def design_ratios_for_M(M):
+def design_ratios_for_M(M, deltas=DELTAS):
     """
-    Design 5 ratio points around r_crit to capture transition precisely.
+    Design ratio points around r_crit to capture transition precisely.
     
-    Pattern:
+    Pattern (default deltas):
       [r_crit - 0.04, r_crit - 0.02, r_crit, r_crit + 0.02, r_crit + 0.04]
     """
     r_crit = estimate_critical_ratio(M)
-    ratios = [
-        r_crit - 0.04,
-        r_crit - 0.02,
-        r_crit,
-        r_crit + 0.02,
-        r_crit + 0.04,
-    ]
+    ratios = [r_crit + d for d in deltas]
     # Clamp to valid range [0.1, 1.0]
     ratios = [max(0.1, min(1.0, r)) for r in ratios]
     return sorted(list(set(ratios)))  # Remove duplicates and sort
 
-def run_experiment(M, ratio, seed):
-    """Run a single training experiment."""
-    # Build command with direct arguments
-    cmd = [
-        sys.executable, "train.py",
-        "--M", str(M),
-        "--ratio", str(ratio),
-        "--seed", str(seed),
-        "--hidden_dim", str(CONFIG_BASE["hidden_dim"]),
-        "--activation", CONFIG_BASE["activation"],
-        "--lr", str(CONFIG_BASE["lr"]),
-        "--weight_decay", str(CONFIG_BASE["weight_decay"]),
-        "--epochs", str(CONFIG_BASE["epochs"]),
-        "--output_dir", str(RESULTS_DIR),
-    ]
-    
-    result = subprocess.run(cmd, capture_output=False)
-    return result.returncode == 0
+def _parse_list(text, cast):
+    return [cast(x.strip()) for x in text.split(",") if x.strip()]
+
+def experiment_job(M, ratio, seed):
+    """Scheduler job for a single training experiment."""
+    return Job(
+        M=M,
+        ratio=ratio,
+        seed=seed,
+        train_args=train_flags(
+            hidden_dim=CONFIG_BASE["hidden_dim"],
+            activation=CONFIG_BASE["activation"],
+            lr=CONFIG_BASE["lr"],
+            weight_decay=CONFIG_BASE["weight_decay"],
+            epochs=CONFIG_BASE["epochs"],
+        ),
+    )
 
 def main():
+    parser = argparse.ArgumentParser(description="Dense M-sweep around the estimated r_crit")
+    parser.add_argument("--Ms", type=str, default=",".join(str(M) for M in M_VALUES), help="Comma-separated M values")
+    parser.add_argument("--deltas", type=str, default=",".join(str(d) for d in DELTAS),
+                        help="Comma-separated ratio offsets around r_crit_est")
+    parser.add_argument("--output_dir", type=Path, default=RESULTS_DIR)
+    parser.add_argument("--dry_run", action="store_true", help="Print the pending runs without training")
+    add_scheduler_args(parser)
+    args = parser.parse_args()
+    m_values = _parse_list(args.Ms, int)
+    deltas = _parse_list(args.deltas, float)
+
     print("=" * 70)
     print("Dense M-Sweep: Locating β Phase Transition")
     print("=" * 70)
-    print(f"\nM values to test: {M_VALUES}")
+    print(f"\nM values to test: {m_values}")
     print(f"Seeds per config: {len(SEEDS)}")
-    print(f"Total experiments: ~{len(M_VALUES) * 5 * len(SEEDS)}")
+    print(f"Total experiments: ~{len(m_values) * len(deltas) * len(SEEDS)}")
     print()
     
     # Plan experiment
     experiment_plan = {}
     total_exps = 0
     
-    for M in M_VALUES:
-        ratios = design_ratios_for_M(M)
+    for M in m_values:
+        ratios = design_ratios_for_M(M, deltas)
         experiment_plan[M] = ratios
         total_exps += len(ratios) * len(SEEDS)
         
@@ -122,21 +127,19 @@ def main():
     print("Running Dense M-Sweep")
     print("=" * 70)
     
-    exp_count = 0
-    for M in M_VALUES:
-        for ratio in experiment_plan[M]:
-            for seed in SEEDS:
-                exp_count += 1
-                print(f"\n[{exp_count}/{total_exps}] M={M}, ratio={ratio:.3f}, seed={seed}")
-                
-                success = run_experiment(M, ratio, seed)
-                if not success:
-                    print(f"  ⚠️  Experiment failed (continuing)")
+    jobs = [experiment_job(M, ratio, seed)
+            for M in m_values for ratio in experiment_plan[M] for seed in SEEDS]
+    failed = run_jobs(jobs, args.output_dir, workers=args.workers,
+                      threads_per_worker=args.threads_per_worker, dry_run=args.dry_run)
+    for job in failed:
+        print(f"  ⚠️  Experiment failed: {job.label()}")
+    if args.dry_run:
+        return
     
     print("\n" + "=" * 70)
     print("✅ Dense M-Sweep Complete")
     print("=" * 70)
-    print(f"\nResults directory: {RESULTS_DIR}")
+    print(f"\nResults directory: {args.output_dir}")
     print(f"Next step: Run analyze_beta_transition.py to analyze β evolution")
 
 if __name__ == "__main__":
@@ -23,13 +23,13 @@ from __future__ import annotations
 
 import argparse
 import json
-import subprocess
-import sys
 from collections import defaultdict
 from pathlib import Path
 
 import numpy as np
 
+from scheduler import Job, add_scheduler_args, run_jobs, train_flags
+
 
 def _parse_filename(stem: str) -> tuple[int, float, int] | None:
     parts = stem.split("_")
@@ -78,36 +78,6 @@ def _estimate_rcrit_50(ratios: list[float], probs: list[float]) -> float | None:
     return None
 
 
-def _format_ratio(r: float) -> str:
-    # Keep filenames stable with 3 decimals (matches existing band_sweep naming).
-    return f"{r:.3f}"
-
-
-def _result_path(output_dir: Path, M: int, ratio: float, seed: int) -> Path:
-    return output_dir / f"M{M}_ratio{_format_ratio(ratio)}_seed{seed}.json"
-
-
-def _run_one(M: int, ratio: float, seed: int, output_dir: Path, epochs: int, weight_decay: float) -> bool:
-    cmd = [
-        sys.executable,
-        "train.py",
-        "--M",
-        str(M),
-        "--ratio",
-        str(float(_format_ratio(ratio))),
-        "--seed",
-        str(seed),
-        "--epochs",
-        str(epochs),
-        "--weight_decay",
-        str(weight_decay),
-        "--output_dir",
-        str(output_dir),
-    ]
-    result = subprocess.run(cmd, capture_output=False)
-    return result.returncode == 0
-
-
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--baseline_results_dir", type=Path, default=Path("results/band_sweep"))
@@ -120,6 +90,7 @@ def main():
     parser.add_argument("--max_ratio", type=float, default=0.70)
     parser.add_argument("--dry_run", action="store_true")
     parser.add_argument("--run", action="store_true")
+    add_scheduler_args(parser)
     args = parser.parse_args()
 
     Ms = [int(x.strip()) for x in args.Ms.split(",") if x.strip()]
@@ -163,45 +134,22 @@ def main():
     for M in sorted(rcrit_map.keys()):
         print(f"  - M={M}: r_crit~{rcrit_map[M]:.4f}")
 
-    total = len(planned) * len(seeds)
-    skipped = 0
-    todo: list[tuple[int, float, int]] = []
-    for M, ratio in planned:
-        for seed in seeds:
-            out_path = _result_path(args.output_dir, M, ratio, seed)
-            if out_path.exists():
-                skipped += 1
-                continue
-            todo.append((M, ratio, seed))
+    flags = train_flags(epochs=args.epochs, weight_decay=args.weight_decay)
+    jobs = [Job(M=M, ratio=ratio, seed=seed, train_args=flags) for M, ratio in planned for seed in seeds]
 
     print(f"- planned configs (unique M,ratio): {len(planned)}")
-    print(f"- total runs (with seeds): {total}")
-    print(f"- already present: {skipped}")
-    print(f"- pending: {len(todo)}")
-
-    if args.dry_run or not args.run:
-        print("\n(dry run) First 10 pending runs:")
-        for item in todo[:10]:
-            M, ratio, seed = item
-            print(f"  M={M} ratio={ratio:.3f} seed={seed}")
-        if len(todo) > 10:
-            print(f"  ... and {len(todo) - 10} more")
+    print(f"- total runs (with seeds): {len(jobs)}")
+
+    dry_run = args.dry_run or not args.run
+    failed = run_jobs(jobs, args.output_dir, workers=args.workers,
+                      threads_per_worker=args.threads_per_worker, dry_run=dry_run)
+    if dry_run:
         print("\nTo run: add --run (and optionally omit --dry_run).")
         return
 
-    # Run
-    done = 0
-    failed: list[tuple[int, float, int]] = []
-    for (M, ratio, seed) in todo:
-        done += 1
-        print(f"\n[{done}/{len(todo)}] M={M} ratio={ratio:.3f} seed={seed}")
-        ok = _run_one(M, ratio, seed, args.output_dir, epochs=args.epochs, weight_decay=args.weight_decay)
-        if not ok:
-            failed.append((M, ratio, seed))
-
     print("\nDone.")
     if failed:
-        print(f"Failed: {failed}")
+        print(f"Failed: {[(j.M, j.ratio, j.seed) for j in failed]}")
     else:
         print("All runs completed successfully.")
 
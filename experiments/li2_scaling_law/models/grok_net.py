@@ -8,6 +8,20 @@ import torch.nn as nn
 import torch.nn.functional as F
 
 
+def input_projection(layer, x, M):
+    """
+    First (bias-free) layer applied to either input encoding
+
+    x: [batch, 2*M] one-hot rows -> layer(x)
+    x: [batch, 2] integer (a, b) pairs -> W[:, a] + W[:, M + b], the same sum the one-hot
+       matmul forms, as an embedding lookup (no [batch, 2*M] input, no dense matmul)
+    """
+    if x.dtype.is_floating_point:
+        return layer(x)
+    w = layer.weight.t()  # [2*M, hidden]
+    return w[x[:, 0]] + w[x[:, 1] + M]
+
+
 class TwoLayerGrokNet(nn.Module):
     """
     2-layer network for grokking experiments
@@ -59,13 +73,13 @@ class TwoLayerGrokNet(nn.Module):
         Forward pass
         
         Args:
-            x: [batch_size, 2*M] one-hot encoded inputs
+            x: [batch_size, 2*M] one-hot encoded inputs, or [batch_size, 2] (a, b) indices
             
         Returns:
             logits: [batch_size, M]
         """
         # Hidden layer
-        h = self.embed(x)  # [batch, hidden_dim]
+        h = input_projection(self.embed, x, self.M)  # [batch, hidden_dim]
         
         # Activation
         if self.activation_name == 'quadratic':
@@ -86,7 +100,7 @@ class TwoLayerGrokNet(nn.Module):
     
     def get_hidden_activations(self, x):
         """Get hidden layer activations for analysis"""
-        h = self.embed(x)
+        h = input_projection(self.embed, x, self.M)
         if self.activation_name == 'quadratic':
             h = h ** 2
         elif self.activation_name == 'relu':
@@ -134,7 +148,7 @@ class ThreeLayerGrokNet(nn.Module):
             return F.silu(h)
         
     def forward(self, x):
-        h = self.layer1(x)
+        h = input_projection(self.layer1, x, self.M)
         h = self._activate(h)
         h = self.layer2(h)
         h = self._activate(h)
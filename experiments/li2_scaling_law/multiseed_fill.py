@@ -17,20 +17,15 @@ Example:
 from __future__ import annotations
 
 import argparse
-import subprocess
-import sys
-from dataclasses import dataclass
 from pathlib import Path
 
+from scheduler import Job, add_scheduler_args, run_jobs, train_flags
+
 
 def _format_ratio(r: float) -> str:
     return f"{r:.3f}"
 
 
-def _result_path(output_dir: Path, M: int, ratio: float, seed: int) -> Path:
-    return output_dir / f"M{M}_ratio{_format_ratio(ratio)}_seed{seed}.json"
-
-
 def _parse_spec(spec: str) -> dict[int, list[float]]:
     out: dict[int, list[float]] = {}
     parts = [p.strip() for p in spec.split(";") if p.strip()]
@@ -50,40 +45,6 @@ def _parse_spec(spec: str) -> dict[int, list[float]]:
     return out
 
 
-@dataclass(frozen=True)
-class RunCfg:
-    M: int
-    ratio: float
-    seed: int
-
-
-def _run_one(cfg: RunCfg, output_dir: Path, hidden_dim: int, activation: str, lr: float, weight_decay: float, epochs: int) -> bool:
-    cmd = [
-        sys.executable,
-        "train.py",
-        "--M",
-        str(cfg.M),
-        "--ratio",
-        str(float(_format_ratio(cfg.ratio))),
-        "--seed",
-        str(cfg.seed),
-        "--hidden_dim",
-        str(hidden_dim),
-        "--activation",
-        str(activation),
-        "--lr",
-        str(lr),
-        "--weight_decay",
-        str(weight_decay),
-        "--epochs",
-        str(epochs),
-        "--output_dir",
-        str(output_dir),
-    ]
-    r = subprocess.run(cmd, capture_output=False)
-    return r.returncode == 0
-
-
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--spec", type=str, required=True, help='Example: "30:0.515,0.535;45:0.461,0.501"')
@@ -94,6 +55,7 @@ def main() -> int:
     parser.add_argument("--lr", type=float, default=0.001)
     parser.add_argument("--weight_decay", type=float, default=0.001)
     parser.add_argument("--epochs", type=int, default=25000)
+    add_scheduler_args(parser)
     args = parser.parse_args()
 
     plan = _parse_spec(args.spec)
@@ -103,16 +65,15 @@ def main() -> int:
 
     args.output_dir.mkdir(parents=True, exist_ok=True)
 
-    todo: list[RunCfg] = []
-    skipped = 0
-    for M in sorted(plan.keys()):
-        for ratio in plan[M]:
-            for seed in seeds:
-                out_path = _result_path(args.output_dir, M, ratio, seed)
-                if out_path.exists():
-                    skipped += 1
-                    continue
-                todo.append(RunCfg(M=M, ratio=ratio, seed=seed))
+    flags = train_flags(
+        hidden_dim=args.hidden_dim,
+        activation=args.activation,
+        lr=args.lr,
+        weight_decay=args.weight_decay,
+        epochs=args.epochs,
+    )
+    jobs = [Job(M=M, ratio=ratio, seed=seed, train_args=flags)
+            for M in sorted(plan.keys()) for ratio in plan[M] for seed in seeds]
 
     total = sum(len(plan[M]) for M in plan) * len(seeds)
     print("Multi-seed fill plan")
@@ -122,23 +83,8 @@ def main() -> int:
     for M in sorted(plan.keys()):
         print(f"  - M={M}: ratios={[_format_ratio(r) for r in plan[M]]}")
     print(f"- total runs: {total}")
-    print(f"- skipped (already present): {skipped}")
-    print(f"- pending: {len(todo)}")
-
-    failed: list[RunCfg] = []
-    for idx, cfg in enumerate(todo, start=1):
-        print(f"\n[{idx}/{len(todo)}] M={cfg.M} ratio={cfg.ratio:.3f} seed={cfg.seed}")
-        ok = _run_one(
-            cfg,
-            output_dir=args.output_dir,
-            hidden_dim=args.hidden_dim,
-            activation=args.activation,
-            lr=args.lr,
-            weight_decay=args.weight_decay,
-            epochs=args.epochs,
-        )
-        if not ok:
-            failed.append(cfg)
+
+    failed = run_jobs(jobs, args.output_dir, workers=args.workers, threads_per_worker=args.threads_per_worker)
 
     print("\nDone.")
     if failed:
@@ -0,0 +1,314 @@
+"""
+Population training: several train.py runs with the same M and architecture, stacked into one
+batched model
+
+Each replica (its own train_ratio and seed) keeps what its solo `train.py` process would do:
+the same split, the same initial weights (drawn from a fresh default torch RNG, as in a new
+process), the same batch order and the same evaluation schedule, early stop and results JSON.
+Replica parameters are stacked along a leading axis (`torch.func.stack_module_state`), one
+`vmap(functional_call(...))` computes every replica's loss, and one AdamW steps the stacked
+tensors; AdamW is elementwise, so this is one independent optimizer per replica.
+
+Replicas with different train sizes have different numbers of batches per epoch. Every global
+step takes one batch from each replica; short batches are zero-padded to batch_size and masked
+out of that replica's mean loss. Results match solo runs up to float summation order in the
+batched kernels. Finished replicas are saved and dropped from the stack.
+"""
+
+import argparse
+import copy
+import json
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+import torch.optim as optim
+from torch.func import functional_call, stack_module_state, vmap
+from tqdm import tqdm
+
+sys.path.append(str(Path(__file__).parent))
+
+from data.generate_data import generate_modular_addition_data, get_tensor_batches
+from models.grok_net import create_model
+from train import RunMonitor, save_results
+
+
+# Keys that must agree across replicas (they define the stacked model and optimizer).
+SHARED_KEYS = ('M', 'hidden_dim', 'n_layers', 'activation', 'zero_init_output',
+               'lr', 'weight_decay', 'batch_size', 'input_encoding')
+
+
+class ReplicaRng:
+    """Per-replica global CPU RNG state, starting where a fresh train.py process starts"""
+
+    def __init__(self, n):
+        self.states = [torch.Generator().get_state() for _ in range(n)]
+
+    @contextmanager
+    def use(self, k):
+        outer = torch.get_rng_state()
+        torch.set_rng_state(self.states[k])
+        try:
+            yield
+        finally:
+            self.states[k] = torch.get_rng_state()
+            torch.set_rng_state(outer)
+
+
+class Replica:
+    """Bookkeeping for one solo run inside the population"""
+
+    def __init__(self, config, data, train_loader, test_loader, model, monitor):
+        self.config = config
+        self.data = data
+        self.train_loader = train_loader
+        self.test_loader = test_loader
+        self.model = model
+        self.monitor = monitor
+        self.epoch = 0
+        self.batch_idx = 0
+        self.batches = None
+        self.loss_sum = 0.0
+
+    def results(self):
+        return self.monitor.results(self.epoch)
+
+
+def _padded(x, y, batch_size):
+    """Zero-pad a (possibly short) batch to batch_size rows, plus its row mask"""
+    n = len(y)
+    mask = torch.zeros(batch_size, device=y.device)
+    mask[:n] = 1.0
+    if n == batch_size:
+        return x, y, mask
+    x_pad = torch.zeros((batch_size,) + tuple(x.shape[1:]), dtype=x.dtype, device=x.device)
+    y_pad = torch.zeros(batch_size, dtype=y.dtype, device=y.device)
+    x_pad[:n] = x
+    y_pad[:n] = y
+    return x_pad, y_pad, mask
+
+
+def _load_replica(model, params, buffers, i):
+    """Copy row i of the stacked parameters into a plain model (for evaluation and grad stats)"""
+    with torch.no_grad():
+        for name, p in model.named_parameters():
+            p.copy_(params[name][i])
+        for name, b in model.named_buffers():
+            b.copy_(buffers[name][i])
+
+
+def _select_replicas(params, buffers, optimizer, keep):
+    """Stacks and AdamW state restricted to the replica rows in `keep`"""
+    idx = torch.tensor(keep, device=next(iter(params.values())).device)
+    new_params = {n: p.detach().index_select(0, idx).clone().requires_grad_() for n, p in params.items()}
+    new_buffers = {n: b.index_select(0, idx).clone() for n, b in buffers.items()}
+    sd = optimizer.state_dict()
+    state = {
+        i: {key: (v.index_select(0, idx.to(v.device)) if torch.is_tensor(v) and v.ndim > 0 else v)
+            for key, v in st.items()}
+        for i, st in sd['state'].items()
+    }
+    new_optimizer = optim.AdamW(list(new_params.values()))
+    new_optimizer.load_state_dict({'state': state, 'param_groups': sd['param_groups']})
+    return new_params, new_buffers, new_optimizer
+
+
+def train_population(configs, output_dir):
+    """
+    Train solo-equivalent replicas of train.train() together and save each one's results
+
+    Args:
+        configs: list of train.py config dicts; SHARED_KEYS must agree
+        output_dir: directory for the per-replica results JSON files
+
+    Returns:
+        list of results dicts, in the order of `configs`
+    """
+    for key in SHARED_KEYS:
+        values = {json.dumps(c.get(key)) for c in configs}
+        if len(values) > 1:
+            raise ValueError(f"Population replicas must share '{key}', got {sorted(values)}")
+
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    print(f"Using device: {device}")
+
+    shared = configs[0]
+    batch_size = shared.get('batch_size', 512)
+    encoding = shared.get('input_encoding', 'index')
+    rngs = ReplicaRng(len(configs))
+    criterion = nn.CrossEntropyLoss()
+
+    replicas = []
+    for k, config in enumerate(configs):
+        data = generate_modular_addition_data(
+            M=config['M'],
+            train_ratio=config['train_ratio'],
+            seed=config['seed']
+        )
+        train_loader = get_tensor_batches(data['train'], batch_size=batch_size, shuffle=True,
+                                          device=device, encoding=encoding)
+        test_loader = get_tensor_batches(data['test'], batch_size=batch_size, shuffle=False,
+                                         device=device, encoding=encoding)
+        with rngs.use(k):
+            model = create_model(
+                M=config['M'],
+                hidden_dim=config.get('hidden_dim', 2048),
+                n_layers=config.get('n_layers', 2),
+                activation=config.get('activation', 'quadratic'),
+                zero_init_output=config.get('zero_init_output', False)
+            ).to(device)
+        monitor = RunMonitor(config, train_loader, test_loader, criterion, device)
+        replicas.append(Replica(config, data, train_loader, test_loader, model, monitor))
+        print(f"[{k}] M = {config['M']}, ratio = {config['train_ratio']:.3f}, seed = {config['seed']}, "
+              f"Train: {data['train_size']}, Test: {data['test_size']}")
+
+    params, buffers = stack_module_state([r.model for r in replicas])
+    base = copy.deepcopy(replicas[0].model).to('meta')
+
+    def replica_loss(p_k, b_k, x, y, mask):
+        logits = functional_call(base, (p_k, b_k), (x,))
+        ce = F.cross_entropy(logits, y, reduction='none')
+        return (ce * mask).sum() / mask.sum()
+
+    batched_loss = vmap(replica_loss)
+    optimizer = optim.AdamW(
+        list(params.values()),
+        lr=shared.get('lr', 1e-3),
+        weight_decay=shared.get('weight_decay', 2e-4)
+    )
+
+    active = list(range(len(replicas)))
+    pbar = tqdm(desc=f"Population x{len(replicas)}")
+    while active:
+        xs, ys, masks = [], [], []
+        for k in active:
+            r = replicas[k]
+            with rngs.use(k):
+                if r.batches is None:
+                    r.batches = iter(r.train_loader)
+                    r.batch_idx = 0
+                    r.loss_sum = 0.0
+                x, y = next(r.batches)
+            x, y, mask = _padded(x, y, batch_size)
+            xs.append(x)
+            ys.append(y)
+            masks.append(mask)
+
+        base.train()
+        losses = batched_loss(params, buffers, torch.stack(xs), torch.stack(ys), torch.stack(masks))
+        optimizer.zero_grad()
+        losses.sum().backward()
+        optimizer.step()
+        losses = losses.detach().cpu().tolist()
+
+        finished = []
+        for i, k in enumerate(active):
+            r = replicas[k]
+            r.loss_sum += losses[i]
+            r.batch_idx += 1
+            if r.batch_idx < len(r.train_loader):
+                continue
+            # End of this replica's epoch: the solo run's evaluation block.
+            r.batches = None
+            train_loss = r.loss_sum / r.batch_idx
+            _load_replica(r.model, params, buffers, i)
+            with rngs.use(k):
+                _, stop = r.monitor.end_epoch(r.model, r.epoch, train_loss)
+            done = stop or r.epoch == r.config.get('epochs', 50000) - 1
+            if done:
+                save_results(r.results(), output_dir)
+                finished.append(k)
+            else:
+                r.epoch += 1
+
+        if finished:
+            keep = [i for i, k in enumerate(active) if k not in finished]
+            active = [k for k in active if k not in finished]
+            if active:
+                params, buffers, optimizer = _select_replicas(params, buffers, optimizer, keep)
+        pbar.update(1)
+        pbar.set_postfix({'active': len(active)})
+    pbar.close()
+
+    return [r.results() for r in replicas]
+
+
+def _parse_run(text):
+    ratio, seed = text.split(':')
+    return float(ratio), int(seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train several (ratio, seed) runs of one M as a batched population')
+    parser.add_argument('--M', type=int, default=71, help='Group size')
+    parser.add_argument('--runs', type=_parse_run, nargs='+', required=True,
+                        help='Replicas as ratio:seed, e.g. 0.3:0 0.3:1 0.4:0')
+    parser.add_argument('--hidden_dim', type=int, default=2048, help='Hidden layer width')
+    parser.add_argument('--activation', type=str, default='quadratic', choices=['quadratic', 'relu', 'gelu', 'silu'])
+    parser.add_argument('--lr', type=float, default=1e-3, help='Learning rate')
+    parser.add_argument('--weight_decay', type=float, default=2e-4, help='Weight decay')
+    parser.add_argument('--epochs', type=int, default=50000, help='Max epochs')
+    parser.add_argument('--log_interval', type=int, default=100, help='Log metrics every N epochs')
+    parser.add_argument('--grad_log_interval', type=int, default=1000, help='Log gradient stats every N epochs')
+    parser.add_argument('--batch_size', type=int, default=512, help='Batch size')
+    parser.add_argument('--n_layers', type=int, default=2, help='Number of layers')
+    parser.add_argument('--grok_threshold', type=float, default=0.95, help='Test-acc threshold for grok detection')
+    parser.add_argument('--input_encoding', type=str, default='index', choices=['index', 'onehot'])
+    parser.add_argument('--zero_init', action='store_true', help='Use zero-init for output layer')
+    parser.add_argument('--eval_mode', type=str, default='full', choices=['full', 'adaptive'])
+    parser.add_argument('--eval_subsample', type=int, default=1024)
+    parser.add_argument('--eval_jump', type=float, default=0.05)
+    parser.add_argument('--eval_margin', type=float, default=0.05)
+    parser.add_argument('--full_eval_interval', type=int, default=1000)
+    parser.add_argument('--abort_window', type=int, default=0, help='Memorization abort window in epochs (0 = off)')
+    parser.add_argument('--abort_min_epoch', type=int, default=0)
+    parser.add_argument('--abort_test_acc_tol', type=float, default=0.02)
+    parser.add_argument('--abort_loss_rtol', type=float, default=0.1)
+    parser.add_argument('--output_dir', type=str, default='results', help='Output directory')
+    args = parser.parse_args()
+
+    timestamp = datetime.now().isoformat()
+    configs = []
+    for ratio, seed in args.runs:
+        configs.append({
+            'M': args.M,
+            'train_ratio': ratio,
+            'seed': seed,
+            'hidden_dim': args.hidden_dim,
+            'activation': args.activation,
+            'lr': args.lr,
+            'weight_decay': args.weight_decay,
+            'epochs': args.epochs,
+            'log_interval': args.log_interval,
+            'grad_log_interval': args.grad_log_interval,
+            'zero_init_output': bool(args.zero_init),
+            'batch_size': args.batch_size,
+            'n_layers': args.n_layers,
+            'grok_threshold': args.grok_threshold,
+            'input_encoding': args.input_encoding,
+            'eval_mode': args.eval_mode,
+            'eval_subsample': args.eval_subsample,
+            'eval_jump': args.eval_jump,
+            'eval_margin': args.eval_margin,
+            'full_eval_interval': args.full_eval_interval,
+            'abort_window': args.abort_window,
+            'abort_min_epoch': args.abort_min_epoch,
+            'abort_test_acc_tol': args.abort_test_acc_tol,
+            'abort_loss_rtol': args.abort_loss_rtol,
+            'population_size': len(args.runs),
+            'timestamp': timestamp,
+        })
+
+    results = train_population(configs, args.output_dir)
+    for r in results:
+        c = r['config']
+        print(f"M={c['M']} ratio={c['train_ratio']:.3f} seed={c['seed']}: grok={r['grok_happened']} "
+              f"epoch={r['grok_epoch']} test={r['final_test_acc']:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Shared job scheduler for the train.py sweeps (sweep.py, dense_m_sweep.py, multiseed_fill.py,
+grok_speed_sweep.py).
+
+- Resume: a job is skipped when its result JSON (`M{M}_ratio{r:.3f}_seed{s}.json`, the name
+  train.save_results writes) already exists in the output directory.
+- Ordering: largest M first (runtime grows with M), so the long jobs do not end up as a tail
+  running on one core while the others sit idle.
+- Workers: up to N train.py processes at once. Each worker slot owns a fixed block of cores
+  (pinned with `taskset -c` where available) and its process runs with that many torch/BLAS threads.
+- Ledger: every start/finish/skip is appended to `sweep_ledger.jsonl` in the output directory
+  (command, worker, cores, return code, elapsed seconds). With more than one worker, each job's
+  output goes to `logs/<result stem>.log` instead of the terminal.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+LEDGER_NAME = "sweep_ledger.jsonl"
+
+
+def result_path(output_dir: Path, M: int, ratio: float, seed: int) -> Path:
+    return Path(output_dir) / f"M{M}_ratio{ratio:.3f}_seed{seed}.json"
+
+
+@dataclass(frozen=True)
+class Job:
+    """One train.py run; `train_args` are the extra CLI flags (everything but M/ratio/seed/output_dir)."""
+
+    M: int
+    ratio: float
+    seed: int
+    train_args: tuple[str, ...] = field(default=())
+
+    def command(self, output_dir: Path, num_threads: int | None = None) -> list[str]:
+        cmd = [
+            sys.executable,
+            "train.py",
+            "--M",
+            str(self.M),
+            "--ratio",
+            str(self.train_ratio),
+            "--seed",
+            str(self.seed),
+            *self.train_args,
+            "--output_dir",
+            str(output_dir),
+        ]
+        if num_threads:
+            cmd += ["--num_threads", str(num_threads)]
+        return cmd
+
+    @property
+    def train_ratio(self) -> float:
+        """The ratio rounded to 3 decimals, as in the result file name, so runs and names agree."""
+        return float(f"{self.ratio:.3f}")
+
+    def label(self) -> str:
+        return f"M={self.M} ratio={self.ratio:.3f} seed={self.seed}"
+
+
+def train_flags(**kwargs) -> tuple[str, ...]:
+    """train.py flags from keyword values, e.g. train_flags(hidden_dim=2048, lr=1e-3)."""
+    out: list[str] = []
+    for key, value in kwargs.items():
+        out += [f"--{key}", str(value)]
+    return tuple(out)
+
+
+def order_jobs(jobs: list[Job]) -> list[Job]:
+    """Largest M first; the given order is kept within an M."""
+    return sorted(jobs, key=lambda job: -job.M)
+
+
+def pending_jobs(jobs: list[Job], output_dir: Path) -> tuple[list[Job], list[Job]]:
+    """(todo, already_done), de-duplicated by result file."""
+    todo: list[Job] = []
+    done: list[Job] = []
+    seen: set[Path] = set()
+    for job in jobs:
+        path = result_path(output_dir, job.M, job.ratio, job.seed)
+        if path in seen:
+            continue
+        seen.add(path)
+        (done if path.exists() else todo).append(job)
+    return todo, done
+
+
+def core_blocks(workers: int, threads_per_worker: int | None) -> list[list[int] | None]:
+    """Disjoint core sets per worker slot (None where affinity or taskset is unavailable)."""
+    if not hasattr(os, "sched_getaffinity") or shutil.which("taskset") is None or not threads_per_worker:
+        return [None] * workers
+    cores = sorted(os.sched_getaffinity(0))
+    if workers * threads_per_worker > len(cores):
+        return [None] * workers
+    return [cores[i * threads_per_worker : (i + 1) * threads_per_worker] for i in range(workers)]
+
+
+class Ledger:
+    """Append-only JSONL record of scheduler events (thread-safe)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def write(self, job: Job, event: str, **fields) -> None:
+        record = {
+            "ts": datetime.now().isoformat(),
+            "event": event,
+            "M": job.M,
+            "ratio": round(job.ratio, 3),
+            "seed": job.seed,
+            **fields,
+        }
+        with self._lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def records(self) -> list[dict]:
+        if not self.path.exists():
+            return []
+        with self.path.open(encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+def add_scheduler_args(parser) -> None:
+    """--workers / --threads_per_worker, shared by the sweep scripts."""
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent train.py processes")
+    parser.add_argument("--threads_per_worker", type=int, default=None,
+                        help="torch/BLAS threads (and pinned cores) per worker; default: torch's own choice")
+
+
+def _child_env(num_threads: int | None) -> dict[str, str]:
+    env = dict(os.environ)
+    if num_threads:
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+            env[var] = str(num_threads)
+    return env
+
+
+def _pinned(cmd: list[str], cores: list[int] | None) -> list[str]:
+    # taskset sets the affinity before exec, so train.py and all its threads start pinned
+    # (preexec_fn is not safe here: jobs are launched from scheduler threads).
+    if not cores:
+        return cmd
+    return ["taskset", "-c", ",".join(str(c) for c in cores), *cmd]
+
+
+def _launch(cmd: list[str], cwd: Path, num_threads: int | None, cores: list[int] | None, stdout=None) -> subprocess.Popen:
+    return subprocess.Popen(
+        _pinned(cmd, cores),
+        cwd=cwd,
+        env=_child_env(num_threads),
+        stdout=stdout,
+        stderr=subprocess.STDOUT if stdout is not None else None,
+    )
+
+
+def run_jobs(
+    jobs: list[Job],
+    output_dir: Path,
+    workers: int = 1,
+    threads_per_worker: int | None = None,
+    dry_run: bool = False,
+    cwd: Path | None = None,
+) -> list[Job]:
+    """
+    Run the jobs whose results are missing, largest M first, on `workers` concurrent processes.
+
+    Returns the failed jobs.
+    """
+    output_dir = Path(output_dir).resolve()
+    cwd = Path(cwd) if cwd is not None else Path(__file__).parent
+    workers = max(1, int(workers))
+    todo, done = pending_jobs(order_jobs(jobs), output_dir)
+
+    print(f"- jobs: {len(todo) + len(done)}, already present: {len(done)}, pending: {len(todo)}")
+    print(f"- workers: {workers}, threads per worker: {threads_per_worker or 'default'}")
+    if dry_run:
+        for job in todo[:10]:
+            print(f"  {job.label()}")
+        if len(todo) > 10:
+            print(f"  ... and {len(todo) - 10} more")
+        return []
+    if not todo:
+        return []
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ledger = Ledger(output_dir / LEDGER_NAME)
+    last_event = {(r["M"], r["ratio"], r["seed"]): r["event"] for r in ledger.records()}
+    retried = sum(1 for job in todo if last_event.get((job.M, round(job.ratio, 3), job.seed)) in ("failed", "started"))
+    if retried:
+        print(f"- retrying {retried} job(s) that failed or were interrupted in an earlier session")
+    for job in done:
+        ledger.write(job, "skipped")
+
+    blocks = core_blocks(workers, threads_per_worker)
+    slots: queue.Queue[int] = queue.Queue()
+    for slot in range(workers):
+        slots.put(slot)
+    counter = iter(range(1, len(todo) + 1))
+    counter_lock = threading.Lock()
+    failed: list[Job] = []
+
+    def run_one(job: Job) -> None:
+        slot = slots.get()
+        try:
+            with counter_lock:
+                idx = next(counter)
+            cores = blocks[slot]
+            cmd = job.command(output_dir, threads_per_worker)
+            print(f"[{idx}/{len(todo)}] worker {slot}: {job.label()}", flush=True)
+            ledger.write(job, "started", worker=slot, cores=cores, cmd=cmd)
+            t0 = time.perf_counter()
+            if workers == 1:
+                proc = _launch(cmd, cwd, threads_per_worker, cores)
+                proc.wait()
+            else:
+                log_path = output_dir / "logs" / f"{result_path(output_dir, job.M, job.ratio, job.seed).stem}.log"
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                with log_path.open("w", encoding="utf-8") as log:
+                    proc = _launch(cmd, cwd, threads_per_worker, cores, stdout=log)
+                    proc.wait()
+            elapsed = time.perf_counter() - t0
+            ok = proc.returncode == 0
+            ledger.write(job, "done" if ok else "failed", worker=slot, returncode=proc.returncode,
+                         elapsed_sec=round(elapsed, 1))
+            if not ok:
+                with counter_lock:
+                    failed.append(job)
+                print(f"  [FAIL] {job.label()} (exit {proc.returncode})", flush=True)
+        finally:
+            slots.put(slot)
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(run_one, todo))
+
+    return failed
@@ -13,6 +13,8 @@ import math
 import subprocess
 import sys
 
+from scheduler import Job, add_scheduler_args, result_path, run_jobs, train_flags
+
 
 def _ratios_for_M(M: int) -> list[float]:
     """
@@ -83,13 +85,31 @@ def generate_sweep_configs():
     return configs
 
 
-def run_single_experiment(config, output_dir):
-    """Run a single experiment using subprocess"""
+def config_job(config):
+    """Scheduler job (one train.py run) for a sweep config"""
+    return Job(
+        M=config['M'],
+        ratio=config['train_ratio'],
+        seed=config['seed'],
+        train_args=train_flags(
+            hidden_dim=config['hidden_dim'],
+            activation=config['activation'],
+            lr=config['lr'],
+            weight_decay=config['weight_decay'],
+            epochs=config['epochs'],
+            log_interval=config.get('log_interval', 100),
+            grad_log_interval=config.get('grad_log_interval', 1000),
+        ),
+    )
+
+
+def run_population(configs, output_dir):
+    """Run same-M configs as one batched population.py process"""
+    config = configs[0]
     cmd = [
-        sys.executable, 'train.py',
+        sys.executable, 'population.py',
         '--M', str(config['M']),
-        '--ratio', str(config['train_ratio']),
-        '--seed', str(config['seed']),
+        '--runs', *[f"{c['train_ratio']}:{c['seed']}" for c in configs],
         '--hidden_dim', str(config['hidden_dim']),
         '--activation', config['activation'],
         '--lr', str(config['lr']),
@@ -99,11 +119,11 @@ def run_single_experiment(config, output_dir):
         '--grad_log_interval', str(config.get('grad_log_interval', 1000)),
         '--output_dir', output_dir,
     ]
-    
+
     subprocess.run(cmd, check=True)
 
 
-def run_sweep(output_dir, dry_run=False, max_jobs=None):
+def run_sweep(output_dir, dry_run=False, max_jobs=None, population=1, workers=1, threads_per_worker=None):
     """
     Run the full sweep
     
@@ -111,6 +131,11 @@ def run_sweep(output_dir, dry_run=False, max_jobs=None):
         output_dir: directory to save results
         dry_run: if True, just print configs without running
         max_jobs: maximum number of jobs to run (for testing)
+        population: if > 1, train same-M configs in batched groups of this size
+        workers: concurrent train.py processes (scheduler.run_jobs)
+        threads_per_worker: torch threads / pinned cores per worker
+    
+    Configs whose result JSON already exists are skipped, so an interrupted sweep resumes.
     """
     configs = generate_sweep_configs()
     
@@ -140,18 +165,30 @@ def run_sweep(output_dir, dry_run=False, max_jobs=None):
     # Run experiments
     if max_jobs:
         configs = configs[:max_jobs]
-        
-    for i, config in enumerate(configs):
-        print(f"\n{'='*60}")
-        print(f"Running experiment {i+1}/{len(configs)}")
-        print(f"M={config['M']}, ratio={config['train_ratio']}, seed={config['seed']}")
-        print(f"{'='*60}")
-        
-        try:
-            run_single_experiment(config, output_dir)
-        except Exception as e:
-            print(f"Error running experiment: {e}")
-            continue
+
+    if population > 1:
+        pending = [c for c in configs
+                   if not result_path(Path(output_dir), c['M'], c['train_ratio'], c['seed']).exists()]
+        groups = []
+        for M in sorted(set(c['M'] for c in pending), reverse=True):
+            same_m = [c for c in pending if c['M'] == M]
+            groups.extend(same_m[i:i + population] for i in range(0, len(same_m), population))
+        for i, group in enumerate(groups):
+            print(f"\n{'='*60}")
+            print(f"Running population {i+1}/{len(groups)}: M={group[0]['M']}, {len(group)} runs")
+            print(f"{'='*60}")
+            try:
+                run_population(group, output_dir)
+            except Exception as e:
+                print(f"Error running population: {e}")
+                continue
+        print(f"\nSweep complete! Results saved to {output_dir}")
+        return
+
+    failed = run_jobs([config_job(c) for c in configs], Path(output_dir),
+                      workers=workers, threads_per_worker=threads_per_worker)
+    if failed:
+        print(f"Failed: {[(j.M, j.ratio, j.seed) for j in failed]}")
     
     print(f"\n{'='*60}")
     print(f"Sweep complete! Results saved to {output_dir}")
@@ -190,14 +227,21 @@ def main():
                         help='Maximum number of jobs to run')
     parser.add_argument('--estimate', action='store_true',
                         help='Estimate sweep time without running')
+    parser.add_argument('--population', type=int, default=1,
+                        help='If > 1, train same-M configs as batched populations of this size')
+    add_scheduler_args(parser)
     
     args = parser.parse_args()
+    if args.population > 1 and (args.workers != 1 or args.threads_per_worker):
+        parser.error('--population runs one population.py process at a time; '
+                     'it cannot be combined with --workers / --threads_per_worker')
     
     if args.estimate:
         estimate_time()
         return
     
-    run_sweep(args.output_dir, args.dry_run, args.max_jobs)
+    run_sweep(args.output_dir, args.dry_run, args.max_jobs, args.population,
+              args.workers, args.threads_per_worker)
 
 
 if __name__ == "__main__":
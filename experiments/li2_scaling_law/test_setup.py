@@ -10,8 +10,9 @@ from pathlib import Path
 # Add parent to path
 sys.path.append(str(Path(__file__).parent))
 
-from data.generate_data import generate_modular_addition_data, get_dataloader
+from data.generate_data import generate_modular_addition_data, get_dataloader, get_tensor_batches
 from models.grok_net import create_model, TwoLayerGrokNet
+from scheduler import Job, LEDGER_NAME, Ledger, _pinned, result_path, run_jobs
 
 
 def test_data_generation():
@@ -160,6 +161,176 @@ def test_activations():
     return True
 
 
+def test_tensor_batches():
+    """Test tensor-resident batches and the index input path"""
+    print("Testing tensor batches...")
+    
+    M = 23
+    data = generate_modular_addition_data(M, 0.5, seed=42)
+    
+    # Same batches, in the same order, as the DataLoader
+    torch.manual_seed(0)
+    ref = [(x.clone(), y.clone()) for x, y in get_dataloader(data['train'], batch_size=64)]
+    torch.manual_seed(0)
+    fast = list(get_tensor_batches(data['train'], batch_size=64, encoding='onehot'))
+    assert len(ref) == len(fast)
+    for (x0, y0), (x1, y1) in zip(ref, fast):
+        assert torch.equal(x0, x1) and torch.equal(y0, y1)
+    
+    # Index inputs give the one-hot logits
+    x_onehot, _ = data['test'].tensors('onehot')
+    x_index, _ = data['test'].tensors('index')
+    for n_layers in [2, 3]:
+        model = create_model(M, 256, n_layers=n_layers, activation='quadratic')
+        assert torch.allclose(model(x_index), model(x_onehot), rtol=1e-5, atol=1e-6)
+    
+    print(f"  [OK] Tensor batches match DataLoader: {len(fast)} batches, index path matches one-hot")
+    return True
+
+
+def test_run_monitor():
+    """Test adaptive evaluation and the memorization-abort rule"""
+    print("Testing run monitor...")
+    from train import RunMonitor
+    
+    M = 23
+    data = generate_modular_addition_data(M, 0.5, seed=42)
+    train_loader = get_tensor_batches(data['train'], batch_size=64)
+    test_loader = get_tensor_batches(data['test'], batch_size=64, shuffle=False)
+    model = create_model(M, 64)
+    criterion = torch.nn.CrossEntropyLoss()
+    config = {'seed': 42, 'epochs': 100, 'log_interval': 10, 'grad_log_interval': 0,
+              'eval_mode': 'adaptive', 'eval_subsample': 100, 'eval_jump': 0.2, 'abort_window': 40}
+    
+    # Adaptive mode: first log is a full eval, a quiet next log is subsampled (no RNG draws)
+    monitor = RunMonitor(config, train_loader, test_loader, criterion, 'cpu')
+    assert monitor.end_epoch(model, 0, 1.0) == (True, False)
+    state = torch.get_rng_state()
+    monitor.end_epoch(model, 10, 1.0)
+    assert monitor.history['eval_full'] == [True, False]
+    assert torch.equal(state, torch.get_rng_state())
+    
+    # Abort: memorized and flat over the whole window; not before the window is covered
+    monitor = RunMonitor(dict(config, eval_mode='full'), train_loader, test_loader, criterion, 'cpu')
+    for e in range(0, 60, 10):
+        monitor.history['epochs'].append(e)
+        monitor.history['train_loss'].append(0.010)
+        monitor.history['train_acc'].append(1.0)
+        monitor.history['test_acc'].append(0.05 + 0.001 * (e % 20 == 0))
+    assert monitor._memorization_abort(30) is None
+    stats = monitor._memorization_abort(50)
+    assert stats is not None and stats['window_start'] == 10 and stats['n_logs'] == 5
+    monitor.history['test_acc'][-1] = 0.5
+    assert monitor._memorization_abort(50) is None
+    
+    # A window holding fewer than three full evaluations never aborts
+    monitor.history['test_acc'][-1] = 0.05
+    monitor.abort_window = 15
+    assert monitor._memorization_abort(50) is None
+    monitor.abort_window = 20
+    assert monitor._memorization_abort(50)['n_logs'] == 3
+    
+    # Adaptive mode: subsampled logs are left out of the window
+    monitor.history['eval_full'] = [True, True, False, True, False, True]
+    monitor.abort_window = 40
+    stats = monitor._memorization_abort(50)
+    assert stats['window_start'] == 10 and stats['n_logs'] == 3
+    monitor.history['eval_full'] = [True, False, False, True, False, True]
+    assert monitor._memorization_abort(50) is None
+    
+    print("  [OK] Subsampled evals draw no RNG, abort rule fires only on a flat memorized window of full evals")
+    return True
+
+
+def test_population():
+    """Test that a batched population reproduces solo train.train() runs"""
+    print("Testing population training...")
+    import math
+    import tempfile
+    from train import train
+    from population import train_population
+
+    # Two ratios: different train sizes, so batch counts per epoch differ (padded, masked batches)
+    base = {'M': 23, 'hidden_dim': 64, 'n_layers': 2, 'activation': 'quadratic', 'lr': 1e-3,
+            'weight_decay': 2e-4, 'batch_size': 64, 'epochs': 30, 'log_interval': 5,
+            'grad_log_interval': 10, 'input_encoding': 'index'}
+    configs = [dict(base, train_ratio=0.4, seed=0), dict(base, train_ratio=0.6, seed=1)]
+
+    solo = []
+    for config in configs:
+        torch.set_rng_state(torch.Generator().get_state())  # a fresh train.py process
+        solo.append(train(dict(config)))
+    with tempfile.TemporaryDirectory() as tmp:
+        pop = train_population([dict(c) for c in configs], tmp)
+        assert sorted(p.name for p in Path(tmp).iterdir()) == [
+            'M23_ratio0.400_seed0.json', 'M23_ratio0.600_seed1.json']
+
+    # Only float summation order in the batched kernels differs
+    tol = 1e-5
+    for a, b in zip(solo, pop):
+        for key in ('total_epochs', 'stop_reason', 'grok_happened', 'grok_epoch',
+                    'final_train_acc', 'final_test_acc'):
+            assert a[key] == b[key], key
+        ha, hb = a['history'], b['history']
+        assert ha['epochs'] == hb['epochs'] and ha['train_acc'] == hb['train_acc'] and ha['test_acc'] == hb['test_acc']
+        assert all(math.isclose(x, y, abs_tol=tol) for x, y in zip(ha['train_loss'], hb['train_loss']))
+        assert len(ha['grad_norms']) == len(hb['grad_norms']) == 3
+        for ga, gb in zip(ha['grad_norms'], hb['grad_norms']):
+            assert ga.keys() == gb.keys()
+            assert all(math.isclose(ga[k], gb[k], rel_tol=1e-4, abs_tol=1e-7) for k in ga)
+
+    print(f"  [OK] Population matches solo runs: {len(pop)} replicas, losses within {tol}")
+    return True
+
+
+def test_scheduler():
+    """Test sweep scheduler ordering, resume and ledger (with a stand-in train.py)"""
+    print("Testing sweep scheduler...")
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        # Stand-in train.py: writes the result file train.save_results would, fails for seed 13.
+        (tmp / "train.py").write_text(
+            "import argparse, json, sys\n"
+            "from pathlib import Path\n"
+            "p = argparse.ArgumentParser()\n"
+            "for k in ['--M', '--ratio', '--seed', '--output_dir', '--num_threads']:\n"
+            "    p.add_argument(k)\n"
+            "a = p.parse_args()\n"
+            "if a.seed == '13':\n"
+            "    sys.exit(3)\n"
+            "name = f'M{a.M}_ratio{float(a.ratio):.3f}_seed{a.seed}.json'\n"
+            "Path(a.output_dir, name).write_text(json.dumps({'threads': a.num_threads}))\n"
+        )
+        out = tmp / "results"
+        out.mkdir()
+        result_path(out, 23, 0.5, 0).write_text("{}")
+        jobs = [Job(23, 0.5, 0), Job(23, 0.5, 1), Job(41, 0.4, 0), Job(41, 0.4, 13)]
+        
+        failed = run_jobs(jobs, out, workers=2, threads_per_worker=1, cwd=tmp)
+        assert failed == [Job(41, 0.4, 13)]
+        assert result_path(out, 23, 0.5, 0).read_text() == "{}"  # resumed, not rerun
+        assert result_path(out, 41, 0.4, 0).exists() and result_path(out, 23, 0.5, 1).exists()
+        
+        records = Ledger(out / LEDGER_NAME).records()
+        started = [(r["M"], r["seed"]) for r in records if r["event"] == "started"]
+        assert set(started[:2]) == {(41, 0), (41, 13)}  # largest M first
+        assert sorted(r["event"] for r in records) == ["done", "done", "failed", "skipped", "started", "started", "started"]
+        
+        # Second pass only retries the failure
+        assert run_jobs(jobs, out, workers=2, cwd=tmp) == [Job(41, 0.4, 13)]
+        
+        # Trains on the ratio the result file is named after
+        cmd = Job(23, 0.41237, 0).command(out)
+        assert cmd[cmd.index("--ratio") + 1] == "0.412"
+        assert _pinned(["train.py"], [2, 3]) == ["taskset", "-c", "2,3", "train.py"]
+        assert _pinned(["train.py"], None) == ["train.py"]
+    
+    print("  [OK] Largest M first, existing results skipped, ledger written")
+    return True
+
+
 def main():
     print("=" * 60)
     print("Li² Scaling Law Experiment - Quick Test")
@@ -171,6 +342,10 @@ def main():
         test_training_step,
         test_short_training,
         test_activations,
+        test_tensor_batches,
+        test_run_monitor,
+        test_population,
+        test_scheduler,
     ]
     
     all_passed = True
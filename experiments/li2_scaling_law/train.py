@@ -19,7 +19,7 @@ from tqdm import tqdm
 import sys
 sys.path.append(str(Path(__file__).parent))
 
-from data.generate_data import generate_modular_addition_data, get_dataloader
+from data.generate_data import generate_modular_addition_data, get_tensor_batches
 from models.grok_net import create_model
 
 
@@ -103,6 +103,24 @@ def evaluate(model, dataloader, device):
     return correct / total if total > 0 else 0.0
 
 
+def eval_subset(loader, size, seed):
+    """
+    Fixed random subset of a TensorBatches split, as a list of batches for evaluate()
+    
+    Drawn from its own generator, so it does not advance the global RNG.
+    """
+    n = loader.n
+    if size >= n:
+        idx = torch.arange(n)
+    else:
+        generator = torch.Generator()
+        generator.manual_seed(int(seed))
+        idx = torch.randperm(n, generator=generator)[:size]
+    idx = idx.to(loader.x.device)
+    x, y = loader.x[idx], loader.y[idx]
+    return [(x[i:i + loader.batch_size], y[i:i + loader.batch_size]) for i in range(0, len(idx), loader.batch_size)]
+
+
 def compute_gradient_stats(model, dataloader, criterion, device):
     """
     Compute gradient statistics for analysis
@@ -181,6 +199,174 @@ def train_epoch(model, dataloader, optimizer, criterion, device):
     return total_loss / n_batches if n_batches > 0 else 0.0
 
 
+# Full evaluations the memorization-abort window must hold (a single log makes the range tests trivial).
+ABORT_MIN_LOGS = 3
+
+
+class RunMonitor:
+    """
+    Per-epoch evaluation, grokking detection and stopping for one run
+
+    eval_mode 'full' (default): full train and test accuracy every log_interval epochs.
+    eval_mode 'adaptive': at log epochs, accuracy on fixed subsets of eval_subsample examples
+    (no RNG draws); a full evaluation replaces it when a change-point is suspected: first log,
+    last epoch, a move of more than eval_jump since the last full evaluation, an accuracy within
+    eval_margin of the memorization (0.99) or grok threshold, or full_eval_interval epochs without
+    one. Grok detection, convergence and the abort rule only act on full evaluations.
+
+    Preregistered memorization abort (abort_window > 0): at a full evaluation at epoch
+    e >= max(abort_min_epoch, abort_window), stop if the full evaluations in [e - abort_window, e]
+    (at least ABORT_MIN_LOGS of them; subsampled logs are ignored) all have train_acc >= 0.99,
+    test_acc stays below grok_threshold and within abort_test_acc_tol, and the train loss range is
+    at most abort_loss_rtol of its window mean. The run is saved with stop_reason
+    'abort_memorization' (no grok, censored at total_epochs).
+    """
+
+    def __init__(self, config, train_loader, test_loader, criterion, device):
+        self.config = config
+        self.train_loader = train_loader
+        self.test_loader = test_loader
+        self.criterion = criterion
+        self.device = device
+        self.epochs = config.get('epochs', 50000)
+        self.log_interval = config.get('log_interval', 100)
+        self.grad_log_interval = config.get('grad_log_interval', 1000)
+        self.grok_threshold = config.get('grok_threshold', 0.95)
+        self.adaptive = config.get('eval_mode', 'full') == 'adaptive'
+        self.abort_window = config.get('abort_window', 0)
+
+        self.history = {
+            'train_loss': [],
+            'train_acc': [],
+            'test_acc': [],
+            'grad_norms': [],
+            'epochs': [],
+        }
+        if self.adaptive:
+            self.history['eval_full'] = []
+            size = config.get('eval_subsample', 1024)
+            self.train_subset = eval_subset(train_loader, size, config['seed'])
+            self.test_subset = eval_subset(test_loader, size, config['seed'] + 1)
+        self.grok_epoch = None
+        self.stop_reason = 'max_epochs'
+        self.abort = None
+        self.last_full = None  # (epoch, train_acc, test_acc)
+
+    def _needs_full(self, epoch, train_acc, test_acc):
+        cfg = self.config
+        if self.last_full is None or epoch == self.epochs - 1:
+            return True
+        full_epoch, full_train, full_test = self.last_full
+        interval = cfg.get('full_eval_interval', 1000)
+        if interval and epoch - full_epoch >= interval:
+            return True
+        jump = cfg.get('eval_jump', 0.05)
+        if abs(train_acc - full_train) > jump or abs(test_acc - full_test) > jump:
+            return True
+        margin = cfg.get('eval_margin', 0.05)
+        if full_train < 0.99 and train_acc >= 0.99 - margin:
+            return True
+        return test_acc >= min(self.grok_threshold, 0.99) - margin
+
+    def _memorization_abort(self, epoch):
+        cfg = self.config
+        w = self.abort_window
+        if not w or epoch < max(cfg.get('abort_min_epoch', 0), w):
+            return None
+        h = self.history
+        full = h.get('eval_full')
+        idx = [i for i, e in enumerate(h['epochs']) if e >= epoch - w and (full is None or full[i])]
+        if len(idx) < ABORT_MIN_LOGS:
+            return None
+        train_acc = [h['train_acc'][i] for i in idx]
+        test_acc = [h['test_acc'][i] for i in idx]
+        loss = [h['train_loss'][i] for i in idx]
+        loss_mean = sum(loss) / len(loss)
+        stats = {
+            'epoch': epoch,
+            'window_start': h['epochs'][idx[0]],
+            'n_logs': len(idx),
+            'min_train_acc': min(train_acc),
+            'test_acc_range': max(test_acc) - min(test_acc),
+            'max_test_acc': max(test_acc),
+            'train_loss_rel_range': (max(loss) - min(loss)) / loss_mean if loss_mean > 0 else 0.0,
+        }
+        if (stats['min_train_acc'] >= 0.99
+                and stats['max_test_acc'] < self.grok_threshold
+                and stats['test_acc_range'] <= cfg.get('abort_test_acc_tol', 0.02)
+                and stats['train_loss_rel_range'] <= cfg.get('abort_loss_rtol', 0.1)):
+            return stats
+        return None
+
+    def end_epoch(self, model, epoch, train_loss):
+        """
+        Log epoch `epoch` if due; returns (logged, stop)
+        """
+        if not (epoch % self.log_interval == 0 or epoch == self.epochs - 1):
+            return False, False
+
+        full = True
+        if self.adaptive:
+            train_acc = evaluate(model, self.train_subset, self.device)
+            test_acc = evaluate(model, self.test_subset, self.device)
+            full = self._needs_full(epoch, train_acc, test_acc)
+        if full:
+            train_acc = evaluate(model, self.train_loader, self.device)
+            test_acc = evaluate(model, self.test_loader, self.device)
+            self.last_full = (epoch, train_acc, test_acc)
+
+        history = self.history
+        history['epochs'].append(epoch)
+        history['train_loss'].append(train_loss)
+        history['train_acc'].append(train_acc)
+        history['test_acc'].append(test_acc)
+        if self.adaptive:
+            history['eval_full'].append(full)
+
+        # Gradient stats (feature-level proxy + parameter norms)
+        if self.grad_log_interval and epoch % self.grad_log_interval == 0:
+            grad_norms = compute_gradient_stats(model, self.train_loader, self.criterion, self.device)
+            history['grad_norms'].append({'epoch': epoch, **grad_norms})
+
+        if not full:
+            return True, False
+
+        # Grokking detection
+        if self.grok_epoch is None and test_acc >= self.grok_threshold:
+            self.grok_epoch = epoch
+            print(f"\n[GROK] Detected at epoch {epoch} (test_acc={test_acc:.2%})")
+
+        # Early stopping
+        if train_acc > 0.99 and test_acc > 0.99:
+            print(f"\n[OK] Converged at epoch {epoch}")
+            self.stop_reason = 'converged'
+            return True, True
+
+        abort = self._memorization_abort(epoch) if self.grok_epoch is None else None
+        if abort is not None:
+            print(f"\n[ABORT] Flat memorization over {self.abort_window} epochs at epoch {epoch}")
+            self.stop_reason = 'abort_memorization'
+            self.abort = abort
+            return True, True
+        return True, False
+
+    def results(self, epoch):
+        history = self.history
+        results = {
+            'config': self.config,
+            'grok_happened': self.grok_epoch is not None,
+            'grok_epoch': self.grok_epoch,
+            'final_train_acc': history['train_acc'][-1] if history['train_acc'] else 0,
+            'final_test_acc': history['test_acc'][-1] if history['test_acc'] else 0,
+            'total_epochs': epoch + 1,
+            'stop_reason': self.stop_reason,
+        }
+        if self.abort is not None:
+            results['abort'] = self.abort
+        results['history'] = history
+        return results
+
+
 def train(config):
     """
     Main training function
@@ -202,15 +388,21 @@ def train(config):
         seed=config['seed']
     )
     
-    train_loader = get_dataloader(
-        data['train'], 
+    # Tensor-resident batches (same order as the DataLoader); 'index' inputs skip one-hot rows.
+    encoding = config.get('input_encoding', 'index')
+    train_loader = get_tensor_batches(
+        data['train'],
         batch_size=config.get('batch_size', 512),
-        shuffle=True
+        shuffle=True,
+        device=device,
+        encoding=encoding
     )
-    test_loader = get_dataloader(
+    test_loader = get_tensor_batches(
         data['test'],
         batch_size=config.get('batch_size', 512),
-        shuffle=False
+        shuffle=False,
+        device=device,
+        encoding=encoding
     )
     
     print(f"M = {config['M']}, Train: {data['train_size']}, Test: {data['test_size']}")
@@ -234,23 +426,10 @@ def train(config):
     
     criterion = nn.CrossEntropyLoss()
     
-    # Training history
-    history = {
-        'train_loss': [],
-        'train_acc': [],
-        'test_acc': [],
-        'grad_norms': [],
-        'epochs': [],
-    }
-    
-    # Grokking detection
-    grok_epoch = None
-    grok_threshold = config.get('grok_threshold', 0.95)
+    monitor = RunMonitor(config, train_loader, test_loader, criterion, device)
     
     # Training loop
     epochs = config.get('epochs', 50000)
-    log_interval = config.get('log_interval', 100)
-    grad_log_interval = config.get('grad_log_interval', 1000)
     
     pbar = tqdm(range(epochs), desc="Training")
     for epoch in pbar:
@@ -258,46 +437,18 @@ def train(config):
         train_loss = train_epoch(model, train_loader, optimizer, criterion, device)
         
         # Evaluate periodically
-        if epoch % log_interval == 0 or epoch == epochs - 1:
-            train_acc = evaluate(model, train_loader, device)
-            test_acc = evaluate(model, test_loader, device)
-            
-            history['epochs'].append(epoch)
-            history['train_loss'].append(train_loss)
-            history['train_acc'].append(train_acc)
-            history['test_acc'].append(test_acc)
-            
-            # Gradient stats (feature-level proxy + parameter norms)
-            if grad_log_interval and epoch % grad_log_interval == 0:
-                grad_norms = compute_gradient_stats(model, train_loader, criterion, device)
-                history['grad_norms'].append({'epoch': epoch, **grad_norms})
-            
+        logged, stop = monitor.end_epoch(model, epoch, train_loss)
+        if logged:
             pbar.set_postfix({
                 'loss': f'{train_loss:.4f}',
-                'train': f'{train_acc:.2%}',
-                'test': f'{test_acc:.2%}'
+                'train': f"{monitor.history['train_acc'][-1]:.2%}",
+                'test': f"{monitor.history['test_acc'][-1]:.2%}"
             })
-            
-            # Grokking detection
-            if grok_epoch is None and test_acc >= grok_threshold:
-                grok_epoch = epoch
-                print(f"\n[GROK] Detected at epoch {epoch} (test_acc={test_acc:.2%})")
-            
-            # Early stopping
-            if train_acc > 0.99 and test_acc > 0.99:
-                print(f"\n[OK] Converged at epoch {epoch}")
-                break
+        if stop:
+            break
     
     # Results
-    results = {
-        'config': config,
-        'grok_happened': grok_epoch is not None,
-        'grok_epoch': grok_epoch,
-        'final_train_acc': history['train_acc'][-1] if history['train_acc'] else 0,
-        'final_test_acc': history['test_acc'][-1] if history['test_acc'] else 0,
-        'total_epochs': epoch + 1,
-        'history': history,
-    }
+    results = monitor.results(epoch)
     
     return results
 
@@ -354,10 +505,24 @@ def main():
     parser.add_argument('--batch_size', type=int, default=suppress, help='Batch size')
     parser.add_argument('--n_layers', type=int, default=suppress, help='Number of layers')
     parser.add_argument('--grok_threshold', type=float, default=suppress, help='Test-acc threshold for grok detection')
+    parser.add_argument('--input_encoding', type=str, default=suppress, choices=['index', 'onehot'],
+                        help='Model input: (a, b) indices (embedding path) or 2*M one-hot rows')
 
     parser.add_argument('--zero_init', action='store_true', default=suppress, help='Use zero-init for output layer')
+    parser.add_argument('--eval_mode', type=str, default=suppress, choices=['full', 'adaptive'],
+                        help='Full evals every log_interval, or subsampled evals with full evals at suspected change-points')
+    parser.add_argument('--eval_subsample', type=int, default=suppress, help='Adaptive mode: examples per subsampled eval')
+    parser.add_argument('--eval_jump', type=float, default=suppress, help='Adaptive mode: acc move that forces a full eval')
+    parser.add_argument('--eval_margin', type=float, default=suppress, help='Adaptive mode: full eval within this of a threshold')
+    parser.add_argument('--full_eval_interval', type=int, default=suppress, help='Adaptive mode: max epochs between full evals')
+    parser.add_argument('--abort_window', type=int, default=suppress, help='Memorization abort window in epochs (0 = off)')
+    parser.add_argument('--abort_min_epoch', type=int, default=suppress, help='No memorization abort before this epoch')
+    parser.add_argument('--abort_test_acc_tol', type=float, default=suppress, help='Abort: max test-acc range over the window')
+    parser.add_argument('--abort_loss_rtol', type=float, default=suppress, help='Abort: max train-loss range / mean over the window')
+    parser.add_argument('--num_threads', type=int, default=None, help='torch CPU threads (set by the sweep scheduler)')
     
     args = parser.parse_args()
+    num_threads = args.num_threads
 
     defaults = {
         'M': 71,
@@ -375,10 +540,21 @@ def main():
         'batch_size': 512,
         'n_layers': 2,
         'grok_threshold': 0.95,
+        'input_encoding': 'index',
+        'eval_mode': 'full',
+        'eval_subsample': 1024,
+        'eval_jump': 0.05,
+        'eval_margin': 0.05,
+        'full_eval_interval': 1000,
+        'abort_window': 0,
+        'abort_min_epoch': 0,
+        'abort_test_acc_tol': 0.02,
+        'abort_loss_rtol': 0.1,
     }
 
     cli_overrides = vars(args).copy()
     config_path = cli_overrides.pop('config', None)
+    cli_overrides.pop('num_threads', None)
 
     file_cfg: dict = {}
     if config_path:
@@ -416,9 +592,21 @@ def main():
         'batch_size': int(merged.get('batch_size', 512)),
         'n_layers': int(merged.get('n_layers', 2)),
         'grok_threshold': float(merged.get('grok_threshold', 0.95)),
+        'input_encoding': str(merged.get('input_encoding', 'index')),
+        'eval_mode': str(merged['eval_mode']),
+        'eval_subsample': int(merged['eval_subsample']),
+        'eval_jump': float(merged['eval_jump']),
+        'eval_margin': float(merged['eval_margin']),
+        'full_eval_interval': int(merged['full_eval_interval']),
+        'abort_window': int(merged['abort_window']),
+        'abort_min_epoch': int(merged['abort_min_epoch']),
+        'abort_test_acc_tol': float(merged['abort_test_acc_tol']),
+        'abort_loss_rtol': float(merged['abort_loss_rtol']),
         'timestamp': datetime.now().isoformat(),
     }
     output_dir = str(merged.get('output_dir', 'results'))
+    if num_threads:
+        torch.set_num_threads(num_threads)
     
     print("=" * 60)
     print("Li2 Scaling Law Verification Experiment")
@@ -435,6 +623,7 @@ def main():
     print("=" * 60)
     print(f"Grok happened: {results['grok_happened']}")
     print(f"Grok epoch: {results['grok_epoch']}")
+    print(f"Stop reason: {results['stop_reason']} (after {results['total_epochs']} epochs)")
     print(f"Final train acc: {results['final_train_acc']:.2%}")
     print(f"Final test acc: {results['final_test_acc']:.2%}")
     
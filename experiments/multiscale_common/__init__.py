@@ -0,0 +1 @@
+"""Shared simulation and measurement kernels for the multiscale / CA experiments."""
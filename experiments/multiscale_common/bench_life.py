@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from multiscale_common.life_bits import LifeBatch
+
+
+def roll_step(g: np.ndarray) -> np.ndarray:
+    # Reference int8 kernel (the per-seed np.roll loop this replaces).
+    n = np.zeros_like(g, dtype=np.int16)
+    for di in (-1, 0, 1):
+        for dj in (-1, 0, 1):
+            if di == 0 and dj == 0:
+                continue
+            n += np.roll(np.roll(g, di, axis=0), dj, axis=1)
+    return (((g == 0) & (n == 3)) | ((g == 1) & ((n == 2) | (n == 3)))).astype(np.int8)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Per-seed int8 roll kernel vs bit-packed batched kernel.")
+    ap.add_argument("--grid", type=int, default=512)
+    ap.add_argument("--seeds", type=int, default=64)
+    ap.add_argument("--steps", type=int, default=50)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    grids = rng.integers(0, 2, (args.seeds, args.grid, args.grid), dtype=np.int8)
+
+    t0 = time.perf_counter()
+    ref = []
+    for g in grids:
+        for _ in range(args.steps):
+            g = roll_step(g)
+        ref.append(g)
+    t_roll = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    life = LifeBatch(grids)
+    life.step(args.steps)
+    out = life.cells()
+    t_bits = time.perf_counter() - t0
+
+    seed_steps = args.seeds * args.steps
+    print(
+        json.dumps(
+            {
+                "grid": args.grid,
+                "seeds": args.seeds,
+                "steps": args.steps,
+                "identical": bool(np.array_equal(np.stack(ref), out)),
+                "roll_ms_per_seed_step": round(1000.0 * t_roll / seed_steps, 4),
+                "packed_ms_per_seed_step": round(1000.0 * t_bits / seed_steps, 4),
+                "speedup": round(t_roll / t_bits, 2) if t_bits > 0 else None,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
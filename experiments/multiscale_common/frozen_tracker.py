@@ -0,0 +1,77 @@
+"""Incremental frozen-fraction tracker.
+
+`C_frozen` over a window of W snapshots is the fraction of cells whose value did not change
+across those W snapshots (zero variance). Instead of re-stacking the last W snapshots at every
+measurement, the tracker keeps, per cell, the index of the last snapshot at which it changed:
+a cell is frozen iff that index is <= n - W, where n is the number of snapshots seen. Each update
+is O(cells) and memory does not grow with run length.
+
+Snapshots may carry leading batch axes (e.g. (S, h, w) for S seeds); fractions are taken over
+the trailing `cell_ndim` axes. An optional ring buffer keeps the last `capacity` snapshots for
+estimators that need the raw window.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class FrozenTracker:
+    def __init__(
+        self,
+        shape: Tuple[int, ...],
+        window: int,
+        cell_ndim: int = 2,
+        capacity: int = 0,
+        dtype=np.int8,
+    ) -> None:
+        self.shape = tuple(int(v) for v in shape)
+        self.window = int(window)
+        self.cell_ndim = int(cell_ndim)
+        self.n = 0
+        self.last_change = np.zeros(self.shape, dtype=np.int64)
+        self._prev = np.zeros(self.shape, dtype=dtype)
+        self._changed = np.zeros(self.shape, dtype=bool)
+        self.capacity = int(capacity)
+        self._ring: Optional[np.ndarray] = (
+            np.zeros((self.capacity,) + self.shape, dtype=dtype) if self.capacity > 0 else None
+        )
+
+    def update(self, snapshot: np.ndarray) -> None:
+        if snapshot.shape != self.shape:
+            raise ValueError(f"snapshot shape {snapshot.shape} != tracker shape {self.shape}")
+        if self.n > 0:
+            np.not_equal(snapshot, self._prev, out=self._changed)
+            self.last_change[self._changed] = self.n
+        self._prev[...] = snapshot
+        if self._ring is not None:
+            self._ring[self.n % self.capacity] = snapshot
+        self.n += 1
+
+    def frozen_mask(self, window: Optional[int] = None) -> np.ndarray:
+        w = self.window if window is None else int(window)
+        return self.last_change <= self.n - w
+
+    def frozen_fraction(self, window: Optional[int] = None):
+        """Fraction of frozen cells (0.0 until `window` snapshots exist); float, or per batch row."""
+        w = self.window if window is None else int(window)
+        lead = self.shape[: len(self.shape) - self.cell_ndim]
+        if self.n < w:
+            return 0.0 if not lead else np.zeros(lead, dtype=np.float64)
+        axes = tuple(range(len(lead), len(self.shape)))
+        frac = np.mean(self.frozen_mask(w), axis=axes)
+        return float(frac) if not lead else frac
+
+    def activity_fraction(self, window: Optional[int] = None):
+        # C_activity is the complement of C_frozen.
+        return 1.0 - self.frozen_fraction(window)
+
+    def recent(self, k: int) -> np.ndarray:
+        """Last k snapshots in chronological order, shape (k, *shape). Needs capacity >= k."""
+        if self._ring is None or int(k) > self.capacity:
+            raise ValueError(f"recent({k}) needs a ring buffer of capacity >= {k} (have {self.capacity})")
+        k = min(int(k), self.n)
+        idx = np.arange(self.n - k, self.n) % self.capacity
+        return self._ring[idx]
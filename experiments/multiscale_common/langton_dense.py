@@ -0,0 +1,193 @@
+"""Dense-bitmap Langton's ant engine.
+
+Cells live in one flat `bytearray` (0 = white, 1 = black) with a zero-copy NumPy view, so the
+stepping loop is plain integer indexing and view windows are array slices. Two geometries:
+
+- unbounded plane (`torus=False`): the bitmap grows around the ant (and around requested views)
+  by at least `margin` cells per side, so memory follows the visited region, not the step count;
+- fixed torus of side `size` (`torus=True`), the v1 geometry.
+
+`run(n)` advances n steps in chunks of straight-line index arithmetic: the ant moves one cell per
+step, so it cannot leave the bitmap within `distance-to-edge` steps and bounds are only checked
+between chunks. Coordinates follow the callers' convention: `pos = (x, y)` indexes axis 0 and 1,
+and DIRECTIONS are N, E, S, W as (dx, dy).
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+DIRECTIONS = np.array([[0, -1], [1, 0], [0, 1], [-1, 0]], dtype=int)
+
+
+class LangtonDense:
+    def __init__(
+        self,
+        pos: Tuple[int, int] = (0, 0),
+        dir_idx: int = 0,
+        black_cells: Iterable[Tuple[int, int]] = (),
+        size: int = 64,
+        torus: bool = False,
+        margin: int = 64,
+    ) -> None:
+        self.torus = bool(torus)
+        self.margin = max(1, int(margin))
+        self.dir_idx = int(dir_idx) % 4
+        self.step_count = 0
+        side = int(size)
+        if self.torus:
+            # Index coordinates are world coordinates on the torus.
+            self._origin = (0, 0)
+            self._alloc(side, side)
+            x, y = int(pos[0]) % side, int(pos[1]) % side
+        else:
+            # World (x, y) sits at index (x + ox, y + oy); start with the ant in the middle.
+            self._origin = (side // 2 - int(pos[0]), side // 2 - int(pos[1]))
+            self._alloc(side, side)
+            x, y = side // 2, side // 2
+        self._p = x * self._w + y
+        for cx, cy in black_cells:
+            self.set_cell(cx, cy, 1)
+
+    # --- storage -------------------------------------------------------------------------------
+
+    def _alloc(self, h: int, w: int) -> None:
+        self._h, self._w = h, w
+        self._buf = bytearray(h * w)
+        self._view = np.frombuffer(self._buf, dtype=np.uint8).reshape(h, w)
+
+    def _pad(self, need: int, side: int) -> int:
+        # Grow geometrically (at least half the current side) so repeated growth stays amortized.
+        return 0 if need <= 0 else max(need + self.margin, side // 2)
+
+    def _grow(self, lo_x: int, hi_x: int, lo_y: int, hi_y: int) -> None:
+        """Grow the bitmap so index rows [lo_x, hi_x) and cols [lo_y, hi_y) exist (plus margin)."""
+        pad_top = self._pad(-lo_x, self._h)
+        pad_bottom = self._pad(hi_x - self._h, self._h)
+        pad_left = self._pad(-lo_y, self._w)
+        pad_right = self._pad(hi_y - self._w, self._w)
+        if not (pad_top or pad_bottom or pad_left or pad_right):
+            return
+        x, y = divmod(self._p, self._w)
+        old, (h, w) = self._view, (self._h, self._w)
+        self._alloc(h + pad_top + pad_bottom, w + pad_left + pad_right)
+        self._view[pad_top : pad_top + h, pad_left : pad_left + w] = old
+        self._origin = (self._origin[0] + pad_top, self._origin[1] + pad_left)
+        self._p = (x + pad_top) * self._w + (y + pad_left)
+
+    # --- state ---------------------------------------------------------------------------------
+
+    @property
+    def pos(self) -> np.ndarray:
+        x, y = divmod(self._p, self._w)
+        return np.array([x - self._origin[0], y - self._origin[1]], dtype=int)
+
+    @property
+    def cells(self) -> np.ndarray:
+        """The whole bitmap (uint8 view, no copy). On the torus this is the size x size grid."""
+        return self._view
+
+    def set_cell(self, x: int, y: int, value: int) -> None:
+        if self.torus:
+            self._view[int(x) % self._h, int(y) % self._w] = value
+            return
+        ix, iy = int(x) + self._origin[0], int(y) + self._origin[1]
+        self._grow(ix, ix + 1, iy, iy + 1)
+        self._view[int(x) + self._origin[0], int(y) + self._origin[1]] = value
+
+    def window(self, x_min: int, y_min: int, h: int, w: int, dtype=np.int8) -> np.ndarray:
+        """Copy of world cells [x_min, x_min + h) x [y_min, y_min + w) (unbounded plane only)."""
+        if self.torus:
+            raise ValueError("window() needs the unbounded plane; slice `cells` on the torus")
+        ix, iy = int(x_min) + self._origin[0], int(y_min) + self._origin[1]
+        self._grow(ix, ix + h, iy, iy + w)
+        ix, iy = int(x_min) + self._origin[0], int(y_min) + self._origin[1]
+        return self._view[ix : ix + h, iy : iy + w].astype(dtype)
+
+    # --- dynamics ------------------------------------------------------------------------------
+
+    def _edge_distance(self) -> int:
+        x, y = divmod(self._p, self._w)
+        return min(x, self._h - 1 - x, y, self._w - 1 - y)
+
+    def _wrapped_step(self) -> None:
+        # One step with explicit torus wrap, used when the ant sits on the border.
+        buf, p = self._buf, self._p
+        if buf[p]:
+            self.dir_idx = (self.dir_idx - 1) % 4
+            buf[p] = 0
+        else:
+            self.dir_idx = (self.dir_idx + 1) % 4
+            buf[p] = 1
+        x, y = divmod(p, self._w)
+        dx, dy = DIRECTIONS[self.dir_idx]
+        self._p = ((x + dx) % self._h) * self._w + (y + dy) % self._w
+        self.step_count += 1
+
+    def run(self, n: int, positions: Optional[np.ndarray] = None) -> None:
+        """Advance n steps. If `positions` ((n, 2) int array) is given, row k gets the world
+        position after step k + 1 (torus positions are in [0, size))."""
+        done = 0
+        n = int(n)
+        while done < n:
+            safe = self._edge_distance()
+            if safe == 0:
+                if self.torus:
+                    self._wrapped_step()
+                    if positions is not None:
+                        positions[done] = self.pos
+                    done += 1
+                    continue
+                x, y = divmod(self._p, self._w)
+                self._grow(x - 1, x + 2, y - 1, y + 2)
+                continue
+            k = min(safe, n - done)
+            w = self._w
+            moves = (-1, w, 1, -w)  # N, E, S, W in flat-index steps
+            buf, p, d = self._buf, self._p, self.dir_idx
+            if positions is None:
+                for _ in range(k):
+                    if buf[p]:
+                        d = (d - 1) & 3
+                        buf[p] = 0
+                    else:
+                        d = (d + 1) & 3
+                        buf[p] = 1
+                    p += moves[d]
+            else:
+                trail = []
+                for _ in range(k):
+                    if buf[p]:
+                        d = (d - 1) & 3
+                        buf[p] = 0
+                    else:
+                        d = (d + 1) & 3
+                        buf[p] = 1
+                    p += moves[d]
+                    trail.append(p)
+                trail = np.asarray(trail, dtype=np.int64)
+                positions[done : done + k, 0] = trail // w - self._origin[0]
+                positions[done : done + k, 1] = trail % w - self._origin[1]
+            self._p, self.dir_idx = p, d
+            self.step_count += k
+            done += k
+
+    def step(self) -> None:
+        # Single-step fast path for callers that measure after every step.
+        p, w = self._p, self._w
+        x, y = divmod(p, w)
+        if not (0 < x < self._h - 1 and 0 < y < w - 1):
+            self.run(1)
+            return
+        buf = self._buf
+        if buf[p]:
+            d = (self.dir_idx - 1) & 3
+            buf[p] = 0
+        else:
+            d = (self.dir_idx + 1) & 3
+            buf[p] = 1
+        self.dir_idx = d
+        self._p = p + (-1, w, 1, -w)[d]
+        self.step_count += 1
@@ -0,0 +1,192 @@
+"""Permutation null for the direct-map negative-control audit.
+
+The audit refits the direct isotonic map `x -> y` on shuffled training labels and compares each
+refit with the composed map. `x` never changes across permutations, so its sort order and tie
+groups are computed once (`FixedXIsotonic`). A chunk of permutations is then one index matrix:
+labels are gathered, sorted within tie groups and tie-averaged as whole arrays. Each row gets one
+pool-adjacent-violators solve, and every RMSE in the chunk comes from a single row reduction.
+Fits and RMSEs equal a fresh `IsotonicRegression(increasing=True, out_of_bounds="clip")` per
+permutation.
+
+Permutations are drawn from one Generator in the same order as the serial
+`rng.permutation(n)` loop, chunk by chunk, so memory stays at `chunk_size x n`. Chunks can be
+fitted in a process pool and are consumed in order, so results do not depend on the worker
+count. Per-permutation RMSEs can be streamed to a CSV as chunks finish. With `early_stop`, the
+run ends at the first chunk boundary where the final `p_emp <= alpha` verdict is already decided
+(curtailed sampling).
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .seed_bootstrap import _average_ties, _pav_inplace, _scipy_isotonic_regression
+
+
+class FixedXIsotonic:
+    """`IsotonicFit` for many label vectors sharing one x."""
+
+    def __init__(self, x: np.ndarray) -> None:
+        x = np.asarray(x, dtype=np.float64).reshape(-1)
+        self.n = len(x)
+        self.x_order = np.argsort(x, kind="stable")
+        xs = x[self.x_order]
+        # Exact-x groups fix the (x, y) sort order; resolution-merged groups are averaged.
+        self._exact_gid = np.concatenate(([0], np.cumsum(np.diff(xs) != 0)))
+        self._has_exact_ties = bool(self._exact_gid[-1] + 1 < len(xs)) if len(xs) else False
+        self.ux, _, self.weights = _average_ties(xs, np.zeros_like(xs))
+        counts = self.weights.astype(np.intp)
+        self._starts = np.cumsum(counts) - counts
+        self._multi = np.flatnonzero(counts > 1)
+        if len(self._multi):
+            offsets = np.arange(int(counts[self._multi].max()))
+            idx = self._starts[self._multi][:, None] + offsets
+            self._pad_mask = offsets < counts[self._multi][:, None]
+            self._pad_idx = np.minimum(idx, len(xs) - 1)
+        self.x_min = float(self.ux[0]) if len(self.ux) else 0.0
+        self.x_max = float(self.ux[-1]) if len(self.ux) else 0.0
+
+    def _tie_means(self, y: np.ndarray) -> np.ndarray:
+        # y: (k, n) labels aligned with x. Same order and running sums as `_average_ties`.
+        ys = y[:, self.x_order]
+        if self._has_exact_ties:
+            by_y = np.argsort(ys, axis=1, kind="stable")
+            by_group = np.argsort(self._exact_gid[by_y], axis=1, kind="stable")
+            ys = np.take_along_axis(ys, np.take_along_axis(by_y, by_group, axis=1), axis=1)
+        uy = ys[:, self._starts]
+        if len(self._multi):
+            block = np.where(self._pad_mask, ys[:, self._pad_idx], 0.0)
+            uy[:, self._multi] = np.cumsum(block, axis=2)[:, :, -1] / self.weights[self._multi]
+        return uy
+
+    def fit_predict(self, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """Predictions at z, one row per label vector in y ((k, n) -> (k, len(z)))."""
+        y = np.atleast_2d(np.asarray(y, dtype=np.float64))
+        z = np.clip(np.asarray(z, dtype=np.float64).reshape(-1), self.x_min, self.x_max)
+        uy = self._tie_means(y)
+        out = np.empty((len(y), len(z)), dtype=np.float64)
+        for k in range(len(y)):
+            if _scipy_isotonic_regression is not None:
+                fitted = np.asarray(_scipy_isotonic_regression(uy[k], weights=self.weights, increasing=True).x)
+            else:
+                fitted = _pav_inplace(uy[k].tolist(), self.weights.tolist())
+            if len(fitted) == 1:
+                out[k] = fitted[0]
+            else:
+                # Interior points of flat runs do not change np.interp, so no threshold pruning.
+                out[k] = np.interp(z, self.ux, fitted)
+        return out
+
+
+def draw_permutations(rng: np.random.Generator, n: int, k: int) -> np.ndarray:
+    """k permutations of range(n) as rows, drawn like k successive `rng.permutation(n)` calls."""
+    out = np.empty((k, n), dtype=np.int64)
+    for j in range(k):
+        out[j] = rng.permutation(n)
+    return out
+
+
+def permutation_rmses(
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    x_eval: np.ndarray,
+    y_ref: np.ndarray,
+    perm_idx: np.ndarray,
+) -> np.ndarray:
+    """RMSE vs y_ref of the isotonic map refit on `y_train[perm]`, for each row of perm_idx."""
+    model = FixedXIsotonic(x_train)
+    pred = model.fit_predict(np.asarray(y_train, dtype=np.float64)[perm_idx], x_eval)
+    return np.sqrt(np.mean((pred - np.asarray(y_ref, dtype=np.float64)) ** 2, axis=1))
+
+
+def curtailed_decision(n_hits: int, n_done: int, n_total: int, alpha: float) -> Optional[bool]:
+    """Final `(1 + hits) / (n_total + 1) <= alpha` verdict, or None while it can still change."""
+    if (1 + n_hits) / (n_total + 1) > alpha:
+        return False
+    if (1 + n_hits + (n_total - n_done)) / (n_total + 1) <= alpha:
+        return True
+    return None
+
+
+def permutation_null(
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    x_eval: np.ndarray,
+    y_ref: np.ndarray,
+    rmse_real: float,
+    n_perm: int,
+    perm_seed: int,
+    chunk_size: int = 256,
+    executor: Optional[Executor] = None,
+    max_in_flight: int = 4,
+    early_stop: bool = False,
+    alpha: float = 0.05,
+    out_csv: Optional[Path] = None,
+) -> dict:
+    """Permutation RMSEs in draw order, plus how many were run and whether the run stopped early.
+
+    A permutation counts as a hit when its RMSE is <= rmse_real (lower-tail p-value).
+    """
+    rng = np.random.default_rng(perm_seed)
+    x_train = np.asarray(x_train, dtype=np.float64)
+    y_train = np.asarray(y_train, dtype=np.float64)
+    x_eval = np.asarray(x_eval, dtype=np.float64)
+    y_ref = np.asarray(y_ref, dtype=np.float64)
+    n = len(y_train)
+    chunk_size = max(1, int(chunk_size))
+    bounds = [(lo, min(lo + chunk_size, n_perm)) for lo in range(0, n_perm, chunk_size)]
+
+    sink = None
+    if out_csv is not None:
+        out_csv = Path(out_csv)
+        out_csv.parent.mkdir(parents=True, exist_ok=True)
+        sink = out_csv.open("w", encoding="utf-8")
+        sink.write("perm,rmse\n")
+
+    def submit(lo: int, hi: int):
+        perms = draw_permutations(rng, n, hi - lo)
+        if executor is None:
+            return permutation_rmses(x_train, y_train, x_eval, y_ref, perms)
+        return executor.submit(permutation_rmses, x_train, y_train, x_eval, y_ref, perms)
+
+    parts: list[np.ndarray] = []
+    n_done = 0
+    n_hits = 0
+    stopped_early = False
+    pending: deque = deque()
+    next_chunk = 0
+    window = max(1, int(max_in_flight)) if executor is not None else 1
+    try:
+        while next_chunk < len(bounds) or pending:
+            while next_chunk < len(bounds) and len(pending) < window:
+                lo, hi = bounds[next_chunk]
+                pending.append((lo, submit(lo, hi)))
+                next_chunk += 1
+            lo, res = pending.popleft()
+            rmses = res if executor is None else res.result()
+            parts.append(rmses)
+            n_done += len(rmses)
+            n_hits += int(np.sum(rmses <= rmse_real))
+            if sink is not None:
+                sink.write("".join(f"{lo + j},{float(r)!r}\n" for j, r in enumerate(rmses)))
+                sink.flush()
+            if early_stop and n_done < n_perm and curtailed_decision(n_hits, n_done, n_perm, alpha) is not None:
+                stopped_early = True
+                break
+    finally:
+        for _, fut in pending:
+            if executor is not None:
+                fut.cancel()
+        if sink is not None:
+            sink.close()
+
+    return {
+        "rmses": np.concatenate(parts) if parts else np.empty(0, dtype=np.float64),
+        "n_done": int(n_done),
+        "stopped_early": bool(stopped_early),
+    }
@@ -0,0 +1,308 @@
+"""Seed-level bootstrap of scale-map fixed points and slopes (shared by the Path-4 fit scripts).
+
+Rows are grouped by seed once into contiguous index blocks, so a resample is one index gather
+instead of a `pd.concat` of per-seed boolean filters. The isotonic map is a NumPy/Python port of
+scikit-learn's `IsotonicRegression(increasing=True, out_of_bounds="clip")`: same tie averaging,
+the same pool-adjacent-violators solver sklearn dispatches to (SciPy's, or a port of sklearn's own
+loop on SciPy < 1.12) and the same interpolation, so fits, roots and slopes are unchanged.
+
+All resample seed draws come from one Generator in the same order as the serial loop before any
+fitting starts; `workers > 1` then farms chunks of pre-drawn resamples to a process pool, so
+results do not depend on the worker count.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import warnings
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import brentq
+
+try:  # SciPy >= 1.12; scikit-learn delegates to it when present
+    from scipy.optimize import isotonic_regression as _scipy_isotonic_regression
+except ImportError:  # pragma: no cover - older SciPy
+    _scipy_isotonic_regression = None
+
+MIN_BOOT_ROWS = 30
+
+
+def stable_polyfit(x: np.ndarray, y: np.ndarray, degree: int) -> np.ndarray:
+    if degree < 0:
+        raise ValueError("degree must be >= 0")
+    # Degenerate case: no x variation => constant predictor.
+    if len(np.unique(x)) < 2:
+        coefs = np.zeros(degree + 1, dtype=float)
+        coefs[-1] = float(np.mean(y))
+        return coefs
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            coefs = np.polyfit(x, y, degree)
+            if np.all(np.isfinite(coefs)):
+                return coefs
+        except Exception:
+            pass
+
+    coefs = np.zeros(degree + 1, dtype=float)
+    coefs[-1] = float(np.mean(y))
+    return coefs
+
+
+def root_find_on_unit_interval(f: Callable[[np.ndarray], np.ndarray], grid_points: int) -> tuple[float | None, bool]:
+    xs = np.linspace(0.0, 1.0, grid_points)
+    gx = f(xs) - xs
+
+    close_idx = np.where(np.isclose(gx, 0.0, atol=1e-6))[0]
+    if len(close_idx) > 0:
+        x0 = float(xs[close_idx[0]])
+        return x0, True
+
+    # Grid cells with a sign change (or an exact zero at the left end), in scan order.
+    sign = np.sign(gx)
+    for i in np.flatnonzero((sign[:-1] == 0) | (sign[:-1] * sign[1:] < 0)):
+        if sign[i] == 0:
+            return float(xs[i]), True
+        a, b = float(xs[i]), float(xs[i + 1])
+        try:
+            r = float(brentq(lambda z: float(f(np.array([z]))[0] - z), a, b))
+            return r, True
+        except Exception:
+            continue
+
+    # fallback: nearest approach, not strict root
+    idx = int(np.argmin(np.abs(gx)))
+    return float(xs[idx]), False
+
+
+def _pav_inplace(y: List[float], w: List[float]) -> np.ndarray:
+    # Pool-adjacent-violators with the block bookkeeping and merge order of sklearn's
+    # `_inplace_contiguous_isotonic_regression` (its path on SciPy < 1.12).
+    n = len(y)
+    target = list(range(n))
+    i = 0
+    while i < n:
+        k = target[i] + 1
+        if k == n:
+            break
+        if y[i] < y[k]:
+            i = k
+            continue
+        sum_wy = w[i] * y[i]
+        sum_w = w[i]
+        while True:
+            prev_y = y[k]
+            sum_wy += w[k] * y[k]
+            sum_w += w[k]
+            k = target[k] + 1
+            if k == n or prev_y < y[k]:
+                y[i] = sum_wy / sum_w
+                w[i] = sum_w
+                target[i] = k - 1
+                target[k - 1] = i
+                if i > 0:
+                    i = target[i - 1]
+                break
+    out = np.empty(n, dtype=np.float64)
+    i = 0
+    while i < n:
+        k = target[i] + 1
+        out[i:k] = y[i]
+        i = k
+    return out
+
+
+def _average_ties(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # sklearn's `_make_unique` on sorted x: a group runs while x - x[group start] < resolution,
+    # and its y is a left-to-right running sum divided by the count.
+    eps = np.finfo(np.float64).resolution
+    gaps = np.diff(x)
+    if np.any((gaps > 0) & (gaps < eps)):
+        starts = [0]
+        for j in range(1, len(x)):
+            if x[j] - x[starts[-1]] >= eps:
+                starts.append(j)
+        starts = np.asarray(starts, dtype=np.intp)
+    else:
+        starts = np.flatnonzero(np.concatenate(([True], gaps >= eps)))
+    counts = np.diff(np.append(starts, len(x)))
+    uy = y[starts].copy()
+    multi = np.flatnonzero(counts > 1)
+    if len(multi):
+        # Tie groups as zero-padded rows; cumsum along a row adds left to right, which is the
+        # running-sum order (trailing zeros leave the total unchanged).
+        offsets = np.arange(int(counts[multi].max()))
+        idx = starts[multi][:, None] + offsets
+        block = np.where(offsets < counts[multi][:, None], y[np.minimum(idx, len(y) - 1)], 0.0)
+        uy[multi] = np.cumsum(block, axis=1)[:, -1] / counts[multi]
+    return x[starts], uy, counts.astype(np.float64)
+
+
+class IsotonicFit:
+    """Increasing isotonic map with clipped extrapolation; `predict` is piecewise linear."""
+
+    def __init__(self, x: np.ndarray, y: np.ndarray) -> None:
+        x = np.asarray(x, dtype=np.float64).reshape(-1)
+        y = np.asarray(y, dtype=np.float64).reshape(-1)
+        order = np.lexsort((y, x))
+        x, y = x[order], y[order]
+        ux, uy, uw = _average_ties(x, y)
+
+        if _scipy_isotonic_regression is not None:
+            fitted = np.asarray(_scipy_isotonic_regression(uy, weights=uw, increasing=True).x, dtype=np.float64)
+        else:
+            fitted = _pav_inplace(uy.tolist(), uw.tolist())
+        self.x_min, self.x_max = float(np.min(ux)), float(np.max(ux))
+        keep = np.ones(len(fitted), dtype=bool)
+        keep[1:-1] = (fitted[1:-1] != fitted[:-2]) | (fitted[1:-1] != fitted[2:])
+        self.x_thresholds = ux[keep]
+        self.y_thresholds = fitted[keep]
+
+    def predict(self, z) -> np.ndarray:
+        z = np.clip(np.asarray(z, dtype=np.float64).reshape(-1), self.x_min, self.x_max)
+        if len(self.y_thresholds) == 1:
+            return self.y_thresholds.repeat(z.shape)
+        return np.interp(z, self.x_thresholds, self.y_thresholds)
+
+
+def slope_iso(iso, x_star: float, delta: float) -> float:
+    a = max(0.0, x_star - delta)
+    b = min(1.0, x_star + delta)
+    if np.isclose(a, b):
+        return 0.0
+    ya = float(iso.predict([a])[0])
+    yb = float(iso.predict([b])[0])
+    return float((yb - ya) / (b - a))
+
+
+def slope_poly(coefs: np.ndarray, x_star: float) -> float:
+    dcoefs = np.polyder(coefs)
+    return float(np.polyval(dcoefs, x_star))
+
+
+def slope_stability(slope_samples: list[float]) -> dict:
+    if len(slope_samples) == 0:
+        return {"label": "unknown", "abs_mean": None, "abs_ci_low": None, "abs_ci_high": None}
+    arr = np.abs(np.array(slope_samples, dtype=float))
+    m = float(np.mean(arr))
+    lo = float(np.quantile(arr, 0.025))
+    hi = float(np.quantile(arr, 0.975))
+    if m < 1.0 and hi < 1.0:
+        label = "stable"
+    elif m > 1.0 and lo > 1.0:
+        label = "unstable"
+    else:
+        label = "unknown"
+    return {"label": label, "abs_mean": m, "abs_ci_low": lo, "abs_ci_high": hi}
+
+
+class SeedGroups:
+    """Row indices of each seed, in original row order, built once per frame."""
+
+    def __init__(self, seeds: np.ndarray) -> None:
+        seeds = np.asarray(seeds)
+        order = np.argsort(seeds, kind="stable")
+        uniq, starts = np.unique(seeds[order], return_index=True)
+        bounds = np.append(starts, len(order))
+        self.rows: Dict[int, np.ndarray] = {
+            int(s): order[bounds[k] : bounds[k + 1]] for k, s in enumerate(uniq.tolist())
+        }
+        self._empty = np.empty(0, dtype=np.intp)
+
+    def gather(self, sample_seeds: Sequence[int]) -> np.ndarray:
+        """Concatenated row indices for a resample (seeds may repeat or be absent)."""
+        parts = [self.rows.get(int(s), self._empty) for s in sample_seeds]
+        return np.concatenate(parts) if parts else self._empty
+
+
+def _fit_resample(x: np.ndarray, y: np.ndarray, degree: int, grid_points: int, delta: float) -> Tuple[float, ...]:
+    iso = IsotonicFit(x, y)
+    x_star_iso, _ = root_find_on_unit_interval(iso.predict, grid_points=grid_points)
+    coefs = stable_polyfit(x, y, degree)
+    x_star_poly, _ = root_find_on_unit_interval(lambda z: np.polyval(coefs, z), grid_points=grid_points)
+    return (
+        float(x_star_iso),
+        float(slope_iso(iso, x_star_iso, delta=delta)),
+        float(x_star_poly),
+        float(slope_poly(coefs, x_star_poly)),
+    )
+
+
+def _fit_resamples(
+    x: np.ndarray,
+    y: np.ndarray,
+    indices: List[np.ndarray],
+    degree: int,
+    grid_points: int,
+    delta: float,
+) -> List[Optional[Tuple[float, ...]]]:
+    out: List[Optional[Tuple[float, ...]]] = []
+    for idx in indices:
+        if len(idx) < MIN_BOOT_ROWS:
+            out.append(None)
+            continue
+        out.append(_fit_resample(x[idx], y[idx], degree, grid_points, delta))
+    return out
+
+
+def _summarize(vals: list[float]) -> dict:
+    if len(vals) == 0:
+        return {"mean": None, "ci_low": None, "ci_high": None, "n": 0}
+    arr = np.array(vals, dtype=float)
+    return {
+        "mean": float(np.mean(arr)),
+        "ci_low": float(np.quantile(arr, 0.025)),
+        "ci_high": float(np.quantile(arr, 0.975)),
+        "n": int(len(arr)),
+    }
+
+
+def bootstrap_fixed_point_and_slope(
+    pair_df: pd.DataFrame,
+    train_seeds: list[int],
+    degree: int,
+    grid_points: int,
+    n_bootstrap: int,
+    random_seed: int,
+    delta: float,
+    workers: int = 0,
+) -> dict:
+    rng = np.random.default_rng(random_seed)
+    train_seed_arr = np.array(train_seeds, dtype=int)
+    draws = [rng.choice(train_seed_arr, size=len(train_seed_arr), replace=True) for _ in range(n_bootstrap)]
+
+    groups = SeedGroups(pair_df["seed"].to_numpy())
+    x = pair_df["x"].to_numpy(dtype=float)
+    y = pair_df["y"].to_numpy(dtype=float)
+    indices = [groups.gather(d) for d in draws]
+
+    if int(workers) > 1 and len(indices) > 1:
+        n_chunks = min(int(workers), len(indices))
+        chunks = [indices[k::n_chunks] for k in range(n_chunks)]
+        with ProcessPoolExecutor(max_workers=n_chunks) as ex:
+            futures = [ex.submit(_fit_resamples, x, y, c, degree, grid_points, delta) for c in chunks]
+            fitted_chunks = [f.result() for f in futures]
+        # Undo the round-robin split so results are in resample order.
+        fitted: List[Optional[Tuple[float, ...]]] = [None] * len(indices)
+        for k, res in enumerate(fitted_chunks):
+            fitted[k::n_chunks] = res
+    else:
+        fitted = _fit_resamples(x, y, indices, degree, grid_points, delta)
+
+    ok = [r for r in fitted if r is not None]
+    xstars_iso = [r[0] for r in ok]
+    slope_iso_samples = [r[1] for r in ok]
+    xstars_poly = [r[2] for r in ok]
+    slope_poly_samples = [r[3] for r in ok]
+
+    return {
+        "x_star_iso": _summarize(xstars_iso),
+        "x_star_poly": _summarize(xstars_poly),
+        "slope_iso": _summarize(slope_iso_samples),
+        "slope_poly": _summarize(slope_poly_samples),
+        "slope_iso_stability": slope_stability(slope_iso_samples),
+        "slope_poly_stability": slope_stability(slope_poly_samples),
+    }
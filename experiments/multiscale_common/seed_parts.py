@@ -0,0 +1,140 @@
+"""Per-seed Parquet part files for multiscale dataset generators.
+
+A generator's `--workers` path farms seeds to a process pool; each task simulates one seed,
+converts its rows to a frame with the generator's output dtypes (the same schema its serial path
+writes, so the combined files do not depend on `--workers`) and writes one part file, returning
+only the part's metadata. The parent never holds more than one part in memory
+when it assembles the combined CSV / Parquet, so peak memory is bounded by one seed's output.
+
+Part files are named `part-seed<seed>.parquet` and assembled in the seed order requested, so
+outputs do not depend on worker scheduling.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("--workers writes Parquet part files and requires pyarrow (pip install pyarrow)") from e
+    return pa, pq
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def part_path(part_dir: Path, seed: int) -> Path:
+    return Path(part_dir) / f"part-seed{int(seed)}.parquet"
+
+
+def write_part(df: pd.DataFrame, path: Path) -> Dict[str, object]:
+    pa, pq = _require_pyarrow()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".parquet.tmp")
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp)
+    tmp.replace(path)
+    return {"path": str(path.as_posix()), "rows": int(len(df)), "sha256": sha256_file(path)}
+
+
+def run_parts(task: Callable[[int], Dict[str, object]], seeds: Iterable[int], workers: int) -> List[Dict[str, object]]:
+    """Run `task(seed)` (which writes one part and returns its metadata) for every seed.
+
+    `task` must be picklable (a module-level function or a functools.partial of one).
+    Results come back in seed order.
+    """
+    seeds = list(seeds)
+    if int(workers) <= 1:
+        return [task(s) for s in seeds]
+    with ProcessPoolExecutor(max_workers=int(workers)) as ex:
+        return list(ex.map(task, seeds))
+
+
+def read_part(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    _, pq = _require_pyarrow()
+    return pq.read_table(path, columns=columns).to_pandas()
+
+
+def iter_parts(parts: List[Dict[str, object]]) -> Iterator[pd.DataFrame]:
+    for p in parts:
+        yield read_part(Path(str(p["path"])))
+
+
+def combine_parquet(parts: List[Dict[str, object]], out_path: Path) -> None:
+    """Concatenate parts into one Parquet file, one row group per part."""
+    pa, pq = _require_pyarrow()
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    writer = None
+    try:
+        for p in parts:
+            table = pq.read_table(str(p["path"]))
+            if writer is None:
+                writer = pq.ParquetWriter(out_path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def combine_csv(frames: Iterable[pd.DataFrame], out_path: Path, **to_csv_kwargs) -> int:
+    """Append frames to one CSV (header once). Returns the number of rows written."""
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    n = 0
+    first = True
+    for df in frames:
+        df.to_csv(out_path, mode="w" if first else "a", header=first, index=False, **to_csv_kwargs)
+        n += len(df)
+        first = False
+    if first:
+        out_path.write_text("", encoding="utf-8")
+    return n
+
+
+
+def combine_csv_grouped(
+    parts: List[Dict[str, object]], column: str, values: Sequence[object], out_path: Path, **to_csv_kwargs
+) -> int:
+    """Like `combine_csv(iter_parts(parts))`, but rows ordered by `values` of `column` first, then by
+    part. Each part is read once and split into one temporary CSV per value; the temporaries are
+    then concatenated. Returns the number of rows written."""
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    chunks = [out_path.with_name(f"{out_path.name}.group{i}.tmp") for i in range(len(values))]
+    n = 0
+    try:
+        for chunk in chunks:
+            chunk.unlink(missing_ok=True)
+        for df in iter_parts(parts):
+            key = df[column].astype(str)
+            for value, chunk in zip(values, chunks):
+                sub = df[key == str(value)]
+                first = not chunk.exists()
+                sub.to_csv(chunk, mode="w" if first else "a", header=first, index=False, **to_csv_kwargs)
+                n += len(sub)
+        with out_path.open("wb") as out:
+            for i, chunk in enumerate(c for c in chunks if c.exists()):
+                with chunk.open("rb") as f:
+                    if i > 0:
+                        f.readline()  # header
+                    shutil.copyfileobj(f, out)
+    finally:
+        for chunk in chunks:
+            chunk.unlink(missing_ok=True)
+    return n
@@ -0,0 +1,79 @@
+from collections import Counter
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from multiscale_common.block_entropy import block_codes, block_entropy, block_pattern_counts
+
+
+def _entropy_2x2_unique(grid):
+    # Golden copy of the np.unique estimator from the multiscale generators.
+    h, w = grid.shape
+    blocks = []
+    for i in range(0, h - 1, 2):
+        for j in range(0, w - 1, 2):
+            blocks.append(tuple(grid[i : i + 2, j : j + 2].flat))
+    if not blocks:
+        return 0.0
+    _, counts = np.unique(blocks, axis=0, return_counts=True)
+    p = counts.astype(float) / counts.sum()
+    return float(-(p * np.log2(p + 1e-15)).sum())
+
+
+def _entropy_counter(grid, block_size):
+    # Golden copy of GameOfLife.measure_entropy (Conway experiments).
+    blocks = []
+    H, W = grid.shape
+    for i in range(0, H - block_size + 1, block_size):
+        for j in range(0, W - block_size + 1, block_size):
+            blocks.append(tuple(grid[i : i + block_size, j : j + block_size].flatten()))
+    if not blocks:
+        return 0.0
+    counts = Counter(blocks)
+    probs = np.array(list(counts.values()), dtype=float)
+    probs /= probs.sum()
+    return -np.sum(probs * np.log2(probs + 1e-12))
+
+
+SHAPES = [(1, 1), (2, 2), (3, 5), (16, 16), (17, 33), (50, 50), (128, 128)]
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_matches_unique_estimator_exactly(shape):
+    rng = np.random.default_rng(sum(shape))
+    for density in (0.02, 0.3, 0.5):
+        grid = (rng.random(shape) < density).astype(np.int8)
+        assert block_entropy(grid, 2) == _entropy_2x2_unique(grid)
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 4])
+def test_matches_counter_estimator_exactly(block_size):
+    rng = np.random.default_rng(block_size)
+    for shape in SHAPES:
+        grid = rng.integers(0, 2, shape)
+        got = block_entropy(grid, block_size, eps=1e-12, order="first_seen")
+        assert got == _entropy_counter(grid, block_size)
+
+
+def test_batched_stack_matches_per_grid():
+    rng = np.random.default_rng(7)
+    stack = (rng.random((3, 4, 32, 32)) < 0.4).astype(np.int8)
+    for b in (2, 4):
+        out = block_entropy(stack, b, max_bins=1 << 17)  # forces several histogram chunks at b=4
+        assert out.shape == (3, 4)
+        for i in range(3):
+            for j in range(4):
+                assert out[i, j] == block_entropy(stack[i, j], b)
+
+
+def test_codes_and_counts():
+    grid = np.array([[1, 0, 0, 0], [0, 0, 0, 1]], dtype=np.int8)
+    assert block_codes(grid, 2).tolist() == [0b1000, 0b0001]
+    counts = block_pattern_counts(grid, 2)
+    assert counts.shape == (16,) and counts.sum() == 2 and counts[8] == 1 and counts[1] == 1
+    with pytest.raises(ValueError):
+        block_codes(grid, 5)
@@ -0,0 +1,51 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from multiscale_common.frozen_tracker import FrozenTracker
+
+
+def _frozen_fraction_stack(history, window):
+    # Golden copy of the np.stack / np.var estimator used by the generators.
+    if len(history) < window:
+        return 0.0
+    rec = np.stack(history[-window:])
+    return float(np.mean(np.var(rec, axis=0) == 0.0))
+
+
+@pytest.mark.parametrize("window", [1, 2, 5, 13])
+def test_matches_stacked_variance(window):
+    rng = np.random.default_rng(window)
+    tracker = FrozenTracker((12, 9), window)
+    history = []
+    for t in range(60):
+        # Sparse flips so that some cells stay frozen across whole windows.
+        snap = history[-1].copy() if history else rng.integers(0, 2, (12, 9)).astype(np.int8)
+        snap[rng.random(snap.shape) < 0.05] ^= 1
+        history.append(snap)
+        tracker.update(snap)
+        assert tracker.frozen_fraction() == _frozen_fraction_stack(history, window)
+        assert tracker.activity_fraction() == 1.0 - _frozen_fraction_stack(history, window)
+
+
+def test_batched_rows_and_ring_buffer():
+    rng = np.random.default_rng(0)
+    tracker = FrozenTracker((3, 8, 8), window=4, capacity=6)
+    per_seed = [[], [], []]
+    for _ in range(11):
+        snaps = (rng.random((3, 8, 8)) < 0.1).astype(np.int8)
+        tracker.update(snaps)
+        for i in range(3):
+            per_seed[i].append(snaps[i])
+    frac = tracker.frozen_fraction()
+    assert frac.shape == (3,)
+    for i in range(3):
+        assert frac[i] == _frozen_fraction_stack(per_seed[i], 4)
+    recent = tracker.recent(6)
+    assert np.array_equal(recent, np.stack([np.stack(h[-6:]) for h in per_seed], axis=1))
+    with pytest.raises(ValueError):
+        tracker.recent(7)
@@ -0,0 +1,98 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from multiscale_common.ising_checkerboard import (
+    CheckerboardIsing,
+    acceptance_table,
+    from_checkerboard,
+    to_checkerboard,
+)
+
+
+class _LegacyGlauber:
+    # Golden copy of the full-grid masked kernel Ising2DGlauber used before the checkerboard layout.
+    def __init__(self, seed, size, temperature):
+        self.rng = np.random.default_rng(seed)
+        self.temperature = temperature
+        self.spins = self.rng.choice(np.array([-1, 1], dtype=np.int8), size=(size, size)).astype(np.int8)
+        ii, jj = np.indices((size, size))
+        self.mask_even = (ii + jj) % 2 == 0
+        self.mask_odd = ~self.mask_even
+
+    def _update_mask(self, mask):
+        s = self.spins
+        neigh = np.roll(s, 1, axis=0) + np.roll(s, -1, axis=0) + np.roll(s, 1, axis=1) + np.roll(s, -1, axis=1)
+        dE = 2.0 * s * neigh
+        acc = (dE <= 0) & mask
+        uphill = (dE > 0) & mask
+        if np.any(uphill):
+            p = np.exp(-dE[uphill] / self.temperature)
+            acc[uphill] = self.rng.random(size=p.shape[0]) < p
+        s[acc] *= -1
+
+    def sweep(self):
+        self._update_mask(self.mask_even)
+        self._update_mask(self.mask_odd)
+
+
+def _replica(seed, size):
+    rng = np.random.default_rng(seed)
+    return rng.choice(np.array([-1, 1], dtype=np.int8), size=(size, size)).astype(np.int8), rng
+
+
+def test_layout_roundtrip():
+    s = np.random.default_rng(0).choice(np.array([-1, 1], dtype=np.int8), size=(3, 6, 6))
+    even, odd = to_checkerboard(s)
+    assert even.shape == (3, 6, 3)
+    np.testing.assert_array_equal(from_checkerboard(even, odd), s)
+    with pytest.raises(ValueError):
+        to_checkerboard(np.ones((5, 5), dtype=np.int8))
+
+
+def test_acceptance_table():
+    table = acceptance_table([2.0])
+    assert table.shape == (1, 9)
+    assert table[0, 6] == np.exp(-4.0 / 2.0)
+    assert table[0, 8] == np.exp(-8.0 / 2.0)
+    assert np.all(np.delete(table[0], [6, 8]) == 1.0)
+
+
+def test_per_replica_matches_legacy_kernel():
+    # Mixed seeds and temperatures in one batch; each replica must follow its legacy trajectory.
+    cases = [(11, 2.269), (12, 1.5), (13, 3.2), (11, 2.0)]
+    size = 16
+    legacy = [_LegacyGlauber(seed, size, temp) for seed, temp in cases]
+    spins, rngs = zip(*(_replica(seed, size) for seed, _ in cases))
+    batch = CheckerboardIsing(np.stack(spins), [temp for _, temp in cases], rngs=list(rngs))
+    for _ in range(40):
+        batch.sweep()
+        for sim in legacy:
+            sim.sweep()
+        np.testing.assert_array_equal(batch.spins(), np.stack([sim.spins for sim in legacy]))
+    np.testing.assert_array_equal(batch.binary_snapshots(), batch.spins() > 0)
+
+
+def test_shared_rng_limits():
+    # Different stream, same dynamics: T -> 0 keeps an ordered lattice, high T disorders it.
+    spins = np.ones((2, 32, 32), dtype=np.int8)
+    batch = CheckerboardIsing(spins, [0.5, 50.0], rng_mode="shared", rng=np.random.default_rng(0))
+    for _ in range(50):
+        batch.sweep()
+    m = np.abs(batch.spins().astype(float).mean(axis=(1, 2)))
+    assert m[0] > 0.99
+    assert m[1] < 0.2
+
+
+def test_rng_arguments_checked():
+    spins = np.ones((2, 4, 4), dtype=np.int8)
+    with pytest.raises(ValueError):
+        CheckerboardIsing(spins, [2.0, 2.0])
+    with pytest.raises(ValueError):
+        CheckerboardIsing(spins, [2.0, 2.0], rng_mode="shared")
+    with pytest.raises(ValueError):
+        CheckerboardIsing(spins, [2.0], rng_mode="shared", rng=np.random.default_rng(0))
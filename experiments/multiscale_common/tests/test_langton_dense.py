@@ -0,0 +1,91 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from multiscale_common.langton_dense import DIRECTIONS, LangtonDense
+
+
+class _SparseAnt:
+    # Golden copy of the set-of-black-cells ant (unbounded plane, or torus when size is given).
+    def __init__(self, pos, dir_idx, black_cells=(), size=None):
+        self.pos = np.array(pos, dtype=int)
+        self.dir_idx = dir_idx
+        self.black = set(black_cells)
+        self.size = size
+
+    def step(self):
+        key = (int(self.pos[0]), int(self.pos[1]))
+        if key in self.black:
+            self.dir_idx = (self.dir_idx - 1) % 4
+            self.black.discard(key)
+        else:
+            self.dir_idx = (self.dir_idx + 1) % 4
+            self.black.add(key)
+        self.pos = self.pos + DIRECTIONS[self.dir_idx]
+        if self.size is not None:
+            self.pos %= self.size
+
+    def window(self, x_min, y_min, h, w):
+        arr = np.zeros((h, w), dtype=np.int8)
+        for x, y in self.black:
+            if x_min <= x < x_min + h and y_min <= y < y_min + w:
+                arr[x - x_min, y - y_min] = 1
+        return arr
+
+
+def _random_cells(seed, radius=6, prob=0.1):
+    rng = np.random.default_rng(seed)
+    return [(x, y) for x in range(-radius, radius + 1) for y in range(-radius, radius + 1) if rng.random() < prob]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_plane_matches_sparse_ant(seed):
+    cells = _random_cells(seed)
+    ref = _SparseAnt((3, -2), seed % 4, cells)
+    ant = LangtonDense(pos=(3, -2), dir_idx=seed % 4, black_cells=cells, size=8, margin=4)
+    positions = np.empty((700, 2), dtype=int)
+    for _ in range(20):
+        expected = []
+        for _ in range(700):
+            ref.step()
+            expected.append(ref.pos.copy())
+        ant.run(700, positions=positions)
+        np.testing.assert_array_equal(positions, np.array(expected))
+        assert ant.dir_idx == ref.dir_idx
+        x, y = ref.pos
+        np.testing.assert_array_equal(ant.window(x - 32, y - 32, 64, 64), ref.window(x - 32, y - 32, 64, 64))
+    assert ant.step_count == 14000
+
+
+def test_step_and_run_agree_on_torus():
+    size = 12
+    ref = _SparseAnt((6, 6), 0, size=size)
+    stepped = LangtonDense(pos=(6, 6), size=size, torus=True)
+    batched = LangtonDense(pos=(6, 6), size=size, torus=True)
+    positions = np.empty((3000, 2), dtype=int)
+    batched.run(3000, positions=positions)
+    for k in range(3000):
+        ref.step()
+        stepped.step()
+        np.testing.assert_array_equal(stepped.pos, ref.pos)
+        np.testing.assert_array_equal(positions[k], ref.pos)
+    grid = np.zeros((size, size), dtype=np.uint8)
+    for x, y in ref.black:
+        grid[x, y] = 1
+    np.testing.assert_array_equal(stepped.cells, grid)
+    np.testing.assert_array_equal(batched.cells, grid)
+    assert stepped.cells.shape == (size, size)
+    with pytest.raises(ValueError):
+        batched.window(0, 0, 4, 4)
+
+
+def test_window_outside_visited_region_is_white():
+    ant = LangtonDense(size=4)
+    ant.run(50)
+    far = ant.window(1000, -1000, 16, 16)
+    assert far.shape == (16, 16) and far.dtype == np.int8 and not far.any()
+    assert ant.cells.sum() == ant.window(-200, -200, 400, 400).sum()
@@ -0,0 +1,109 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from multiscale_common.permutation_audit import (
+    FixedXIsotonic,
+    curtailed_decision,
+    draw_permutations,
+    permutation_null,
+    permutation_rmses,
+)
+
+
+def _audit_data(seed, n=300, n_eval=120, decimals=2):
+    # Direct-map-like data; rounding x gives the tie groups C_frozen produces.
+    rng = np.random.default_rng(seed)
+    x = np.round(rng.random(n), decimals)
+    y = np.clip(0.1 + 0.8 * x + rng.normal(0, 0.05, n), 0.0, 1.0)
+    x_eval = np.round(rng.random(n_eval) * 1.2 - 0.1, decimals)
+    y_ref = np.clip(0.1 + 0.8 * x_eval, 0.0, 1.0)
+    return x, y, x_eval, y_ref
+
+
+def _legacy_rmses(x, y, x_eval, y_ref, n_perm, perm_seed):
+    # Golden copy of the audit's one-sklearn-fit-per-permutation loop.
+    from sklearn.isotonic import IsotonicRegression
+
+    rng = np.random.default_rng(perm_seed)
+    out = []
+    for _ in range(n_perm):
+        y_perm = y[rng.permutation(len(y))]
+        iso = IsotonicRegression(increasing=True, out_of_bounds="clip").fit(x, y_perm)
+        out.append(float(np.sqrt(np.mean((iso.predict(x_eval) - y_ref) ** 2))))
+    return np.array(out)
+
+
+@pytest.mark.parametrize("decimals", [2, 6])
+def test_permutation_rmses_match_sklearn_loop(decimals):
+    pytest.importorskip("sklearn.isotonic")
+    x, y, x_eval, y_ref = _audit_data(decimals, decimals=decimals)
+    expected = _legacy_rmses(x, y, x_eval, y_ref, n_perm=40, perm_seed=11)
+    perms = draw_permutations(np.random.default_rng(11), len(y), 40)
+    np.testing.assert_array_equal(permutation_rmses(x, y, x_eval, y_ref, perms), expected)
+
+
+def test_fixed_x_isotonic_predicts_like_sklearn():
+    sklearn_isotonic = pytest.importorskip("sklearn.isotonic")
+    x, y, _, _ = _audit_data(3)
+    z = np.linspace(-0.5, 1.5, 2001)
+    ref = sklearn_isotonic.IsotonicRegression(increasing=True, out_of_bounds="clip").fit(x, y).predict(z)
+    np.testing.assert_array_equal(FixedXIsotonic(x).fit_predict(y, z)[0], ref)
+    np.testing.assert_allclose(FixedXIsotonic(np.full(4, 0.5)).fit_predict([0.1, 0.2, 0.3, 0.6], [0.0, 1.0]), [[0.3, 0.3]])
+
+
+def test_draw_permutations_follow_serial_stream():
+    a, b = np.random.default_rng(5), np.random.default_rng(5)
+    drawn = draw_permutations(a, 17, 6)
+    np.testing.assert_array_equal(drawn, np.stack([b.permutation(17) for _ in range(6)]))
+
+
+def test_null_independent_of_chunks_and_workers(tmp_path):
+    x, y, x_eval, y_ref = _audit_data(4)
+    kwargs = dict(rmse_real=0.05, n_perm=50, perm_seed=2)
+    serial = permutation_null(x, y, x_eval, y_ref, chunk_size=50, **kwargs)
+    with ProcessPoolExecutor(max_workers=2) as ex:
+        pooled = permutation_null(
+            x, y, x_eval, y_ref, chunk_size=7, executor=ex, max_in_flight=3, out_csv=tmp_path / "perm.csv", **kwargs
+        )
+    np.testing.assert_array_equal(pooled["rmses"], serial["rmses"])
+    assert pooled["n_done"] == 50 and not pooled["stopped_early"]
+    streamed = pd.read_csv(tmp_path / "perm.csv", float_precision="round_trip")
+    np.testing.assert_array_equal(streamed["perm"], np.arange(50))
+    np.testing.assert_array_equal(streamed["rmse"], serial["rmses"])
+
+
+def test_curtailed_decision_bounds():
+    # n_total = 99, alpha = 0.05: the final p is (1 + hits) / 100.
+    assert curtailed_decision(n_hits=5, n_done=10, n_total=99, alpha=0.05) is False
+    assert curtailed_decision(n_hits=4, n_done=10, n_total=99, alpha=0.05) is None
+    assert curtailed_decision(n_hits=0, n_done=95, n_total=99, alpha=0.05) is True
+    assert curtailed_decision(n_hits=0, n_done=94, n_total=99, alpha=0.05) is None
+
+
+@pytest.mark.parametrize("rmse_real", [0.0, 0.05, 1.0])
+def test_early_stop_keeps_full_run_verdict(rmse_real):
+    x, y, x_eval, y_ref = _audit_data(6)
+    kwargs = dict(rmse_real=rmse_real, n_perm=400, perm_seed=9, chunk_size=10, alpha=0.05)
+    full = permutation_null(x, y, x_eval, y_ref, **kwargs)
+    early = permutation_null(x, y, x_eval, y_ref, early_stop=True, **kwargs)
+    np.testing.assert_array_equal(early["rmses"], full["rmses"][: early["n_done"]])
+
+    full_pass = (1 + np.sum(full["rmses"] <= rmse_real)) / (400 + 1) <= 0.05
+    if early["stopped_early"]:
+        hits = int(np.sum(early["rmses"] <= rmse_real))
+        assert curtailed_decision(hits, early["n_done"], 400, 0.05) == full_pass
+    else:
+        assert early["n_done"] == 400
+    if rmse_real == 0.0:
+        # No hits: passes once the last 5% of permutations could no longer flip it.
+        assert early["stopped_early"] and early["n_done"] == 390
+    if rmse_real == 1.0:
+        # Every permutation is a hit: fails as soon as hits exceed alpha * (n_perm + 1).
+        assert early["stopped_early"] and early["n_done"] == 20
@@ -0,0 +1,110 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from multiscale_common.seed_bootstrap import (
+    IsotonicFit,
+    _pav_inplace,
+    SeedGroups,
+    bootstrap_fixed_point_and_slope,
+    root_find_on_unit_interval,
+    slope_iso,
+    slope_poly,
+    stable_polyfit,
+)
+
+
+def _pair_frame(seed=0, n_seeds=5, per_seed=60):
+    # Scale-map-like data with many tied x values (as C_frozen produces) and noisy y.
+    rng = np.random.default_rng(seed)
+    rows = []
+    for s in range(n_seeds):
+        x = np.round(rng.random(per_seed), 2)
+        y = np.clip(0.2 + 0.7 * x + rng.normal(0, 0.08, per_seed), 0.0, 1.0)
+        rows.append(pd.DataFrame({"seed": 100 + s, "t": np.arange(per_seed), "x": x, "y": y}))
+    # Interleave seeds so per-seed rows are not contiguous in the frame.
+    return pd.concat(rows, ignore_index=True).sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def _legacy_bootstrap(pair_df, train_seeds, degree, grid_points, n_bootstrap, random_seed, delta):
+    # Golden copy of the pd.concat + sklearn loop the fit scripts used.
+    from sklearn.isotonic import IsotonicRegression
+
+    rng = np.random.default_rng(random_seed)
+    out = []
+    train_seed_arr = np.array(train_seeds, dtype=int)
+    for _ in range(n_bootstrap):
+        sample_seeds = rng.choice(train_seed_arr, size=len(train_seed_arr), replace=True)
+        boot = pd.concat([pair_df[pair_df["seed"] == s] for s in sample_seeds], ignore_index=True)
+        if len(boot) < 30:
+            continue
+        x = boot["x"].to_numpy(dtype=float)
+        y = boot["y"].to_numpy(dtype=float)
+        iso = IsotonicRegression(increasing=True, out_of_bounds="clip").fit(x, y)
+        xi, _ = root_find_on_unit_interval(lambda z: iso.predict(z), grid_points=grid_points)
+        coefs = stable_polyfit(x, y, degree)
+        xp, _ = root_find_on_unit_interval(lambda z: np.polyval(coefs, z), grid_points=grid_points)
+        out.append((xi, slope_iso(iso, xi, delta), xp, slope_poly(coefs, xp)))
+    return out
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_isotonic_fit_matches_sklearn(seed):
+    sklearn_isotonic = pytest.importorskip("sklearn.isotonic")
+    df = _pair_frame(seed)
+    x, y = df["x"].to_numpy(), df["y"].to_numpy()
+    ref = sklearn_isotonic.IsotonicRegression(increasing=True, out_of_bounds="clip").fit(x, y)
+    fit = IsotonicFit(x, y)
+    np.testing.assert_array_equal(fit.x_thresholds, ref.X_thresholds_)
+    np.testing.assert_array_equal(fit.y_thresholds, ref.y_thresholds_)
+    z = np.linspace(-0.5, 1.5, 4001)
+    np.testing.assert_array_equal(fit.predict(z), ref.predict(z))
+
+
+def test_pav_fallback_matches_sklearn_loop():
+    # The pure-Python solver used on SciPy < 1.12 must match sklearn's own Cython loop.
+    cy = pytest.importorskip("sklearn._isotonic")
+    rng = np.random.default_rng(4)
+    y = np.cumsum(rng.normal(0.0, 1.0, 500))
+    w = rng.integers(1, 4, 500).astype(float)
+    ref_y, ref_w = y.copy(), w.copy()
+    cy._inplace_contiguous_isotonic_regression(ref_y, ref_w)
+    np.testing.assert_array_equal(_pav_inplace(y.tolist(), w.tolist()), ref_y)
+
+
+def test_isotonic_fit_constant_and_monotone():
+    fit = IsotonicFit(np.full(5, 0.3), np.array([0.1, 0.2, 0.3, 0.4, 0.5]))
+    np.testing.assert_array_equal(fit.predict([0.0, 1.0]), [0.3, 0.3])
+    fit = IsotonicFit(np.array([0.0, 0.5, 1.0]), np.array([1.0, 0.0, 2.0]))
+    np.testing.assert_allclose(fit.predict([0.0, 0.25, 1.0]), [0.5, 0.5, 2.0])
+
+
+def test_seed_groups_gather_keeps_row_order():
+    seeds = np.array([3, 1, 3, 2, 1, 3])
+    groups = SeedGroups(seeds)
+    np.testing.assert_array_equal(groups.gather([3, 1, 3]), [0, 2, 5, 1, 4, 0, 2, 5])
+    assert len(groups.gather([9])) == 0
+
+
+def test_bootstrap_matches_legacy_loop_and_workers():
+    pytest.importorskip("sklearn.isotonic")
+    df = _pair_frame(3)
+    train = [100, 101, 102, 103]
+    train_df = df[df["seed"].isin(train)]
+    kwargs = dict(degree=2, grid_points=501, n_bootstrap=25, random_seed=7, delta=0.01)
+    legacy = _legacy_bootstrap(train_df, train, **kwargs)
+
+    serial = bootstrap_fixed_point_and_slope(train_df, train, **kwargs)
+    arr = np.array(legacy)
+    assert serial["x_star_iso"]["n"] == len(legacy)
+    assert serial["x_star_iso"]["mean"] == float(np.mean(arr[:, 0]))
+    assert serial["slope_iso"]["ci_high"] == float(np.quantile(arr[:, 1], 0.975))
+    assert serial["x_star_poly"]["ci_low"] == float(np.quantile(arr[:, 2], 0.025))
+    assert serial["slope_poly"]["mean"] == float(np.mean(arr[:, 3]))
+
+    assert bootstrap_fixed_point_and_slope(train_df, train, workers=2, **kwargs) == serial
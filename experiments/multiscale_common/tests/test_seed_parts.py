@@ -0,0 +1,51 @@
+from functools import partial
+from pathlib import Path
+import sys
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from multiscale_common.seed_parts import (
+    combine_csv,
+    combine_csv_grouped,
+    combine_parquet,
+    iter_parts,
+    part_path,
+    run_parts,
+    write_part,
+)
+
+
+def _task(seed, part_dir):
+    rows = [{"seed": seed, "scheme": sc, "b": b, "value": seed + b / 10} for sc in ("a", "b") for b in (1, 2)]
+    df = pd.DataFrame(rows, columns=["seed", "scheme", "b", "value"]).astype({"b": "int16"})
+    return write_part(df, part_path(part_dir, seed))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parts_assemble_in_seed_order(tmp_path, workers):
+    parts = run_parts(partial(_task, part_dir=tmp_path / "parts"), [5, 3, 9], workers=workers)
+    assert [Path(p["path"]).name for p in parts] == ["part-seed5.parquet", "part-seed3.parquet", "part-seed9.parquet"]
+
+    n = combine_csv(iter_parts(parts), tmp_path / "all.csv")
+    assert n == 12
+    assert pd.read_csv(tmp_path / "all.csv")["seed"].tolist() == [5] * 4 + [3] * 4 + [9] * 4
+
+    combine_parquet(parts, tmp_path / "all.parquet")
+    df = pd.read_parquet(tmp_path / "all.parquet")
+    assert len(df) == 12 and str(df["b"].dtype) == "int16" and pd.api.types.is_string_dtype(df["scheme"])
+
+
+def test_combine_csv_grouped_matches_filtered_passes(tmp_path):
+    parts = run_parts(partial(_task, part_dir=tmp_path / "parts"), [5, 3, 9], workers=1)
+    n = combine_csv_grouped(parts, "scheme", ["b", "a"], tmp_path / "grouped.csv")
+    combine_csv(
+        (df[df["scheme"] == scheme] for scheme in ["b", "a"] for df in iter_parts(parts)), tmp_path / "ref.csv"
+    )
+    assert n == 12
+    assert (tmp_path / "grouped.csv").read_bytes() == (tmp_path / "ref.csv").read_bytes()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["grouped.csv", "parts", "ref.csv"]
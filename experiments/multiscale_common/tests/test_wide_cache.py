@@ -0,0 +1,105 @@
+from pathlib import Path
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from multiscale_common.wide_cache import WideCache
+
+
+def _long_table(seed=0, n_seeds=4, n_t=30, scales=(1, 2, 4, 8)):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for scheme in ("majority", "average"):
+        for estimator in ("H_2x2", "C_frozen"):
+            for s in range(n_seeds):
+                for t in range(0, n_t * 10, 10):
+                    for b in scales:
+                        rows.append((s + 100, t, scheme, b, estimator, float(rng.random())))
+    df = pd.DataFrame(rows, columns=["seed", "t", "scheme", "b", "estimator", "value"])
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def _build_pair_data(df, scheme, estimator, b1, b2):
+    # Golden copy of the per-pair pivot the Path-4 scripts used.
+    sub = df[(df["scheme"] == scheme) & (df["estimator"] == estimator)].copy()
+    piv = sub.pivot_table(index=["seed", "t"], columns="b", values="value", aggfunc="mean").reset_index()
+    if b1 not in piv.columns or b2 not in piv.columns:
+        return pd.DataFrame(columns=["seed", "t", "x", "y"])
+    out = piv[["seed", "t", b1, b2]].dropna().rename(columns={b1: "x", b2: "y"})
+    out.columns.name = None
+    return out
+
+
+def _assert_matches_pivot(df, cache):
+    assert cache.schemes == sorted(df["scheme"].astype(str).unique())
+    assert cache.estimators == sorted(df["estimator"].astype(str).unique())
+    for scheme in cache.schemes:
+        for estimator in cache.estimators:
+            for b1, b2 in [(1, 2), (2, 4), (1, 4), (4, 8), (8, 16)]:
+                expected = _build_pair_data(df, scheme, estimator, b1, b2)
+                got = cache.pair_frame(scheme, estimator, b1, b2)
+                pd.testing.assert_frame_equal(got, expected, check_index_type=False)
+
+
+def test_pair_frames_match_pivot_table():
+    df = _long_table()
+    cache = WideCache.from_long(df)
+    assert cache.exact_long
+    _assert_matches_pivot(df, cache)
+
+
+def test_pair_frames_match_with_gaps_and_duplicates():
+    df = _long_table(1)
+    rng = np.random.default_rng(1)
+    df = df.drop(index=rng.choice(len(df), len(df) // 8, replace=False))
+    df.loc[df.sample(frac=0.05, random_state=2).index, "value"] = np.nan
+    # Drop scale 8 entirely for one slice and duplicate some cells (averaged by the pivot).
+    df = df[~((df["scheme"] == "average") & (df["estimator"] == "H_2x2") & (df["b"] == 8))]
+    df = pd.concat([df, df.iloc[:50].assign(value=0.5)], ignore_index=True)
+    cache = WideCache.from_long(df)
+    assert not cache.exact_long
+    assert not cache.table("average", "H_2x2").has(8)
+    _assert_matches_pivot(df, cache)
+
+
+def test_save_load_round_trip_and_staleness(tmp_path):
+    src = tmp_path / "long.parquet"
+    df = _long_table(2)
+    df.to_parquet(src, index=False)
+    cache_path = tmp_path / "long.wide.npz"
+    calls = []
+
+    def load(path):
+        calls.append(path)
+        return pd.read_parquet(path)
+
+    built, read_df = WideCache.for_input(src, cache_path, load)
+    assert read_df is not None and len(calls) == 1
+    reused, read_df = WideCache.for_input(src, cache_path, load)
+    assert read_df is None and len(calls) == 1
+    assert reused.exact_long == built.exact_long
+    for key, tab in built.tables.items():
+        other = reused.tables[key]
+        assert other.scales == tab.scales
+        np.testing.assert_array_equal(other.values, tab.values)
+        np.testing.assert_array_equal(other.seeds, tab.seeds)
+    pd.testing.assert_frame_equal(reused.pair_frame("majority", "H_2x2", 1, 2), built.pair_frame("majority", "H_2x2", 1, 2))
+
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert WideCache.load(cache_path, source=src) is None
+    WideCache.for_input(src, cache_path, load)
+    assert len(calls) == 2
+
+
+def test_missing_slice_is_empty_frame():
+    cache = WideCache.from_long(_long_table())
+    assert cache.pair_frame("threshold_high", "H_2x2", 1, 2).empty
+    assert cache.pair_frame("majority", "H_2x2", 1, 16).empty
+    with pytest.raises(KeyError):
+        cache.table("majority", "H_2x2").column(16)
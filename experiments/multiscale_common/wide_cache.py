@@ -0,0 +1,202 @@
+"""Pivot-once wide tables for the Path-4 analysis scripts.
+
+The long table (`seed, t, scheme, b, estimator, value`) is aggregated once with a single
+`groupby(...).mean().unstack("b")`, then split into one `WideTable` per (scheme, estimator):
+(seed, t) rows x scale columns as NumPy arrays. Every scale pair, closure triple, saturation
+group and permutation audit then slices columns instead of re-filtering and re-pivoting the long
+table. `pair_frame` returns exactly what the scripts' per-pair `pivot_table` produced (same rows,
+order, values and dtypes).
+
+A cache can be saved as a single `.npz` next to the data and reused by later pipeline steps; it
+records the source file's size and mtime and is rebuilt when they no longer match.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+KEYS = ["scheme", "estimator", "seed", "t", "b"]
+PAIR_COLUMNS = ["seed", "t", "x", "y"]
+
+
+class WideTable:
+    """One (scheme, estimator) slice: rows sorted by (seed, t), one column per scale."""
+
+    def __init__(self, seed: np.ndarray, t: np.ndarray, scales: Iterable[int], values: np.ndarray, seeds: np.ndarray):
+        self.seed = seed
+        self.t = t
+        self.scales = [int(b) for b in scales]
+        self.values = values
+        # Seeds with any long-table row (before all-NaN rows are dropped), for seed splits.
+        self.seeds = seeds
+        self._col = {b: j for j, b in enumerate(self.scales)}
+
+    def has(self, b: int) -> bool:
+        return int(b) in self._col
+
+    def column(self, b: int) -> np.ndarray:
+        return self.values[:, self._col[int(b)]]
+
+    def pair_mask(self, b1: int, b2: int) -> np.ndarray:
+        return ~(np.isnan(self.column(b1)) | np.isnan(self.column(b2)))
+
+    def pair_frame(self, b1: int, b2: int) -> pd.DataFrame:
+        if not (self.has(b1) and self.has(b2)):
+            return pd.DataFrame(columns=PAIR_COLUMNS)
+        keep = self.pair_mask(b1, b2)
+        out = pd.DataFrame(
+            {"seed": self.seed[keep], "t": self.t[keep], "x": self.column(b1)[keep], "y": self.column(b2)[keep]},
+            index=np.flatnonzero(keep),
+        )
+        return out
+
+
+class WideCache:
+    def __init__(self, tables: Dict[Tuple[str, str], WideTable], exact_long: bool) -> None:
+        self.tables = tables
+        # True when every long row is its own (scheme, estimator, seed, t, b) cell with a finite
+        # value, so wide columns hold exactly the long table's values.
+        self.exact_long = bool(exact_long)
+
+    @property
+    def schemes(self) -> List[str]:
+        return sorted({s for s, _ in self.tables})
+
+    @property
+    def estimators(self) -> List[str]:
+        return sorted({e for _, e in self.tables})
+
+    def table(self, scheme: str, estimator: str) -> Optional[WideTable]:
+        return self.tables.get((str(scheme), str(estimator)))
+
+    def pair_frame(self, scheme: str, estimator: str, b1: int, b2: int) -> pd.DataFrame:
+        tab = self.table(scheme, estimator)
+        if tab is None:
+            return pd.DataFrame(columns=PAIR_COLUMNS)
+        return tab.pair_frame(b1, b2)
+
+    # --- build -----------------------------------------------------------------------------------
+
+    @classmethod
+    def from_long(cls, df: pd.DataFrame) -> "WideCache":
+        key_na = df[KEYS].isna().any(axis=1).to_numpy()
+        long = df.loc[~key_na, KEYS + ["value"]]
+        # Integer codes (in sorted string order) for the label columns keep the groupby cheap.
+        labels = {}
+        codes = {}
+        for col in ("scheme", "estimator"):
+            c, uniq = pd.factorize(long[col].astype(str) if long[col].dtype == object else long[col])
+            names = np.array([str(u) for u in uniq], dtype=object)
+            order = np.argsort(names, kind="stable")
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            codes[col] = rank[c]
+            labels[col] = names[order]
+        keyed = pd.DataFrame(
+            {
+                "scheme": codes["scheme"],
+                "estimator": codes["estimator"],
+                "seed": long["seed"].to_numpy(),
+                "t": long["t"].to_numpy(),
+                "b": long["b"].to_numpy(),
+                "value": long["value"].to_numpy(dtype=np.float64),
+            }
+        )
+        means = keyed.groupby(KEYS, sort=True)["value"].mean()
+        exact_long = (not bool(key_na.any())) and bool(df["value"].notna().all()) and len(means) == len(df)
+
+        wide = means.unstack("b")
+        idx = wide.index
+        pair_codes, pair_keys = pd.MultiIndex.from_arrays(
+            [idx.get_level_values(0), idx.get_level_values(1)]
+        ).factorize()
+        seed_all = idx.get_level_values(2).to_numpy()
+        t_all = idx.get_level_values(3).to_numpy()
+        scales_all = [int(b) for b in wide.columns]
+        vals_all = wide.to_numpy(dtype=np.float64)
+        bounds = np.flatnonzero(np.diff(pair_codes)) + 1
+        starts = np.concatenate(([0], bounds))
+        stops = np.concatenate((bounds, [len(pair_codes)]))
+
+        tables: Dict[Tuple[str, str], WideTable] = {}
+        for k, (lo, hi) in enumerate(zip(starts, stops)):
+            vals = vals_all[lo:hi]
+            # pivot_table(dropna=True): drop all-NaN scale columns, then all-NaN rows.
+            cols = ~np.all(np.isnan(vals), axis=0)
+            vals = vals[:, cols]
+            rows = ~np.all(np.isnan(vals), axis=1)
+            scheme, estimator = pair_keys[pair_codes[lo]]
+            tables[(str(labels["scheme"][scheme]), str(labels["estimator"][estimator]))] = WideTable(
+                seed=seed_all[lo:hi][rows],
+                t=t_all[lo:hi][rows],
+                scales=[b for b, c in zip(scales_all, cols) if c],
+                values=np.ascontiguousarray(vals[rows]),
+                seeds=np.unique(seed_all[lo:hi]),
+            )
+        return cls(tables, exact_long=exact_long)
+
+    # --- persistence -----------------------------------------------------------------------------
+
+    def save(self, path: Path, source: Optional[Path] = None) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = {"exact_long": self.exact_long, "tables": [], "source": _source_stamp(source)}
+        arrays: Dict[str, np.ndarray] = {}
+        for k, ((scheme, estimator), tab) in enumerate(sorted(self.tables.items())):
+            header["tables"].append({"scheme": scheme, "estimator": estimator, "scales": tab.scales})
+            arrays[f"seed_{k}"] = tab.seed
+            arrays[f"t_{k}"] = tab.t
+            arrays[f"values_{k}"] = tab.values
+            arrays[f"seeds_{k}"] = tab.seeds
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            np.savez(f, header=np.array(json.dumps(header)), **arrays)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path, source: Optional[Path] = None) -> Optional["WideCache"]:
+        """Saved cache, or None if it is missing or was built from a different source file."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        with np.load(path, allow_pickle=False) as z:
+            header = json.loads(str(z["header"]))
+            if source is not None and header.get("source") != _source_stamp(source):
+                return None
+            tables = {}
+            for k, meta in enumerate(header["tables"]):
+                tables[(meta["scheme"], meta["estimator"])] = WideTable(
+                    seed=z[f"seed_{k}"],
+                    t=z[f"t_{k}"],
+                    scales=meta["scales"],
+                    values=z[f"values_{k}"],
+                    seeds=z[f"seeds_{k}"],
+                )
+        return cls(tables, exact_long=header["exact_long"])
+
+    @classmethod
+    def for_input(cls, input_path: Path, cache_path: Optional[Path], load_table) -> Tuple["WideCache", Optional[pd.DataFrame]]:
+        """Reuse a fresh cache at `cache_path`, else build from the long table (and save it when a
+        path is given). Returns the cache and the long frame if it had to be read (else None)."""
+        input_path = Path(input_path)
+        if cache_path is not None:
+            cached = cls.load(cache_path, source=input_path)
+            if cached is not None:
+                return cached, None
+        df = load_table(input_path)
+        cache = cls.from_long(df)
+        if cache_path is not None:
+            cache.save(cache_path, source=input_path)
+        return cache, df
+
+
+def _source_stamp(source: Optional[Path]) -> Optional[dict]:
+    if source is None:
+        return None
+    st = Path(source).stat()
+    return {"path": Path(source).name, "size": int(st.st_size), "mtime_ns": int(st.st_mtime_ns)}
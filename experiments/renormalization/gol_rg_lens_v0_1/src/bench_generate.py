@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from gol_core import SimConfig, run_seed, run_seeds_schemes
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Per-scheme vs single-pass dataset generation (timing + row equality).")
+    ap.add_argument("--seeds", type=int, default=2)
+    ap.add_argument("--seed_start", type=int, default=1000)
+    ap.add_argument("--steps", type=int, default=600)
+    ap.add_argument("--grid", type=int, default=128)
+    ap.add_argument("--burn_in", type=int, default=100)
+    ap.add_argument("--measure_interval", type=int, default=10)
+    ap.add_argument("--window", type=int, default=50)
+    ap.add_argument("--scales", nargs="+", type=int, default=[1, 2, 4, 8])
+    ap.add_argument(
+        "--schemes",
+        nargs="+",
+        default=["majority", "threshold_low", "threshold_high", "average"],
+    )
+    args = ap.parse_args()
+
+    cfg = SimConfig(
+        grid_size=args.grid,
+        steps=args.steps,
+        burn_in=args.burn_in,
+        measure_interval=args.measure_interval,
+        window=args.window,
+        scales=args.scales,
+    )
+    seeds = [args.seed_start + i for i in range(args.seeds)]
+
+    t0 = time.perf_counter()
+    legacy = [row for scheme in args.schemes for seed in seeds for row in run_seed(seed=seed, cfg=cfg, scheme=scheme)]
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    by_seed = run_seeds_schemes(seeds, cfg=cfg, schemes=args.schemes)
+    single = [row for scheme in args.schemes for seed_rows in by_seed for row in seed_rows[scheme]]
+    t_single = time.perf_counter() - t0
+
+    result = {
+        "rows": len(single),
+        "rows_identical": legacy == single,
+        "per_scheme_s": round(t_legacy, 3),
+        "single_pass_s": round(t_single, 3),
+        "speedup": round(t_legacy / t_single, 2) if t_single > 0 else None,
+    }
+    print(json.dumps(result, indent=2))
+    if not result["rows_identical"]:
+        raise SystemExit("single-pass rows differ from per-scheme rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
 import argparse
+from functools import partial
 import json
 from pathlib import Path
 
 import pandas as pd
 
-from gol_core import SimConfig, run_seed
+from gol_core import SimConfig, run_seed, run_seeds_schemes
+from multiscale_common.seed_parts import combine_csv_grouped, part_path, run_parts, write_part
+
+COLUMNS = ["seed", "scheme", "t", "b", "C_frozen", "C_activity", "H"]
+
+
+def seed_part(seed: int, cfg: SimConfig, schemes: list, part_dir: Path) -> dict:
+    # One seed, all schemes (scheme-major rows) -> one Parquet part.
+    by_scheme = run_seeds_schemes([seed], cfg=cfg, schemes=schemes)[0]
+    df = pd.DataFrame([row for scheme in schemes for row in by_scheme[scheme]], columns=COLUMNS)
+    return dict(write_part(df, part_path(part_dir, seed)), seed=int(seed))
 
 
 def main() -> None:
@@ -24,6 +35,19 @@ def main() -> None:
         nargs="+",
         default=["majority", "threshold_low", "threshold_high", "average"],
     )
+    ap.add_argument(
+        "--mode",
+        choices=["single_pass", "per_scheme"],
+        default="single_pass",
+        help="single_pass simulates each seed once for all schemes; per_scheme re-simulates per scheme (legacy)",
+    )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="0 = in-memory; N >= 1 = one Parquet part per seed on N processes (single_pass only, needs pyarrow)",
+    )
+    ap.add_argument("--parts_dir", default=None, help="Part-file directory (default: <out_csv stem>_parts)")
     ap.add_argument("--out_csv", default="out/multiscale_scheme_audit.csv")
     ap.add_argument("--summary_json", default="out/run_summary.json")
     args = ap.parse_args()
@@ -37,20 +61,41 @@ def main() -> None:
         scales=args.scales,
     )
 
-    rows = []
-    for scheme in args.schemes:
-        for i in range(args.seeds):
-            seed = args.seed_start + i
-            rows.extend(run_seed(seed=seed, cfg=cfg, scheme=scheme))
-
-    df = pd.DataFrame(rows)
     out_csv = Path(args.out_csv)
     out_csv.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(out_csv, index=False)
+    parts = None
+    if args.workers > 0:
+        if args.mode != "single_pass":
+            raise SystemExit("--workers requires --mode single_pass")
+        part_dir = Path(args.parts_dir) if args.parts_dir else out_csv.with_name(f"{out_csv.stem}_parts")
+        for stale in part_dir.glob("part-seed*.parquet"):
+            stale.unlink()
+        seeds = [args.seed_start + i for i in range(args.seeds)]
+        parts = run_parts(partial(seed_part, cfg=cfg, schemes=args.schemes, part_dir=part_dir), seeds, workers=args.workers)
+        # Same row order as the in-memory path: scheme-major, then seed (each part read once).
+        n_rows = combine_csv_grouped(parts, "scheme", args.schemes, out_csv)
+    else:
+        rows = []
+        if args.mode == "per_scheme":
+            for scheme in args.schemes:
+                for i in range(args.seeds):
+                    seed = args.seed_start + i
+                    rows.extend(run_seed(seed=seed, cfg=cfg, scheme=scheme))
+        else:
+            by_seed = run_seeds_schemes([args.seed_start + i for i in range(args.seeds)], cfg=cfg, schemes=args.schemes)
+            # Same row order as the per-scheme loop: scheme-major, then seed.
+            for scheme in args.schemes:
+                for seed_rows in by_seed:
+                    rows.extend(seed_rows[scheme])
+
+        df = pd.DataFrame(rows)
+        df.to_csv(out_csv, index=False)
+        n_rows = int(len(df))
 
     summary = {
-        "rows": int(len(df)),
+        "rows": n_rows,
         "schemes": args.schemes,
+        "mode": args.mode,
         "estimators": ["C_frozen", "C_activity", "H"],
         "config": {
             "grid_size": cfg.grid_size,
@@ -64,12 +109,15 @@ def main() -> None:
         },
         "out_csv": str(out_csv.as_posix()),
     }
+    if parts is not None:
+        summary["workers"] = args.workers
+        summary["parts"] = [{k: p[k] for k in ("seed", "path", "rows", "sha256")} for p in parts]
 
     summary_json = Path(args.summary_json)
     summary_json.parent.mkdir(parents=True, exist_ok=True)
     summary_json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
 
-    print(f"Wrote {len(df)} rows to {out_csv}")
+    print(f"Wrote {n_rows} rows to {out_csv}")
     print(f"Wrote summary to {summary_json}")
 
 
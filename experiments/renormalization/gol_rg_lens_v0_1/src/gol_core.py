@@ -1,10 +1,20 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
+import sys
 from typing import Dict, List
 
 import numpy as np
 
+EXPERIMENTS = Path(__file__).resolve().parents[3]
+if str(EXPERIMENTS) not in sys.path:
+    sys.path.insert(0, str(EXPERIMENTS))
+
+from multiscale_common.block_entropy import block_entropy
+from multiscale_common.frozen_tracker import FrozenTracker
+from multiscale_common.life_bits import LifeBatch
+
 
 @dataclass
 class SimConfig:
@@ -24,19 +34,15 @@ class GoL:
     def __init__(self, size: int, seed: int):
         self.size = size
         self.rng = np.random.default_rng(seed)
-        self.grid = self.rng.integers(0, 2, (size, size), dtype=np.int8)
+        self.life = LifeBatch(self.rng.integers(0, 2, (size, size), dtype=np.int8))
+
+    @property
+    def grid(self) -> np.ndarray:
+        # Unpacked lazily from the bit-packed state; read-only view, copy before modifying.
+        return self.life.cells()[0]
 
     def step(self) -> None:
-        g = self.grid
-        n = np.zeros_like(g, dtype=np.int16)
-        for di in (-1, 0, 1):
-            for dj in (-1, 0, 1):
-                if di == 0 and dj == 0:
-                    continue
-                n += np.roll(np.roll(g, di, axis=0), dj, axis=1)
-        birth = (g == 0) & (n == 3)
-        survive = (g == 1) & ((n == 2) | (n == 3))
-        self.grid = (birth | survive).astype(np.int8)
+        self.life.step()
 
 
 def coarsen_grid(grid: np.ndarray, b: int, scheme: str) -> np.ndarray:
@@ -67,18 +73,43 @@ def coarsen_grid(grid: np.ndarray, b: int, scheme: str) -> np.ndarray:
     raise ValueError(f"Unknown scheme: {scheme}")
 
 
+def scheme_threshold(b: int, scheme: str) -> int:
+    # Every scheme is `block_sum >= threshold`; `average` (mean >= 0.5) is sum >= ceil(area / 2).
+    area = b * b
+    if scheme == "majority":
+        return (area + 1) // 2
+    if scheme == "threshold_high":
+        return int(np.ceil(0.6 * area))
+    if scheme == "threshold_low":
+        return int(np.ceil(0.4 * area))
+    if scheme == "average":
+        return (area + 1) // 2
+    raise ValueError(f"Unknown scheme: {scheme}")
+
+
+def block_sum_pyramid(grid: np.ndarray, scales: List[int]) -> Dict[int, np.ndarray]:
+    """Block sums for every scale, each built from the largest smaller scale that divides it.
+
+    `grid` is (s, s) or a (..., s, s) stack; sums keep the leading axes.
+    """
+    s = grid.shape[-1]
+    lead = grid.shape[:-2]
+    sums: Dict[int, np.ndarray] = {1: grid}
+    for b in sorted(set(scales)):
+        if b == 1:
+            continue
+        if s % b != 0:
+            raise ValueError(f"Grid size {s} is not divisible by b={b}")
+        base = max(k for k in sums if b % k == 0)
+        src = sums[base]
+        f = b // base
+        n = s // b
+        sums[b] = src.reshape(lead + (n, f, n, f)).sum(axis=(-3, -1))
+    return sums
+
+
 def entropy_2x2(grid: np.ndarray) -> float:
-    h, w = grid.shape
-    blocks = []
-    for i in range(0, h - 1, 2):
-        for j in range(0, w - 1, 2):
-            blocks.append(tuple(grid[i : i + 2, j : j + 2].flat))
-    if not blocks:
-        return 0.0
-    vals, counts = np.unique(blocks, axis=0, return_counts=True)
-    _ = vals  # keep explicit for readability
-    p = counts.astype(float) / counts.sum()
-    return float(-(p * np.log2(p + 1e-15)).sum())
+    return block_entropy(grid, 2)
 
 
 def frozen_fraction(history: List[np.ndarray], window: int) -> float:
@@ -96,7 +127,7 @@ def activity_fraction(history: List[np.ndarray], window: int) -> float:
 
 def run_seed(seed: int, cfg: SimConfig, scheme: str) -> List[Dict[str, float]]:
     gol = GoL(cfg.grid_size, seed)
-    histories: Dict[int, List[np.ndarray]] = {b: [] for b in cfg.scales}
+    trackers: Dict[int, FrozenTracker] = {}
     rows: List[Dict[str, float]] = []
 
     for t in range(1, cfg.steps + 1):
@@ -106,12 +137,12 @@ def run_seed(seed: int, cfg: SimConfig, scheme: str) -> List[Dict[str, float]]:
 
         for b in cfg.scales:
             cg = coarsen_grid(gol.grid, b, scheme)
-            histories[b].append(cg)
-            if len(histories[b]) > cfg.window + 5:
-                histories[b] = histories[b][-cfg.window - 5 :]
+            if b not in trackers:
+                trackers[b] = FrozenTracker(cg.shape, cfg.window)
+            trackers[b].update(cg)
 
-            c_frozen = frozen_fraction(histories[b], cfg.window)
-            c_activity = activity_fraction(histories[b], cfg.window)
+            c_frozen = trackers[b].frozen_fraction()
+            c_activity = trackers[b].activity_fraction()
             h = entropy_2x2(cg)
 
             rows.append(
@@ -126,3 +157,72 @@ def run_seed(seed: int, cfg: SimConfig, scheme: str) -> List[Dict[str, float]]:
                 }
             )
     return rows
+
+
+class _SchemeMeasurer:
+    # Frozen trackers over all seeds for each (scheme, scale) key, deduplicated by (b, threshold).
+
+    def __init__(self, seeds: List[int], cfg: SimConfig, schemes: List[str]) -> None:
+        self.seeds = [int(s) for s in seeds]
+        self.cfg = cfg
+        self.schemes = list(schemes)
+        self.keys = {(sc, b): (b, 0 if b == 1 else scheme_threshold(b, sc)) for sc in self.schemes for b in cfg.scales}
+        self.trackers: Dict[tuple, FrozenTracker] = {}
+        for key in sorted(set(self.keys.values())):
+            n = cfg.grid_size // key[0]
+            self.trackers[key] = FrozenTracker((len(self.seeds), n, n), cfg.window)
+        self.rows: List[Dict[str, List[Dict[str, float]]]] = [{sc: [] for sc in self.schemes} for _ in self.seeds]
+
+    def measure(self, grids: np.ndarray, t: int) -> None:
+        # grids: (S, H, W), one snapshot per seed.
+        cfg = self.cfg
+        sums = block_sum_pyramid(grids, cfg.scales)
+        measured: Dict[tuple, tuple] = {}
+        for key, tracker in self.trackers.items():
+            b, thr = key
+            cg = grids if b == 1 else (sums[b] >= thr).astype(np.int8)
+            tracker.update(cg)
+            measured[key] = (tracker.frozen_fraction(), tracker.activity_fraction(), block_entropy(cg, 2))
+
+        for i, seed in enumerate(self.seeds):
+            for scheme in self.schemes:
+                for b in cfg.scales:
+                    c_frozen, c_activity, h = measured[self.keys[(scheme, b)]]
+                    self.rows[i][scheme].append(
+                        {
+                            "seed": seed,
+                            "scheme": scheme,
+                            "t": int(t),
+                            "b": int(b),
+                            "C_frozen": float(c_frozen[i]),
+                            "C_activity": float(c_activity[i]),
+                            "H": float(h[i]),
+                        }
+                    )
+
+
+def measurement_times(cfg: SimConfig) -> List[int]:
+    return [t for t in range(1, cfg.steps + 1) if t >= cfg.burn_in and t % cfg.measure_interval == 0]
+
+
+def run_seeds_schemes(seeds: List[int], cfg: SimConfig, schemes: List[str]) -> List[Dict[str, List[Dict[str, float]]]]:
+    """Single-pass equivalent of `run_seed` for several seeds and schemes.
+
+    All seeds are stepped together as one bit-packed stack (initial grids drawn exactly as in
+    `GoL`), and unpacked only at measurement steps. Each measured stack is coarsened for all
+    schemes from a shared block-sum pyramid; schemes that resolve to the same threshold at a
+    scale (always the case at b=1) share one frozen tracker, and entropies are computed for all
+    seeds at once. Returns, per seed, rows per scheme identical to `run_seed(seed, cfg, scheme)`.
+    """
+    if not seeds:
+        return []
+    measurer = _SchemeMeasurer(seeds, cfg, schemes)
+    life = LifeBatch(np.stack([GoL(cfg.grid_size, seed).grid for seed in seeds]))
+    for t in measurement_times(cfg):
+        life.step(t - life.generation)
+        measurer.measure(life.cells(), t)
+    return measurer.rows
+
+
+def run_seed_schemes(seed: int, cfg: SimConfig, schemes: List[str]) -> Dict[str, List[Dict[str, float]]]:
+    return run_seeds_schemes([seed], cfg, schemes)[0]
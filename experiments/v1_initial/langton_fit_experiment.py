@@ -20,7 +20,15 @@ from dataclasses import dataclass
 from typing import List, Tuple, Dict
 import time
 import os
+import sys
 from datetime import datetime
+from pathlib import Path
+
+_EXPERIMENTS = Path(__file__).resolve().parents[1]
+if str(_EXPERIMENTS) not in sys.path:
+    sys.path.insert(0, str(_EXPERIMENTS))
+
+from multiscale_common.langton_dense import LangtonDense
 
 
 # ============================================================================
@@ -73,46 +81,39 @@ class LangtonsAnt:
             seed: Random seed (not used for deterministic ant, but for consistency)
         """
         self.size = size
-        self.grid = np.zeros((size, size), dtype=int)  # 0=white, 1=black
-        
-        # Ant starts at center
-        self.pos = np.array([size // 2, size // 2])
-        self.dir_idx = 0  # Index into DIRECTIONS (0=North)
+        # Ant starts at center of a size x size torus, all cells white
+        self.engine = LangtonDense(pos=(size // 2, size // 2), dir_idx=0, size=size, torus=True)
         
         # History tracking
         self.position_history = [self.pos.copy()]
-        self.grid_history = [self.grid.copy()]
-        self.step_count = 0
+    
+    @property
+    def grid(self) -> np.ndarray:
+        """Current grid (0=white, 1=black), a view into the engine bitmap"""
+        return self.engine.cells
+    
+    @property
+    def pos(self) -> np.ndarray:
+        return self.engine.pos
+    
+    @property
+    def dir_idx(self) -> int:
+        return self.engine.dir_idx
+    
+    @property
+    def step_count(self) -> int:
+        return self.engine.step_count
         
     def step(self):
         """Perform one step of Langton's Ant"""
-        x, y = self.pos
-        
-        # Get current cell color
-        current_color = self.grid[x, y]
-        
-        # Turn and flip color
-        if current_color == 0:  # White
-            # Turn right
-            self.dir_idx = (self.dir_idx + 1) % 4
-            self.grid[x, y] = 1  # Make black
-        else:  # Black
-            # Turn left
-            self.dir_idx = (self.dir_idx - 1) % 4
-            self.grid[x, y] = 0  # Make white
-        
-        # Move forward
-        dx, dy = self.DIRECTIONS[self.dir_idx]
-        x = (x + dx) % self.size
-        y = (y + dy) % self.size
-        self.pos = np.array([x, y])
-        
-        # Update history
-        self.position_history.append(self.pos.copy())
-        if len(self.grid_history) < 1000:  # Limit memory
-            self.grid_history.append(self.grid.copy())
-        
-        self.step_count += 1
+        self.engine.step()
+        self.position_history.append(self.pos)
+    
+    def run(self, n: int):
+        """Perform n steps as one engine batch, recording every position"""
+        positions = np.empty((n, 2), dtype=int)
+        self.engine.run(n, positions=positions)
+        self.position_history.extend(positions)
     
     # ------------------------------------------------------------------------
     # FIT Framework Estimators
@@ -556,8 +557,7 @@ class PropositionTester:
             ant = LangtonsAnt(size=self.config.grid_size)
             
             # Evolve to highway regime
-            for step in range(self.config.highway_end):
-                ant.step()
+            ant.run(self.config.highway_end)
             
             # Measure timescales in highway regime
             # Fast timescale: force/direction fluctuations
@@ -15,12 +15,21 @@ Output:
 """
 
 import numpy as np
-from collections import Counter
 from dataclasses import dataclass
 from typing import List, Tuple, Dict
 import time
 import os
+import sys
 from datetime import datetime
+from pathlib import Path
+
+_EXPERIMENTS = Path(__file__).resolve().parents[1]
+if str(_EXPERIMENTS) not in sys.path:
+    sys.path.insert(0, str(_EXPERIMENTS))
+
+from multiscale_common.block_entropy import block_entropy
+from multiscale_common.frozen_tracker import FrozenTracker
+from multiscale_common.life_bits import LifeBatch
 
 
 # ============================================================================
@@ -58,45 +67,33 @@ class ExperimentConfig:
 class GameOfLife:
     """Conway's Game of Life with FIT Framework instrumentation"""
     
-    def __init__(self, size: int = 50, seed: int = None):
+    def __init__(self, size: int = 50, seed: int = None, window: int = 50):
         """
         Initialize Game of Life grid
         
         Args:
             size: Grid dimension (size x size)
             seed: Random seed for reproducibility
+            window: Longest window any estimator will ask for (history ring size)
         """
         if seed is not None:
             np.random.seed(seed)
         
         self.size = size
         self.grid = np.random.randint(0, 2, (size, size))
-        self.history = [self.grid.copy()]
+        self.life = LifeBatch(self.grid)  # packed state; self.grid is its unpacked copy
+        # Last-change index per cell + ring buffer of the last `window` generations
+        self.tracker = FrozenTracker(self.grid.shape, window, capacity=window, dtype=self.grid.dtype)
+        self.tracker.update(self.grid)
         self.generation = 0
         
     def step(self):
         """Perform one generation step"""
-        # Convolution kernel for counting neighbors
-        kernel = np.array([[1, 1, 1],
-                          [1, 0, 1],
-                          [1, 1, 1]])
-        
-        # Use periodic boundary conditions (toroidal grid)
-        padded = np.pad(self.grid, 1, mode='wrap')
-        neighbors = np.zeros_like(self.grid)
-        
-        for i in range(3):
-            for j in range(3):
-                if i == 1 and j == 1:
-                    continue
-                neighbors += padded[i:i+self.size, j:j+self.size]
-        
-        # Apply Conway's rules
-        birth = (self.grid == 0) & (neighbors == 3)
-        survival = (self.grid == 1) & ((neighbors == 2) | (neighbors == 3))
-        self.grid = (birth | survival).astype(int)
+        # Toroidal B3/S23 on the shared bit-packed kernel (same rule as the old padded sum)
+        self.life.step()
+        self.grid = self.life.cells(dtype=int)[0]
         
-        self.history.append(self.grid.copy())
+        self.tracker.update(self.grid)
         self.generation += 1
         
     # ------------------------------------------------------------------------
@@ -143,23 +140,8 @@ class GameOfLife:
         Returns:
             Entropy estimate in bits
         """
-        blocks = []
-        H, W = self.grid.shape
-        
-        for i in range(0, H - block_size + 1, block_size):
-            for j in range(0, W - block_size + 1, block_size):
-                block = tuple(self.grid[i:i+block_size, j:j+block_size].flatten())
-                blocks.append(block)
-        
-        if not blocks:
-            return 0.0
-        
-        counts = Counter(blocks)
-        probs = np.array(list(counts.values()), dtype=float)
-        probs /= probs.sum()
-        
-        # Shannon entropy
-        return -np.sum(probs * np.log2(probs + 1e-12))
+        # Shared vectorized estimator; first_seen order keeps the Counter-based sums bit for bit
+        return block_entropy(self.grid, block_size, eps=1e-12, order="first_seen")
     
     def measure_constraint(self, window: int = 50) -> float:
         """
@@ -173,12 +155,10 @@ class GameOfLife:
         Returns:
             Fraction of frozen cells (0 to 1)
         """
-        if len(self.history) < window:
+        if self.tracker.n < window:
             return 0.0
         
-        recent = np.array(self.history[-window:])
-        var_per_cell = np.var(recent, axis=0)
-        constrained = np.sum(var_per_cell == 0.0)
+        constrained = np.sum(self.tracker.frozen_mask(window))
         
         return constrained / self.grid.size
     
@@ -194,10 +174,10 @@ class GameOfLife:
         Returns:
             Compression-based constraint estimate
         """
-        if len(self.history) < window:
+        if self.tracker.n < window:
             return 0.0
         
-        recent = np.array(self.history[-window:])
+        recent = self.tracker.recent(window)
         
         # Simple run-length encoding as compression proxy
         unique_patterns = len(np.unique(recent.reshape(window, -1), axis=0))
@@ -218,10 +198,10 @@ class GameOfLife:
         Returns:
             Estimated intrinsic dimension (normalized)
         """
-        if len(self.history) < window:
+        if self.tracker.n < window:
             return 1.0
         
-        recent = np.array(self.history[-window:])
+        recent = self.tracker.recent(window)
         flattened = recent.reshape(window, -1).astype(float)
         
         # Use covariance-based dimension estimate
@@ -276,7 +256,7 @@ class PropositionTester:
             if verbose and run % 5 == 0:
                 print(f"  Run {run+1}/{self.config.num_runs}...")
             
-            gol = GameOfLife(size=self.config.grid_size, seed=run)
+            gol = GameOfLife(size=self.config.grid_size, seed=run, window=self.config.window_W)
             
             # Evolve until nirvana detected or max steps
             nirvana_gen = None
@@ -364,7 +344,7 @@ class PropositionTester:
             if verbose and run % 5 == 0:
                 print(f"  Run {run+1}/{self.config.num_runs}...")
             
-            gol = GameOfLife(size=self.config.grid_size, seed=run)
+            gol = GameOfLife(size=self.config.grid_size, seed=run, window=self.config.window_W)
             C_values = []
             
             for gen in range(self.config.max_steps):
@@ -427,7 +407,7 @@ class PropositionTester:
             if verbose and run % 5 == 0:
                 print(f"  Run {run+1}/{self.config.num_runs}...")
             
-            gol = GameOfLife(size=self.config.grid_size, seed=run)
+            gol = GameOfLife(size=self.config.grid_size, seed=run, window=self.config.window_W)
             
             H_series = []
             C_series = []
@@ -513,7 +493,7 @@ class PropositionTester:
             if verbose and run % 5 == 0:
                 print(f"  Run {run+1}/{self.config.num_runs}...")
             
-            gol = GameOfLife(size=self.config.grid_size, seed=run)
+            gol = GameOfLife(size=self.config.grid_size, seed=run, window=self.config.window_W)
             
             violations = 0
             total_checks = 0
@@ -584,7 +564,7 @@ class PropositionTester:
             if verbose and run % 2 == 0:
                 print(f"  Run {run+1}/10...")
             
-            gol = GameOfLife(size=self.config.grid_size, seed=run)
+            gol = GameOfLife(size=self.config.grid_size, seed=run, window=self.config.window_W)
             
             C_frozen = []
             C_compression = []
@@ -49,3 +49,8 @@ def validate_prereg(cfg: dict) -> None:
     if max_evals <= 0:
         raise ValueError("budget.oracle_evals_max must be positive")
 
+    ec = cfg["search"].get("eval_cache") or {}
+    if bool(ec.get("enabled", False)) and ec.get("store_path") and float(cfg["domain"]["oracle"].get("noise_std", 0.0)) > 0:
+        # Oracle noise is drawn per batch position, so a stored result is not a property of the candidate.
+        raise ValueError("search.eval_cache.store_path requires domain.oracle.noise_std: 0")
+
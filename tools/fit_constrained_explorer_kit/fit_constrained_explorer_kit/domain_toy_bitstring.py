@@ -1,19 +1,49 @@
+"""Toy bitstring domain: sparse bitstrings under a max_ones constraint, hidden linear reward.
+
+Determinism contract
+--------------------
+Every generator draws from its own `np.random.default_rng` seeded by
+sha256(seed_string + "::" + seed_tag), so output depends only on (seed_string, seed_tag,
+arguments, generator) and never on call order or on other policies.
+
+`domain.generator` selects the draw schedule (default "loop"):
+
+- "loop": the original row-at-a-time schedule (`rng.choice` per row). Kept so locked
+  preregs replay identically.
+- "batched": whole-batch draws, vectorized. For a given seed tag the stream is consumed as
+    sample_random: k ~ integers(0, max_ones+1, size=n); keys ~ random((n, n_bits));
+                   row i sets the k_i bits with the smallest keys.
+    mutate:        parent ~ integers(0, n_parents, size=n); keys ~ random((n, n_bits));
+                   flip the flip_k bits with the smallest keys; then, only if some row
+                   exceeds max_ones, keys2 ~ random((n, n_bits)) and each such row clears
+                   its excess on-bits with the smallest keys2.
+  Batched output is a pure function of n (row i of a batch of n is not row i of a batch
+  of n+1), and differs from "loop" output for the same seed tag.
+
+Fingerprints are sha256 of the "0101..." string and identical under both generators.
+"""
+
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Tuple
+import hashlib
+from typing import Dict, List, Tuple
 
 import numpy as np
 
 from .utils_hash import sha256_hex
 
 
+GENERATORS = ("loop", "batched")
+
+
 @dataclass(frozen=True)
 class DomainConfig:
     n_bits: int
     max_ones: int
     noise_std: float
     seed_string: str
+    generator: str = "loop"
 
 
 def _rng(seed_string: str) -> np.random.Generator:
@@ -23,8 +53,53 @@ def _rng(seed_string: str) -> np.random.Generator:
     return np.random.default_rng(seed)
 
 
+def _smallest_k_mask(keys: np.ndarray, k: np.ndarray, k_max: int) -> np.ndarray:
+    # Row-wise mask of the k[i] positions with the smallest keys (k[i] <= k_max).
+    n, d = keys.shape
+    mask = np.zeros((n, d), dtype=bool)
+    k_max = min(int(k_max), d)
+    if n == 0 or k_max <= 0:
+        return mask
+    if k_max < d:
+        part = np.argpartition(keys, k_max - 1, axis=1)[:, :k_max]
+    else:
+        part = np.broadcast_to(np.arange(d), (n, d))
+    order = np.argsort(np.take_along_axis(keys, part, axis=1), axis=1, kind="stable")
+    idx = np.take_along_axis(part, order, axis=1)
+    take = np.arange(k_max)[None, :] < np.asarray(k)[:, None]
+    rows = np.broadcast_to(np.arange(n)[:, None], idx.shape)
+    mask[rows[take], idx[take]] = True
+    return mask
+
+
+def _sample_random_batched(cfg: DomainConfig, n: int, rng: np.random.Generator) -> np.ndarray:
+    k = rng.integers(0, int(cfg.max_ones) + 1, size=int(n))
+    keys = rng.random((int(n), int(cfg.n_bits)))
+    return _smallest_k_mask(keys, k, int(cfg.max_ones)).astype(np.int8)
+
+
+def _mutate_batched(
+    cfg: DomainConfig, parents: np.ndarray, n_children: int, flip_k: int, rng: np.random.Generator
+) -> np.ndarray:
+    n = int(n_children)
+    pick = rng.integers(0, parents.shape[0], size=n)
+    keys = rng.random((n, int(cfg.n_bits)))
+    flip = _smallest_k_mask(keys, np.full((n,), int(flip_k)), int(flip_k))
+    kids = (parents[pick].astype(bool) ^ flip).astype(np.int8)
+
+    excess = kids.sum(axis=1).astype(int) - int(cfg.max_ones)
+    if (excess > 0).any():
+        keys2 = rng.random((n, int(cfg.n_bits)))
+        keys2[kids == 0] = np.inf
+        drop = _smallest_k_mask(keys2, np.clip(excess, 0, None), int(excess.max()))
+        kids[drop] = 0
+    return kids
+
+
 def sample_random(cfg: DomainConfig, n: int, seed_tag: str) -> np.ndarray:
     rng = _rng(cfg.seed_string + "::" + seed_tag)
+    if cfg.generator == "batched":
+        return _sample_random_batched(cfg, int(n), rng)
     X = np.zeros((int(n), int(cfg.n_bits)), dtype=np.int8)
     # Sample feasible-by-construction (sparse) for the toy max_ones constraint.
     for i in range(int(n)):
@@ -42,6 +117,8 @@ def is_feasible(cfg: DomainConfig, X: np.ndarray) -> np.ndarray:
 
 def mutate(cfg: DomainConfig, parents: np.ndarray, n_children: int, flip_k: int, seed_tag: str) -> np.ndarray:
     rng = _rng(cfg.seed_string + "::" + seed_tag)
+    if cfg.generator == "batched":
+        return _mutate_batched(cfg, parents, int(n_children), int(flip_k), rng)
     n_par = parents.shape[0]
     kids = np.empty((int(n_children), int(cfg.n_bits)), dtype=np.int8)
     for i in range(int(n_children)):
@@ -63,7 +140,9 @@ def oracle_reward(cfg: DomainConfig, X: np.ndarray) -> np.ndarray:
     # Hidden linear reward with deterministic weights.
     rng = _rng(cfg.seed_string + "::oracle_weights")
     w = rng.normal(0.0, 1.0, size=(cfg.n_bits,))
-    base = X.astype(np.float64) @ w
+    # Row-wise sum (not BLAS gemv) so a candidate's reward does not depend on which other
+    # rows share its batch; cached/resumed rewards then match a fresh evaluation bit for bit.
+    base = np.einsum("nd,d->n", X.astype(np.float64), w)
     if cfg.noise_std > 0:
         rng2 = _rng(cfg.seed_string + "::oracle_noise")
         base = base + rng2.normal(0.0, cfg.noise_std, size=base.shape)
@@ -71,7 +150,19 @@ def oracle_reward(cfg: DomainConfig, X: np.ndarray) -> np.ndarray:
 
 
 def fingerprint_bits(x: np.ndarray) -> str:
-    return sha256_hex("".join(map(str, x.astype(int).tolist())))
+    # sha256 of the "0101..." string; ASCII '0'/'1' are 48/49, so hash the shifted bytes directly.
+    return hashlib.sha256((np.asarray(x, dtype=np.uint8) + np.uint8(48)).tobytes()).hexdigest()
+
+
+def fingerprint_batch(X: np.ndarray) -> List[str]:
+    A = np.ascontiguousarray(np.asarray(X, dtype=np.uint8) + np.uint8(48))
+    return [hashlib.sha256(row.tobytes()).hexdigest() for row in A]
+
+
+def packed_keys(X: np.ndarray) -> List[bytes]:
+    # Compact exact identity of each row (n_bits/8 bytes), for dict/set membership.
+    P = np.packbits(np.asarray(X, dtype=np.uint8), axis=1)
+    return [row.tobytes() for row in P]
 
 
 def decode_cfg(prereg: dict) -> DomainConfig:
@@ -79,7 +170,12 @@ def decode_cfg(prereg: dict) -> DomainConfig:
     max_ones = int(prereg["domain"]["constraint"]["max_ones"])
     noise_std = float(prereg["domain"]["oracle"].get("noise_std", 0.0))
     seed_string = str(prereg["search"]["seed_string"])
-    return DomainConfig(n_bits=n_bits, max_ones=max_ones, noise_std=noise_std, seed_string=seed_string)
+    generator = str(prereg["domain"].get("generator", "loop"))
+    if generator not in GENERATORS:
+        raise ValueError(f"Unsupported domain.generator: {generator} (supported: {'|'.join(GENERATORS)})")
+    return DomainConfig(
+        n_bits=n_bits, max_ones=max_ones, noise_std=noise_std, seed_string=seed_string, generator=generator
+    )
 
 
 def summarize_constraints(cfg: DomainConfig) -> Dict[str, object]:
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .domain_toy_bitstring import DomainConfig, packed_keys
+from .utils_hash import sha256_hex
+
+
+def cache_namespace(cfg: DomainConfig) -> str:
+    # Oracle outputs depend on the hidden weights (seed_string) and the domain shape/noise.
+    return sha256_hex(f"{cfg.seed_string}|{cfg.n_bits}|{cfg.max_ones}|{cfg.noise_std}")[:16]
+
+
+def _to_json_reward(x: float) -> Optional[float]:
+    return None if math.isnan(float(x)) else float(x)
+
+
+def _from_json_reward(x: Optional[float]) -> float:
+    return float("nan") if x is None else float(x)
+
+
+class EvalCache:
+    """Packed-bits index of oracle evaluations.
+
+    - `seen`: candidates already in this run's history. Re-proposals are skipped and do not
+      consume oracle budget.
+    - `stored`: results loaded from (and appended to) an optional JSONL store shared across
+      runs, keyed by namespace + packed bits. A hit enters the history but skips the oracle call.
+    - `replay`: (fingerprint, feasible, reward) rows from an interrupted run's partial trace;
+      the deterministic loop re-proposes them in order, and each is served without an oracle call.
+    """
+
+    def __init__(self, cfg: DomainConfig, store_path: Path | None = None) -> None:
+        self.ns = cache_namespace(cfg)
+        self.store_path = store_path
+        self.seen: Dict[bytes, int] = {}
+        self.stored: Dict[bytes, Tuple[bool, float]] = {}
+        self.replay: List[dict] = []
+        self.stats = {"proposed": 0, "dup_skipped": 0, "store_hits": 0, "resumed": 0, "oracle_calls": 0}
+        if store_path is not None and store_path.exists():
+            for line in store_path.read_text(encoding="utf-8").splitlines():
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                if rec.get("ns") == self.ns:
+                    self.stored[bytes.fromhex(rec["key"])] = (bool(rec["feasible"]), _from_json_reward(rec["reward"]))
+
+    def keys(self, X: np.ndarray) -> List[bytes]:
+        return packed_keys(X)
+
+    def persist(self, keys: List[bytes], feasible: np.ndarray, reward: np.ndarray) -> None:
+        if self.store_path is None or not keys:
+            return
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.store_path.open("a", encoding="utf-8") as f:
+            for k, fe, r in zip(keys, feasible.tolist(), reward.tolist()):
+                self.stored[k] = (bool(fe), float(r))
+                f.write(json.dumps({"ns": self.ns, "key": k.hex(), "feasible": bool(fe), "reward": _to_json_reward(r)}) + "\n")
+
+    def summary(self) -> Dict[str, int]:
+        s = dict(self.stats)
+        s["store_size"] = len(self.stored)
+        return s
+
+
+def append_partial_trace(path: Path, rows: List[dict]) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(dict(row, reward=_to_json_reward(row["reward"]))) + "\n")
+
+
+def load_partial_trace(path: Path) -> List[dict]:
+    if not path.exists():
+        return []
+    text = path.read_text(encoding="utf-8")
+    rows = []
+    kept = 0
+    for line in text.splitlines(keepends=True):
+        if not line.endswith("\n"):
+            break  # torn last write of an interrupted run
+        kept += len(line)
+        if line.strip():
+            row = json.loads(line)
+            row["reward"] = _from_json_reward(row["reward"])
+            rows.append(row)
+    if kept < len(text):
+        # Drop the torn tail so rows appended by the resumed run start on a fresh line.
+        path.write_text(text[:kept], encoding="utf-8")
+    return rows
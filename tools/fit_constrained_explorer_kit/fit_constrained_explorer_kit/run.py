@@ -9,8 +9,10 @@ from typing import Any, Dict
 import numpy as np
 
 from .config import load_prereg, validate_prereg
-from .domain_toy_bitstring import decode_cfg, is_feasible, oracle_reward, fingerprint_bits, summarize_constraints
+from .domain_toy_bitstring import decode_cfg, is_feasible, oracle_reward, fingerprint_batch, summarize_constraints
+from .eval_cache import EvalCache, append_partial_trace, load_partial_trace
 from .search import propose
+from .surrogate_ridge import IncrementalRidge
 from .plot_onepager import plot_onepage
 from .report import render_report
 
@@ -27,6 +29,7 @@ def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--prereg", required=True)
     ap.add_argument("--run_id", default=None)
+    ap.add_argument("--resume", action="store_true", help="Continue an interrupted run (same --run_id) from its partial trace")
     args = ap.parse_args()
 
     cfg = load_prereg(args.prereg).raw
@@ -40,7 +43,14 @@ def main() -> None:
     run_dir.mkdir(parents=True, exist_ok=True)
 
     # lock prereg
-    _write_text(run_dir / "PREREG.locked.yaml", Path(args.prereg).read_text(encoding="utf-8"))
+    prereg_text = Path(args.prereg).read_text(encoding="utf-8")
+    locked = run_dir / "PREREG.locked.yaml"
+    if args.resume:
+        if args.run_id is None:
+            raise ValueError("--resume requires --run_id")
+        if locked.exists() and locked.read_text(encoding="utf-8") != prereg_text:
+            raise ValueError(f"--resume: {args.prereg} differs from the run's locked prereg {locked}")
+    _write_text(locked, prereg_text)
 
     dom = decode_cfg(cfg)
 
@@ -50,38 +60,107 @@ def main() -> None:
     init_random = int(cfg["search"]["init_random"])
     policies = list(cfg["search"]["policies"])
 
-    evaluated_X: list[np.ndarray] = []
-    evaluated_y: list[float] = []
+    # Evaluated history in preallocated buffers (the budget bounds its size), so each round
+    # slices views instead of re-stacking a list of rows.
+    evaluated_X = np.zeros((max_evals, int(dom.n_bits)), dtype=np.int8)
+    evaluated_y = np.full((max_evals,), np.nan, dtype=np.float64)
     evaluated_fp: list[str] = []
+    n_eval = 0
     trace: list[dict] = []
 
     best = {"reward": float("-inf"), "fingerprint": None, "bits": None, "policy": None, "eval_index": None}
 
+    ec_cfg = cfg["search"].get("eval_cache") or {}
+    cache = None
+    partial_trace = run_dir / "trace.partial.jsonl"
+    if bool(ec_cfg.get("enabled", False)):
+        store_path = None
+        if ec_cfg.get("store_path"):
+            store_path = Path(str(ec_cfg["store_path"]))
+            if not store_path.is_absolute():
+                store_path = kit_dir / store_path
+        cache = EvalCache(dom, store_path=store_path)
+        if args.resume:
+            cache.replay = load_partial_trace(partial_trace)
+        elif partial_trace.exists():
+            partial_trace.unlink()
+    elif args.resume:
+        raise ValueError("--resume requires search.eval_cache.enabled: true (the partial trace is written by the cache)")
+
+    def _lookup(X: np.ndarray, fps: list[str]) -> tuple[list[int], np.ndarray, list[bytes]]:
+        # Rows to evaluate (first occurrences not yet in the history, within budget) and their
+        # rewards, served from the resume trace or the store where possible, else the oracle.
+        assert cache is not None
+        keys = cache.keys(X)
+        take: list[int] = []
+        batch_seen: set[bytes] = set()
+        for i, k in enumerate(keys):
+            if n_eval + len(take) >= max_evals:
+                break
+            cache.stats["proposed"] += 1
+            if k in cache.seen or k in batch_seen:
+                cache.stats["dup_skipped"] += 1
+                continue
+            batch_seen.add(k)
+            take.append(i)
+
+        r = np.full((X.shape[0],), np.nan, dtype=np.float64)
+        need: list[int] = []
+        for pos, i in enumerate(take):
+            j = n_eval + pos
+            if j < len(cache.replay):
+                if cache.replay[j]["fingerprint"] != fps[i]:
+                    raise RuntimeError(f"Resume diverged at eval_index {j + 1}: trace and re-proposal differ")
+                r[i] = float(cache.replay[j]["reward"])
+                cache.stats["resumed"] += 1
+            elif keys[i] in cache.stored:
+                r[i] = cache.stored[keys[i]][1]
+                cache.stats["store_hits"] += 1
+            else:
+                need.append(i)
+        if need:
+            # Noise is drawn by row position over the whole proposed batch, so with noise the misses
+            # are picked out of a full-batch evaluation (the same values a cache-off run sees).
+            r[need] = oracle_reward(dom, X)[need] if dom.noise_std > 0 else oracle_reward(dom, X[need])
+            cache.stats["oracle_calls"] += len(need)
+            cache.persist([keys[i] for i in need], is_feasible(dom, X[need]), r[need])
+        return take, r, keys
+
     def _eval_batch(X: np.ndarray, policy: str, start_idx: int) -> int:
-        nonlocal best
+        nonlocal best, n_eval
         feas = is_feasible(dom, X)
-        r = oracle_reward(dom, X)
-        for i in range(X.shape[0]):
-            if len(evaluated_y) >= max_evals:
+        fps = fingerprint_batch(X)
+        if cache is None:
+            r = oracle_reward(dom, X)
+            take = list(range(X.shape[0]))
+            keys = None
+        else:
+            take, r, keys = _lookup(X, fps)
+        new_rows: list[dict] = []
+        for i in take:
+            if n_eval >= max_evals:
                 break
-            fp = fingerprint_bits(X[i])
-            evaluated_X.append(X[i].copy())
-            evaluated_y.append(float(r[i]) if bool(feas[i]) else float("nan"))
+            fp = fps[i]
+            reward_val = float(r[i]) if bool(feas[i]) else float("nan")
+            evaluated_X[n_eval] = X[i]
+            evaluated_y[n_eval] = reward_val
             evaluated_fp.append(fp)
+            if keys is not None:
+                cache.seen[keys[i]] = n_eval  # type: ignore[union-attr]
+            n_eval += 1
 
-            reward_val = float(r[i]) if bool(feas[i]) else float("nan")
             if bool(feas[i]) and reward_val > float(best["reward"]):
                 best = {
                     "reward": reward_val,
                     "fingerprint": fp,
                     "bits": X[i].astype(int).tolist(),
                     "policy": policy,
-                    "eval_index": int(len(evaluated_y)),
+                    "eval_index": int(n_eval),
                 }
 
             trace.append(
                 {
-                    "eval_index": int(len(evaluated_y)),
+                    "eval_index": int(n_eval),
                     "policy": policy,
                     "feasible": bool(feas[i]),
                     "reward": reward_val,
@@ -89,7 +168,11 @@ def main() -> None:
                     "best_reward_so_far": float(best["reward"]),
                 }
             )
-        return len(evaluated_y)
+            if cache is not None and n_eval > len(cache.replay):
+                new_rows.append(trace[-1])
+        if new_rows:
+            append_partial_trace(partial_trace, new_rows)
+        return n_eval
 
     # init
     X0 = propose(
@@ -103,31 +186,44 @@ def main() -> None:
     ).X
     _eval_batch(X0, policy="init_random", start_idx=0)
 
+    # Surrogate posterior, advanced at each round start with the feasible evaluations
+    # made since the previous round (same data the per-round refit used to see).
+    surrogate = None
+    if "surrogate_ucb" in policies:
+        surrogate = IncrementalRidge(d=int(dom.n_bits), lam=float(cfg["search"]["surrogate"]["ridge_lambda"]))
+    n_synced = 0
+
     # rounds
     for r in range(1, rounds + 1):
-        if len(evaluated_y) >= max_evals:
+        if n_eval >= max_evals:
             break
 
-        evX = np.stack(evaluated_X, axis=0)
-        evy = np.asarray(evaluated_y, dtype=np.float64)
+        evX = evaluated_X[:n_eval]
+        evy = evaluated_y[:n_eval]
         # train surrogate only on feasible samples (toy semantics)
         ok = np.isfinite(evy)
         evX_ok = evX[ok]
         evy_ok = evy[ok]
 
+        if surrogate is not None:
+            new_ok = np.isfinite(evaluated_y[n_synced:n_eval])
+            surrogate.update(evaluated_X[n_synced:n_eval][new_ok].astype(np.float64), evaluated_y[n_synced:n_eval][new_ok])
+            n_synced = n_eval
+
         for policy in policies:
-            if len(evaluated_y) >= max_evals:
+            if n_eval >= max_evals:
                 break
             pr = propose(
                 policy=policy,
                 cfg=dom,
-                batch_size=min(batch_size, max_evals - len(evaluated_y)),
+                batch_size=min(batch_size, max_evals - n_eval),
                 rng_tag=dom.seed_string + f"::round{r}::{policy}",
                 evaluated_X=evX_ok if len(evX_ok) else None,
                 evaluated_y=evy_ok if len(evy_ok) else None,
                 policy_cfg=cfg["search"],
+                surrogate=surrogate,
             )
-            _eval_batch(pr.X, policy=policy, start_idx=len(evaluated_y))
+            _eval_batch(pr.X, policy=policy, start_idx=n_eval)
 
     _write_json(run_dir / "best_candidate.json", best)
     import pandas as pd
@@ -136,11 +232,13 @@ def main() -> None:
 
     constraints = summarize_constraints(dom)
     summary = {
-        "n_oracle_evals": int(len(evaluated_y)),
+        "n_oracle_evals": int(n_eval),
         "best_reward": float(best["reward"]),
         "best_policy": best.get("policy"),
         "feasible_rate": float(np.mean([1.0 if t["feasible"] else 0.0 for t in trace])) if trace else float("nan"),
     }
+    if cache is not None:
+        summary.update({f"eval_cache_{k}": v for k, v in cache.summary().items()})
     _write_text(run_dir / "eval_report.md", render_report(run_id=run_id, cfg=cfg, best=best, constraints=constraints, summary=summary))
 
     plot_onepage(
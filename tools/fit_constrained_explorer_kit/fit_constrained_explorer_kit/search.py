@@ -6,7 +6,7 @@ from typing import Dict, List, Tuple
 import numpy as np
 
 from .domain_toy_bitstring import DomainConfig, sample_random, mutate, is_feasible
-from .surrogate_ridge import fit_ridge, predict_mean_var
+from .surrogate_ridge import IncrementalRidge, fit_ridge, predict_mean_var
 
 
 @dataclass(frozen=True)
@@ -15,6 +15,16 @@ class Proposal:
     policy: str
 
 
+def _top_k_desc(v: np.ndarray, k: int) -> np.ndarray:
+    # Indices of the k largest values, best first; O(n) partition before sorting only the top k.
+    if k <= 0:
+        return np.zeros((0,), dtype=int)
+    if k < len(v):
+        part = np.argpartition(-v, k - 1)[:k]
+        return part[np.argsort(-v[part], kind="stable")]
+    return np.argsort(-v, kind="stable")
+
+
 def propose(
     policy: str,
     cfg: DomainConfig,
@@ -23,6 +33,7 @@ def propose(
     evaluated_X: np.ndarray | None,
     evaluated_y: np.ndarray | None,
     policy_cfg: dict,
+    surrogate: IncrementalRidge | None = None,
 ) -> Proposal:
     if policy == "random":
         X = sample_random(cfg, n=batch_size, seed_tag=rng_tag + "::random")
@@ -47,18 +58,22 @@ def propose(
 
         lam = float(policy_cfg["surrogate"]["ridge_lambda"])
         beta = float(policy_cfg["surrogate"]["ucb_beta"])
-        m = fit_ridge(evaluated_X.astype(np.float64), evaluated_y.astype(np.float64), lam=lam)
+        pool_factor = int(policy_cfg["surrogate"].get("pool_factor", 20))
+        if surrogate is not None:
+            m = surrogate.model()
+        else:
+            m = fit_ridge(evaluated_X.astype(np.float64), evaluated_y.astype(np.float64), lam=lam)
 
         # candidate pool (oversample then take top)
-        pool = sample_random(cfg, n=batch_size * 20, seed_tag=rng_tag + "::ucb_pool")
+        pool = sample_random(cfg, n=batch_size * pool_factor, seed_tag=rng_tag + "::ucb_pool")
         feas = is_feasible(cfg, pool)
         pool = pool[feas]
         if len(pool) == 0:
-            pool = sample_random(cfg, n=batch_size * 20, seed_tag=rng_tag + "::ucb_pool2")
+            pool = sample_random(cfg, n=batch_size * pool_factor, seed_tag=rng_tag + "::ucb_pool2")
 
         mean, var = predict_mean_var(m, pool.astype(np.float64))
         ucb = mean + beta * np.sqrt(var + 1e-12)
-        pick = np.argsort(-ucb)[: min(batch_size, len(pool))]
+        pick = _top_k_desc(ucb, min(batch_size, len(pool)))
         X = pool[pick]
         if len(X) < batch_size:
             pad = sample_random(cfg, n=batch_size - len(X), seed_tag=rng_tag + "::ucb_pad")
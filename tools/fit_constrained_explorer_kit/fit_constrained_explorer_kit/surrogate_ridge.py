@@ -14,11 +14,16 @@ class RidgeModel:
     cov: np.ndarray  # (d+1,d+1) for [1,x] features
 
 
+def _design(X: np.ndarray) -> np.ndarray:
+    X = np.asarray(X, dtype=np.float64)
+    return np.concatenate([np.ones((X.shape[0], 1), dtype=np.float64), X], axis=1)
+
+
 def fit_ridge(X: np.ndarray, y: np.ndarray, lam: float) -> RidgeModel:
     X = np.asarray(X, dtype=np.float64)
     y = np.asarray(y, dtype=np.float64).reshape(-1)
     n, d = X.shape
-    Phi = np.concatenate([np.ones((n, 1), dtype=np.float64), X], axis=1)
+    Phi = _design(X)
     A = Phi.T @ Phi + float(lam) * np.eye(d + 1)
     b = Phi.T @ y
     theta = np.linalg.solve(A, b)
@@ -26,13 +31,63 @@ def fit_ridge(X: np.ndarray, y: np.ndarray, lam: float) -> RidgeModel:
     return RidgeModel(bias=float(theta[0]), w=theta[1:].astype(np.float64), cov=cov.astype(np.float64))
 
 
-def predict_mean_var(m: RidgeModel, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+class IncrementalRidge:
+    """Bayesian ridge posterior updated batch by batch.
+
+    Keeps the exact normal equations (A = lam*I + Phi^T Phi, b = Phi^T y) and A^{-1}, which
+    absorbs a batch of k rows with a Woodbury (rank-k Sherman-Morrison) update in O(k d^2 + k^3)
+    instead of refitting on the full history. A^{-1} is recomputed from A by Cholesky every
+    `refresh_every` updates to bound round-off drift.
+    """
+
+    def __init__(self, d: int, lam: float, refresh_every: int = 50) -> None:
+        self.d = int(d)
+        self.lam = float(lam)
+        self.refresh_every = int(refresh_every)
+        self.A = self.lam * np.eye(self.d + 1)
+        self.b = np.zeros((self.d + 1,), dtype=np.float64)
+        self.A_inv = np.eye(self.d + 1) / self.lam
+        self.n = 0
+        self._updates = 0
+
+    def update(self, X: np.ndarray, y: np.ndarray) -> None:
+        y = np.asarray(y, dtype=np.float64).reshape(-1)
+        if len(y) == 0:
+            return
+        Phi = _design(X)
+        self.A += Phi.T @ Phi
+        self.b += Phi.T @ y
+        self.n += len(y)
+        self._updates += 1
+
+        if self.refresh_every > 0 and self._updates % self.refresh_every == 0:
+            self._refresh()
+            return
+        # (A + U^T U)^{-1} = A^{-1} - A^{-1} U^T (I + U A^{-1} U^T)^{-1} U A^{-1}
+        PA = Phi @ self.A_inv  # (k, d+1)
+        S = np.eye(len(y)) + PA @ Phi.T
+        self.A_inv -= PA.T @ np.linalg.solve(S, PA)
+        self.A_inv = 0.5 * (self.A_inv + self.A_inv.T)
+
+    def _refresh(self) -> None:
+        L = np.linalg.cholesky(self.A)
+        L_inv = np.linalg.solve(L, np.eye(self.d + 1))
+        self.A_inv = L_inv.T @ L_inv
+
+    def model(self) -> RidgeModel:
+        theta = self.A_inv @ self.b
+        return RidgeModel(bias=float(theta[0]), w=theta[1:].astype(np.float64), cov=self.A_inv.copy())
+
+
+def predict_mean_var(m: RidgeModel, X: np.ndarray, chunk_rows: int = 65536) -> Tuple[np.ndarray, np.ndarray]:
     X = np.asarray(X, dtype=np.float64)
     n = X.shape[0]
-    Phi = np.concatenate([np.ones((n, 1), dtype=np.float64), X], axis=1)
     mean = m.bias + X @ m.w
-    # var ~ phi^T cov phi (up to sigma^2 scaling; we treat it as relative uncertainty)
-    var = np.einsum("nd,dd,nd->n", Phi, m.cov, Phi)
+    # var ~ phi^T cov phi (up to sigma^2 scaling; we treat it as relative uncertainty).
+    # Full quadratic form, O(n d^2), chunked so large candidate pools stay bounded in memory.
+    var = np.empty((n,), dtype=np.float64)
+    for s in range(0, n, int(chunk_rows)):
+        Phi = _design(X[s : s + int(chunk_rows)])
+        var[s : s + len(Phi)] = np.einsum("nd,nd->n", Phi @ m.cov, Phi)
     var = np.clip(var, 0.0, None)
     return mean.astype(np.float64), var.astype(np.float64)
-
@@ -0,0 +1,45 @@
+import hashlib
+
+import numpy as np
+
+from fit_constrained_explorer_kit.domain_toy_bitstring import (
+    DomainConfig,
+    fingerprint_batch,
+    fingerprint_bits,
+    is_feasible,
+    mutate,
+    packed_keys,
+    sample_random,
+)
+
+CFG = DomainConfig(n_bits=64, max_ones=10, noise_std=0.0, seed_string="TEST", generator="batched")
+
+
+def test_batched_sample_is_deterministic_and_feasible():
+    a = sample_random(CFG, n=2000, seed_tag="t")
+    b = sample_random(CFG, n=2000, seed_tag="t")
+    c = sample_random(CFG, n=2000, seed_tag="u")
+    np.testing.assert_array_equal(a, b)
+    assert not np.array_equal(a, c)
+    assert is_feasible(CFG, a).all()
+    # k is uniform on 0..max_ones
+    counts = np.bincount(a.sum(axis=1), minlength=CFG.max_ones + 1)
+    assert len(counts) == CFG.max_ones + 1 and counts.min() > 100
+
+
+def test_batched_mutate_flips_then_repairs():
+    parents = sample_random(CFG, n=20, seed_tag="p")
+    kids = mutate(CFG, parents=parents, n_children=500, flip_k=3, seed_tag="m")
+    np.testing.assert_array_equal(kids, mutate(CFG, parents=parents, n_children=500, flip_k=3, seed_tag="m"))
+    assert is_feasible(CFG, kids).all()
+    # Flips touch flip_k bits; repair clears at most flip_k extra on-bits.
+    dist = (kids[:, None, :] != parents[None, :, :]).sum(axis=2).min(axis=1)
+    assert dist.max() <= 3 + 3
+
+
+def test_fingerprints_match_string_hash():
+    X = sample_random(CFG, n=50, seed_tag="f")
+    expected = [hashlib.sha256("".join(map(str, x.astype(int).tolist())).encode("utf-8")).hexdigest() for x in X]
+    assert fingerprint_batch(X) == expected
+    assert [fingerprint_bits(x) for x in X] == expected
+    assert len(set(packed_keys(X))) == len({tuple(x) for x in X.tolist()})
@@ -0,0 +1,102 @@
+import json
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from fit_constrained_explorer_kit import run
+from fit_constrained_explorer_kit.eval_cache import append_partial_trace, load_partial_trace
+
+FIXTURE = Path(__file__).resolve().parents[1] / "PREREG.fixture.yaml"
+
+
+def _write_prereg(tmp_path, noise_std=0.0, **eval_cache):
+    cfg = yaml.safe_load(FIXTURE.read_text(encoding="utf-8"))
+    cfg["domain"]["oracle"]["noise_std"] = noise_std
+    cfg["search"]["eval_cache"] = dict({"enabled": True}, **eval_cache)
+    cfg["outputs"]["out_root"] = str(tmp_path / "out")
+    path = tmp_path / "PREREG.yaml"
+    path.write_text(yaml.safe_dump(cfg, sort_keys=False), encoding="utf-8")
+    return path
+
+
+@pytest.fixture()
+def prereg(tmp_path):
+    return _write_prereg(tmp_path)
+
+
+def _run(monkeypatch, prereg, run_id, *extra):
+    monkeypatch.setattr(sys, "argv", ["run", "--prereg", str(prereg), "--run_id", run_id, *extra])
+    run.main()
+    return prereg.parent / "out" / run_id
+
+
+def _report_count(run_dir, key):
+    for line in (run_dir / "eval_report.md").read_text(encoding="utf-8").splitlines():
+        if f"eval_cache_{key}" in line:
+            return int(line.split(":")[-1].strip(" `"))
+    raise AssertionError(f"eval_cache_{key} not in report")
+
+
+@pytest.mark.parametrize(
+    "noise_std,keep_rows,torn", [(0.0, 0, False), (0.0, 57, False), (0.0, 57, True), (0.0, 300, False), (0.5, 57, False)]
+)
+def test_resume_from_truncated_partial_trace_reproduces_trace(tmp_path, monkeypatch, noise_std, keep_rows, torn):
+    prereg = _write_prereg(tmp_path, noise_std=noise_std)
+    ref = _run(monkeypatch, prereg, "ref")
+    ref_lines = (ref / "trace.partial.jsonl").read_text(encoding="utf-8").splitlines(keepends=True)
+    assert len(ref_lines) == 300
+
+    # Simulate an interruption: a copy of the run with only the first rows of its partial trace.
+    cut = prereg.parent / "out" / "cut"
+    cut.mkdir()
+    (cut / "PREREG.locked.yaml").write_bytes((ref / "PREREG.locked.yaml").read_bytes())
+    tail = ref_lines[keep_rows][: len(ref_lines[keep_rows]) // 2] if torn else ""
+    (cut / "trace.partial.jsonl").write_text("".join(ref_lines[:keep_rows]) + tail, encoding="utf-8")
+
+    _run(monkeypatch, prereg, "cut", "--resume")
+    assert (cut / "trace.csv").read_bytes() == (ref / "trace.csv").read_bytes()
+    assert (cut / "trace.partial.jsonl").read_bytes() == (ref / "trace.partial.jsonl").read_bytes()
+    assert json.loads((cut / "best_candidate.json").read_text()) == json.loads((ref / "best_candidate.json").read_text())
+    assert _report_count(cut, "resumed") == keep_rows
+    assert _report_count(cut, "oracle_calls") == 300 - keep_rows
+
+
+def test_resume_rejects_a_diverged_trace(monkeypatch, prereg):
+    ref = _run(monkeypatch, prereg, "ref")
+    rows = load_partial_trace(ref / "trace.partial.jsonl")
+    rows[10]["fingerprint"] = "0" * len(rows[10]["fingerprint"])
+    (ref / "trace.partial.jsonl").unlink()
+    append_partial_trace(ref / "trace.partial.jsonl", rows[:20])
+    with pytest.raises(RuntimeError, match="eval_index 11"):
+        _run(monkeypatch, prereg, "ref", "--resume")
+
+
+def test_load_partial_trace_drops_torn_tail(tmp_path):
+    path = tmp_path / "trace.partial.jsonl"
+    good = json.dumps({"eval_index": 1, "reward": None, "fingerprint": "ab"}) + "\n"
+    path.write_text(good + '{"eval_index": 2, "rew', encoding="utf-8")
+    rows = load_partial_trace(path)
+    assert len(rows) == 1 and rows[0]["reward"] != rows[0]["reward"]  # None -> NaN
+    assert path.read_text(encoding="utf-8") == good
+
+
+def test_noisy_cache_rewards_match_cache_off(tmp_path, monkeypatch):
+    # Noise belongs to the batch position, not to which rows were cache misses.
+    on = _run(monkeypatch, _write_prereg(tmp_path, noise_std=0.5), "on")
+    off = _run(monkeypatch, _write_prereg(tmp_path, noise_std=0.5, enabled=False), "off")
+    on_trace = pd.read_csv(on / "trace.csv")
+    off_trace = pd.read_csv(off / "trace.csv")
+    first_off = off_trace[off_trace["policy"] == "init_random"].drop_duplicates("fingerprint").set_index("fingerprint")
+    init_on = on_trace[on_trace["policy"] == "init_random"]
+    assert len(init_on) == len(first_off)
+    np.testing.assert_array_equal(init_on["reward"].to_numpy(), first_off.loc[init_on["fingerprint"], "reward"].to_numpy())
+
+
+def test_store_with_noisy_oracle_is_rejected(tmp_path, monkeypatch):
+    prereg = _write_prereg(tmp_path, noise_std=0.5, store_path=str(tmp_path / "store.jsonl"))
+    with pytest.raises(ValueError, match="noise_std"):
+        _run(monkeypatch, prereg, "x")
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from fit_constrained_explorer_kit.surrogate_ridge import IncrementalRidge, fit_ridge, predict_mean_var
+
+D = 64
+LAM = 1.0
+ATOL = 1e-12  # measured drift vs a full refit is ~1e-15 after 60 updates
+
+
+def _batches(n_batches, seed=0):
+    rng = np.random.default_rng(seed)
+    w = rng.normal(size=D)
+    for i in range(n_batches):
+        k = int(rng.integers(1, 40)) if i % 5 else 1  # includes rank-1 updates
+        X = (rng.random((k, D)) < 0.15).astype(np.float64)  # bitstring-like features, as in run.py
+        yield X, X @ w + 0.1 * rng.normal(size=k)
+
+
+@pytest.mark.parametrize("refresh_every", [0, 7, 50])
+def test_woodbury_updates_match_fit_ridge(refresh_every):
+    inc = IncrementalRidge(d=D, lam=LAM, refresh_every=refresh_every)
+    X_all, y_all = np.zeros((0, D)), np.zeros((0,))
+    rng = np.random.default_rng(1)
+    X_cand = (rng.random((500, D)) < 0.15).astype(np.float64)
+    for i, (X, y) in enumerate(_batches(60)):
+        inc.update(X, y)
+        X_all, y_all = np.vstack([X_all, X]), np.concatenate([y_all, y])
+        if i % 10 and i != 59:
+            continue
+        got, ref = inc.model(), fit_ridge(X_all, y_all, lam=LAM)
+        assert inc.n == len(y_all)
+        np.testing.assert_allclose(got.bias, ref.bias, rtol=0, atol=ATOL)
+        np.testing.assert_allclose(got.w, ref.w, rtol=0, atol=ATOL)
+        np.testing.assert_allclose(got.cov, ref.cov, rtol=0, atol=ATOL)
+        mean_g, var_g = predict_mean_var(got, X_cand)
+        mean_r, var_r = predict_mean_var(ref, X_cand)
+        np.testing.assert_allclose(mean_g, mean_r, rtol=0, atol=ATOL)
+        np.testing.assert_allclose(var_g, var_r, rtol=0, atol=ATOL)
+
+
+def test_empty_update_is_a_no_op():
+    inc = IncrementalRidge(d=3, lam=LAM)
+    inc.update(np.zeros((0, 3)), np.zeros((0,)))
+    assert inc.n == 0
+    np.testing.assert_array_equal(inc.model().cov, np.eye(4) / LAM)
+
+
+def test_predict_mean_var_chunking_is_exact():
+    X, y = next(_batches(1, seed=2))
+    m = fit_ridge(np.vstack([X] * 3), np.concatenate([y] * 3), lam=LAM)
+    X_cand = (np.random.default_rng(3).random((101, D)) < 0.15).astype(np.float64)
+    mean_a, var_a = predict_mean_var(m, X_cand)
+    mean_b, var_b = predict_mean_var(m, X_cand, chunk_rows=8)
+    np.testing.assert_array_equal(mean_a, mean_b)
+    np.testing.assert_allclose(var_a, var_b, rtol=0, atol=1e-15)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import List
 import numpy as np
-from .utils_hash import stable_hash_order, sha256_hex
+from .utils_hash import stable_hash_order, hash_sort_keys
 
 
 def select_batch(
@@ -24,15 +24,13 @@ def select_batch(
     if policy == "uncertainty":
         # smaller |p-0.5| is more uncertain
         u = np.abs(unlabeled_scores - 0.5)
-        hashes = np.array([sha256_hex(seed + "::uncertainty::" + i) for i in unlabeled_ids])
-        order = np.lexsort((hashes, u))
+        order = np.lexsort(hash_sort_keys(unlabeled_ids, seed + "::uncertainty::") + (u,))
         return [unlabeled_ids[i] for i in order[:n]]
 
     if policy == "high_score":
         # higher p first
         neg_scores = -unlabeled_scores
-        hashes = np.array([sha256_hex(seed + "::high_score::" + i) for i in unlabeled_ids])
-        order = np.lexsort((hashes, neg_scores))
+        order = np.lexsort(hash_sort_keys(unlabeled_ids, seed + "::high_score::") + (neg_scores,))
         return [unlabeled_ids[i] for i in order[:n]]
 
     raise ValueError(f"Unknown policy: {policy}")
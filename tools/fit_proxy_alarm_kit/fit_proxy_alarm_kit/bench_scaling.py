@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from .dataset import Dataset, build_pool_index
+from .run import _run_policy
+from .utils_hash import stable_hash_order
+
+
+FEATURES = ["length", "f_hi_conf_frac", "f_mean_conf", "f_entropy", "f_low_conf_frac"]
+
+BENCH_CFG = {
+    "model": {
+        "standardize": True,
+        "impute_strategy": "median",
+        "params": {"C": 1.0, "max_iter": 100, "tol": 1.0e-6, "class_weight": "balanced"},
+    }
+}
+
+
+def _synthetic(n: int, seed: int) -> Dataset:
+    rng = np.random.default_rng(seed)
+    X = rng.normal(0.0, 1.0, size=(n, len(FEATURES)))
+    z = X @ np.linspace(1.0, -1.0, len(FEATURES)) + rng.normal(0.0, 1.0, size=(n,))
+    y = (z > 1.0).astype(int)
+    ids = np.asarray([f"item_{i:08d}" for i in range(n)], dtype=object)
+    return Dataset(ids=ids, X=pd.DataFrame(X, columns=FEATURES), y_oracle=y, meta={"n": str(n)})
+
+
+def bench_one(pool_n: int, hold_n: int, rounds: int, batch_size: int, init_n: int, policy: str) -> dict:
+    seed = "FIT_PROXY_ALARM_BENCH"
+    ds_pool = _synthetic(pool_n, seed=0)
+    ds_hold = _synthetic(hold_n, seed=1)
+    pool_ids = list(ds_pool.ids.astype(str))
+    init_ids = stable_hash_order(pool_ids, seed_string=seed + "::init")[: min(init_n, len(pool_ids))]
+
+    t0 = time.perf_counter()
+    pool_index = build_pool_index(ds_pool.ids)
+    t_index = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    res = _run_policy(
+        policy=policy,
+        ds_pool=ds_pool,
+        ds_hold=ds_hold,
+        pool_index=pool_index,
+        init_ids=init_ids,
+        cfg=BENCH_CFG,
+        seed=seed,
+        rounds=rounds,
+        batch_size=batch_size,
+        fpr_targets=[0.01, 0.05, 0.10],
+        primary_fpr=0.05,
+        train_frac=0.7,
+        val_frac=0.3,
+    )
+    elapsed = time.perf_counter() - t0
+    n_rounds = max(len(res.round_metrics), 1)
+    return {
+        "pool_n": pool_n,
+        "rounds": len(res.round_metrics),
+        "index_s": t_index,
+        "total_s": elapsed,
+        "per_round_s": elapsed / n_rounds,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Per-round wall time of the acquisition loop vs pool size.")
+    ap.add_argument("--pool_sizes", default="2000,8000,32000", help="Comma-separated pool sizes")
+    ap.add_argument("--holdout_n", type=int, default=2000)
+    ap.add_argument("--rounds", type=int, default=5)
+    ap.add_argument("--batch_size", type=int, default=50)
+    ap.add_argument("--init_labeled_n", type=int, default=200)
+    ap.add_argument("--policy", default="uncertainty")
+    args = ap.parse_args()
+
+    sizes: List[int] = [int(x) for x in str(args.pool_sizes).split(",") if x.strip()]
+    print("pool_n,rounds,index_s,total_s,per_round_s,per_round_us_per_item")
+    for n in sizes:
+        r = bench_one(
+            pool_n=n,
+            hold_n=int(args.holdout_n),
+            rounds=int(args.rounds),
+            batch_size=int(args.batch_size),
+            init_n=int(args.init_labeled_n),
+            policy=str(args.policy),
+        )
+        print(
+            f"{r['pool_n']},{r['rounds']},{r['index_s']:.4f},{r['total_s']:.4f},{r['per_round_s']:.4f},"
+            f"{1e6 * r['per_round_s'] / r['pool_n']:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
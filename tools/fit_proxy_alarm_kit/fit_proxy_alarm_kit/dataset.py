@@ -50,3 +50,19 @@ def build_dataset(
     }
     return Dataset(ids=ids, X=X, y_oracle=y, meta=meta)
 
+
+
+@dataclass(frozen=True)
+class PoolIndex:
+    # Unique ids in sorted (str) order, the first dataset row holding each id,
+    # and the inverse id -> position map. Lets the acquisition loop track
+    # labeled/unlabeled state as boolean masks instead of sets of strings.
+    ids_sorted: np.ndarray
+    rows_sorted: np.ndarray
+    pos: Dict[str, int]
+
+
+def build_pool_index(ids: np.ndarray) -> PoolIndex:
+    ids_sorted, rows_sorted = np.unique(np.asarray(ids, dtype=object), return_index=True)
+    pos = {str(i): k for k, i in enumerate(ids_sorted.tolist())}
+    return PoolIndex(ids_sorted=ids_sorted, rows_sorted=rows_sorted.astype(int), pos=pos)
@@ -51,20 +51,27 @@ def _average_precision_score(y_true: np.ndarray, scores: np.ndarray) -> float:
     return ap
 
 
-def _roc_curve(y_true: np.ndarray, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+def _cumulative_counts(y_true: np.ndarray, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Scores sorted descending (stable) with running TP/FP counts; shared by the ROC curve
+    # and the threshold sweep.
     y = np.asarray(y_true, dtype=int).reshape(-1)
     s = np.asarray(scores, dtype=np.float64).reshape(-1)
-    pos = int(y.sum())
-    neg = int(len(y) - pos)
-    if pos == 0 or neg == 0:
-        return np.asarray([0.0]), np.asarray([0.0]), np.asarray([float("inf")])
-
     order = np.argsort(-s, kind="mergesort")
     s_sorted = s[order]
     y_sorted = y[order]
-
     tp = np.cumsum(y_sorted == 1)
     fp = np.cumsum(y_sorted == 0)
+    return s_sorted, tp, fp
+
+
+def _roc_curve(y_true: np.ndarray, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    y = np.asarray(y_true, dtype=int).reshape(-1)
+    pos = int(y.sum())
+    neg = int(len(y) - pos)
+    if pos == 0 or neg == 0:
+        return np.asarray([0.0]), np.asarray([0.0]), np.asarray([float("inf")])
+
+    s_sorted, tp, fp = _cumulative_counts(y, scores)
 
     distinct = np.r_[True, s_sorted[1:] != s_sorted[:-1]]
     idx = np.where(distinct)[0]
@@ -131,7 +138,8 @@ def _metrics_at_thr(y_true: np.ndarray, scores: np.ndarray, thr: float) -> Dict[
     }
 
 
-def choose_threshold_max_tpr_under_fpr(y_val: np.ndarray, s_val: np.ndarray, fpr_cap: float) -> float:
+def _choose_threshold_scan(y_val: np.ndarray, s_val: np.ndarray, fpr_cap: float) -> float:
+    # Reference implementation: one confusion matrix per candidate threshold (quadratic).
     uniq = np.unique(s_val)
     candidates = np.concatenate([uniq, np.array([np.inf])])
     best_thr = float(np.inf)
@@ -144,6 +152,77 @@ def choose_threshold_max_tpr_under_fpr(y_val: np.ndarray, s_val: np.ndarray, fpr
     return best_thr
 
 
+def choose_thresholds_max_tpr_under_fpr(y_val: np.ndarray, s_val: np.ndarray, fpr_caps: List[float]) -> List[float]:
+    """Max-TPR threshold under each FPR cap, from one sort of the validation scores.
+
+    TPR and FPR are both non-increasing in the threshold, so the max-TPR feasible threshold
+    is the smallest distinct score whose FPR (`score >= thr`) is within the cap; ties in TPR
+    resolve to that same smallest threshold, as in the candidate scan. Returns `inf` when no
+    finite threshold is feasible.
+    """
+    y = np.asarray(y_val, dtype=int).reshape(-1)
+    s = np.asarray(s_val, dtype=np.float64).reshape(-1)
+    if len(s) == 0:
+        return [float(np.inf) for _ in fpr_caps]
+    if np.isnan(s).any():
+        return [_choose_threshold_scan(y, s, float(cap)) for cap in fpr_caps]
+
+    neg = int(len(y) - int(y.sum()))
+    s_sorted, _, fp = _cumulative_counts(y, s)
+    last = np.r_[s_sorted[1:] != s_sorted[:-1], True]
+    thr = s_sorted[last]
+    fpr = fp[last] / neg if neg > 0 else np.zeros((int(last.sum()),), dtype=np.float64)
+
+    # fpr is non-decreasing along descending thresholds: count of feasible thresholds.
+    k = np.searchsorted(fpr, np.asarray(fpr_caps, dtype=np.float64), side="right")
+    return [float(thr[i - 1]) if i > 0 else float(np.inf) for i in k.tolist()]
+
+
+def choose_threshold_max_tpr_under_fpr(y_val: np.ndarray, s_val: np.ndarray, fpr_cap: float) -> float:
+    return choose_thresholds_max_tpr_under_fpr(y_val, s_val, [float(fpr_cap)])[0]
+
+
+def choose_thresholds_batched(y_val: np.ndarray, S_val: np.ndarray, fpr_caps: List[float]) -> np.ndarray:
+    """Batched threshold selection for K score vectors on the same labels.
+
+    `S_val` has shape (K, n); returns a (K, len(fpr_caps)) array of thresholds, each equal
+    to `choose_threshold_max_tpr_under_fpr(y_val, S_val[k], cap)`.
+    """
+    y = np.asarray(y_val, dtype=int).reshape(-1)
+    S = np.asarray(S_val, dtype=np.float64)
+    if S.ndim != 2 or S.shape[1] != len(y):
+        raise ValueError(f"S_val must have shape (K, {len(y)}); got {S.shape}")
+    K, n = S.shape
+    caps = np.asarray(fpr_caps, dtype=np.float64).reshape(-1)
+    out = np.full((K, len(caps)), np.inf, dtype=np.float64)
+    if n == 0:
+        return out
+    if np.isnan(S).any():
+        for k in range(K):
+            out[k] = choose_thresholds_max_tpr_under_fpr(y, S[k], caps.tolist())
+        return out
+
+    order = np.argsort(-S, axis=1, kind="mergesort")
+    S_sorted = np.take_along_axis(S, order, axis=1)
+    fp = np.cumsum(y[order] == 0, axis=1)
+    neg = int(n - int(y.sum()))
+
+    # For each position, the index of the last element of its tie group.
+    last = np.concatenate([S_sorted[:, 1:] != S_sorted[:, :-1], np.ones((K, 1), dtype=bool)], axis=1)
+    end_idx = np.where(last, np.arange(n)[None, :], n)
+    end_idx = np.minimum.accumulate(end_idx[:, ::-1], axis=1)[:, ::-1]
+    fp_end = np.take_along_axis(fp, end_idx, axis=1)
+    fpr = fp_end / neg if neg > 0 else np.zeros_like(fp_end, dtype=np.float64)
+
+    rows = np.arange(K)
+    for c, cap in enumerate(caps.tolist()):
+        # Feasible positions form a prefix; its last element is the smallest feasible threshold.
+        cnt = (fpr <= cap).sum(axis=1)
+        ok = cnt > 0
+        out[ok, c] = S_sorted[rows[ok], cnt[ok] - 1]
+    return out
+
+
 def evaluate_holdout(
     y_val: np.ndarray,
     s_val: np.ndarray,
@@ -162,8 +241,8 @@ def evaluate_holdout(
     out["pr_curve"] = {"precision": prec.tolist(), "recall": rec.tolist(), "thresholds": thr_pr.tolist()}
 
     ops = []
-    for cap in fpr_targets:
-        thr_sel = choose_threshold_max_tpr_under_fpr(y_val, s_val, fpr_cap=float(cap))
+    thr_by_cap = choose_thresholds_max_tpr_under_fpr(y_val, s_val, [float(cap) for cap in fpr_targets])
+    for cap, thr_sel in zip(fpr_targets, thr_by_cap):
         m = _metrics_at_thr(y_test, s_test, thr_sel)
         ops.append(
             {
@@ -73,16 +73,20 @@ def _train_logreg_irls(
     l2_lambda: float,
     max_iter: int,
     tol: float,
-) -> np.ndarray:
+    w0: np.ndarray | None = None,
+) -> tuple[np.ndarray, int]:
+    # Returns (coef, n_iter). w0 warm-starts Newton steps from a previous solution.
     y = y.astype(np.float64).reshape(-1)
     n, d = X.shape
     Xd = np.concatenate([np.ones((n, 1), dtype=np.float64), X.astype(np.float64)], axis=1)
-    w = np.zeros((d + 1,), dtype=np.float64)
+    w = np.zeros((d + 1,), dtype=np.float64) if w0 is None else np.asarray(w0, dtype=np.float64).copy()
 
     reg = np.zeros((d + 1,), dtype=np.float64)
     reg[1:] = float(l2_lambda)
 
+    n_iter = 0
     for _ in range(int(max_iter)):
+        n_iter += 1
         z = Xd @ w
         p = _sigmoid(z)
         r = (p * (1.0 - p)) * sample_weight
@@ -104,17 +108,33 @@ def _train_logreg_irls(
             break
         w = w_new
 
-    return w
+    return w, n_iter
 
 
-def train_logreg(
-    X: pd.DataFrame,
-    y: np.ndarray,
-    standardize: bool,
-    impute_strategy: str,
-    params: Dict[str, Any],
-) -> TrainedModel:
-    feature_names = list(X.columns)
+@dataclass(frozen=True)
+class _FitParams:
+    l2_lambda: float
+    max_iter: int
+    tol: float
+    class_weight: str | None
+
+
+def _fit_params(params: Dict[str, Any]) -> _FitParams:
+    C = float(params.get("C", 1.0))
+    cw = params.get("class_weight", None)
+    if isinstance(cw, dict):
+        raise ValueError("class_weight dict not supported; use null or 'balanced'")
+    return _FitParams(
+        l2_lambda=1.0 / max(C, 1e-12),
+        max_iter=int(params.get("max_iter", 200)),
+        tol=float(params.get("tol", 1e-6)),
+        class_weight=str(cw) if cw is not None else None,
+    )
+
+
+def _prepare(
+    X: pd.DataFrame, standardize: bool, impute_strategy: str
+) -> tuple[np.ndarray, np.ndarray, np.ndarray | None, np.ndarray | None]:
     Xnp = np.asarray(X.to_numpy(), dtype=np.float64)
 
     impute_values = _impute_fit(Xnp, str(impute_strategy))
@@ -124,21 +144,17 @@ def train_logreg(
     if standardize:
         mean, std = _standardize_fit(Xnp)
         Xnp = _standardize_apply(Xnp, mean, std)
+    return Xnp, impute_values, mean, std
 
-    C = float(params.get("C", 1.0))
-    l2_lambda = 1.0 / max(C, 1e-12)
-    max_iter = int(params.get("max_iter", 200))
-    tol = float(params.get("tol", 1e-6))
-
-    cw = params.get("class_weight", None)
-    if isinstance(cw, dict):
-        raise ValueError("class_weight dict not supported; use null or 'balanced'")
-    sample_weight = _class_weights(np.asarray(y, dtype=int), mode=str(cw) if cw is not None else None)
-
-    coef = _train_logreg_irls(
-        X=Xnp, y=np.asarray(y, dtype=np.float64), sample_weight=sample_weight, l2_lambda=l2_lambda, max_iter=max_iter, tol=tol
-    )
 
+def _pack(
+    feature_names: list[str],
+    impute_values: np.ndarray,
+    standardize: bool,
+    mean: np.ndarray | None,
+    std: np.ndarray | None,
+    coef: np.ndarray,
+) -> TrainedModel:
     return TrainedModel(
         feature_names=feature_names,
         impute_values=[float(x) for x in impute_values.tolist()],
@@ -149,6 +165,127 @@ def train_logreg(
     )
 
 
+def train_logreg(
+    X: pd.DataFrame,
+    y: np.ndarray,
+    standardize: bool,
+    impute_strategy: str,
+    params: Dict[str, Any],
+) -> TrainedModel:
+    feature_names = list(X.columns)
+    Xnp, impute_values, mean, std = _prepare(X, standardize, impute_strategy)
+
+    fp = _fit_params(params)
+    sample_weight = _class_weights(np.asarray(y, dtype=int), mode=fp.class_weight)
+
+    coef, _ = _train_logreg_irls(
+        X=Xnp, y=np.asarray(y, dtype=np.float64), sample_weight=sample_weight, l2_lambda=fp.l2_lambda, max_iter=fp.max_iter, tol=fp.tol
+    )
+
+    return _pack(feature_names, impute_values, standardize, mean, std, coef)
+
+
+def _rescale_coef(
+    coef: np.ndarray,
+    mean_old: np.ndarray | None,
+    std_old: np.ndarray | None,
+    mean_new: np.ndarray | None,
+    std_new: np.ndarray | None,
+) -> np.ndarray:
+    # Express a previous solution in the new standardization so the decision function is unchanged:
+    # b + sum w_j (x_j - m_j) / s_j == b' + sum w'_j (x_j - m'_j) / s'_j
+    if mean_old is None or std_old is None or mean_new is None or std_new is None:
+        return np.asarray(coef, dtype=np.float64).copy()
+    coef = np.asarray(coef, dtype=np.float64)
+    w = coef[1:] / std_old
+    out = np.empty_like(coef)
+    out[1:] = w * std_new
+    out[0] = coef[0] + float(w @ (mean_new - mean_old))
+    return out
+
+
+class IncrementalLogReg:
+    """Warm-started logistic regression across acquisition rounds.
+
+    Each `fit` re-derives impute/standardize statistics on the current training rows
+    (the labeled train/val split is re-drawn every round, so the training set is not a
+    superset of the previous one) and starts IRLS from the previous round's coefficients,
+    mapped into the new standardization. The optimum is unique (L2-regularized), so the
+    warm fit lands on the cold solution within `tol`.
+
+    `verify_every=k` refits from zero weights on every k-th call and records the cold
+    iteration count plus the max absolute coefficient difference (0 disables the check).
+    """
+
+    def __init__(
+        self,
+        standardize: bool,
+        impute_strategy: str,
+        params: Dict[str, Any],
+        verify_every: int = 0,
+        coef_tol: float = 1e-4,
+    ) -> None:
+        self.standardize = bool(standardize)
+        self.impute_strategy = str(impute_strategy)
+        self.fp = _fit_params(params)
+        self.verify_every = int(verify_every)
+        self.coef_tol = float(coef_tol)
+        self.prev: TrainedModel | None = None
+        self.n_calls = 0
+        self.last_stats: Dict[str, Any] = {}
+
+    def fit(self, X: pd.DataFrame, y: np.ndarray) -> TrainedModel:
+        feature_names = list(X.columns)
+        Xnp, impute_values, mean, std = _prepare(X, self.standardize, self.impute_strategy)
+        y_arr = np.asarray(y, dtype=np.float64)
+        sample_weight = _class_weights(np.asarray(y, dtype=int), mode=self.fp.class_weight)
+
+        w0 = None
+        if self.prev is not None and self.prev.feature_names == feature_names:
+            w0 = _rescale_coef(
+                np.asarray(self.prev.coef),
+                np.asarray(self.prev.mean) if self.prev.mean is not None else None,
+                np.asarray(self.prev.std) if self.prev.std is not None else None,
+                mean,
+                std,
+            )
+
+        coef, n_iter = _train_logreg_irls(
+            X=Xnp,
+            y=y_arr,
+            sample_weight=sample_weight,
+            l2_lambda=self.fp.l2_lambda,
+            max_iter=self.fp.max_iter,
+            tol=self.fp.tol,
+            w0=w0,
+        )
+        stats: Dict[str, Any] = {"warm_start": w0 is not None, "irls_iter": int(n_iter)}
+
+        if self.verify_every > 0 and self.n_calls % self.verify_every == 0:
+            coef_cold, n_iter_cold = _train_logreg_irls(
+                X=Xnp,
+                y=y_arr,
+                sample_weight=sample_weight,
+                l2_lambda=self.fp.l2_lambda,
+                max_iter=self.fp.max_iter,
+                tol=self.fp.tol,
+            )
+            diff = float(np.max(np.abs(coef - coef_cold)))
+            stats.update(
+                {
+                    "irls_iter_cold": int(n_iter_cold),
+                    "irls_iter_saved": int(n_iter_cold - n_iter),
+                    "coef_max_abs_diff_cold": diff,
+                    "coef_match_cold": bool(diff <= self.coef_tol),
+                }
+            )
+
+        self.n_calls += 1
+        self.last_stats = stats
+        self.prev = _pack(feature_names, impute_values, self.standardize, mean, std, coef)
+        return self.prev
+
+
 def predict_proba(model: TrainedModel, X: pd.DataFrame) -> np.ndarray:
     feats = model.feature_names
     Xnp = np.asarray(X[feats].to_numpy(), dtype=np.float64)
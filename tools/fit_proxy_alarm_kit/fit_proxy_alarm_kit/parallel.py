@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .dataset import Dataset, build_pool_index
+
+
+@dataclass(frozen=True)
+class SharedArraySpec:
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+@dataclass(frozen=True)
+class SharedDatasetSpec:
+    # Feature matrix and labels live in shared memory; ids/meta are small enough to pickle.
+    ids: np.ndarray
+    columns: List[str]
+    X: SharedArraySpec
+    y_oracle: SharedArraySpec
+    meta: Dict[str, str]
+
+
+def _share_array(a: np.ndarray, handles: list) -> SharedArraySpec:
+    a = np.ascontiguousarray(a)
+    shm = shared_memory.SharedMemory(create=True, size=max(int(a.nbytes), 1))
+    handles.append(shm)
+    np.ndarray(a.shape, dtype=a.dtype, buffer=shm.buf)[...] = a
+    return SharedArraySpec(name=shm.name, shape=tuple(a.shape), dtype=str(a.dtype))
+
+
+def _attach_array(spec: SharedArraySpec, handles: list) -> np.ndarray:
+    # Workers share the parent's resource tracker, so attaching does not take ownership;
+    # only the creating process unlinks (see `release`).
+    shm = shared_memory.SharedMemory(name=spec.name)
+    handles.append(shm)
+    return np.ndarray(spec.shape, dtype=np.dtype(spec.dtype), buffer=shm.buf)
+
+
+def share_dataset(ds: Dataset, handles: list) -> SharedDatasetSpec:
+    return SharedDatasetSpec(
+        ids=ds.ids,
+        columns=list(ds.X.columns),
+        X=_share_array(np.asarray(ds.X.to_numpy(), dtype=np.float64), handles),
+        y_oracle=_share_array(np.asarray(ds.y_oracle), handles),
+        meta=dict(ds.meta),
+    )
+
+
+def attach_dataset(spec: SharedDatasetSpec, handles: list) -> Dataset:
+    X = _attach_array(spec.X, handles)
+    return Dataset(
+        ids=spec.ids,
+        X=pd.DataFrame(X, columns=spec.columns, copy=False),
+        y_oracle=_attach_array(spec.y_oracle, handles),
+        meta=dict(spec.meta),
+    )
+
+
+def release(handles: list, unlink: bool) -> None:
+    for shm in handles:
+        shm.close()
+        if unlink:
+            shm.unlink()
+    handles.clear()
+
+
+def _policy_worker(pool_spec: SharedDatasetSpec, hold_spec: SharedDatasetSpec, kwargs: Dict[str, Any]):
+    from .run import _run_policy
+
+    handles: list = []
+    try:
+        ds_pool = attach_dataset(pool_spec, handles)
+        ds_hold = attach_dataset(hold_spec, handles)
+        return _run_policy(
+            ds_pool=ds_pool,
+            ds_hold=ds_hold,
+            pool_index=build_pool_index(ds_pool.ids),
+            **kwargs,
+        )
+    finally:
+        release(handles, unlink=False)
+
+
+def run_policies_parallel(
+    policies: List[str],
+    ds_pool: Dataset,
+    ds_hold: Dataset,
+    workers: int,
+    common: Dict[str, Any],
+) -> list:
+    """Run `_run_policy` for each policy in a process pool.
+
+    Pool/holdout features are placed in shared memory once and attached by each worker.
+    Results are returned in `policies` order, so downstream merging matches the serial path.
+    """
+    handles: list = []
+    try:
+        pool_spec = share_dataset(ds_pool, handles)
+        hold_spec = share_dataset(ds_hold, handles)
+        with ProcessPoolExecutor(max_workers=int(workers)) as ex:
+            futures = [ex.submit(_policy_worker, pool_spec, hold_spec, dict(common, policy=p)) for p in policies]
+            return [f.result() for f in futures]
+    finally:
+        release(handles, unlink=True)
@@ -3,41 +3,91 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
+import time
 
 import pandas as pd
 
 from .io_dataset import load_metrics, require_columns
 from .modeling import from_dict, predict_proba
+from .streaming import ChunkWriter, ScoringKernel, iter_metric_chunks, load_alarm_threshold
 
 
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--model", required=True, help="Path to alarm_model.json")
     ap.add_argument("--metrics", required=True, help="CSV/Parquet file with deploy-boundary features")
-    ap.add_argument("--out", required=True, help="Output CSV with probabilities")
+    ap.add_argument("--out", required=True, help="Output CSV (or .parquet in streaming mode) with probabilities")
     ap.add_argument("--id_field", default="item_id", help="ID column name in metrics")
     ap.add_argument("--feature_whitelist", default=None, help="Optional JSON list of features (else infer from model)")
+    ap.add_argument(
+        "--chunk_rows",
+        type=int,
+        default=0,
+        help="Stream the metrics file in chunks of N rows (CSV chunks / Parquet record batches); 0 = load all at once",
+    )
+    ap.add_argument("--threshold_from", default=None, help="alarm_thresholds.json; adds an `alarm` column (p >= threshold)")
+    ap.add_argument("--fpr_target", default=None, help="Operating point key in --threshold_from (e.g. 0.05)")
     args = ap.parse_args()
 
     model_obj = json.loads(Path(args.model).read_text(encoding="utf-8"))
     model = from_dict(model_obj)
     feature_names = list(model.feature_names)
 
-    df = load_metrics(Path(args.metrics), fallback="csv")
-
     if args.feature_whitelist:
         feats = json.loads(args.feature_whitelist)
+        missing = [f for f in feature_names if f not in feats]
+        if missing:
+            raise ValueError(f"--feature_whitelist is missing model features: {missing}")
     else:
         feats = feature_names
 
+    thr = None
+    if args.threshold_from:
+        _, thr = load_alarm_threshold(args.threshold_from, args.fpr_target)
+
+    if int(args.chunk_rows) > 0:
+        _score_streaming(args, model, feats, thr)
+        return
+
+    df = load_metrics(Path(args.metrics), fallback="csv")
+
     require_columns(df, [args.id_field] + feats)
     X = df[feats]
     p = predict_proba(model, X)
 
     out = pd.DataFrame({args.id_field: df[args.id_field].astype(str), "predicted_prob": p})
+    if thr is not None:
+        out["alarm"] = (p >= thr).astype(int)
     Path(args.out).parent.mkdir(parents=True, exist_ok=True)
     out.to_csv(args.out, index=False)
 
 
+def _score_streaming(args: argparse.Namespace, model, feats: list[str], thr: float | None) -> None:
+    kernel = ScoringKernel(model, chunk_rows=int(args.chunk_rows))
+    writer = ChunkWriter(args.out)
+    # Same columns as the one-shot path: the id plus every whitelisted feature must be present.
+    cols = [args.id_field] + [f for f in feats if f != args.id_field]
+    n_rows = 0
+    t0 = time.perf_counter()
+    try:
+        for chunk in iter_metric_chunks(args.metrics, cols, int(args.chunk_rows)):
+            p = kernel.score(chunk[kernel.feature_names].to_numpy(dtype="float64", na_value=float("nan")))
+            out = pd.DataFrame({args.id_field: chunk[args.id_field].astype(str).to_numpy(), "predicted_prob": p.copy()})
+            if thr is not None:
+                out["alarm"] = (p >= thr).astype(int)
+            writer.write(out)
+            n_rows += len(chunk)
+        if n_rows == 0:
+            empty = {args.id_field: pd.Series([], dtype=str), "predicted_prob": pd.Series([], dtype=float)}
+            if thr is not None:
+                empty["alarm"] = pd.Series([], dtype=int)
+            writer.write(pd.DataFrame(empty))
+    finally:
+        writer.close()
+    dt = time.perf_counter() - t0
+    rate = n_rows / dt if dt > 0 else float("inf")
+    print(f"Scored {n_rows} rows in {dt:.2f}s ({rate:,.0f} rows/sec) -> {args.out}")
+
+
 if __name__ == "__main__":
     main()
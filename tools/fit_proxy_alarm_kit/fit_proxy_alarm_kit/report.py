@@ -11,6 +11,7 @@ def render_eval_report(
     gate_by_policy: Dict[str, dict],
     event_by_policy: Dict[str, dict],
     final_summary_by_policy: Dict[str, dict],
+    training_by_policy: Dict[str, dict] | None = None,
 ) -> str:
     lines: List[str] = []
     lines.append("# Eval report - FIT Proxy Alarm Kit\n\n")
@@ -42,6 +43,16 @@ def render_eval_report(
         lines.append(f"- pr_auc: `{s.get('pr_auc')}`\n")
         lines.append(f"- primary_op: `{s.get('primary_op')}`\n\n")
 
+    if training_by_policy:
+        lines.append("## Incremental training (warm-started IRLS)\n\n")
+        for policy, t in training_by_policy.items():
+            lines.append(
+                f"- {policy}: fits=`{t['fits']}` irls_iter_total=`{t['irls_iter_total']}` "
+                f"verified_fits=`{t['verified_fits']}` irls_iter_saved_verified=`{t['irls_iter_saved_verified']}` "
+                f"coef_max_abs_diff_cold=`{t['coef_max_abs_diff_cold']:.3g}` coef_match_cold=`{t['coef_match_cold']}`\n"
+            )
+        lines.append("\n")
+
     lines.append("## Interpretation rule\n\n")
     lines.append("- AUC is not sufficient for alarms; the primary criterion is FPR controllability at the locked operating point.\n")
     lines.append("- If a policy is labeled `INVALID_ALARM`, do not interpret its ranking metrics as deployable performance.\n")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 import json
@@ -13,11 +14,12 @@ import pandas as pd
 from .config import load_prereg, validate_prereg
 from .utils_hash import sha256_hex, sha256_file, stable_hash_order
 from .io_dataset import load_metrics, require_columns, apply_basic_filters
-from .dataset import build_dataset, Dataset
+from .dataset import build_dataset, build_pool_index, Dataset, PoolIndex
 from .split import holdout_split, labeled_train_val_split
-from .modeling import train_logreg, predict_proba, coefficients, to_dict
+from .modeling import train_logreg, predict_proba, coefficients, to_dict, IncrementalLogReg, TrainedModel
 from .eval import evaluate_holdout, monitorability_gate
 from .acquisition import select_batch
+from .parallel import run_policies_parallel
 from .event import detect_covjump
 from .plot_onepager import plot_onepage_active
 from .report import render_eval_report
@@ -47,10 +49,218 @@ def _pick_primary_op(operating_points: list[dict], primary_fpr_target: float) ->
     return None
 
 
+@dataclass
+class PolicyResult:
+    decision_rows: list[dict]
+    round_metrics: list[dict]
+    series: Dict[str, list]
+    last_model: TrainedModel | None
+    last_ev: dict | None
+    training: dict | None = None
+
+
+def _summarize_training(rows: list[dict]) -> dict:
+    verified = [x for x in rows if "irls_iter_cold" in x]
+    return {
+        "mode": "incremental_warm_start",
+        "fits": len(rows),
+        "irls_iter_total": int(sum(x["irls_iter"] for x in rows)),
+        "verified_fits": len(verified),
+        "irls_iter_cold_verified": int(sum(x["irls_iter_cold"] for x in verified)),
+        "irls_iter_saved_verified": int(sum(x["irls_iter_saved"] for x in verified)),
+        "coef_max_abs_diff_cold": float(max((x["coef_max_abs_diff_cold"] for x in verified), default=0.0)),
+        "coef_match_cold": bool(all(x["coef_match_cold"] for x in verified)),
+    }
+
+
+def _run_policy(
+    *,
+    policy: str,
+    ds_pool: Dataset,
+    ds_hold: Dataset,
+    pool_index: PoolIndex,
+    init_ids: List[str],
+    cfg: dict,
+    seed: str,
+    rounds: int,
+    batch_size: int,
+    fpr_targets: List[float],
+    primary_fpr: float,
+    train_frac: float,
+    val_frac: float,
+) -> PolicyResult:
+    # Labeled state lives in a boolean mask over pool_index positions (id-sorted),
+    # so every per-round lookup is O(1) and every per-round scan is O(pool).
+    decision_rows: list[dict] = []
+    round_metrics: list[dict] = []
+    labeled_mask = np.zeros((len(pool_index.ids_sorted),), dtype=bool)
+
+    # log init
+    init_labels: list[int] = []
+    for item_id in init_ids:
+        k = pool_index.pos[item_id]
+        labeled_mask[k] = True
+        y = int(ds_pool.y_oracle[pool_index.rows_sorted[k]])
+        init_labels.append(y)
+        decision_rows.append(
+            {
+                "policy": policy,
+                "round": 0,
+                "item_id": item_id,
+                "selected_by": "init_seed",
+                "predicted_prob": float("nan"),
+                "revealed_label": y,
+            }
+        )
+    n_labeled = int(labeled_mask.sum())
+    batch_labels: list[int] = []
+
+    queried_counts: list[int] = []
+    tpr_primary_series: list[float] = []
+    fpr_primary_series: list[float] = []
+    batch_pos_rate_series: list[float] = []
+    round_index_series: list[int] = []
+
+    last_model = None
+    last_ev = None
+
+    mcfg = cfg["model"]
+    inc_cfg = mcfg.get("incremental") or {}
+    trainer = None
+    if bool(inc_cfg.get("enabled", False)):
+        trainer = IncrementalLogReg(
+            standardize=bool(mcfg["standardize"]),
+            impute_strategy=str(mcfg["impute_strategy"]),
+            params=mcfg["params"],
+            verify_every=int(inc_cfg.get("verify_every", 0)),
+            coef_tol=float(inc_cfg.get("coef_tol", 1e-4)),
+        )
+    training_rows: list[dict] = []
+
+    for r in range(0, rounds + 1):
+        labeled_idx = pool_index.rows_sorted[labeled_mask]
+        X_lab = ds_pool.X.iloc[labeled_idx].reset_index(drop=True)
+        y_lab = ds_pool.y_oracle[labeled_idx]
+        ids_lab = ds_pool.ids[labeled_idx]
+
+        lv = labeled_train_val_split(
+            ids_lab, seed_string=seed + f"::{policy}::round{r}", train_frac=train_frac, val_frac=val_frac
+        )
+        if len(lv.train) == 0 or len(lv.val) == 0:
+            break
+
+        if trainer is not None:
+            model = trainer.fit(X_lab.iloc[lv.train], y_lab[lv.train])
+            training_rows.append(dict(trainer.last_stats))
+        else:
+            model = train_logreg(
+                X=X_lab.iloc[lv.train],
+                y=y_lab[lv.train],
+                standardize=bool(mcfg["standardize"]),
+                impute_strategy=str(mcfg["impute_strategy"]),
+                params=mcfg["params"],
+            )
+
+        s_val = predict_proba(model, X_lab.iloc[lv.val])
+        y_val = y_lab[lv.val]
+        s_hold = predict_proba(model, ds_hold.X)
+        y_hold = ds_hold.y_oracle
+
+        ev = evaluate_holdout(y_val=y_val, s_val=s_val, y_test=y_hold, s_test=s_hold, fpr_targets=fpr_targets)
+        op_primary = _pick_primary_op(list(ev["operating_points"]), primary_fpr_target=primary_fpr)
+        assert op_primary is not None
+
+        queried = n_labeled
+        queried_counts.append(int(queried))
+        tpr_primary_series.append(float(op_primary["tpr"]))
+        fpr_primary_series.append(float(op_primary["fpr"]))
+        round_index_series.append(int(r))
+
+        if r == 0:
+            batch_pos = float(np.mean(init_labels))
+        else:
+            batch_pos = float(np.mean(batch_labels)) if batch_labels else float("nan")
+        batch_pos_rate_series.append(batch_pos)
+
+        round_metrics.append(
+            {
+                "round": int(r),
+                "queried_labels": int(queried),
+                "holdout_n": int(len(y_hold)),
+                "roc_auc": float(ev["roc_auc"]),
+                "pr_auc": float(ev["pr_auc"]),
+                "operating_points": ev["operating_points"],
+                "coefficients": coefficients(model),
+            }
+        )
+        if trainer is not None:
+            round_metrics[-1]["training"] = training_rows[-1]
+
+        last_model = model
+        last_ev = ev
+
+        if r == rounds:
+            break
+
+        unlabeled_pos = np.flatnonzero(~labeled_mask)
+        if len(unlabeled_pos) == 0:
+            break
+
+        unlabeled_ids = pool_index.ids_sorted[unlabeled_pos].tolist()
+        unlabeled_idx = pool_index.rows_sorted[unlabeled_pos]
+        X_unlab = ds_pool.X.iloc[unlabeled_idx].reset_index(drop=True)
+        s_unlab = predict_proba(model, X_unlab)
+
+        batch = select_batch(
+            policy=policy,
+            unlabeled_ids=unlabeled_ids,
+            unlabeled_scores=s_unlab,
+            batch_size=batch_size,
+            seed=seed + f"::{policy}::round{r+1}",
+        )
+
+        batch_labels = []
+        for item_id in batch:
+            k = pool_index.pos[item_id]
+            j = int(np.searchsorted(unlabeled_pos, k))
+            p_sel = float(s_unlab[j])
+            y = int(ds_pool.y_oracle[pool_index.rows_sorted[k]])
+            batch_labels.append(y)
+            decision_rows.append(
+                {
+                    "policy": policy,
+                    "round": int(r + 1),
+                    "item_id": item_id,
+                    "selected_by": policy,
+                    "predicted_prob": float(p_sel),
+                    "revealed_label": y,
+                }
+            )
+            if not labeled_mask[k]:
+                labeled_mask[k] = True
+                n_labeled += 1
+
+    return PolicyResult(
+        decision_rows=decision_rows,
+        round_metrics=round_metrics,
+        series={
+            "queried_labels": queried_counts,
+            "tpr_primary": tpr_primary_series,
+            "fpr_primary": fpr_primary_series,
+            "batch_pos_rate": batch_pos_rate_series,
+            "round_index": round_index_series,
+        },
+        last_model=last_model,
+        last_ev=last_ev,
+        training=_summarize_training(training_rows) if trainer is not None else None,
+    )
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--prereg", required=True)
     ap.add_argument("--run_id", default=None)
+    ap.add_argument("--workers", type=int, default=1, help="Run acquisition policies in N worker processes")
     args = ap.parse_args()
 
     cfg = load_prereg(args.prereg).raw
@@ -162,148 +372,45 @@ def main() -> None:
     gate_by_policy: Dict[str, dict] = {}
     event_by_policy: Dict[str, dict] = {}
     final_summary_by_policy: Dict[str, dict] = {}
+    training_by_policy: Dict[str, dict] = {}
 
     final_models_dir = run_dir / "final_models"
     final_models_dir.mkdir(parents=True, exist_ok=True)
 
-    for policy in policies:
-        labeled_set = set(init_ids)
-        unlabeled_set = set(pool_ids) - labeled_set
-
-        # log init
-        for item_id in init_ids:
-            idx = int(np.where(ds_pool.ids == item_id)[0][0])
-            y = int(ds_pool.y_oracle[idx])
-            decision_rows.append(
-                {
-                    "policy": policy,
-                    "round": 0,
-                    "item_id": item_id,
-                    "selected_by": "init_seed",
-                    "predicted_prob": float("nan"),
-                    "revealed_label": y,
-                }
-            )
-
-        queried_counts: list[int] = []
-        tpr_primary_series: list[float] = []
-        fpr_primary_series: list[float] = []
-        batch_pos_rate_series: list[float] = []
-        round_index_series: list[int] = []
-
-        last_model = None
-        last_ev = None
-
-        for r in range(0, rounds + 1):
-            labeled_ids = sorted(list(labeled_set))
-            labeled_idx = np.array([int(np.where(ds_pool.ids == i)[0][0]) for i in labeled_ids], dtype=int)
-            X_lab = ds_pool.X.iloc[labeled_idx].reset_index(drop=True)
-            y_lab = ds_pool.y_oracle[labeled_idx]
-            ids_lab = ds_pool.ids[labeled_idx]
-
-            lv = labeled_train_val_split(
-                ids_lab, seed_string=seed + f"::{policy}::round{r}", train_frac=train_frac, val_frac=val_frac
-            )
-            if len(lv.train) == 0 or len(lv.val) == 0:
-                break
-
-            mcfg = cfg["model"]
-            model = train_logreg(
-                X=X_lab.iloc[lv.train],
-                y=y_lab[lv.train],
-                standardize=bool(mcfg["standardize"]),
-                impute_strategy=str(mcfg["impute_strategy"]),
-                params=mcfg["params"],
-            )
-
-            s_val = predict_proba(model, X_lab.iloc[lv.val])
-            y_val = y_lab[lv.val]
-            s_hold = predict_proba(model, ds_hold.X)
-            y_hold = ds_hold.y_oracle
-
-            ev = evaluate_holdout(y_val=y_val, s_val=s_val, y_test=y_hold, s_test=s_hold, fpr_targets=fpr_targets)
-            op_primary = _pick_primary_op(list(ev["operating_points"]), primary_fpr_target=primary_fpr)
-            assert op_primary is not None
-
-            queried = len(labeled_set)
-            queried_counts.append(int(queried))
-            tpr_primary_series.append(float(op_primary["tpr"]))
-            fpr_primary_series.append(float(op_primary["fpr"]))
-            round_index_series.append(int(r))
-
-            if r == 0:
-                batch_pos = float(
-                    np.mean([row["revealed_label"] for row in decision_rows if row["policy"] == policy and row["round"] == 0])
-                )
-            else:
-                last_batch = [row["revealed_label"] for row in decision_rows if row["policy"] == policy and row["round"] == r]
-                batch_pos = float(np.mean(last_batch)) if last_batch else float("nan")
-            batch_pos_rate_series.append(batch_pos)
-
-            round_metrics[policy].append(
-                {
-                    "round": int(r),
-                    "queried_labels": int(queried),
-                    "holdout_n": int(len(y_hold)),
-                    "roc_auc": float(ev["roc_auc"]),
-                    "pr_auc": float(ev["pr_auc"]),
-                    "operating_points": ev["operating_points"],
-                    "coefficients": coefficients(model),
-                }
-            )
-
-            last_model = model
-            last_ev = ev
-
-            if r == rounds:
-                break
-
-            unlabeled_ids = sorted(list(unlabeled_set))
-            if len(unlabeled_ids) == 0:
-                break
-
-            unlabeled_idx = np.array([int(np.where(ds_pool.ids == i)[0][0]) for i in unlabeled_ids], dtype=int)
-            X_unlab = ds_pool.X.iloc[unlabeled_idx].reset_index(drop=True)
-            s_unlab = predict_proba(model, X_unlab)
-
-            batch = select_batch(
-                policy=policy,
-                unlabeled_ids=unlabeled_ids,
-                unlabeled_scores=s_unlab,
-                batch_size=batch_size,
-                seed=seed + f"::{policy}::round{r+1}",
-            )
-
-            for item_id in batch:
-                j = unlabeled_ids.index(item_id)
-                p_sel = float(s_unlab[j])
-                idx = int(np.where(ds_pool.ids == item_id)[0][0])
-                y = int(ds_pool.y_oracle[idx])
-                decision_rows.append(
-                    {
-                        "policy": policy,
-                        "round": int(r + 1),
-                        "item_id": item_id,
-                        "selected_by": policy,
-                        "predicted_prob": float(p_sel),
-                        "revealed_label": y,
-                    }
-                )
-                labeled_set.add(item_id)
-                if item_id in unlabeled_set:
-                    unlabeled_set.remove(item_id)
-
-        series_by_policy[policy] = {
-            "queried_labels": queried_counts,
-            "tpr_primary": tpr_primary_series,
-            "fpr_primary": fpr_primary_series,
-            "batch_pos_rate": batch_pos_rate_series,
-            "round_index": round_index_series,
-        }
+    common = dict(
+        init_ids=init_ids,
+        cfg=cfg,
+        seed=seed,
+        rounds=rounds,
+        batch_size=batch_size,
+        fpr_targets=fpr_targets,
+        primary_fpr=primary_fpr,
+        train_frac=train_frac,
+        val_frac=val_frac,
+    )
+    workers = max(1, min(int(args.workers), len(policies)))
+    if workers > 1:
+        results = run_policies_parallel(policies, ds_pool=ds_pool, ds_hold=ds_hold, workers=workers, common=common)
+    else:
+        pool_index = build_pool_index(ds_pool.ids)
+        results = [
+            _run_policy(policy=policy, ds_pool=ds_pool, ds_hold=ds_hold, pool_index=pool_index, **common)
+            for policy in policies
+        ]
+
+    # Merge in policy order (same as the serial path, regardless of worker completion order).
+    for policy, res in zip(policies, results):
+        decision_rows.extend(res.decision_rows)
+        round_metrics[policy] = res.round_metrics
+        series_by_policy[policy] = res.series
+        last_model = res.last_model
+        last_ev = res.last_ev
+        if res.training is not None:
+            training_by_policy[policy] = res.training
 
         evcfg = cfg.get("event", {})
         evt = detect_covjump(
-            tpr_series=tpr_primary_series,
+            tpr_series=res.series["tpr_primary"],
             W_jump=int(evcfg.get("W_jump_rounds", 3)),
             delta_tpr=float(evcfg.get("delta_tpr", 0.05)),
         )
@@ -379,6 +486,7 @@ def main() -> None:
         gate_by_policy=gate_by_policy,
         event_by_policy=event_by_policy,
         final_summary_by_policy=final_summary_by_policy,
+        training_by_policy=training_by_policy,
     )
     _write_text(run_dir / "eval_report.md", rep)
 
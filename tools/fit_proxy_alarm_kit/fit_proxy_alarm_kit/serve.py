@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import argparse
+from collections import deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .modeling import TrainedModel, _sigmoid, from_dict
+
+
+def discover_models(run_dir: Path) -> Dict[str, Path]:
+    """Model files in a run directory, keyed `<run_id>` (alarm_model.json) and `<run_id>/<policy>`."""
+    out: Dict[str, Path] = {}
+    run_id = run_dir.name
+    alarm = run_dir / "alarm_model.json"
+    if alarm.exists():
+        out[run_id] = alarm
+    fm = run_dir / "final_models"
+    if fm.is_dir():
+        for p in sorted(fm.glob("*.json")):
+            out[f"{run_id}/{p.stem}"] = p
+    return out
+
+
+@dataclass(frozen=True)
+class ModelStack:
+    """All loaded models folded into one affine map over the union of their features.
+
+    Standardization is folded into the weights (w' = w/std, b' = b - w'.mean) and imputation
+    into a second weight matrix applied to the NaN mask, so
+    z = b' + X0 @ W.T + isnan(X) @ (W * impute).T  scores every model in two matmuls.
+    """
+
+    names: List[str]
+    features: List[str]
+    W: np.ndarray  # (K, F)
+    W_imp: np.ndarray  # (K, F)
+    b: np.ndarray  # (K,)
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        nan = np.isnan(X)
+        X0 = np.where(nan, 0.0, X)
+        z = X0 @ self.W.T + nan.astype(np.float64) @ self.W_imp.T + self.b
+        return _sigmoid(z)
+
+
+def stack_models(models: Dict[str, TrainedModel]) -> ModelStack:
+    names = sorted(models)
+    features: List[str] = []
+    for n in names:
+        for f in models[n].feature_names:
+            if f not in features:
+                features.append(f)
+    col = {f: j for j, f in enumerate(features)}
+
+    K, F = len(names), len(features)
+    W = np.zeros((K, F), dtype=np.float64)
+    W_imp = np.zeros((K, F), dtype=np.float64)
+    b = np.zeros((K,), dtype=np.float64)
+    for k, n in enumerate(names):
+        m = models[n]
+        coef = np.asarray(m.coef, dtype=np.float64)
+        w = coef[1:].copy()
+        bias = float(coef[0])
+        if m.standardize:
+            if m.mean is None or m.std is None:
+                raise ValueError(f"Model {n} is marked standardize=true but mean/std are missing")
+            w = w / np.asarray(m.std, dtype=np.float64)
+            bias -= float(w @ np.asarray(m.mean, dtype=np.float64))
+        idx = [col[f] for f in m.feature_names]
+        W[k, idx] = w
+        W_imp[k, idx] = w * np.asarray(m.impute_values, dtype=np.float64)
+        b[k] = bias
+    return ModelStack(names=names, features=features, W=W, W_imp=W_imp, b=b)
+
+
+class ModelBank:
+    """Loads models from run directories once, re-stacks them when files change."""
+
+    def __init__(self, run_dirs: List[Path]) -> None:
+        self.run_dirs = [Path(p) for p in run_dirs]
+        self._lock = threading.Lock()
+        self._mtimes: Dict[str, Tuple[str, float]] = {}
+        self.stack = stack_models({})
+        self.reloads = 0
+        self.last_reload_utc: str | None = None
+        self.reload()
+
+    def _scan(self) -> Dict[str, Tuple[str, float]]:
+        found: Dict[str, Tuple[str, float]] = {}
+        for d in self.run_dirs:
+            for name, p in discover_models(d).items():
+                found[name] = (str(p), p.stat().st_mtime)
+        return found
+
+    def reload(self, force: bool = True) -> bool:
+        found = self._scan()
+        if not force and found == self._mtimes:
+            return False
+        models = {n: from_dict(json.loads(Path(p).read_text(encoding="utf-8"))) for n, (p, _) in found.items()}
+        stack = stack_models(models)
+        with self._lock:
+            self.stack = stack
+            self._mtimes = found
+            self.reloads += 1
+            self.last_reload_utc = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        return True
+
+    def watch(self, interval_s: float, stop: threading.Event) -> None:
+        while not stop.wait(float(interval_s)):
+            try:
+                self.reload(force=False)
+            except Exception as e:  # keep serving the previous stack on a bad write
+                print(f"[serve] reload failed: {e}")
+
+
+class Counters:
+    def __init__(self, window: int = 4096) -> None:
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.rows = 0
+        self.busy_s = 0.0
+        self._lat_ms: deque = deque(maxlen=int(window))
+
+    def record(self, rows: int, dt_s: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.rows += int(rows)
+            self.busy_s += float(dt_s)
+            self._lat_ms.append(1000.0 * float(dt_s))
+
+    def error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lat = np.asarray(self._lat_ms, dtype=np.float64)
+            up = time.time() - self.started
+            return {
+                "uptime_s": up,
+                "requests": self.requests,
+                "errors": self.errors,
+                "rows": self.rows,
+                "rows_per_s_busy": self.rows / self.busy_s if self.busy_s > 0 else 0.0,
+                "rows_per_s_wall": self.rows / up if up > 0 else 0.0,
+                "latency_ms_p50": float(np.percentile(lat, 50)) if len(lat) else None,
+                "latency_ms_p99": float(np.percentile(lat, 99)) if len(lat) else None,
+            }
+
+
+def _parse_batch(body: Dict[str, Any], features: List[str]) -> Tuple[np.ndarray, List[Any] | None]:
+    # {"rows": [{feature: value, ...}, ...]} or {"columns": {feature: [values...]}}; optional "ids".
+    if not isinstance(body, dict):
+        raise ValueError("request body must be a JSON object")
+    if "columns" in body:
+        cols = body["columns"]
+        if not isinstance(cols, dict):
+            raise ValueError('"columns" must be an object of feature -> values')
+        n = len(next(iter(cols.values()))) if cols else 0
+        X = np.full((n, len(features)), np.nan, dtype=np.float64)
+        for j, f in enumerate(features):
+            if f in cols:
+                X[:, j] = np.asarray(cols[f], dtype=np.float64)
+    else:
+        rows = body.get("rows", [])
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise ValueError('"rows" must be a list of objects')
+        X = np.array([[r.get(f, np.nan) for f in features] for r in rows], dtype=np.float64).reshape(len(rows), len(features))
+    # NaN means missing (imputed); +-inf would reach the scores as NaN, which JSON cannot carry.
+    if np.isinf(X).any():
+        bad = sorted({features[j] for j in np.nonzero(np.isinf(X).any(axis=0))[0]})
+        raise ValueError(f"non-finite feature values: {bad}")
+    return X, body.get("ids")
+
+
+def _encode(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+def make_handler(bank: ModelBank, counters: Counters):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code: int, obj: Any) -> None:
+            self._send_bytes(code, _encode(obj))
+
+        def _send_bytes(self, code: int, data: bytes) -> None:
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, fmt: str, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            if self.path == "/healthz":
+                self._send(200, {"status": "ok"})
+            elif self.path == "/models":
+                st = bank.stack
+                self._send(
+                    200,
+                    {
+                        "models": st.names,
+                        "features": st.features,
+                        "reloads": bank.reloads,
+                        "last_reload_utc": bank.last_reload_utc,
+                    },
+                )
+            elif self.path == "/stats":
+                self._send(200, dict(counters.snapshot(), n_models=len(bank.stack.names)))
+            else:
+                self._send(404, {"error": f"unknown path {self.path}"})
+
+        def do_POST(self) -> None:
+            if self.path != "/score":
+                self._send(404, {"error": f"unknown path {self.path}"})
+                return
+            t0 = time.perf_counter()
+            try:
+                n = int(self.headers.get("Content-Length", "0"))
+                body = json.loads(self.rfile.read(n).decode("utf-8")) if n else {}
+                st = bank.stack  # one consistent stack per request, even across a reload
+                X, ids = _parse_batch(body, st.features)
+                P = st.score(X)  # (n, K)
+                want = body.get("models")
+                keep = list(range(len(st.names))) if not want else [st.names.index(m) for m in want]
+                out: Dict[str, Any] = {"scores": {st.names[k]: P[:, k].tolist() for k in keep}}
+                if ids is not None:
+                    out["ids"] = ids
+                data = _encode(out)  # inside the try: a non-JSON value is a 400, not a dropped connection
+            except (ValueError, KeyError, TypeError) as e:
+                counters.error()
+                self._send(400, {"error": str(e)})
+                return
+            counters.record(rows=X.shape[0], dt_s=time.perf_counter() - t0)
+            self._send_bytes(200, data)
+
+    return Handler
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Long-lived local scoring service for alarm_model.json artifacts.")
+    ap.add_argument("--run_dir", action="append", required=True, help="Run directory (repeatable), e.g. out/<run_id>")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--reload_interval", type=float, default=5.0, help="Seconds between model-file polls (0 = off)")
+    args = ap.parse_args()
+
+    bank = ModelBank([Path(p) for p in args.run_dir])
+    counters = Counters()
+    stop = threading.Event()
+    if float(args.reload_interval) > 0:
+        threading.Thread(target=bank.watch, args=(float(args.reload_interval), stop), daemon=True).start()
+
+    srv = ThreadingHTTPServer((args.host, int(args.port)), make_handler(bank, counters))
+    print(f"Serving {len(bank.stack.names)} model(s) on http://{args.host}:{args.port} (POST /score, GET /models, GET /stats)")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        srv.server_close()
+
+
+if __name__ == "__main__":
+    main()
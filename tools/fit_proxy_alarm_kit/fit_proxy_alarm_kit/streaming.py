@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from .modeling import TrainedModel
+
+
+class ScoringKernel:
+    """Impute -> standardize -> dot -> sigmoid for a TrainedModel, into preallocated buffers.
+
+    Same arithmetic as `predict_proba` (up to BLAS rounding in the dot product), applied chunk
+    by chunk without per-chunk allocations (buffers grow only if a chunk is larger than any
+    seen before).
+    """
+
+    def __init__(self, model: TrainedModel, chunk_rows: int = 65536) -> None:
+        if model.standardize and (model.mean is None or model.std is None):
+            raise ValueError("Model is marked standardize=true but mean/std are missing")
+        self.feature_names = list(model.feature_names)
+        self.impute_values = np.asarray(model.impute_values, dtype=np.float64)
+        self.standardize = bool(model.standardize)
+        self.mean = np.asarray(model.mean, dtype=np.float64) if self.standardize else None
+        self.std = np.asarray(model.std, dtype=np.float64) if self.standardize else None
+        coef = np.asarray(model.coef, dtype=np.float64)
+        self.bias = float(coef[0])
+        self.w = np.ascontiguousarray(coef[1:])
+        self._alloc(int(chunk_rows))
+
+    def _alloc(self, n: int) -> None:
+        d = len(self.feature_names)
+        self._X = np.empty((n, d), dtype=np.float64)
+        self._nan = np.empty((n, d), dtype=bool)
+        self._z = np.empty((n,), dtype=np.float64)
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        """Score a (n, d) chunk. Returns a view into an internal buffer; copy it to keep it."""
+        n = int(X.shape[0])
+        if n > self._X.shape[0]:
+            self._alloc(n)
+        Xb = self._X[:n]
+        nan = self._nan[:n]
+        z = self._z[:n]
+
+        Xb[...] = X
+        np.isnan(Xb, out=nan)
+        np.copyto(Xb, np.broadcast_to(self.impute_values, Xb.shape), where=nan)
+        if self.standardize:
+            np.subtract(Xb, self.mean, out=Xb)
+            np.divide(Xb, self.std, out=Xb)
+        np.matmul(Xb, self.w, out=z)
+        np.add(z, self.bias, out=z)
+        # _sigmoid, in place
+        np.clip(z, -60.0, 60.0, out=z)
+        np.negative(z, out=z)
+        np.exp(z, out=z)
+        np.add(z, 1.0, out=z)
+        np.reciprocal(z, out=z)
+        return z
+
+
+def iter_metric_chunks(path: str | Path, columns: List[str], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    # Parquet: one pyarrow record batch at a time. CSV (or anything else): pandas chunked reader.
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"Input metrics file not found: {p}")
+    if p.suffix.lower() == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Streaming Parquet input requires pyarrow (pip install pyarrow)") from e
+        pf = pq.ParquetFile(p)
+        missing = [c for c in columns if c not in pf.schema_arrow.names]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+        for batch in pf.iter_batches(batch_size=int(chunk_rows), columns=columns):
+            yield batch.to_pandas()
+        return
+
+    header = pd.read_csv(p, nrows=0)
+    missing = [c for c in columns if c not in header.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+    for chunk in pd.read_csv(p, usecols=columns, chunksize=int(chunk_rows)):
+        yield chunk[columns]
+
+
+class ChunkWriter:
+    """Append scored chunks to CSV (header once) or Parquet (one row group per chunk)."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.parquet = self.path.suffix.lower() == ".parquet"
+        self._writer = None
+        self._first = True
+        if self.path.exists():
+            self.path.unlink()
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.parquet:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)") from e
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def load_alarm_threshold(path: str | Path, fpr_target: str | None) -> tuple[str, float]:
+    """Pick a threshold from `alarm_thresholds.json` (written by `run.py`).
+
+    `fpr_target` must match a `by_fpr_target` key (e.g. "0.05"); it may be omitted when the
+    file holds a single operating point.
+    """
+    obj = json.loads(Path(path).read_text(encoding="utf-8"))
+    by = obj.get("by_fpr_target") or {}
+    if not by:
+        raise ValueError(f"No thresholds in {path}")
+    if fpr_target is None:
+        if len(by) != 1:
+            raise ValueError(f"--fpr_target is required; available: {sorted(by)}")
+        key = next(iter(by))
+    else:
+        key = next((k for k in by if float(k) == float(fpr_target)), None)
+        if key is None:
+            raise ValueError(f"fpr_target {fpr_target} not in {path}; available: {sorted(by)}")
+    return key, float(by[key]["threshold"])
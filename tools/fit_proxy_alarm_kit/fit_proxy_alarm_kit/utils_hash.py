@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import hashlib
-from typing import List
+from typing import Iterable, List
+
+import numpy as np
 
 
 def sha256_hex(s: str) -> str:
@@ -22,5 +24,40 @@ def hash_to_unit_interval(s: str, seed_string: str) -> float:
 
 
 def stable_hash_order(ids: List[str], seed_string: str) -> List[str]:
-    return sorted(ids, key=lambda i: sha256_hex(seed_string + "::order::" + str(i)))
+    order = hash_order(ids, seed_string + "::order::")
+    return [ids[i] for i in order.tolist()]
+
+
+def digest_words(ids: Iterable[str], prefix: str) -> np.ndarray:
+    """SHA-256(prefix + id) for every id as a (n, 4) uint64 array of big-endian words.
+
+    Word-wise order equals the order of the hex digests, and word 0 is `int(hex[:16], 16)`.
+    The prefix is hashed once and its state copied per id.
+    """
+    base = hashlib.sha256(prefix.encode("utf-8"))
+    digests: List[bytes] = []
+    for i in ids:
+        h = base.copy()
+        h.update(str(i).encode("utf-8"))
+        digests.append(h.digest())
+    if not digests:
+        return np.zeros((0, 4), dtype=np.uint64)
+    return np.frombuffer(b"".join(digests), dtype=">u8").reshape(-1, 4).astype(np.uint64)
+
+
+def hash_to_unit_interval_many(ids: Iterable[str], seed_string: str) -> np.ndarray:
+    # Bit-identical to [hash_to_unit_interval(str(i), seed_string) for i in ids].
+    w = digest_words(ids, seed_string + "::")
+    return w[:, 0].astype(np.float64) / float(16**16)
+
+
+def hash_order(ids: Iterable[str], prefix: str) -> np.ndarray:
+    # Stable argsort of ids by hex(SHA-256(prefix + id)).
+    w = digest_words(ids, prefix)
+    return np.lexsort((w[:, 3], w[:, 2], w[:, 1], w[:, 0]))
+
 
+def hash_sort_keys(ids: Iterable[str], prefix: str) -> tuple:
+    # np.lexsort keys (least significant first) equivalent to sorting by the hex digest.
+    w = digest_words(ids, prefix)
+    return (w[:, 3], w[:, 2], w[:, 1], w[:, 0])
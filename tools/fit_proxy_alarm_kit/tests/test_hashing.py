@@ -0,0 +1,33 @@
+import hashlib
+
+import numpy as np
+
+from fit_proxy_alarm_kit.utils_hash import (
+    hash_order,
+    hash_sort_keys,
+    hash_to_unit_interval,
+    hash_to_unit_interval_many,
+    sha256_hex,
+    stable_hash_order,
+)
+
+IDS = [f"item_{i}" for i in range(500)] + ["", "ünïcode", "item_3", "x" * 200]
+
+
+def test_unit_interval_many_bit_identical():
+    got = hash_to_unit_interval_many(IDS, "SEED::holdout")
+    expected = np.array([hash_to_unit_interval(i, "SEED::holdout") for i in IDS], dtype=float)
+    assert got.tobytes() == expected.tobytes()
+
+
+def test_stable_hash_order_matches_hex_sort():
+    expected = sorted(IDS, key=lambda i: sha256_hex("SEED::order::" + str(i)))
+    assert stable_hash_order(IDS, "SEED") == expected
+
+
+def test_hash_order_matches_hex_lexsort():
+    hashes = np.array([hashlib.sha256(("P::" + i).encode("utf-8")).hexdigest() for i in IDS])
+    scores = np.round(np.linspace(0.0, 1.0, len(IDS)) % 0.3, 1)
+    np.testing.assert_array_equal(np.lexsort(hash_sort_keys(IDS, "P::") + (scores,)), np.lexsort((hashes, scores)))
+    np.testing.assert_array_equal(hash_order(IDS, "P::"), np.argsort(hashes, kind="stable"))
+
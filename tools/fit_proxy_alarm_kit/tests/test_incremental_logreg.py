@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fit_proxy_alarm_kit.modeling import IncrementalLogReg, _rescale_coef, predict_proba, train_logreg
+
+COEF_TOL = 1e-4  # IncrementalLogReg's default coef_tol (model.incremental.coef_tol)
+PARAMS = {"C": 1.0, "max_iter": 100, "tol": 1e-8, "class_weight": "balanced"}
+
+
+def _pool(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 4)) * [1.0, 3.0, 0.5, 2.0] + [0.0, 5.0, -1.0, 0.0], columns=list("abcd"))
+    z = 0.8 * X["a"] - 0.3 * X["b"] + 1.5 * X["c"] + rng.normal(size=n)
+    y = (z > z.median()).astype(int).to_numpy()
+    X.iloc[rng.choice(n, size=n // 10, replace=False), 3] = np.nan
+    return X, y
+
+
+def _rounds(X, y, n_rounds=5, seed=1):
+    # Growing labeled set, re-split every round: each round's rows are not a superset of the last.
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(X))
+    for r in range(n_rounds):
+        labeled = order[: 150 + 90 * r]
+        train = np.sort(rng.choice(labeled, size=int(0.8 * len(labeled)), replace=False))
+        yield X.iloc[train].reset_index(drop=True), y[train]
+
+
+@pytest.mark.parametrize("standardize,impute_strategy", [(True, "median"), (False, "mean")])
+def test_warm_start_matches_cold_refit(standardize, impute_strategy):
+    X, y = _pool()
+    trainer = IncrementalLogReg(standardize=standardize, impute_strategy=impute_strategy, params=PARAMS, verify_every=1)
+    for r, (X_r, y_r) in enumerate(_rounds(X, y)):
+        warm = trainer.fit(X_r, y_r)
+        cold = train_logreg(X_r, y_r, standardize=standardize, impute_strategy=impute_strategy, params=PARAMS)
+        stats = trainer.last_stats
+
+        assert stats["warm_start"] == (r > 0)
+        assert warm.impute_values == cold.impute_values
+        assert warm.mean == cold.mean and warm.std == cold.std
+        np.testing.assert_allclose(warm.coef, cold.coef, rtol=0, atol=COEF_TOL)
+        np.testing.assert_allclose(predict_proba(warm, X), predict_proba(cold, X), rtol=0, atol=COEF_TOL)
+
+        assert stats["coef_match_cold"]
+        assert stats["coef_max_abs_diff_cold"] == pytest.approx(np.max(np.abs(np.subtract(warm.coef, cold.coef))), abs=1e-12)
+        if r > 0:
+            assert stats["irls_iter"] <= stats["irls_iter_cold"]
+            assert stats["irls_iter_saved"] == stats["irls_iter_cold"] - stats["irls_iter"]
+
+
+def test_verify_every_runs_cold_fit_on_every_kth_call():
+    X, y = _pool()
+    trainer = IncrementalLogReg(standardize=True, impute_strategy="median", params=PARAMS, verify_every=2)
+    checked = []
+    for X_r, y_r in _rounds(X, y):
+        trainer.fit(X_r, y_r)
+        checked.append("coef_max_abs_diff_cold" in trainer.last_stats)
+    assert checked == [True, False, True, False, True]
+
+
+def test_feature_change_falls_back_to_cold_start():
+    X, y = _pool()
+    trainer = IncrementalLogReg(standardize=True, impute_strategy="median", params=PARAMS)
+    trainer.fit(X, y)
+    model = trainer.fit(X[["a", "c"]], y)
+    assert not trainer.last_stats["warm_start"]
+    cold = train_logreg(X[["a", "c"]], y, standardize=True, impute_strategy="median", params=PARAMS)
+    np.testing.assert_allclose(model.coef, cold.coef, rtol=0, atol=COEF_TOL)
+
+
+def test_rescale_coef_preserves_decision_function():
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(50, 3)) * 2.0 + 1.0
+    coef = rng.normal(size=4)
+    m0, s0 = rng.normal(size=3), rng.uniform(0.5, 2.0, size=3)
+    m1, s1 = rng.normal(size=3), rng.uniform(0.5, 2.0, size=3)
+    out = _rescale_coef(coef, m0, s0, m1, s1)
+    z0 = coef[0] + ((X - m0) / s0) @ coef[1:]
+    z1 = out[0] + ((X - m1) / s1) @ out[1:]
+    np.testing.assert_allclose(z1, z0, rtol=1e-12, atol=1e-12)
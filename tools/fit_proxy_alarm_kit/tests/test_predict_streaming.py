@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fit_proxy_alarm_kit import predict
+from fit_proxy_alarm_kit.modeling import predict_proba, to_dict, train_logreg
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "metrics.csv"
+FEATURES = ["f_hi_conf_frac", "f_mean_conf", "f_entropy", "f_low_conf_frac"]
+
+
+@pytest.fixture()
+def model_files(tmp_path):
+    df = pd.read_csv(FIXTURE)
+    df.loc[::9, "f_entropy"] = np.nan  # exercise imputation on both paths
+    metrics = tmp_path / "metrics.csv"
+    df.to_csv(metrics, index=False)
+
+    y = (df["oracle_uncertainty_score"] > df["oracle_uncertainty_score"].median()).astype(int).to_numpy()
+    params = {"C": 1.0, "max_iter": 200, "tol": 1e-8, "class_weight": "balanced"}
+    model = train_logreg(df[FEATURES], y, standardize=True, impute_strategy="median", params=params)
+    model_path = tmp_path / "alarm_model.json"
+    model_path.write_text(json.dumps(to_dict(model)), encoding="utf-8")
+
+    thresholds = tmp_path / "alarm_thresholds.json"
+    p = predict_proba(model, df[FEATURES])
+    thr = float(0.5 * (p.min() + p.max()))  # away from any score, so rounding cannot flip a flag
+    thresholds.write_text(json.dumps({"by_fpr_target": {"0.05": {"threshold": thr}}}), encoding="utf-8")
+    return metrics, model_path, thresholds
+
+
+def _run(monkeypatch, out, metrics, model_path, *extra):
+    argv = ["predict", "--model", str(model_path), "--metrics", str(metrics), "--out", str(out), *extra]
+    monkeypatch.setattr(sys, "argv", argv)
+    predict.main()
+    return pd.read_csv(out, dtype={"item_id": str})
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 1000])
+def test_streaming_matches_one_shot(tmp_path, monkeypatch, model_files, chunk_rows):
+    metrics, model_path, thresholds = model_files
+    extra = ["--threshold_from", str(thresholds), "--fpr_target", "0.05"]
+    ref = _run(monkeypatch, tmp_path / "ref.csv", metrics, model_path, *extra)
+    got = _run(monkeypatch, tmp_path / "got.csv", metrics, model_path, "--chunk_rows", str(chunk_rows), *extra)
+
+    assert list(got.columns) == ["item_id", "predicted_prob", "alarm"]
+    assert got["item_id"].tolist() == ref["item_id"].tolist()
+    np.testing.assert_allclose(got["predicted_prob"], ref["predicted_prob"], rtol=0, atol=1e-12)
+    assert got["alarm"].tolist() == ref["alarm"].tolist()
+    assert 0 < ref["alarm"].sum() < len(ref)
+
+
+def test_streaming_applies_feature_whitelist(tmp_path, monkeypatch, model_files):
+    metrics, model_path, _ = model_files
+    # The whitelist defines the required input columns on both paths.
+    whitelist = json.dumps(FEATURES + ["length"])
+    ref = _run(monkeypatch, tmp_path / "ref.csv", metrics, model_path, "--feature_whitelist", whitelist)
+    got = _run(
+        monkeypatch, tmp_path / "got.csv", metrics, model_path, "--feature_whitelist", whitelist, "--chunk_rows", "10"
+    )
+    np.testing.assert_allclose(got["predicted_prob"], ref["predicted_prob"], rtol=0, atol=1e-12)
+
+    df = pd.read_csv(metrics).drop(columns=["length"])
+    df.to_csv(metrics, index=False)
+    for extra in ([], ["--chunk_rows", "10"]):
+        with pytest.raises(ValueError, match="length"):
+            _run(monkeypatch, tmp_path / "x.csv", metrics, model_path, "--feature_whitelist", whitelist, *extra)
+
+    with pytest.raises(ValueError, match="missing model features"):
+        _run(monkeypatch, tmp_path / "x.csv", metrics, model_path, "--feature_whitelist", json.dumps(FEATURES[:2]))
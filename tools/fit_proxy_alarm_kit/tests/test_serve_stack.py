@@ -0,0 +1,74 @@
+from http.server import ThreadingHTTPServer
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+from fit_proxy_alarm_kit.modeling import predict_proba, to_dict, train_logreg
+from fit_proxy_alarm_kit.serve import Counters, ModelBank, make_handler, stack_models
+
+
+def test_stacked_scores_match_predict_proba():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 4)), columns=["a", "b", "c", "d"])
+    y = (X["a"] + rng.normal(size=200) > 0).astype(int).to_numpy()
+    params = {"C": 1.0, "max_iter": 100, "tol": 1e-8, "class_weight": "balanced"}
+    models = {
+        "all": train_logreg(X, y, standardize=True, impute_strategy="median", params=params),
+        "sub": train_logreg(X[["c", "a"]], y, standardize=False, impute_strategy="mean", params=params),
+    }
+
+    X_new = X.copy()
+    X_new.iloc[::7, 0] = np.nan
+    X_new.iloc[::5, 2] = np.nan
+
+    st = stack_models(models)
+    P = st.score(X_new[st.features].to_numpy())
+    for k, name in enumerate(st.names):
+        np.testing.assert_allclose(P[:, k], predict_proba(models[name], X_new), rtol=0, atol=1e-12)
+
+
+def _post(url, payload):
+    req = urllib.request.Request(url, data=payload.encode("utf-8"), headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_score_rejects_bad_input_with_400(tmp_path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(100, 2)), columns=["a", "b"])
+    y = (X["a"] > 0).astype(int).to_numpy()
+    params = {"C": 1.0, "max_iter": 100, "tol": 1e-8, "class_weight": "balanced"}
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    model = train_logreg(X, y, standardize=True, impute_strategy="median", params=params)
+    (run_dir / "alarm_model.json").write_text(json.dumps(to_dict(model)), encoding="utf-8")
+
+    counters = Counters()
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(ModelBank([run_dir]), counters))
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{srv.server_address[1]}/score"
+    try:
+        code, out = _post(url, '{"rows": [{"a": 0.5, "b": NaN}]}')  # NaN is a missing value
+        assert code == 200 and len(out["scores"]["run"]) == 1
+
+        # Python's json accepts Infinity/NaN tokens; neither may turn into a dropped connection.
+        code, out = _post(url, '{"columns": {"a": [1.0, Infinity], "b": [0.0, -Infinity]}}')
+        assert code == 400 and "non-finite" in out["error"]
+        code, out = _post(url, '{"rows": [{"a": 0.5}], "ids": [NaN]}')
+        assert code == 400 and "JSON" in out["error"]
+
+        # Valid JSON of the wrong shape is a 400 too, not an AttributeError in the handler.
+        for bad in ("[1, 2]", '"x"', '{"rows": [1, 2]}', '{"rows": {"a": 1}}', '{"columns": [[1.0]]}'):
+            code, out = _post(url, bad)
+            assert code == 400, bad
+        assert counters.snapshot()["errors"] == 7
+    finally:
+        srv.shutdown()
+        srv.server_close()
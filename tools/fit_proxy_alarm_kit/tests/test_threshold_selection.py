@@ -0,0 +1,46 @@
+import numpy as np
+
+from fit_proxy_alarm_kit.eval import (
+    _choose_threshold_scan,
+    choose_threshold_max_tpr_under_fpr,
+    choose_thresholds_batched,
+    choose_thresholds_max_tpr_under_fpr,
+)
+
+FPR_CAPS = [0.0, 0.01, 0.05, 0.10, 0.5, 1.0]
+
+
+def _cases():
+    rng = np.random.default_rng(0)
+    for n in [1, 2, 7, 50, 300]:
+        for pos_rate in [0.0, 0.1, 0.5, 1.0]:
+            y = (rng.random(n) < pos_rate).astype(int)
+            yield y, rng.random(n)
+            # heavy ties
+            yield y, np.round(rng.random(n), 1)
+            # constant scores
+            yield y, np.full((n,), 0.3)
+
+
+def test_sweep_matches_scan():
+    for y, s in _cases():
+        expected = [_choose_threshold_scan(y, s, cap) for cap in FPR_CAPS]
+        assert choose_thresholds_max_tpr_under_fpr(y, s, FPR_CAPS) == expected
+        for cap, thr in zip(FPR_CAPS, expected):
+            assert choose_threshold_max_tpr_under_fpr(y, s, cap) == thr
+
+
+def test_batched_matches_scan():
+    rng = np.random.default_rng(1)
+    for n in [5, 40, 200]:
+        y = (rng.random(n) < 0.3).astype(int)
+        S = np.vstack([rng.random(n), np.round(rng.random(n), 1), np.full((n,), 0.5), rng.random(n)])
+        got = choose_thresholds_batched(y, S, FPR_CAPS)
+        expected = np.array([[_choose_threshold_scan(y, S[k], cap) for cap in FPR_CAPS] for k in range(S.shape[0])])
+        np.testing.assert_array_equal(got, expected)
+
+
+def test_empty_scores_return_inf():
+    y = np.array([], dtype=int)
+    s = np.array([], dtype=float)
+    assert choose_thresholds_max_tpr_under_fpr(y, s, [0.05]) == [float("inf")]